@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: audio underflows while the GUI thread is busy
+
+Plays sounds through the audio engine, in this process and then in a process
+of its own, while the main thread does the work that stalls a busy window:
+rebuilding the rows of a large library in Python, sorting them and
+collecting the garbage of the whole heap. The output device is simulated:
+it asks for a block every block period, holds a few blocks of latency and
+counts an underflow whenever a block is mixed after it was due. Exits with
+status 1 if the engine in its own process underflows more than the budget.
+
+    python benchmarks/bench_audio_process.py [--seconds 5] [--sounds 50000] [--latency-blocks 2] [--budget 0]
+"""
+
+import argparse
+import functools
+import gc
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from managers.audio_engine import AudioEngine  # noqa: E402
+from managers.audio_process import AudioProcessEngine  # noqa: E402
+
+
+class OutputStatus:
+    """The flags PortAudio passes the callback"""
+
+    def __init__(self, output_underflow: bool):
+        self.output_underflow = output_underflow
+
+
+class SimulatedOutput:
+    """Stands in for sounddevice.OutputStream, with a device running in real time
+
+    A thread asks for a block each time one of the buffered blocks has
+    played. When a block is mixed after the device needed it, the device
+    has played silence meanwhile: the next callback is flagged with an
+    underflow, as PortAudio does, and the schedule starts over from then.
+    """
+
+    def __init__(self, samplerate: int, channels: int, dtype: str, blocksize: int, callback,
+                 latency_blocks: int = 2):
+        self.period = blocksize / samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self.latency = latency_blocks * self.period
+        self.buffer = np.zeros((blocksize, channels), dtype=dtype)
+        self.running = False
+        self.thread = threading.Thread(target=self.run, name="simulated-output", daemon=True)
+
+    def start(self) -> None:
+        self.running = True
+        self.thread.start()
+
+    def close(self) -> None:
+        self.running = False
+        self.thread.join()
+
+    def run(self) -> None:
+        due = time.perf_counter() + self.latency  # When the block asked for must start playing
+        late = False
+        while self.running:
+            self.callback(self.buffer, self.blocksize, None, OutputStatus(late))
+            now = time.perf_counter()
+            late = now > due
+            due = (now if late else due) + self.period
+            time.sleep(max(0.0, due - self.latency - time.perf_counter()))
+
+
+def make_sounds(count: int, seconds: float, sample_rate: int) -> List[np.ndarray]:
+    """Make stereo tones of different pitches"""
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    return [np.repeat((0.2 * np.sin(2 * np.pi * (220 + 55 * i) * t))[:, None], 2, axis=1).astype(np.float32)
+            for i in range(count)]
+
+
+def make_library(count: int) -> List[Dict[str, Any]]:
+    """Make the sound data of a library, kept alive so collections walk it"""
+    return [{"title": f"Sound {i:06d}", "category": i % 12, "tags": [f"tag{i % 40}", f"set{i % 7}"],
+             "file_path": f"/sounds/{i % 100}/sound_{i}.wav", "play_count": (i * 7919) % 1000,
+             "added_at": 1.6e9 + i} for i in range(count)]
+
+
+def hammer_ui(library: List[Dict[str, Any]]) -> float:
+    """Do one round of busy-window work, the way the GUI thread does it
+
+    Returns:
+        The longest step, in seconds: the longest the interpreter was held
+    """
+    longest = 0.0
+    start = time.perf_counter()
+    rows = [(sound["title"], sound["play_count"], ", ".join(sound["tags"])) for sound in library]
+    rows.sort(key=lambda row: (-row[1], row[0]))
+    longest = max(longest, time.perf_counter() - start)
+    start = time.perf_counter()
+    # Sorting strings never leaves C, so no other thread runs meanwhile
+    sorted(sound["file_path"] for sound in library)
+    longest = max(longest, time.perf_counter() - start)
+    start = time.perf_counter()
+    gc.collect()
+    return max(longest, time.perf_counter() - start)
+
+
+def run(engine, sounds: List[np.ndarray], library: List[Dict[str, Any]], seconds: float) -> Dict[str, float]:
+    """Play sounds while hammering the main thread
+
+    Returns:
+        Underflows, blocks asked for and the longest stall of the main thread
+    """
+    engine.start()
+    shared = [engine.share(samples) for samples in sounds]
+    underflows = engine.underflows
+    start = time.perf_counter()
+    longest_stall = 0.0
+    plays = 0
+    while time.perf_counter() - start < seconds:
+        engine.play(plays % engine.voices, shared[plays % len(shared)], 0.5, plays)
+        plays += 1
+        engine.poll_finished()
+        longest_stall = max(longest_stall, hammer_ui(library))
+    elapsed = time.perf_counter() - start
+    # Let the process engine publish its last count
+    time.sleep(0.05)
+    underflows = engine.underflows - underflows
+    engine.close()
+    return {"underflows": underflows, "blocks": elapsed * engine.sample_rate / engine.block_size,
+            "stall": longest_stall, "plays": plays}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="time played per engine")
+    parser.add_argument("--sounds", type=int, default=50000, help="sounds in the simulated library")
+    parser.add_argument("--latency-blocks", type=int, default=2, help="blocks buffered by the device")
+    parser.add_argument("--budget", type=int, default=0, help="underflows allowed to the engine in its own process")
+    args = parser.parse_args()
+
+    library = make_library(args.sounds)
+    output = functools.partial(SimulatedOutput, latency_blocks=args.latency_blocks)
+    engines = (("in process", AudioEngine(stream_factory=output)),
+               ("own process", AudioProcessEngine(stream_factory=output)))
+    results = {}
+    for name, engine in engines:
+        sounds = make_sounds(8, 1.0, engine.sample_rate)
+        result = run(engine, sounds, library, args.seconds)
+        results[name] = result
+        print(f"{name:12s}  {result['underflows']:5d} underflows in {result['blocks']:6.0f} blocks  "
+              f"{result['plays']:4d} plays  main thread stalled up to {result['stall'] * 1000:6.1f} ms")
+
+    underflows = results["own process"]["underflows"]
+    latency_ms = args.latency_blocks * 1000 * engines[0][1].block_size / engines[0][1].sample_rate
+    print(f"own process: {underflows} underflows at {latency_ms:.1f} ms of latency, budget {args.budget}")
+    return 0 if underflows <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: round trip of the local control API over loopback
+
+Starts the control server of a sound manager holding a synthetic library of
+sounds without files, so nothing reaches the audio device, then times
+requests from a client thread while the Qt event loop runs the commands:
+single plays over a kept-alive HTTP connection, and batches of plays. Exits
+with status 1 if the 99th percentile of a single play goes over the budget.
+
+    python benchmarks/bench_control_api.py [--requests 2000] [--batch 50] [--budget-ms 5]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from managers.control_server import ControlServer  # noqa: E402
+from managers.sound_manager import SoundManager  # noqa: E402
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Get a percentile of sorted samples"""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_client(port: int, args: argparse.Namespace, results: dict) -> None:
+    """Time single and batched plays, in milliseconds"""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    single, server = [], []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        connection.request("POST", f"/sounds/sound_{i % args.sounds}/play")
+        response = json.loads(connection.getresponse().read())
+        single.append((time.perf_counter() - start) * 1000)
+        server.append(response["latency_ms"])
+
+    batches = []
+    for i in range(max(1, args.requests // args.batch)):
+        body = json.dumps([{"op": "play", "id": f"sound_{(i + j) % args.sounds}"} for j in range(args.batch)])
+        start = time.perf_counter()
+        connection.request("POST", "/commands", body, {"Content-Type": "application/json"})
+        connection.getresponse().read()
+        batches.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    results.update(single=sorted(single), server=sorted(server), batches=sorted(batches))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sounds", type=int, default=1000, help="sounds in the library")
+    parser.add_argument("--requests", type=int, default=2000, help="single play requests timed")
+    parser.add_argument("--batch", type=int, default=50, help="plays per batch request")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="99th percentile of a single play")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as home:
+        sound_manager = SoundManager(os.path.join(home, "sounds.json"))
+        for i in range(args.sounds):
+            sound_manager.model.add_sound(f"sound_{i}", {"title": f"Sound {i}", "category": 1})
+        server = ControlServer(sound_manager, port=0)
+        if not server.start():
+            return 1
+
+        results: dict = {}
+
+        def client() -> None:
+            try:
+                run_client(server.port, args, results)
+            finally:
+                app.quit()
+
+        threading.Thread(target=client, daemon=True).start()
+        app.exec()
+        server.stop()
+
+    single, server_side, batches = results["single"], results["server"], results["batches"]
+    print(f"single play   p50 {percentile(single, 0.5):6.3f} ms  p99 {percentile(single, 0.99):6.3f} ms  "
+          f"(server side p50 {percentile(server_side, 0.5):6.3f} ms)")
+    print(f"batch of {args.batch:3d}  p50 {percentile(batches, 0.5):6.3f} ms  "
+          f"{percentile(batches, 0.5) / args.batch * 1000:6.1f} µs per play")
+    worst = percentile(single, 0.99)
+    print(f"p99 {worst:.3f} ms per single play, budget {args.budget_ms:.3f} ms")
+    return 0 if worst <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy search latency per keystroke
+
+Indexes a synthetic library of titles and types misspelled queries one
+character at a time, the way the search bar sends them. Each query is typed
+a few times into a fresh searcher and each keystroke counts its median, so a
+scheduler hiccup does not fail the run. Exits with status 1 if any keystroke
+takes longer than the budget.
+
+    python benchmarks/bench_fuzzy_search.py [--titles 100000] [--rounds 5] [--budget-ms 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models.search_index import SearchIndex  # noqa: E402
+from models.fuzzy_search import FuzzySearcher  # noqa: E402
+
+WORDS = """
+air horn applause laugh drum roll bass drop guitar riff voice effect crowd cheer glass
+breaking door slam thunder rain wind bird chirp dog bark cat meow car phone ring clock
+tick siren alarm explosion gunshot laser whoosh swoosh pop click beep buzz ding chime
+bell gong cymbal snare kick clap snap boing sad trombone victory fanfare fail wow nope
+yes scream gasp sigh cough sneeze burp record scratch airhorn vinyl static glitch bonk
+slap punch kiss heartbeat footsteps creak knock zipper typing mouse keyboard error
+success level up coin jump café naïve epic intro outro transition drumroll suspense
+dramatic spooky ghost zombie robot alien monster
+""".split()
+
+QUERIES = [
+    "aplause",
+    "applasue",
+    "air horm",
+    "victroy fanfare",
+    "explsion",
+    "cafe",
+    "drum rol",
+    "sad tromobne",
+]
+
+
+def make_sounds(count: int, seed: int = 1) -> Dict[str, Dict[str, object]]:
+    """Build a reproducible library of sound titles"""
+    rnd = random.Random(seed)
+    sounds = {}
+    for i in range(count):
+        title = " ".join(rnd.choice(WORDS).title() for _ in range(rnd.choice((1, 2, 2, 3))))
+        if rnd.random() < 0.5:
+            title += f" {rnd.randint(1, 500)}"
+        sounds[f"sound_{i}"] = {"title": title, "category": rnd.randint(1, 4)}
+    return sounds
+
+
+def type_query(searcher: FuzzySearcher, query: str, limit: int) -> List[float]:
+    """Type a query one keystroke at a time, returning each latency in ms"""
+    latencies = []
+    for end in range(1, len(query) + 1):
+        start = time.perf_counter()
+        searcher.search(query[:end], limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100_000, help="library size")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="per keystroke budget")
+    parser.add_argument("--limit", type=int, default=100, help="results per keystroke")
+    parser.add_argument("--rounds", type=int, default=5, help="times each query is typed")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.rebuild(make_sounds(args.titles))
+    print(f"indexed {args.titles} titles in {time.perf_counter() - start:.2f} s")
+
+    worst = 0.0
+    for query in QUERIES:
+        # A fresh searcher per round, so nothing is left over from the previous one
+        rounds = [type_query(FuzzySearcher(index), query, args.limit) for _ in range(args.rounds)]
+        latencies = [statistics.median(keystroke) for keystroke in zip(*rounds)]
+        worst = max(worst, max(latencies))
+        steps = " ".join(f"{latency:.2f}" for latency in latencies)
+        print(f"{query!r:>18}  max {max(latencies):6.2f} ms  [{steps}]")
+
+    print(f"worst keystroke {worst:.2f} ms, budget {args.budget_ms:.2f} ms")
+    return 0 if worst <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
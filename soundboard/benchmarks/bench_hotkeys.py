@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of the global keyboard hook per key event
+
+Binds a growing number of chords and sequences, then feeds the hook a
+stream of key presses and releases, the way the keyboard package delivers
+them. Exits with status 1 if the mean cost of an event goes over the
+budget at any binding count, so the hook stays cheap however many
+bindings there are.
+
+    python benchmarks/bench_hotkeys.py [--bindings 10,1000,20000] [--budget-us 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from managers.hotkey_bindings import MODIFIERS, HotkeyTrie  # noqa: E402
+from managers.hotkey_manager import HotkeyManager  # noqa: E402
+
+KEYS = [chr(c) for c in range(ord("a"), ord("z") + 1)] + [str(d) for d in range(10)] + [f"f{n}" for n in range(1, 13)]
+
+
+class KeyEvent:
+    """The parts of a keyboard.KeyboardEvent the hook reads"""
+
+    __slots__ = ("name", "event_type")
+
+    def __init__(self, name: str, event_type: str):
+        self.name = name
+        self.event_type = event_type
+
+
+def make_bindings(count: int, seed: int = 1) -> Dict[str, str]:
+    """Build reproducible bindings: 200 single chords, then two- and three-chord sequences"""
+    rnd = random.Random(seed)
+    trie = HotkeyTrie()
+    bindings: Dict[str, str] = {}
+    while len(bindings) < count:
+        chords = []
+        for _ in range(1 if len(bindings) < 200 else rnd.choice((2, 3))):
+            modifiers = rnd.sample(MODIFIERS[:3], rnd.randint(0, 2))
+            chords.append("+".join(modifiers + [rnd.choice(KEYS)]))
+        if len(chords) > 1:
+            # Sequences start with chords of their own, so they never shadow a single chord
+            chords[0] = "ctrl+alt+shift+" + chords[0].split("+")[-1]
+        hotkey = ", ".join(chords)
+        sound_id = f"sound_{len(bindings)}"
+        if trie.add(hotkey, sound_id) is None:
+            bindings[hotkey] = sound_id
+    return bindings
+
+
+def make_events(count: int, seed: int = 2) -> List[KeyEvent]:
+    """Build a stream of presses and releases, a third of them with modifiers"""
+    rnd = random.Random(seed)
+    events = []
+    while len(events) < count:
+        modifiers = rnd.sample(("left ctrl", "left alt", "left shift"), rnd.choice((0, 0, 1, 2, 3)))
+        key = rnd.choice(KEYS)
+        events += [KeyEvent(name, "down") for name in modifiers + [key]]
+        events += [KeyEvent(name, "up") for name in [key] + modifiers]
+    return events
+
+
+def feed(manager: HotkeyManager, events: List[KeyEvent]) -> Tuple[float, int]:
+    """Feed every event to the hook, returning the mean cost in µs and the matches"""
+    on_key_event = manager._on_key_event
+    start = time.perf_counter()
+    for event in events:
+        on_key_event(event)
+    elapsed = time.perf_counter() - start
+    matches = len(manager._commands)
+    manager._commands.clear()
+    return elapsed / len(events) * 1e6, matches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bindings", default="10,1000,20000", help="comma separated binding counts")
+    parser.add_argument("--events", type=int, default=200_000, help="key events fed per binding count")
+    parser.add_argument("--budget-us", type=float, default=20.0, help="mean cost per key event")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    worst = 0.0
+    for count in (int(n) for n in args.bindings.split(",")):
+        bindings = make_bindings(count)
+        # The hook never plays anything here, the matches stay queued
+        manager = HotkeyManager(lambda sound_id: True)
+        start = time.perf_counter()
+        trie = manager.set_bindings(bindings)
+        compile_ms = (time.perf_counter() - start) * 1000
+        per_event, matches = feed(manager, events)
+        worst = max(worst, per_event)
+        print(f"{len(trie):6d} bindings  compiled in {compile_ms:7.1f} ms  "
+              f"{per_event:5.2f} µs per key event  {matches} matches")
+
+    print(f"worst {worst:.2f} µs per key event, budget {args.budget_us:.2f} µs")
+    return 0 if worst <= args.budget_us else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse-to-enqueue time of OSC packets
+
+Feeds the OSC server single messages, bundles of messages and bundles
+scheduled for later, the way its receive thread hands them over, and times
+each packet from its bytes to its commands being queued for the sound
+manager. Exits with status 1 if the 99th percentile of any kind of packet
+goes over the budget.
+
+    python benchmarks/bench_osc.py [--packets 20000] [--bundle 8] [--budget-us 1000]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from managers.osc_server import NTP_EPOCH_OFFSET, OscServer  # noqa: E402
+from managers.sound_manager import SoundManager  # noqa: E402
+
+
+def osc_string(value: str) -> bytes:
+    """Encode a null-terminated string padded to four bytes"""
+    data = value.encode() + b"\0"
+    return data + b"\0" * (-len(data) % 4)
+
+
+def osc_message(address: str, *arguments) -> bytes:
+    """Encode a message of string, int and float arguments"""
+    tags, data = ",", b""
+    for argument in arguments:
+        if isinstance(argument, str):
+            tags, data = tags + "s", data + osc_string(argument)
+        elif isinstance(argument, int):
+            tags, data = tags + "i", data + struct.pack(">i", argument)
+        else:
+            tags, data = tags + "f", data + struct.pack(">f", argument)
+    return osc_string(address) + osc_string(tags) + data
+
+
+def osc_bundle(timetag: int, *elements: bytes) -> bytes:
+    """Encode a bundle of messages"""
+    return b"#bundle\0" + struct.pack(">Q", timetag) + b"".join(
+        struct.pack(">i", len(element)) + element for element in elements)
+
+
+def timetag_in(seconds: float) -> int:
+    """Get the timetag of a time some seconds from now"""
+    ntp_time = time.time() + seconds + NTP_EPOCH_OFFSET
+    return (int(ntp_time) << 32) | int((ntp_time % 1) * 2 ** 32)
+
+
+def time_packets(server: OscServer, app: QCoreApplication, make_packet: Callable[[int], bytes],
+                 count: int) -> List[float]:
+    """Time the handling of packets, in µs, sorted"""
+    packets = [make_packet(i) for i in range(count)]
+    timings = []
+    for i, packet in enumerate(packets):
+        start = time.perf_counter()
+        server.handle_packet(packet)
+        timings.append((time.perf_counter() - start) * 1e6)
+        if i % 1000 == 999:
+            # Run the queued commands outside the timings, so the queue does not grow, and drop
+            # the bundles held for later, so they stay under MAX_SCHEDULED
+            app.processEvents()
+            server._scheduled.clear()
+    app.processEvents()
+    return sorted(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sounds", type=int, default=1000, help="sounds in the library")
+    parser.add_argument("--packets", type=int, default=20000, help="packets timed per kind")
+    parser.add_argument("--bundle", type=int, default=8, help="messages per bundle")
+    parser.add_argument("--budget-us", type=float, default=1000.0, help="99th percentile per packet")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as home:
+        sound_manager = SoundManager(os.path.join(home, "sounds.json"))
+        for i in range(args.sounds):
+            # Sounds without files, so nothing reaches the audio device
+            sound_manager.model.add_sound(f"sound_{i}", {"title": f"Sound {i}", "category": 1})
+        # The timings call the receive thread's handler directly, the server is never started
+        server = OscServer(sound_manager, port=0)
+
+        def play(i: int) -> bytes:
+            return osc_message("/board/play", f"sound_{i % args.sounds}")
+
+        def bundle(i: int) -> bytes:
+            return osc_bundle(1, *(osc_message("/board/gain", f"sound_{(i + j) % args.sounds}", -3.0)
+                                   for j in range(args.bundle - 1)), play(i))
+
+        def scheduled(i: int) -> bytes:
+            return osc_bundle(timetag_in(3600), play(i), osc_message("/board/stop"))
+
+        worst = 0.0
+        for name, make_packet in (("message", play), (f"bundle of {args.bundle}", bundle), ("scheduled", scheduled)):
+            timings = time_packets(server, app, make_packet, args.packets)
+            p99 = timings[int(len(timings) * 0.99)]
+            worst = max(worst, p99)
+            print(f"{name:14s}  p50 {timings[len(timings) // 2]:7.2f} µs  p99 {p99:7.2f} µs  "
+                  f"max {timings[-1]:8.2f} µs")
+        sound_manager.flush()
+
+    print(f"worst p99 {worst:.2f} µs per packet, budget {args.budget_us:.2f} µs")
+    return 0 if worst <= args.budget_us else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start time of the application
+
+Launches src/main.py with --profile-startup against a synthetic library in a
+scratch home directory, waits for the window to become interactive, then
+stops it. Exits with status 1 if any launch takes longer than the budget,
+counting from the process start so interpreter start up and imports count.
+
+    python benchmarks/bench_startup.py [--sounds 1000] [--runs 3] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+
+def write_library(home: str, count: int, seed: int = 1) -> None:
+    """Write a reproducible library of sounds to the data file of a home directory"""
+    rnd = random.Random(seed)
+    sounds = {}
+    for i in range(count):
+        sounds[f"sound_{i}"] = {
+            "title": f"Sound {i}",
+            "file_path": f"/nonexistent/sound_{i}.wav",
+            "category": rnd.randint(1, 4),
+            "duration": f"0:{rnd.randint(1, 59):02d}",
+            "added_at": float(i),
+        }
+    favorites = [f"sound_{i}" for i in range(0, count, 10)]
+    os.makedirs(os.path.join(home, ".soundboard"))
+    with open(os.path.join(home, ".soundboard", "sounds.json"), "w", encoding="utf-8") as f:
+        json.dump({"sounds": sounds, "favorites": favorites}, f)
+
+
+def launch(home: str, timeout: float) -> Optional[Dict[str, float]]:
+    """Start the application once and time its phases
+
+    Returns:
+        The end of each phase in ms since the process started, with the
+        wall clock time to interactive as "total", or None if the
+        application exited or timed out before becoming interactive
+    """
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, MAIN, "--profile-startup"], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    # Killing the process ends the output, so a hung launch stops the loop below
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    phases = {}
+    try:
+        for line in process.stderr:
+            fields = line.split()
+            if fields[:1] != ["startup"]:
+                continue
+            # "startup <phase> <ms> ms  (+<ms> ms)", the phase name may contain spaces
+            phase = " ".join(fields[1:fields.index("ms") - 1])
+            phases[phase] = float(fields[fields.index("ms") - 1])
+            if phase == "interactive":
+                phases["total"] = (time.perf_counter() - start) * 1000
+                return phases
+        return None
+    finally:
+        watchdog.cancel()
+        process.kill()
+        process.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sounds", type=int, default=1000, help="library size")
+    parser.add_argument("--runs", type=int, default=3, help="number of launches")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="process start to interactive budget")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for a launch")
+    args = parser.parse_args()
+
+    worst = 0.0
+    with tempfile.TemporaryDirectory() as home:
+        write_library(home, args.sounds)
+        for run in range(1, args.runs + 1):
+            phases = launch(home, args.timeout)
+            if phases is None:
+                print(f"run {run}: the application did not become interactive")
+                return 1
+            worst = max(worst, phases["total"])
+            steps = "  ".join(f"{phase} {ms:.0f}" for phase, ms in phases.items() if phase != "total")
+            print(f"run {run}: interactive after {phases['total']:7.1f} ms  [{steps}]")
+
+    print(f"worst start {worst:.1f} ms, budget {args.budget_ms:.1f} ms")
+    return 0 if worst <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
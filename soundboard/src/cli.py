@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Soundboard command-line client, for scripts and cron jobs
+
+    soundboard play "Air Horn"          soundboard list --sort play_count
+    soundboard stop                     soundboard search horn
+    soundboard import ~/Sounds          soundboard analyze
+    soundboard stats                    soundboard --json stats
+
+Commands go to the running instance of the application over its instance
+channel. When none runs, the library commands read and change the library
+themselves, holding the instance lock meanwhile; playing needs the
+application. Only the standard library is imported until a command needs
+more, so triggering a sound takes a few milliseconds past the interpreter.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# The installed entry point runs this module from the source folder, whose modules import each other from the top
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from managers.single_instance import InstanceLock, send_commands  # noqa: E402
+
+# Sort keys of the list command, repeated from the control commands, which import NumPy
+SORT_KEYS = ("recent", "added", "name", "duration", "category", "play_count")
+
+
+def run_commands(commands: List[Dict[str, Any]], needs_instance: bool = False) -> List[Dict[str, Any]]:
+    """Run commands in the running instance, or on the library if none runs
+
+    Args:
+        commands: Commands as run by ControlCommands
+        needs_instance: Whether the commands need the application, e.g. to play sounds
+
+    Returns:
+        The result of each command
+    """
+    lock = InstanceLock()
+    while not lock.acquire():
+        try:
+            results = send_commands(commands)
+        except OSError as e:
+            return [{"ok": False, "error": str(e)} for _ in commands]
+        if results is not None:
+            return results
+        # The running instance exited in the meantime
+    try:
+        if needs_instance:
+            return [{"ok": False, "error": "The soundboard is not running"} for _ in commands]
+        from managers.control_commands import ControlCommands
+        from managers.offline_library import OfflineLibrary
+        return ControlCommands(OfflineLibrary()).execute(commands)
+    finally:
+        lock.release()
+
+
+def run_command(command: Dict[str, Any], needs_instance: bool = False) -> Dict[str, Any]:
+    """Run a single command, see run_commands()"""
+    return run_commands([command], needs_instance)[0]
+
+
+def format_sounds(sounds: List[Dict[str, Any]]) -> str:
+    """Format sounds as lines of tab-separated title, duration and ID"""
+    return "\n".join(f"{sound['title']}\t{sound.get('duration') or '-'}\t{sound['id']}" for sound in sounds)
+
+
+def play(args: argparse.Namespace) -> Dict[str, Any]:
+    """Play a sound in the running instance"""
+    name = " ".join(args.name)
+    return run_command({"op": "play", "id": name} if args.id else {"op": "play", "name": name}, needs_instance=True)
+
+
+def stop(args: argparse.Namespace) -> Dict[str, Any]:
+    """Stop the sound playing in the running instance"""
+    return run_command({"op": "stop"}, needs_instance=True)
+
+
+def list_sounds(args: argparse.Namespace) -> Dict[str, Any]:
+    """List a page of the library"""
+    result = run_command({"op": "list", "sort": args.sort, "offset": args.offset, "limit": args.limit or None})
+    if result["ok"]:
+        result["text"] = format_sounds(result["sounds"])
+    return result
+
+
+def search(args: argparse.Namespace) -> Dict[str, Any]:
+    """Search the library"""
+    result = run_command({"op": "search", "query": " ".join(args.query), "limit": args.limit})
+    if result["ok"]:
+        result["text"] = format_sounds(result["sounds"])
+    return result
+
+
+def import_folder(args: argparse.Namespace) -> Dict[str, Any]:
+    """Add the audio files of a folder, found here, to the library"""
+    from models.library_files import find_sound_files
+    if not os.path.isdir(args.directory):
+        return {"ok": False, "error": f"Not a folder: {args.directory}"}
+    result = run_command({"op": "import", "files": find_sound_files(args.directory, not args.no_recursive)})
+    if result["ok"]:
+        result["text"] = f"Added {result['added']} sounds, skipped {result['skipped']} already in the library"
+    return result
+
+
+def analyze(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure the sounds here, so decoding never holds up the running application"""
+    from concurrent.futures import ThreadPoolExecutor
+    from models.library_files import analyze_file
+
+    listing = run_command({"op": "list", "sort": "added", "limit": None})
+    if not listing["ok"]:
+        return listing
+    sounds = [sound for sound in listing["sounds"]
+              if sound.get("file_path") and (args.all or not sound.get("duration"))]
+
+    def measure(sound: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            return analyze_file(sound["file_path"])
+        except Exception as e:
+            print(f"Cannot analyze {sound['file_path']}: {e}", file=sys.stderr)
+            return None
+
+    # Decoders mostly wait on ffmpeg processes and file reads
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        measurements = dict(zip((sound["id"] for sound in sounds), executor.map(measure, sounds)))
+    failed = [sound_id for sound_id, fields in measurements.items() if fields is None]
+    measured = {sound_id: fields for sound_id, fields in measurements.items() if fields is not None}
+    result: Dict[str, Any] = run_command({"op": "analysis", "sounds": measured}) if measured else {"ok": True, "updated": 0}
+    if result["ok"]:
+        result["failed"] = failed
+        result["text"] = f"Measured {result['updated']} sounds, {len(failed)} could not be read"
+    return result
+
+
+def stats(args: argparse.Namespace) -> Dict[str, Any]:
+    """Summarize the library"""
+    result = run_command({"op": "stats", "limit": args.limit})
+    if result["ok"]:
+        lines = [
+            f"Sounds:          {result['sounds']}",
+            f"Favorites:       {result['favorites']}",
+            f"Missing files:   {result['missing_files']}",
+            f"Not measured:    {result['unmeasured']}",
+            f"Total duration:  {result['total_duration_s'] / 3600:.1f} h",
+            f"Plays:           {result['plays']}",
+            f"Folders:         {result['folders']}",
+            f"Banks:           {result['banks']}",
+        ]
+        if result["most_played"]:
+            lines.append("Most played:")
+            lines.extend(f"  {sound['play_count']:6d}  {sound['title']}" for sound in result["most_played"])
+        result["text"] = "\n".join(lines)
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse the command line, without the program name"""
+    parser = argparse.ArgumentParser(prog="soundboard", description="Control the soundboard and its library")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON, for scripts")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    command = commands.add_parser("play", help="play a sound, by title (best match) or ID")
+    command.add_argument("name", nargs="+", help="title of the sound")
+    command.add_argument("--id", action="store_true", help="the name is the ID of the sound")
+    command.set_defaults(run=play)
+
+    command = commands.add_parser("stop", help="stop the sound playing")
+    command.set_defaults(run=stop)
+
+    command = commands.add_parser("list", help="list the sounds of the library")
+    command.add_argument("--sort", choices=SORT_KEYS, default="name", help="sort order (default: name)")
+    command.add_argument("--offset", type=int, default=0, help="sounds to skip")
+    command.add_argument("--limit", type=int, default=0, help="most sounds to list, 0 for all")
+    command.set_defaults(run=list_sounds)
+
+    command = commands.add_parser("search", help="search the library, best match first")
+    command.add_argument("query", nargs="+", help="words to look for, typos allowed")
+    command.add_argument("--limit", type=int, default=20, help="most sounds to list")
+    command.set_defaults(run=search)
+
+    command = commands.add_parser("import", help="add the audio files of a folder to the library")
+    command.add_argument("directory", help="the folder")
+    command.add_argument("--no-recursive", action="store_true", help="leave out subfolders")
+    command.set_defaults(run=import_folder)
+
+    command = commands.add_parser("analyze", help="measure the duration and levels of the sounds")
+    command.add_argument("--all", action="store_true", help="measure them again, not only the unmeasured ones")
+    command.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="files decoded at a time")
+    command.set_defaults(run=analyze)
+
+    command = commands.add_parser("stats", help="summarize the library and its most played sounds")
+    command.add_argument("--limit", type=int, default=10, help="most played sounds to list")
+    command.set_defaults(run=stats)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command of a command line
+
+    Args:
+        argv: The command line without the program name, or None for sys.argv
+
+    Returns:
+        The exit code: 0 on success, 1 if the command failed
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    result = args.run(args)
+    text = result.pop("text", None)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif not result["ok"]:
+        print(f"Error: {result['error']}", file=sys.stderr)
+    elif text:
+        print(text)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,115 @@
 #!/usr/bin/env python3
 """
 Soundboard Program - Main Entry Point
+
+Only one instance runs per library, with a window or, with --headless,
+without one. Launching again hands the command line to the running
+instance, e.g. `main.py play "Air Horn"`, and exits before Qt is imported.
 """
 
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+from typing import Any, Dict, List, Optional, Tuple
+
+# Imported first, so the startup clock includes the imports below
+from managers.startup_profile import startup_profile
+
+from managers.single_instance import InstanceLock, send_commands
+
+# Default ports, repeated here so a forwarding launch does not import the servers
+DEFAULT_CONTROL_PORT = 8710
+DEFAULT_OSC_PORT = 9000
+
+
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse the options of the application, leaving the rest to Qt
+
+    Args:
+        argv: The command line, program name first
+
+    Returns:
+        The parsed options and the remaining command line
+    """
+    parser = argparse.ArgumentParser(description="A professional soundboard application")
+    parser.add_argument("command", nargs="*",
+                        help='"play NAME", "stop" or "show"; sent to the running instance if there is one '
+                             '(default: show)')
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window, e.g. on a server, until interrupted")
+    parser.add_argument("--audio-process", action="store_true",
+                        help="mix the sounds in a process of their own, so a busy window never interrupts them")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each phase of the startup took")
+    parser.add_argument("--control-port", type=int, metavar="PORT",
+                        help="serve the local control API on this port of the loopback interface "
+                             f"(e.g. {DEFAULT_CONTROL_PORT})")
+    parser.add_argument("--osc-port", type=int, metavar="PORT",
+                        help=f"listen for OSC triggers on this UDP port (e.g. {DEFAULT_OSC_PORT})")
+    parser.add_argument("--osc-host", default="127.0.0.1", metavar="ADDRESS",
+                        help="address to listen for OSC triggers on, 0.0.0.0 for other machines")
+    options, qt_args = parser.parse_known_args(argv[1:])
+    try:
+        options.commands = parse_command(options.command)
+    except ValueError as e:
+        parser.error(str(e))
+    return options, argv[:1] + qt_args
+
+
+def parse_command(words: List[str]) -> List[Dict[str, Any]]:
+    """Turn the words of the command line into control commands
+
+    Args:
+        words: The positional arguments, e.g. ["play", "Air", "Horn"]
+
+    Returns:
+        The commands, as run by ControlCommands
+    """
+    if not words or words == ["show"]:
+        return [{"op": "show"}]
+    if words[0] == "play" and len(words) > 1:
+        return [{"op": "play", "name": " ".join(words[1:])}]
+    if words == ["stop"]:
+        return [{"op": "stop"}]
+    raise ValueError(f"unknown command: {' '.join(words)}")
+
+
+def forward(commands: List[Dict[str, Any]]) -> Optional[int]:
+    """Run commands in the running instance
+
+    Returns:
+        The exit code, or None if no instance runs
+    """
+    try:
+        results = send_commands(commands)
+    except OSError as e:
+        print(f"Error reaching the running soundboard: {e}", file=sys.stderr)
+        return 1
+    if results is None:
+        return None
+    failed = [result for result in results if not result.get("ok")]
+    for result in failed:
+        print(f"Error: {result.get('error')}", file=sys.stderr)
+    return 1 if failed else 0
+
 
 def main():
     """Main application entry point"""
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    options, qt_args = parse_args(sys.argv)
+    startup_profile.enabled = options.profile_startup
+
+    lock = InstanceLock()
+    while not lock.acquire():
+        exit_code = forward(options.commands)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        # The running instance exited in the meantime, this launch takes over
+
+    # Only the instance owning the library loads Qt
+    if options.headless:
+        from managers.daemon import run
+    else:
+        from ui.application import run
+    sys.exit(run(options, qt_args, lock, [command for command in options.commands if command["op"] != "show"]))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1 +1,6 @@
-"""Managers package for the soundboard application"""
\ No newline at end of file
+"""Managers package for the soundboard application
+
+With the models package, the core of the application. It uses QtCore only,
+never QtWidgets or QtGui, so the board also runs without a window; see
+managers.daemon.
+"""
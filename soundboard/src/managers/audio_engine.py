@@ -0,0 +1,310 @@
+"""Real-time mixer behind the audio player
+
+One output stream stays open and a callback of PortAudio's mixes the sounds
+playing into it, block after block. Nothing else touches the mixer's state:
+other threads send it commands through a ring of preallocated slots, which
+the callback drains at the top of each block, and it reports the sounds that
+finished through a second ring, read from the GUI thread.
+
+The callback never waits: it takes no lock, calls nothing that could block
+on another thread, and mixes into buffers allocated up front. Sounds are
+decoded and converted to the stream's format before they are sent, so
+playing one only hands the callback a reference to its samples.
+"""
+
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Format of the output stream, the one sounds are converted to when decoded
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+# Frames mixed per callback: 512 frames is 11.6 ms at 44.1 kHz
+BLOCK_SIZE = 512
+
+# Sounds the mixer can play at once
+MAX_VOICES = 8
+
+# Commands that can wait in the ring; a burst beyond this is refused
+COMMAND_SLOTS = 256
+
+# Command codes
+PLAY = 1  # voice, gain, samples, tag: start the samples on the voice, replacing its sound
+STOP = 2  # voice: silence the voice
+STOP_ALL = 3  # silence every voice
+SET_VOLUME = 4  # gain: set the master volume
+
+# Event codes
+FINISHED = 1  # voice, tag: the sound of the voice played to its end
+
+
+class SlotRing:
+    """Fixed ring of command slots between one producer and one consumer
+
+    Every slot is allocated up front as an entry of parallel lists. The
+    producer fills the next free slot and then publishes it by bumping the
+    written count; the consumer reads the published slots and bumps the read
+    count. Each count is only ever changed by one side, so neither takes a
+    lock. Several producers must serialize among themselves.
+    """
+
+    def __init__(self, capacity: int):
+        """Allocate the slots
+
+        Args:
+            capacity: Number of slots
+        """
+        self.capacity = capacity
+        self.codes: List[int] = [0] * capacity
+        self.voices: List[int] = [0] * capacity
+        self.values: List[float] = [0.0] * capacity
+        self.tags: List[int] = [0] * capacity
+        # Samples sent with a command; the consumer swaps in those it lets go of
+        self.samples: List[Optional[np.ndarray]] = [None] * capacity
+        self.written = 0  # Slots published, only changed by the producer
+        self.read = 0  # Slots consumed, only changed by the consumer
+        self._swept = 0  # Consumed slots whose samples the producer let go of
+
+    def push(self, code: int, voice: int = 0, value: float = 0.0, tag: int = 0,
+             samples: Optional[np.ndarray] = None) -> bool:
+        """Publish a command, from the producer
+
+        Returns:
+            True if sent, False if the ring is full
+        """
+        # Let go of the samples the consumer swapped into the slots it is done with,
+        # so they are freed on this thread rather than when their slot comes around
+        read = self.read
+        while self._swept < read:
+            self.samples[self._swept % self.capacity] = None
+            self._swept += 1
+        written = self.written
+        if written - read >= self.capacity:
+            return False
+        slot = written % self.capacity
+        self.codes[slot] = code
+        self.voices[slot] = voice
+        self.values[slot] = value
+        self.tags[slot] = tag
+        self.samples[slot] = samples
+        self.written = written + 1
+        return True
+
+    def pending(self) -> int:
+        """Get the number of slots published but not consumed yet"""
+        return self.written - self.read
+
+
+class AudioEngine:
+    """Mixes sounds into a single output stream, controlled only through commands
+
+    Call play(), stop(), stop_all() and set_volume() from any thread; call
+    poll_finished() from a single thread, e.g. on a timer of the GUI thread.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS,
+                 block_size: int = BLOCK_SIZE, voices: int = MAX_VOICES,
+                 stream_factory: Optional[Callable[..., Any]] = None):
+        """Allocate the mixer, without opening the stream yet
+
+        Args:
+            sample_rate: Frames per second of the stream
+            channels: Channels of the stream
+            block_size: Frames mixed per callback
+            voices: Sounds that can play at once
+            stream_factory: Creates the output stream, taking the arguments of
+                sounddevice.OutputStream; None for sounddevice's
+        """
+        self.stream_factory = stream_factory
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.voices = voices
+        self.commands = SlotRing(COMMAND_SLOTS)
+        self.events = SlotRing(COMMAND_SLOTS)
+        self.underflows = 0  # Blocks the device asked for too late, as reported by PortAudio
+        self.dropped_commands = 0  # Commands refused because the ring was full
+        self._producer_lock = threading.Lock()  # Serializes the threads sending commands, never the callback
+        self._stream: Optional[Any] = None  # Output stream made by the stream factory
+        # State of the mixer, only touched by the callback
+        self._voice_samples: List[Optional[np.ndarray]] = [None] * voices
+        self._voice_positions: List[int] = [0] * voices
+        self._voice_gains: List[float] = [0.0] * voices
+        self._voice_tags: List[int] = [0] * voices
+        self._voice_active: List[bool] = [False] * voices
+        self._volume = 1.0
+        self._mix = np.zeros((block_size, channels), dtype=np.float32)
+
+    def start(self) -> None:
+        """Open the output stream, if not open yet
+
+        Raises:
+            Exception: If there is no audio device
+        """
+        with self._producer_lock:
+            if self._stream is not None:
+                return
+            stream_factory = self.stream_factory
+            if stream_factory is None:
+                import sounddevice as sd
+                stream_factory = sd.OutputStream
+            stream = stream_factory(samplerate=self.sample_rate, channels=self.channels, dtype="float32",
+                                    blocksize=self.block_size, callback=self._callback)
+            stream.start()
+            self._stream = stream
+
+    def close(self) -> None:
+        """Close the output stream"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def play(self, voice: int, samples: np.ndarray, gain: float = 1.0, tag: int = 0) -> bool:
+        """Start a sound on a voice, replacing the sound it plays
+
+        Args:
+            voice: The voice, from 0 to voices - 1
+            samples: Float32 frames of the stream's channels, see convert_samples()
+            gain: Linear gain of the sound, on top of the volume
+            tag: Number reported back when the sound finishes
+
+        Returns:
+            True if sent, False if too many commands are waiting
+        """
+        return self._send(PLAY, voice, gain, tag, samples)
+
+    def stop(self, voice: int) -> bool:
+        """Silence a voice"""
+        return self._send(STOP, voice)
+
+    def stop_all(self) -> bool:
+        """Silence every voice"""
+        return self._send(STOP_ALL)
+
+    def set_volume(self, volume: float) -> bool:
+        """Set the master volume, a linear gain"""
+        return self._send(SET_VOLUME, value=volume)
+
+    def share(self, samples: np.ndarray) -> np.ndarray:
+        """Get samples in memory the engine can play from; the engine shares this process's"""
+        return samples
+
+    def poll_finished(self) -> List[Tuple[int, int]]:
+        """Get the sounds that played to their end since the last poll
+
+        Returns:
+            (voice, tag) of each finished sound
+        """
+        events = self.events
+        finished = []
+        while events.read < events.written:
+            slot = events.read % events.capacity
+            if events.codes[slot] == FINISHED:
+                finished.append((events.voices[slot], events.tags[slot]))
+            events.read += 1
+        return finished
+
+    def position(self, voice: int) -> Optional[Tuple[np.ndarray, int]]:
+        """Get the samples a voice plays and its position in them, for meters
+
+        The two are read without synchronization, so they may be a block apart.
+
+        Returns:
+            (samples, frame index), or None if the voice is silent
+        """
+        samples = self._voice_samples[voice]
+        if samples is None or not self._voice_active[voice]:
+            return None
+        return samples, self._voice_positions[voice]
+
+    def voice_state(self, voice: int) -> Tuple[bool, int, int]:
+        """Get whether a voice plays, the tag of its sound and its position, in frames"""
+        return self._voice_active[voice], self._voice_tags[voice], self._voice_positions[voice]
+
+    def _send(self, code: int, voice: int = 0, value: float = 0.0, tag: int = 0,
+              samples: Optional[np.ndarray] = None) -> bool:
+        """Publish a command from any producer thread"""
+        with self._producer_lock:
+            sent = self.commands.push(code, voice, value, tag, samples)
+        if not sent:
+            self.dropped_commands += 1
+        return sent
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info: Any, status: Any) -> None:
+        """PortAudio's callback: count underflows and render the block"""
+        if status.output_underflow:
+            self.underflows += 1
+        self.render(outdata, frames)
+
+    def render(self, outdata: np.ndarray, frames: int) -> None:
+        """Apply the pending commands, then mix the next block of every voice
+
+        Args:
+            outdata: Float32 buffer of frames x channels to fill
+            frames: Frames to fill, at most the block size
+        """
+        self._apply_commands()
+        outdata.fill(0.0)
+        for voice in range(self.voices):
+            samples = self._voice_samples[voice]
+            if not self._voice_active[voice] or samples is None:
+                continue
+            position = self._voice_positions[voice]
+            count = min(frames, len(samples) - position)
+            if count > 0:
+                mix = self._mix[:count]
+                np.multiply(samples[position:position + count], self._voice_gains[voice] * self._volume, out=mix)
+                np.add(outdata[:count], mix, out=outdata[:count])
+                position += count
+            self._voice_positions[voice] = position
+            if position >= len(samples):
+                self._voice_active[voice] = False
+                self.events.push(FINISHED, voice, tag=self._voice_tags[voice])
+        np.clip(outdata, -1.0, 1.0, out=outdata)
+
+    def _apply_commands(self) -> None:
+        """Drain the command ring into the mixer's state"""
+        commands = self.commands
+        while commands.read < commands.written:
+            slot = commands.read % commands.capacity
+            code = commands.codes[slot]
+            voice = commands.voices[slot]
+            if code == PLAY and 0 <= voice < self.voices:
+                # Swap the voice's previous samples into the slot, so they are freed by the producer
+                previous = self._voice_samples[voice]
+                self._voice_samples[voice] = commands.samples[slot]
+                commands.samples[slot] = previous
+                self._voice_positions[voice] = 0
+                self._voice_gains[voice] = commands.values[slot]
+                self._voice_tags[voice] = commands.tags[slot]
+                self._voice_active[voice] = True
+            elif code == STOP and 0 <= voice < self.voices:
+                self._voice_active[voice] = False
+            elif code == STOP_ALL:
+                for index in range(self.voices):
+                    self._voice_active[index] = False
+            elif code == SET_VOLUME:
+                self._volume = commands.values[slot]
+            commands.read += 1
+
+
+def convert_samples(audio: Any, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> np.ndarray:
+    """Convert a decoded pydub segment to frames the engine can play
+
+    Args:
+        audio: The pydub AudioSegment
+        sample_rate: Frames per second of the stream
+        channels: Channels of the stream
+
+    Returns:
+        Float32 array of frames x channels, from -1.0 to 1.0
+    """
+    if audio.frame_rate != sample_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    if audio.channels != channels:
+        audio = audio.set_channels(channels)
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    samples /= float(1 << (8 * audio.sample_width - 1))
+    return samples.reshape(-1, channels)
@@ -1,11 +1,36 @@
-"""Audio player for the soundboard application"""
+"""Audio player for the soundboard application
 
+sounddevice starts PortAudio and pydub looks for ffmpeg as soon as they are
+imported, so both are imported on first use rather than at startup.
+
+Sounds play through an AudioEngine: the player decodes them, converts them
+to the engine's format and sends it commands, from whichever thread plays
+or stops a sound, and never touches the audio callback's state itself.
+The engine can also run in a process of its own, see AudioProcessEngine.
+"""
+
+import itertools
 import os
-import sounddevice as sd
+import threading
+from collections import OrderedDict
 import numpy as np
-from pydub import AudioSegment
-from typing import Optional, Dict, Any
-from PyQt6.QtCore import QObject, pyqtSignal
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable, Tuple, Union
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from managers.audio_engine import AudioEngine, convert_samples
+from models.library_columns import format_duration
+
+if TYPE_CHECKING:
+    from managers.audio_process import AudioProcessEngine
+
+# Decoded sounds kept besides the pinned ones, least recently played dropped first
+DECODE_CACHE_SIZE = 64
+
+# Voice of the engine the player plays on: a new sound replaces the one playing
+PLAYER_VOICE = 0
+
+# Milliseconds between checks for the end of the sound playing
+FINISHED_POLL_MS = 20
 
 class AudioPlayer(QObject):
     """Audio player for playing sound files"""
@@ -15,11 +40,37 @@ class AudioPlayer(QObject):
     playback_stopped = pyqtSignal(str)  # sound_id
     playback_error = pyqtSignal(str, str)  # sound_id, error_message
     
-    def __init__(self):
-        """Initialize the audio player"""
+    def __init__(self, cache_size: int = DECODE_CACHE_SIZE,
+                 engine: Optional[Union[AudioEngine, "AudioProcessEngine"]] = None):
+        """Initialize the audio player
+        
+        Args:
+            cache_size: Decoded sounds to keep besides the pinned ones
+            engine: The engine playing the sounds: an AudioEngine, by default,
+                or an AudioProcessEngine to mix them in another process
+        """
         super().__init__()
+        self.engine: Union[AudioEngine, "AudioProcessEngine"] = engine if engine is not None else AudioEngine()
         self.current_playing: Optional[str] = None
-        self.loaded_sounds: Dict[str, Dict[str, Any]] = {}
+        self.cache_size = cache_size
+        # Decode cache, least recently used first; loads may come from the preload thread
+        self.loaded_sounds: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pinned: frozenset = frozenset()
+        self._cache_lock = threading.Lock()
+        # Guards the sound playing, which the GUI, hotkey and decoding threads all change; reentrant
+        # as the signals are emitted under it, keeping them in the order of the changes
+        self._state_lock = threading.RLock()
+        self._preload_generation = 0  # Bumped by each preload(), stopping the previous one
+        self._requests = itertools.count(1)  # Numbers each play or stop asked for
+        self._latest_request = 0  # A sound decoded for a play only plays if none was asked for since
+        self.volume = 1.0
+        self._tags = itertools.count(1)  # Tells the plays apart when the engine reports one finished
+        self._playing_tag = 0
+        # Watches for the end of the sound playing while there is one; started on the GUI thread
+        self._finished_timer = QTimer(self)
+        self._finished_timer.setInterval(FINISHED_POLL_MS)
+        self._finished_timer.timeout.connect(self._poll_finished)
+        self.playback_started.connect(self._watch_finished)
     
     def load_sound(self, sound_id: str, file_path: str) -> bool:
         """Load a sound file
@@ -37,14 +88,18 @@ class AudioPlayer(QObject):
                 return False
                 
             # Load the audio file using pydub
+            from pydub import AudioSegment
             audio = AudioSegment.from_file(file_path)
             
-            # Store the audio data
-            self.loaded_sounds[sound_id] = {
-                'file_path': file_path,
-                'audio': audio,
-                'duration': len(audio) / 1000  # Duration in seconds
-            }
+            # Store the samples in the engine's format, so playing them needs no conversion
+            samples = self.engine.share(convert_samples(audio, self.engine.sample_rate, self.engine.channels))
+            with self._cache_lock:
+                self.loaded_sounds[sound_id] = {
+                    'file_path': file_path,
+                    'samples': samples,
+                    'duration': len(audio) / 1000  # Duration in seconds
+                }
+                self._evict()
             
             return True
         except Exception as e:
@@ -52,50 +107,193 @@ class AudioPlayer(QObject):
             self.playback_error.emit(sound_id, str(e))
             return False
     
-    def play_sound(self, sound_id: str) -> bool:
+    def play_sound(self, sound_id: str, gain_db: float = 0.0) -> bool:
         """Play a sound
         
         Args:
             sound_id: Unique identifier for the sound
+            gain_db: Gain of the sound in decibels, applied on top of the volume
             
         Returns:
             True if the sound was played, False otherwise
         """
-        if sound_id not in self.loaded_sounds:
-            print(f"Sound not loaded: {sound_id}")
-            return False
+        return self._play(sound_id, gain_db, None)
+    
+    def _play(self, sound_id: str, gain_db: float, request: Optional[int]) -> bool:
+        """Play a sound, unless another play or stop was asked for since the given request
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            gain_db: Gain of the sound in decibels, applied on top of the volume
+            request: Number of the request playing it, or None to play it anyway
             
-        try:
-            # Stop any currently playing sound
+        Returns:
+            True if the sound was played, False otherwise
+        """
+        # Get the samples, marking them as recently used
+        with self._cache_lock:
+            sound_data = self.loaded_sounds.get(sound_id)
+            if sound_data is not None:
+                self.loaded_sounds.move_to_end(sound_id)
+        
+        with self._state_lock:
+            if request is not None and request != self._latest_request:
+                return False
+            self._latest_request = next(self._requests)
+            if sound_data is None:
+                print(f"Sound not loaded: {sound_id}")
+                return False
+                
+            try:
+                # Replace the sound playing, if any
+                self.engine.start()
+                tag = next(self._tags)
+                if not self.engine.play(PLAYER_VOICE, sound_data['samples'], 10 ** (gain_db / 20), tag):
+                    raise RuntimeError("Too many audio commands waiting")
+                
+                # Update current playing
+                previous = self.current_playing
+                self._playing_tag = tag
+                self.current_playing = sound_id
+                if previous:
+                    self.playback_stopped.emit(previous)
+                self.playback_started.emit(sound_id)
+                
+                return True
+            except Exception as e:
+                print(f"Error playing sound: {e}")
+                self.playback_error.emit(sound_id, str(e))
+                return False
+    
+    def stop_sound(self) -> None:
+        """Stop the currently playing sound"""
+        with self._state_lock:
+            self._latest_request = next(self._requests)
             if self.current_playing:
-                self.stop_sound()
-            
-            # Get the audio data
-            sound_data = self.loaded_sounds[sound_id]
-            audio = sound_data['audio']
-            
-            # Convert to numpy array for sounddevice
-            samples = np.array(audio.get_array_of_samples())
-            
-            # Play the sound
-            sd.play(samples, audio.frame_rate)
+                self.engine.stop(PLAYER_VOICE)
+                self._playing_tag = 0
+                self.playback_stopped.emit(self.current_playing)
+                self.current_playing = None
+    
+    def set_volume(self, volume: float) -> float:
+        """Set the volume, which applies to the sound playing too
+        
+        Args:
+            volume: Gain from 0.0 (silent) to 1.0 (as recorded)
             
-            # Update current playing
-            self.current_playing = sound_id
-            self.playback_started.emit(sound_id)
+        Returns:
+            The volume set, clamped to that range
+        """
+        self.volume = min(1.0, max(0.0, float(volume)))
+        self.engine.set_volume(self.volume)
+        return self.volume
+    
+    def close(self) -> None:
+        """Stop the sound playing and close the audio output, e.g. on exit"""
+        self.stop_sound()
+        self.engine.close()
+    
+    def levels(self, window: float = 0.05) -> Optional[Tuple[float, float]]:
+        """Get the level of the sound playing, for a meter; safe to call from any thread
+        
+        Args:
+            window: Seconds of audio measured, ending at the current position
             
-            return True
-        except Exception as e:
-            print(f"Error playing sound: {e}")
-            self.playback_error.emit(sound_id, str(e))
-            return False
+        Returns:
+            The peak and RMS levels, from 0.0 to 1.0, or None if nothing is playing
+        """
+        playing = self.engine.position(PLAYER_VOICE)
+        if playing is None:
+            return None
+        samples, position = playing
+        block = samples[max(0, position - int(window * self.engine.sample_rate)):position]
+        if not len(block):
+            return 0.0, 0.0
+        return (min(1.0, float(np.max(np.abs(block)))),
+                min(1.0, float(np.sqrt(np.mean(np.square(block, dtype=np.float64))))))
     
-    def stop_sound(self) -> None:
-        """Stop the currently playing sound"""
-        if self.current_playing:
-            sd.stop()
-            self.playback_stopped.emit(self.current_playing)
-            self.current_playing = None
+    def play_when_loaded(self, sound_id: str, file_path: str, gain_db: float = 0.0) -> None:
+        """Decode a sound on a background thread, then play it
+        
+        The sound is left unplayed if another sound was played or the
+        sound playing was stopped while it was being decoded.
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            file_path: Path to the sound file
+            gain_db: Gain of the sound in decibels, applied on top of the volume
+        """
+        with self._state_lock:
+            self._latest_request = request = next(self._requests)
+        threading.Thread(
+            target=self._play_when_loaded, args=(sound_id, file_path, gain_db, request), name="audio-decode", daemon=True
+        ).start()
+    
+    def _play_when_loaded(self, sound_id: str, file_path: str, gain_db: float, request: int) -> None:
+        """Decode a sound and play it unless superseded by another play or stop"""
+        if sound_id in self.loaded_sounds or self.load_sound(sound_id, file_path):
+            self._play(sound_id, gain_db, request)
+    
+    def is_loaded(self, sound_id: str) -> bool:
+        """Check whether a sound is decoded and ready to play"""
+        return sound_id in self.loaded_sounds
+    
+    def pin(self, sound_ids: Iterable[str]) -> None:
+        """Keep some sounds decoded, whatever else is played
+        
+        Args:
+            sound_ids: The sounds to keep, replacing the previously pinned ones
+        """
+        with self._cache_lock:
+            self._pinned = frozenset(sound_ids)
+            self._evict()
+    
+    def preload(self, file_paths: Dict[str, str]) -> None:
+        """Decode sounds on a background thread, so they play without delay
+        
+        A new preload stops the previous one after the sound it is decoding.
+        
+        Args:
+            file_paths: Dictionary of sound ID -> path of the sound file
+        """
+        self._preload_generation += 1
+        missing = {sound_id: path for sound_id, path in file_paths.items() if sound_id not in self.loaded_sounds}
+        if missing:
+            threading.Thread(
+                target=self._preload, args=(missing, self._preload_generation), name="audio-preload", daemon=True
+            ).start()
+    
+    def _preload(self, file_paths: Dict[str, str], generation: int) -> None:
+        """Decode sounds until done or superseded by another preload"""
+        for sound_id, file_path in file_paths.items():
+            if generation != self._preload_generation:
+                return
+            if sound_id not in self.loaded_sounds and os.path.exists(file_path):
+                self.load_sound(sound_id, file_path)
+    
+    def _watch_finished(self, sound_id: str) -> None:
+        """Start watching for the end of a sound; runs on the GUI thread"""
+        if not self._finished_timer.isActive():
+            self._finished_timer.start()
+    
+    def _poll_finished(self) -> None:
+        """Report the sound playing as stopped once the engine played it to its end"""
+        with self._state_lock:
+            for _, tag in self.engine.poll_finished():
+                if tag == self._playing_tag and self.current_playing:
+                    sound_id = self.current_playing
+                    self.current_playing = None
+                    self._playing_tag = 0
+                    self.playback_stopped.emit(sound_id)
+            if not self.current_playing:
+                self._finished_timer.stop()
+    
+    def _evict(self) -> None:
+        """Drop the least recently used unpinned sounds over the cache size; the cache lock is held"""
+        unpinned = [sound_id for sound_id in self.loaded_sounds if sound_id not in self._pinned]
+        for sound_id in unpinned[:max(0, len(unpinned) - self.cache_size)]:
+            if sound_id != self.current_playing:
+                del self.loaded_sounds[sound_id]
     
     def get_duration(self, sound_id: str) -> Optional[float]:
         """Get the duration of a sound in seconds
@@ -119,6 +317,4 @@ class AudioPlayer(QObject):
         Returns:
             Formatted duration string
         """
-        minutes = int(seconds // 60)
-        seconds = int(seconds % 60)
-        return f"{minutes}:{seconds:02d}"
\ No newline at end of file
+        return format_duration(seconds)
\ No newline at end of file
@@ -0,0 +1,400 @@
+"""Audio engine running in a process of its own
+
+The mixer of AudioEngine only meets its deadlines if its callback gets the
+interpreter in time, and in the application's process the GUI thread holds
+it through view rebuilds, long sorts and garbage collections of a large
+library: long enough, at times, for the device to run dry. Here the engine
+runs in a child process with an interpreter of its own, which the
+application's pauses never hold up.
+
+Sounds reach the child without being copied again: share() moves decoded
+samples into a shared memory block once, and playing one sends the child
+only the block's name, which it maps and mixes from in place. Commands and
+the finished sounds go through a pipe; the positions of the voices, for the
+meters, and the underflow count come back through a small shared block the
+child keeps up to date.
+"""
+
+import multiprocessing
+import signal
+import threading
+import weakref
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from managers.audio_engine import BLOCK_SIZE, CHANNELS, MAX_VOICES, SAMPLE_RATE, AudioEngine
+
+# Seconds to wait for the child to open the audio output
+START_TIMEOUT = 10.0
+
+# Seconds the child waits for a command before updating the status block
+STATUS_INTERVAL = 0.005
+
+# Fields of a voice in the status block: active, tag and position; a last row holds the underflow count
+STATUS_FIELDS = 3
+
+
+class AudioProcessEngine:
+    """Drop-in replacement for AudioEngine, mixing in a child process
+
+    Offers the methods of AudioEngine the audio player uses, from the same
+    threads. Samples must come from share(); others are shared on the fly,
+    at the cost of a copy. The child is started by start() and started again
+    if it dies.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS,
+                 block_size: int = BLOCK_SIZE, voices: int = MAX_VOICES,
+                 stream_factory: Optional[Callable[..., Any]] = None):
+        """Set up the engine, without starting the child yet
+
+        Args:
+            sample_rate: Frames per second of the stream
+            channels: Channels of the stream
+            block_size: Frames mixed per callback
+            voices: Sounds that can play at once
+            stream_factory: Creates the output stream in the child, see
+                AudioEngine; it must be picklable, e.g. a module-level class
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.voices = voices
+        self.stream_factory = stream_factory
+        self.dropped_commands = 0  # Commands lost because the child was gone
+        self._lock = threading.RLock()  # Serializes the threads writing to the pipe
+        self._process: Optional[BaseProcess] = None
+        self._connection: Optional[Connection] = None
+        self._status_memory: Optional[SharedMemory] = None
+        self._status: Optional[np.ndarray] = None
+        self._volume = 1.0
+        self._shared_names: Dict[int, str] = {}  # Name of the block of each shared array, by id
+        self._released: List[str] = []  # Blocks let go of, for the child to unmap with the next command
+        # Tag and samples last sent to each voice, so the status block can be read back as samples
+        self._sent: List[Optional[Tuple[int, np.ndarray]]] = [None] * voices
+
+    @property
+    def underflows(self) -> int:
+        """Blocks the device asked for too late, as counted by the child"""
+        status = self._status
+        return int(status[self.voices, 0]) if status is not None else 0
+
+    def start(self) -> None:
+        """Start the child and have it open the output stream, if not running yet
+
+        Raises:
+            RuntimeError: If the child cannot open the audio output
+        """
+        with self._lock:
+            if self._connection is not None and self._process is not None and self._process.is_alive():
+                return
+            self._stop_process()
+            status_memory, status = self._status_memory, self._status
+            if status_memory is None or status is None:
+                status_memory = SharedMemory(create=True, size=(self.voices + 1) * STATUS_FIELDS * 8)
+                status = np.ndarray((self.voices + 1, STATUS_FIELDS), dtype=np.int64, buffer=status_memory.buf)
+                self._status_memory, self._status = status_memory, status
+            status.fill(0)
+            # Forking would copy Qt's threads and state into the child
+            context = multiprocessing.get_context("spawn")
+            connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=run_engine, name="audio-engine", daemon=True,
+                args=(child_connection, status_memory.name, self.sample_rate, self.channels,
+                      self.block_size, self.voices, self.stream_factory, self._volume))
+            process.start()
+            child_connection.close()
+            try:
+                reply = connection.recv() if connection.poll(START_TIMEOUT) else ("error", "it did not start")
+            except (EOFError, OSError):
+                reply = ("error", "it exited")
+            if reply[0] != "ready":
+                connection.close()
+                process.terminate()
+                process.join()
+                raise RuntimeError(f"The audio process cannot open the audio output: {reply[1]}")
+            self._process = process
+            self._connection = connection
+            # The blocks the previous child had mapped went with it
+            self._released.clear()
+
+    def close(self) -> None:
+        """Stop the child and free the status block"""
+        with self._lock:
+            self._stop_process()
+            if self._status_memory is not None:
+                self._status = None
+                self._status_memory.close()
+                self._status_memory.unlink()
+                self._status_memory = None
+
+    def play(self, voice: int, samples: np.ndarray, gain: float = 1.0, tag: int = 0) -> bool:
+        """Start a sound on a voice, replacing the sound it plays, see AudioEngine.play()"""
+        name = self._shared_names.get(id(samples))
+        if name is None:
+            samples = self.share(samples)
+            name = self._shared_names[id(samples)]
+        # Keep the samples until the voice plays others, so their block outlives the play
+        self._sent[voice] = (tag, samples)
+        return self._send(("play", voice, name, samples.shape, gain, tag))
+
+    def stop(self, voice: int) -> bool:
+        """Silence a voice"""
+        return self._send(("stop", voice))
+
+    def stop_all(self) -> bool:
+        """Silence every voice"""
+        return self._send(("stop_all",))
+
+    def set_volume(self, volume: float) -> bool:
+        """Set the master volume, a linear gain"""
+        self._volume = volume
+        return self._send(("volume", volume))
+
+    def share(self, samples: np.ndarray) -> np.ndarray:
+        """Copy samples into a shared memory block the child can play from
+
+        The block is freed once the returned array and its views are gone.
+
+        Args:
+            samples: Float32 frames of the stream's channels, see convert_samples()
+
+        Returns:
+            The samples, backed by the block
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        memory = SharedMemory(create=True, size=max(samples.nbytes, 1))
+        shared: np.ndarray = np.ndarray(samples.shape, dtype=np.float32, buffer=memory.buf)
+        shared[...] = samples
+        key = id(shared)
+        self._shared_names[key] = memory.name
+        weakref.finalize(shared, self._release, key, memory)
+        return shared
+
+    def poll_finished(self) -> List[Tuple[int, int]]:
+        """Get the sounds that played to their end since the last poll
+
+        Returns:
+            (voice, tag) of each finished sound
+        """
+        finished: List[Tuple[int, int]] = []
+        connection = self._connection
+        if connection is None:
+            return finished
+        try:
+            while connection.poll():
+                message = connection.recv()
+                if message[0] == "finished":
+                    finished.append((message[1], message[2]))
+        except (EOFError, OSError):
+            self._lose_process()
+        if self._released:
+            self._send(None)
+        return finished
+
+    def position(self, voice: int) -> Optional[Tuple[np.ndarray, int]]:
+        """Get the samples a voice plays and its position in them, for meters
+
+        The status block lags the child by a few milliseconds.
+
+        Returns:
+            (samples, frame index), or None if the voice is silent
+        """
+        status = self._status
+        sent = self._sent[voice]
+        if status is None or sent is None:
+            return None
+        active, tag, position = status[voice]
+        if not active or tag != sent[0]:
+            return None
+        return sent[1], int(position)
+
+    def _send(self, message: Optional[tuple]) -> bool:
+        """Send a command to the child, after telling it the blocks let go of
+
+        Returns:
+            True if sent, False if the child is gone
+        """
+        with self._lock:
+            connection = self._connection
+            if connection is None:
+                self.dropped_commands += 1
+                return False
+            try:
+                while self._released:
+                    connection.send(("release", self._released.pop()))
+                if message is not None:
+                    connection.send(message)
+            except OSError:
+                self._lose_process()
+                self.dropped_commands += 1
+                return False
+        return True
+
+    def _release(self, key: int, memory: SharedMemory) -> None:
+        """Free the block of a shared array once the array is gone
+
+        Runs wherever the last reference to the array is dropped, so it only
+        queues the child's notice, which is sent along with the next command.
+        """
+        self._shared_names.pop(key, None)
+        memory.close()
+        try:
+            memory.unlink()
+        except FileNotFoundError:
+            pass
+        if self._connection is not None:
+            self._released.append(memory.name)
+
+    def _lose_process(self) -> None:
+        """Forget a child that stopped answering; the next start() replaces it"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _stop_process(self) -> None:
+        """Ask the child to exit, and make sure it did"""
+        process = self._process
+        if process is None:
+            return
+        if self._connection is not None:
+            try:
+                self._connection.send(("close",))
+            except OSError:
+                pass
+        self._lose_process()
+        process.join(1.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._process = None
+
+
+class _EngineHost:
+    """The child's side: runs an AudioEngine on the commands from the pipe"""
+
+    def __init__(self, connection: Connection, engine: AudioEngine, status: np.ndarray) -> None:
+        self.connection = connection
+        # Both are dropped once the engine is closed, so the blocks of their arrays can be unmapped
+        self.engine: Optional[AudioEngine] = engine
+        self.status: Optional[np.ndarray] = status
+        self.mapped: Dict[str, Tuple[SharedMemory, np.ndarray]] = {}  # Blocks of the parent, by name
+        self.unmapping: List[SharedMemory] = []  # Blocks released while the mixer may still hold them
+
+    def run(self) -> None:
+        """Handle commands and update the status block until closed or orphaned"""
+        engine, status = self.engine, self.status
+        if engine is None or status is None:
+            return
+        while True:
+            timeout = STATUS_INTERVAL
+            while self.connection.poll(timeout):
+                if not self.handle(self.connection.recv()):
+                    return
+                timeout = 0
+            for voice, tag in engine.poll_finished():
+                self.connection.send(("finished", voice, tag))
+            for voice in range(engine.voices):
+                status[voice] = engine.voice_state(voice)
+            status[engine.voices, 0] = engine.underflows
+            if self.unmapping:
+                self.unmapping = [memory for memory in self.unmapping if not _try_close(memory)]
+
+    def handle(self, message: tuple) -> bool:
+        """Apply a command of the parent
+
+        Returns:
+            False if the parent asked the child to exit
+        """
+        engine = self.engine
+        command = message[0]
+        if engine is None or command == "close":
+            return False
+        if command == "play":
+            _, voice, name, shape, gain, tag = message
+            samples = self.map(name, shape)
+            if samples is not None:
+                engine.play(voice, samples, gain, tag)
+        elif command == "stop":
+            engine.stop(message[1])
+        elif command == "stop_all":
+            engine.stop_all()
+        elif command == "volume":
+            engine.set_volume(message[1])
+        elif command == "release":
+            mapped = self.mapped.pop(message[1], None)
+            if mapped is not None:
+                self.unmapping.append(mapped[0])
+        return True
+
+    def map(self, name: str, shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+        """Get the samples of a block of the parent, mapping it on first use"""
+        mapped = self.mapped.get(name)
+        if mapped is None:
+            try:
+                memory = SharedMemory(name)
+            except FileNotFoundError:
+                # Released by the parent before this play reached us
+                return None
+            mapped = (memory, np.ndarray(shape, dtype=np.float32, buffer=memory.buf))
+            self.mapped[name] = mapped
+        return mapped[1]
+
+    def unmap_all(self) -> None:
+        """Unmap every block, once the engine is closed"""
+        self.unmapping.extend(memory for memory, _ in self.mapped.values())
+        self.mapped.clear()
+        for memory in self.unmapping:
+            _try_close(memory)
+
+
+def _try_close(memory: SharedMemory) -> bool:
+    """Unmap a block, unless arrays still use it
+
+    Returns:
+        True if unmapped
+    """
+    try:
+        memory.close()
+    except BufferError:
+        return False
+    return True
+
+
+def run_engine(connection: Connection, status_name: str, sample_rate: int, channels: int, block_size: int,
+               voices: int, stream_factory: Optional[Callable[..., Any]], volume: float) -> None:
+    """Entry point of the child process
+
+    Opens the output stream, replies "ready" or ("error", message), then
+    serves the parent until it sends "close" or goes away.
+    """
+    # Ctrl+C in a terminal reaches the whole process group; the parent decides when the child exits
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    status_memory = SharedMemory(status_name)
+    status = np.ndarray((voices + 1, STATUS_FIELDS), dtype=np.int64, buffer=status_memory.buf)
+    engine = AudioEngine(sample_rate, channels, block_size, voices, stream_factory)
+    try:
+        engine.start()
+    except Exception as e:
+        connection.send(("error", str(e)))
+        return
+    engine.set_volume(volume)
+    host = _EngineHost(connection, engine, status)
+    connection.send(("ready",))
+    try:
+        host.run()
+    except (EOFError, OSError):
+        # The parent exited without closing us
+        pass
+    finally:
+        engine.close()
+        # Blocks stay mapped while arrays of them live, the mixer's included
+        host.engine = host.status = None
+        del engine, status
+        host.unmap_all()
+        status_memory.close()
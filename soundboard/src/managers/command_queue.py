@@ -0,0 +1,60 @@
+"""Queue of calls into the sound manager from other threads
+
+The sound manager, its model and its signals belong to the thread running
+the Qt event loop. Other threads, like the control server, hand it calls
+through a CommandQueue instead of calling it directly, and wait on the
+returned future for the result.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Optional, Tuple
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+
+class CommandQueue(QObject):
+    """Runs calls on the thread the queue belongs to, in the order they were submitted
+
+    Submitting appends to a deque, which needs no lock, and posts one
+    wakeup event; the owning thread drains every queued call per wakeup, so
+    a burst of calls costs one trip through its event loop.
+    """
+
+    _wakeup = pyqtSignal()
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initialize the queue, owned by the current thread"""
+        super().__init__(parent)
+        self._calls: Deque[Tuple[Future, Callable[..., Any], tuple]] = deque()
+        # Queued even when emitted from the owning thread, so submit() never runs a call itself
+        self._wakeup.connect(self._drain, Qt.ConnectionType.QueuedConnection)  # type: ignore[call-arg]
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        """Queue a call, from any thread
+
+        Args:
+            function: The function to call on the owning thread
+            *args: Its arguments
+
+        Returns:
+            A future holding the result, or the exception raised by the call
+        """
+        future: Future = Future()
+        self._calls.append((future, function, args))
+        self._wakeup.emit()
+        return future
+
+    def pending(self) -> int:
+        """Get the number of calls waiting to run"""
+        return len(self._calls)
+
+    def _drain(self) -> None:
+        """Run every queued call"""
+        while self._calls:
+            future, function, args = self._calls.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
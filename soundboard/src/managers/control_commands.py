@@ -0,0 +1,259 @@
+"""Commands sent by remote controls: the control API and other instances of the application
+
+A command is a JSON object naming its operation, like {"op": "play", "id": "..."}.
+Its result is an object with "ok", and either the fields of the operation or
+an "error". Commands run on the thread owning the sound manager, so callers
+on other threads go through its command queue.
+
+    {"op": "list", "offset": 0, "limit": 100, "sort": "name"}  (a null limit lists them all)
+    {"op": "search", "query": "horn", "limit": 20}
+    {"op": "play", "id": "..."}  or  {"op": "play", "name": "Air Horn"}
+    {"op": "stop"}
+    {"op": "gain", "id": "...", "db": -6}
+    {"op": "volume"}  or  {"op": "volume", "volume": 0.5}
+    {"op": "status"}
+    {"op": "stats", "limit": 10}
+    {"op": "import", "files": ["/path/horn.wav", ...]}
+    {"op": "analysis", "sounds": {"<id>": {"duration": "0:03", "peak_db": -0.1, "rms_db": -14.2}}}
+
+Bulk operations save the library once, however many sounds they change.
+"""
+
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from models.library_columns import UNKNOWN_DURATION, parse_duration_ms
+from models.library_files import new_sound_data
+
+# Sort keys of the list operation
+SORT_KEYS = ("recent", "added", "name", "duration", "category", "play_count")
+
+# Fields of the sound data set by the analysis operation
+ANALYSIS_FIELDS = ("duration", "peak_db", "rms_db")
+
+
+class ControlCommands:
+    """Runs commands against a sound manager"""
+
+    def __init__(self, sound_manager: Any) -> None:
+        """Initialize the operations
+
+        Args:
+            sound_manager: The sound manager the commands control, or an
+                OfflineLibrary for the library commands
+        """
+        self.sound_manager = sound_manager
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "list": self._list, "search": self._search, "play": self._play,
+            "stop": self._stop, "gain": self._gain, "volume": self._volume, "status": self._status,
+            "stats": self._stats, "import": self._import, "analysis": self._analysis,
+        }
+
+    def register(self, op: str, operation: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+        """Add an operation, e.g. one only the application window can run
+
+        Args:
+            op: Name of the operation
+            operation: Called with the command; returns the fields of the
+                result, raising ValueError for invalid commands
+        """
+        self._operations[op] = operation
+
+    def execute(self, commands: List[Any]) -> List[Dict[str, Any]]:
+        """Run commands one after the other, each failing on its own
+
+        Args:
+            commands: The commands
+
+        Returns:
+            The result of each command
+        """
+        results = []
+        for command in commands:
+            try:
+                if not isinstance(command, dict):
+                    raise ValueError("A command must be an object")
+                op = command.get("op")
+                operation = self._operations.get(op) if isinstance(op, str) else None
+                if operation is None:
+                    raise ValueError(f"Unknown operation: {op}")
+                result: Dict[str, Any] = {"ok": True}
+                result.update(operation(command))
+            except (ValueError, TypeError) as e:
+                result = {"ok": False, "error": str(e)}
+            except Exception as e:
+                print(f"Error running control command {command}: {e}")
+                result = {"ok": False, "error": "Internal error"}
+            results.append(result)
+        return results
+
+    def describe(self, sound_id: str) -> Dict[str, Any]:
+        """Get the fields of a sound a client needs to show and play it"""
+        sound_data = self.sound_manager.get_sound(sound_id) or {}
+        return {
+            "id": sound_id,
+            "title": sound_data.get("title", "Untitled"),
+            "category": sound_data.get("category"),
+            "duration": sound_data.get("duration"),
+            "favorite": self.sound_manager.is_favorite(sound_id),
+            "hotkey": sound_data.get("hotkey"),
+            "gain_db": sound_data.get("gain_db", 0.0),
+            "file_path": sound_data.get("file_path"),
+        }
+
+    def find_sound(self, command: Dict[str, Any]) -> str:
+        """Get the sound a command names, by its "id" or else its "name"
+
+        A name matches the title of a sound regardless of case, or failing
+        that, the best search result for it.
+
+        Raises:
+            ValueError: If no sound matches
+        """
+        sound_id = command.get("id")
+        if sound_id is not None:
+            if not isinstance(sound_id, str) or self.sound_manager.get_sound(sound_id) is None:
+                raise ValueError(f"Unknown sound: {sound_id}")
+            return sound_id
+        name = command.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Expected the id or the name of a sound")
+        matches: List[str] = self.sound_manager.search_sounds(name, 20)
+        for match in matches:
+            if (self.sound_manager.get_sound(match) or {}).get("title", "").lower() == name.lower():
+                return match
+        if not matches:
+            raise ValueError(f"No sound named {name}")
+        return matches[0]
+
+    def _list(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """List a page of the library, in a sort order"""
+        offset = int_argument(command, "offset", 0) or 0
+        limit = int_argument(command, "limit", 100)
+        sort_by = command.get("sort", "name")
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        sound_ids = self.sound_manager.get_sorted_sound_ids(sort_by)
+        end = None if limit is None else offset + limit
+        return {
+            "total": len(sound_ids),
+            "sounds": [self.describe(sound_id) for sound_id in sound_ids[offset:end]],
+        }
+
+    def _search(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Search the library, best match first"""
+        query = command.get("query")
+        if not isinstance(query, str):
+            raise ValueError("query must be a string")
+        limit = int_argument(command, "limit", 20)
+        sound_ids = self.sound_manager.search_sounds(query, limit)
+        return {"sounds": [self.describe(sound_id) for sound_id in sound_ids]}
+
+    def _play(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Play a sound
+
+        Raises:
+            ValueError: If the sound could not be decoded or played
+        """
+        sound_id = self.find_sound(command)
+        if not self.sound_manager.play_sound(sound_id):
+            title = (self.sound_manager.get_sound(sound_id) or {}).get("title", sound_id)
+            raise ValueError(f"Could not play {title}")
+        return {"id": sound_id, "played": True}
+
+    def _stop(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Stop the sound playing"""
+        self.sound_manager.stop_sound()
+        return {}
+
+    def _gain(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Set the gain of a sound, in decibels"""
+        gain_db = command.get("db")
+        if isinstance(gain_db, bool) or not isinstance(gain_db, (int, float)):
+            raise ValueError("db must be a number")
+        sound_id = self.find_sound(command)
+        return {"id": sound_id, "gain_db": self.sound_manager.set_gain(sound_id, gain_db)}
+
+    def _volume(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the volume, or set it when the command has one"""
+        if command.get("volume") is not None:
+            volume = command["volume"]
+            if isinstance(volume, bool) or not isinstance(volume, (int, float)):
+                raise ValueError("volume must be a number from 0.0 to 1.0")
+            self.sound_manager.set_volume(volume)
+        return {"volume": self.sound_manager.get_volume()}
+
+    def _status(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe what is playing and the library"""
+        loaded, _ = self.sound_manager.loading_progress()
+        return {
+            "playing": self.sound_manager.current_playing,
+            "volume": self.sound_manager.get_volume(),
+            "bank": self.sound_manager.get_active_bank_id(),
+            "loading": self.sound_manager.is_loading(),
+            "sounds": loaded,
+        }
+
+    def _stats(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize the library, with its most played sounds"""
+        limit = int_argument(command, "limit", 10)
+        sounds = self.sound_manager.get_all_sounds()
+        durations = [parse_duration_ms(sound_data.get("duration")) for sound_data in sounds.values()]
+        return {
+            "sounds": len(sounds),
+            "favorites": self.sound_manager.get_facet_counts("favorite").get(True, 0),
+            "missing_files": self.sound_manager.get_facet_counts("missing_file").get(True, 0),
+            "unmeasured": durations.count(UNKNOWN_DURATION),
+            "total_duration_s": sum(ms for ms in durations if ms != UNKNOWN_DURATION) / 1000,
+            "plays": sum(int(sound_data.get("play_count") or 0) for sound_data in sounds.values()),
+            "folders": len(self.sound_manager.get_folders(recursive=True)),
+            "banks": len(self.sound_manager.get_banks()),
+            "most_played": [
+                dict(self.describe(sound_id), play_count=sounds[sound_id].get("play_count", 0))
+                for sound_id in self.sound_manager.get_most_played_sound_ids(limit)
+            ],
+        }
+
+    def _import(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Add sound files, leaving out those already in the library"""
+        files = command.get("files")
+        if not isinstance(files, list) or not all(isinstance(file_path, str) for file_path in files):
+            raise ValueError("files must be a list of paths")
+        known = {sound_data.get("file_path") for sound_data in self.sound_manager.get_all_sounds().values()}
+        sounds = {}
+        for file_path in files:
+            if file_path not in known:
+                known.add(file_path)
+                sounds[str(uuid.uuid4())] = new_sound_data(file_path)
+        if sounds:
+            self.sound_manager.add_sounds(sounds)
+        return {"added": len(sounds), "skipped": len(files) - len(sounds)}
+
+    def _analysis(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the measurements of sounds, as made by models.library_files.analyze_file"""
+        measured = command.get("sounds")
+        if not isinstance(measured, dict) or not all(isinstance(fields, dict) for fields in measured.values()):
+            raise ValueError("sounds must map sound IDs to their measurements")
+        changes = {
+            sound_id: {name: value for name, value in fields.items() if name in ANALYSIS_FIELDS}
+            for sound_id, fields in measured.items()
+        }
+        return {"updated": len(self.sound_manager.update_sounds(changes))}
+
+
+def int_argument(command: Dict[str, Any], name: str, default: Optional[int]) -> Optional[int]:
+    """Get a non-negative integer argument of a command, given as a number or a string
+
+    Raises:
+        ValueError: If the argument is not a non-negative integer
+    """
+    value = command.get(name, default)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value
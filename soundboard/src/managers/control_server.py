@@ -0,0 +1,536 @@
+"""Local control API, for stream decks, chat bots and automation scripts
+
+An HTTP and WebSocket server on the loopback interface, run by an asyncio
+event loop on a thread of its own. It never touches the sound manager
+directly: every request becomes one call through the sound manager's
+command queue, however many commands it batches, and waits for its result.
+
+HTTP routes, answering JSON:
+
+    GET  /status                    what is playing, the volume and the library size
+    GET  /sounds?offset=&limit=&sort=
+    GET  /search?q=&limit=
+    POST /sounds/<id>/play
+    PUT  /sounds/<id>/gain          {"db": -6}
+    POST /stop
+    GET  /volume
+    PUT  /volume                    {"volume": 0.5}
+    POST /commands                  a command, or a list of commands run as a batch
+    GET  /events                    WebSocket upgrade
+
+A command is an object like {"op": "play", "id": "..."}, run by
+ControlCommands. Every response carries latency_ms, the time from the
+request being read to its result being ready, and HTTP responses a
+Server-Timing header with the same value.
+
+The WebSocket at /events streams play state changes and, while a sound
+plays, its meter levels. Commands sent over it, alone or as a list, are
+answered with a "result" message echoing their "ref".
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from managers.control_commands import ControlCommands
+
+if TYPE_CHECKING:
+    from managers.sound_manager import SoundManager
+
+DEFAULT_PORT = 8710
+
+# Names the server answers to; anything else may be a DNS rebinding attack
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Largest request body or WebSocket message accepted
+MAX_MESSAGE_SIZE = 1 << 20
+
+# Most header lines of a request
+MAX_HEADER_LINES = 100
+
+# Largest payload of a WebSocket control frame, per RFC 6455
+MAX_CONTROL_PAYLOAD = 125
+
+# Most commands in a batch
+MAX_BATCH_COMMANDS = 1000
+
+# Seconds to wait for the sound manager before answering 503
+COMMAND_TIMEOUT = 5.0
+
+# Seconds between meter events while a sound plays
+METER_INTERVAL = 0.05
+
+# Events queued for a WebSocket client that reads too slowly, before it is dropped
+MAX_QUEUED_EVENTS = 256
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+HTTP_REASONS = {
+    101: "Switching Protocols", 200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """A request that cannot be answered, with the status to answer it with"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ControlServer:
+    """Serves the control API of a sound manager
+
+    Start and stop it from the thread owning the sound manager.
+    """
+
+    def __init__(self, sound_manager: "SoundManager", port: int = DEFAULT_PORT,
+                 allowed_origins: Iterable[str] = ()):
+        """Initialize the server
+
+        Args:
+            sound_manager: The sound manager to control
+            port: TCP port on the loopback interface, or 0 for any free port
+            allowed_origins: Origins of web pages allowed to call the API
+                besides local ones, e.g. "https://deck.example.com"
+        """
+        self.sound_manager = sound_manager
+        self.port = port
+        self.allowed_origins = set(allowed_origins)
+        self.operations = ControlCommands(sound_manager)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._start_error: Optional[Exception] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._subscribers: Set[asyncio.Queue] = set()  # Event queues of the WebSocket clients
+        self._signals = [
+            (sound_manager.sound_played, lambda sound_id: self._post_event({"type": "played", "id": sound_id})),
+            (sound_manager.sound_stopped, lambda sound_id: self._post_event({"type": "stopped", "id": sound_id})),
+            (sound_manager.volume_changed, lambda volume: self._post_event({"type": "volume", "volume": volume})),
+            (sound_manager.bank_switched, lambda bank_id: self._post_event({"type": "bank", "id": bank_id})),
+        ]
+
+    def is_running(self) -> bool:
+        """Check whether the server is listening"""
+        return self._thread is not None
+
+    def start(self) -> bool:
+        """Start listening
+
+        Returns:
+            True if listening, False if the port cannot be bound
+        """
+        if self._thread is not None:
+            return True
+        self._ready.clear()
+        self._start_error = None
+        self._thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            print(f"Control server unavailable: {self._start_error}")
+            self._thread.join()
+            self._thread = None
+            return False
+        for signal, slot in self._signals:
+            signal.connect(slot)
+        return True
+
+    def stop(self) -> None:
+        """Stop listening, closing every connection"""
+        if self._thread is None:
+            return
+        for signal, slot in self._signals:
+            signal.disconnect(slot)
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None:
+            loop.call_soon_threadsafe(stopping.set)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Run the event loop of the server thread until stopped"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        """Accept connections until stopped"""
+        self._stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle_connection, "127.0.0.1", self.port)
+        except OSError as e:
+            self._start_error = e
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        meter_task = asyncio.ensure_future(self._send_meters())
+        self._ready.set()
+
+        await self._stopping.wait()
+        server.close()
+        meter_task.cancel()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(meter_task, *self._connections, return_exceptions=True)
+        await server.wait_closed()
+
+    # Requests, on the server thread
+
+    async def _run_commands(self, commands: List[Any]) -> List[Dict[str, Any]]:
+        """Run commands on the thread owning the sound manager, as one call"""
+        if len(commands) > MAX_BATCH_COMMANDS:
+            raise HttpError(413, f"More than {MAX_BATCH_COMMANDS} commands in a batch")
+        future = self.sound_manager.commands.submit(self.operations.execute, commands)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), COMMAND_TIMEOUT)
+        except (asyncio.TimeoutError, FutureTimeoutError):
+            future.cancel()
+            raise HttpError(503, "The soundboard is busy")
+
+    async def _answer(self, payload: Any, started: float) -> Dict[str, Any]:
+        """Run a command, or a list of them as a batch, and time it"""
+        if isinstance(payload, list):
+            response: Dict[str, Any] = {"results": await self._run_commands(payload)}
+        else:
+            response = (await self._run_commands([payload]))[0]
+        response["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of a connection, until it closes or upgrades to a WebSocket"""
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"ok": False, "error": str(e)}, None, False)
+                    return
+                if request is None:
+                    return
+                method, path, query, headers, body = request
+                started = time.perf_counter()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    self._check_origin(headers)
+                    if path == "/events":
+                        await self._serve_websocket(reader, writer, headers)
+                        return
+                    payload = self._route(method, path, query, body)
+                    response = await self._answer(payload, started)
+                    status = 200 if "results" in response or response["ok"] else 400
+                except HttpError as e:
+                    status, response = e.status, {"ok": False, "error": str(e)}
+                await self._respond(writer, status, response, started, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    def _check_origin(self, headers: Dict[str, str]) -> None:
+        """Refuse requests of web pages of other sites, and to other host names"""
+        host = headers.get("host", "")
+        host = host[1:].split("]")[0] if host.startswith("[") else host.split(":")[0]
+        if host not in LOCAL_HOSTS:
+            raise HttpError(403, f"Unexpected host: {host}")
+        origin = headers.get("origin")
+        if origin is not None and origin not in self.allowed_origins and urlsplit(origin).hostname not in LOCAL_HOSTS:
+            raise HttpError(403, f"Origin not allowed: {origin}")
+
+    def _route(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Any:
+        """Turn a request into a command, or a list of commands"""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["status"] and method == "GET":
+            return {"op": "status"}
+        if parts == ["sounds"] and method == "GET":
+            return {"op": "list", **{key: query[key] for key in ("offset", "limit", "sort") if key in query}}
+        if parts == ["search"] and method == "GET":
+            return {"op": "search", "query": query.get("q", ""), **({"limit": query["limit"]} if "limit" in query else {})}
+        if len(parts) == 3 and parts[0] == "sounds" and parts[2] == "play" and method == "POST":
+            return {"op": "play", "id": parts[1]}
+        if len(parts) == 3 and parts[0] == "sounds" and parts[2] == "gain" and method in ("PUT", "POST"):
+            gain = _parse_json(body)
+            return {"op": "gain", "id": parts[1], "db": gain.get("db") if isinstance(gain, dict) else gain}
+        if parts == ["stop"] and method == "POST":
+            return {"op": "stop"}
+        if parts == ["volume"] and method == "GET":
+            return {"op": "volume"}
+        if parts == ["volume"] and method in ("PUT", "POST"):
+            volume = _parse_json(body)
+            return {"op": "volume", "volume": volume.get("volume") if isinstance(volume, dict) else volume}
+        if parts == ["commands"] and method == "POST":
+            return _parse_json(body)
+        if parts[0] in ("status", "sounds", "search", "stop", "volume", "commands"):
+            raise HttpError(405, f"{method} not allowed on {path}")
+        raise HttpError(404, f"No such resource: {path}")
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, response: Dict[str, Any],
+                       started: Optional[float], keep_alive: bool) -> None:
+        """Write a JSON response"""
+        body = json.dumps(response).encode()
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if started is not None:
+            headers.append(f"Server-Timing: control;dur={(time.perf_counter() - started) * 1000:.3f}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # WebSocket
+
+    async def _serve_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                               headers: Dict[str, str]) -> None:
+        """Stream events to a WebSocket client and answer its commands"""
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            raise HttpError(400, "Expected a WebSocket upgrade")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode("latin-1"))
+
+        events: asyncio.Queue = asyncio.Queue(MAX_QUEUED_EVENTS)
+        self._subscribers.add(events)
+        sender = asyncio.ensure_future(self._send_events(writer, events))
+        frames = FrameReader(reader)
+        try:
+            while not sender.done():
+                opcode, payload = await frames.read()
+                if opcode == 0x8:
+                    await events.put((0x8, payload[:2]))
+                    break
+                if opcode == 0x9:
+                    await events.put((0xA, payload))
+                elif opcode in (0x1, 0x2):
+                    started = time.perf_counter()
+                    try:
+                        message = json.loads(payload)
+                        ref = message.get("ref") if isinstance(message, dict) else None
+                        response = await self._answer(message, started)
+                    except (ValueError, HttpError) as e:
+                        ref, response = None, {"ok": False, "error": str(e)}
+                    await events.put((0x1, {"type": "result", "ref": ref, **response}))
+        except HttpError as e:
+            await events.put((0x8, struct.pack("!H", 1009 if e.status == 413 else 1002)))
+        finally:
+            self._subscribers.discard(events)
+            if not sender.done():
+                try:
+                    events.put_nowait(None)
+                except asyncio.QueueFull:
+                    sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+
+    async def _send_events(self, writer: asyncio.StreamWriter, events: asyncio.Queue) -> None:
+        """Write the frames queued for a WebSocket client, until None or a close frame"""
+        while True:
+            item = await events.get()
+            if item is None:
+                return
+            opcode, payload = item
+            if opcode == 0x1:
+                payload = json.dumps(payload).encode()
+            writer.write(_encode_frame(opcode, payload))
+            await writer.drain()
+            if opcode == 0x8:
+                return
+
+    def _post_event(self, event: Dict[str, Any]) -> None:
+        """Send an event to every WebSocket client, from any thread"""
+        loop = self._loop
+        if loop is not None and self._subscribers:
+            try:
+                loop.call_soon_threadsafe(self._broadcast, event)
+            except RuntimeError:
+                # The loop closed while stopping
+                pass
+
+    def _broadcast(self, event: Dict[str, Any]) -> None:
+        """Queue an event for every WebSocket client, dropping clients too slow to keep up"""
+        for events in list(self._subscribers):
+            try:
+                events.put_nowait((0x1, event))
+            except asyncio.QueueFull:
+                self._subscribers.discard(events)
+                # Make room for the close frame, which ends the client's sender
+                events.get_nowait()
+                events.put_nowait((0x8, struct.pack("!H", 1008)))
+
+    async def _send_meters(self) -> None:
+        """Broadcast the levels of the sound playing, while any client listens"""
+        audio_player = self.sound_manager.audio_player
+        was_playing = False
+        while True:
+            await asyncio.sleep(METER_INTERVAL)
+            if not self._subscribers:
+                continue
+            levels = audio_player.levels(METER_INTERVAL)
+            if levels is None and not was_playing:
+                continue
+            peak, rms = levels if levels is not None else (0.0, 0.0)
+            self._broadcast({"type": "meter", "id": audio_player.current_playing,
+                             "peak": round(peak, 4), "rms": round(rms, 4)})
+            was_playing = levels is not None
+
+
+def _parse_json(body: bytes) -> Any:
+    """Parse a JSON request body"""
+    try:
+        return json.loads(body or b"null")
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON: {e}")
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], Dict[str, str], bytes]]:
+    """Read an HTTP request
+
+    Returns:
+        The method, path, query parameters, headers with lower case names,
+        and body, or None if the connection closed before a request
+    """
+    line = await _read_line(reader, 400, "Request line too long")
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Invalid request line")
+    headers = {}
+    for _ in range(MAX_HEADER_LINES + 1):
+        line = await _read_line(reader, 431, "Header line too long")
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(431, f"More than {MAX_HEADER_LINES} header lines")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_MESSAGE_SIZE:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return method.upper(), url.path, query, headers, body
+
+
+async def _read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """Read a line of a request, raising HttpError with the given status if it is over the reader's limit"""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # The stream's LimitOverrunError, which readline() turns into a ValueError
+        raise HttpError(status, message)
+
+
+class FrameReader:
+    """Reads the WebSocket messages of a client, joining their fragments
+
+    A fragmented message is kept across the control frames a client may
+    send between its fragments, like a ping.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader):
+        """Initialize the reader
+
+        Args:
+            reader: The stream of the connection, past the upgrade request
+        """
+        self.reader = reader
+        self._opcode: Optional[int] = None  # Opcode of the message being received, None between messages
+        self._fragments: List[bytes] = []
+        self._size = 0
+
+    async def read(self) -> Tuple[int, bytes]:
+        """Read the next control frame or whole message
+
+        Returns:
+            The opcode and the unmasked payload
+
+        Raises:
+            HttpError: 413 if the message is too large, 400 if the client
+                breaks the protocol
+        """
+        while True:
+            first, second = await self.reader.readexactly(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            final = bool(first & 0x80)
+            if not second & 0x80:
+                raise HttpError(400, "Client frames must be masked")
+            if length == 126:
+                length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+
+            if opcode >= 0x8:
+                if not final or length > MAX_CONTROL_PAYLOAD:
+                    raise HttpError(400, "Invalid control frame")
+                return opcode, await self._read_payload(length)
+            if opcode == 0x0:
+                if self._opcode is None:
+                    raise HttpError(400, "Continuation frame without a message")
+            elif self._opcode is not None:
+                raise HttpError(400, "New message before the last one ended")
+            else:
+                self._opcode = opcode
+            self._size += length
+            if self._size > MAX_MESSAGE_SIZE:
+                raise HttpError(413, "Message too large")
+            self._fragments.append(await self._read_payload(length))
+            if final:
+                message = self._opcode, b"".join(self._fragments)
+                self._opcode, self._fragments, self._size = None, [], 0
+                return message
+
+    async def _read_payload(self, length: int) -> bytes:
+        """Read the mask and payload of a frame, unmasked"""
+        mask = await self.reader.readexactly(4)
+        return _unmask(await self.reader.readexactly(length), mask)
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    """Unmask a client frame, XORing it with its mask as one big integer"""
+    if not payload:
+        return payload
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+def _encode_frame(opcode: int, payload: bytes) -> bytes:
+    """Encode an unfragmented, unmasked server frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
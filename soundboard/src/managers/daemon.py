@@ -0,0 +1,69 @@
+"""Headless soundboard, for servers and stream boxes
+
+Runs the library, the audio player, the hotkeys and the remote controls on a
+QCoreApplication event loop, without a window: neither QtWidgets nor QtGui
+is imported, which saves most of the memory and startup time of the GUI.
+"""
+
+import argparse
+import signal
+from typing import Any, Dict, List
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+from managers.remote_controls import RemoteControls
+from managers.services import services
+from managers.single_instance import InstanceLock
+from managers.startup_profile import startup_profile
+
+startup_profile.mark("imports")
+
+# Milliseconds between the slices of time given to Python signal handlers
+SIGNAL_CHECK_INTERVAL = 250
+
+
+def run(options: argparse.Namespace, argv: List[str], lock: InstanceLock, commands: List[Dict[str, Any]]) -> int:
+    """Run the soundboard until interrupted or terminated
+
+    Args:
+        options: The parsed options of the application
+        argv: The command line left to Qt
+        lock: The instance lock, held; released on exit
+        commands: Commands of the command line, run once the library is loaded
+
+    Returns:
+        The exit code
+    """
+    app = QCoreApplication(argv)
+    services.audio_process = options.audio_process
+    # Reads the library and sets up the audio player, marking both phases
+    sound_manager = services.sound_manager
+    remote_controls = RemoteControls(sound_manager, lock, options.control_port, options.osc_port, options.osc_host)
+    remote_controls.operations.register("show", _show_window)
+
+    # Qt's event loop holds the interpreter, so Python only handles signals when a timer hands it control
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: app.quit())
+    signal_timer = QTimer()
+    signal_timer.timeout.connect(lambda: None)
+    signal_timer.start(SIGNAL_CHECK_INTERVAL)
+
+    def on_started() -> None:
+        startup_profile.mark("interactive")
+        startup_profile.print_report()
+        sound_manager.start_hotkeys()
+        remote_controls.start()
+        print(f"Soundboard running headless, instance channel on port {remote_controls.ipc_server.port}",
+              flush=True)
+
+    QTimer.singleShot(0, on_started)
+    remote_controls.run_when_loaded(commands)
+    exit_code = app.exec()
+    remote_controls.stop()
+    sound_manager.flush()
+    sound_manager.audio_player.close()
+    return exit_code
+
+
+def _show_window(command: Dict[str, Any]) -> Dict[str, Any]:
+    """There is no window to show"""
+    raise ValueError("The running soundboard is headless and has no window")
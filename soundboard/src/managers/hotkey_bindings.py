@@ -0,0 +1,294 @@
+"""Hotkey names and the trie matching key events against bindings
+
+A binding is a sequence of chords written like "Ctrl+K, 3": each chord is
+any number of modifiers and one other key, joined by "+", and the chords of
+a sequence are pressed one after the other, separated by ", ".
+"""
+
+import time
+from functools import lru_cache
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+# Modifier keys, in the order they are written in a chord
+MODIFIERS = ("ctrl", "alt", "shift", "windows")
+
+# Other names of keys, mapped to the names the keyboard package reports
+KEY_ALIASES = {
+    "control": "ctrl",
+    "option": "alt",
+    "altgr": "alt",
+    "alt gr": "alt",
+    "win": "windows",
+    "meta": "windows",
+    "super": "windows",
+    "cmd": "windows",
+    "command": "windows",
+    "return": "enter",
+    "escape": "esc",
+    "del": "delete",
+    "ins": "insert",
+    "pgup": "page up",
+    "pgdown": "page down",
+    "pageup": "page up",
+    "pagedown": "page down",
+    "spacebar": "space",
+    # Written by name, as they separate the chords and keys of a hotkey
+    ",": "comma",
+    "+": "plus",
+}
+
+# Seconds allowed between the chords of a sequence
+SEQUENCE_TIMEOUT = 1.0
+
+
+@lru_cache(maxsize=1024)
+def normalize_key(name: str) -> str:
+    """Get the canonical name of a key, e.g. "Left Ctrl" -> "ctrl"
+
+    Args:
+        name: Key name as written by a user or reported by the keyboard package
+    """
+    name = name.strip().lower()
+    for side in ("left ", "right "):
+        if name.startswith(side):
+            unsided = KEY_ALIASES.get(name[len(side):], name[len(side):])
+            if unsided in MODIFIERS:
+                return unsided
+    return KEY_ALIASES.get(name, name)
+
+
+def chord_of(modifiers: Collection[str], key: str) -> str:
+    """Get the canonical chord of a key pressed with some modifiers
+
+    Args:
+        modifiers: Canonical names of the modifiers held, in any order
+        key: Canonical name of the key
+    """
+    return "+".join([modifier for modifier in MODIFIERS if modifier in modifiers] + [key])
+
+
+def normalize_hotkey(hotkey: str) -> Optional[str]:
+    """Get the canonical form of a chord, e.g. "Shift+Ctrl+F1" -> "ctrl+shift+f1"
+
+    Args:
+        hotkey: Modifiers and one other key, joined by "+"
+
+    Returns:
+        The chord with canonical key names and its modifiers in a fixed
+        order, or None if it is not exactly one key with optional modifiers
+    """
+    keys = [normalize_key(key) for key in hotkey.split("+")]
+    others = [key for key in keys if key not in MODIFIERS]
+    if len(others) != 1 or not others[0]:
+        return None
+    return chord_of(keys, others[0])
+
+
+def normalize_sequence(sequence: str) -> Optional[str]:
+    """Get the canonical form of a hotkey sequence, e.g. "Control+k,3" -> "ctrl+k, 3"
+
+    Args:
+        sequence: One or more chords separated by commas
+
+    Returns:
+        The canonical chords separated by ", ", or None if any chord is invalid
+    """
+    chords = []
+    for chord in sequence.split(","):
+        canonical = normalize_hotkey(chord)
+        if canonical is None:
+            return None
+        chords.append(canonical)
+    return ", ".join(chords)
+
+
+def format_hotkey(sequence: str) -> str:
+    """Format a canonical hotkey sequence for display, e.g. "ctrl+k, page up" -> "Ctrl+K, Page Up" """
+    return ", ".join(
+        "+".join(key.title() if len(key) > 1 else key.upper() for key in chord.split("+"))
+        for chord in sequence.split(", ")
+    )
+
+
+class _Node:
+    """State of the matcher: the chords pressed so far"""
+
+    __slots__ = ("children", "target")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}  # canonical chord -> next state
+        self.target: Any = None  # What the sequence ending here triggers
+
+    def copy(self) -> "_Node":
+        """Get a copy of the subtree starting here"""
+        node = _Node()
+        node.target = self.target
+        node.children = {chord: child.copy() for chord, child in self.children.items()}
+        return node
+
+
+class HotkeyTrie:
+    """Bindings compiled into a trie of chords
+
+    Matching a key event is one dictionary lookup whatever the number of
+    bindings. As no binding may be a prefix of another, a sequence is
+    complete as soon as it reaches a node with a target, so a hotkey never
+    waits to see whether a longer one follows.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty trie"""
+        self.root = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def copy(self) -> "HotkeyTrie":
+        """Get an independent copy, e.g. to add the bindings of a layout to"""
+        trie = HotkeyTrie()
+        trie.root = self.root.copy()
+        trie._count = self._count
+        return trie
+
+    def add(self, sequence: str, target: Any) -> Any:
+        """Bind a sequence, unless it conflicts with an existing binding
+
+        Args:
+            sequence: The hotkey sequence, in any form normalize_sequence() accepts
+            target: What the sequence triggers, e.g. a sound ID; never None
+
+        Returns:
+            None if bound, or the target of a conflicting binding; a
+            sequence conflicts with a binding of the same sequence and with
+            bindings it starts with or that start with it
+        """
+        canonical = normalize_sequence(sequence)
+        if canonical is None:
+            raise ValueError(f"Invalid hotkey: {sequence}")
+        chords = canonical.split(", ")
+        conflict = self._find_conflict(chords, None)
+        if conflict is not None:
+            return conflict
+
+        node = self.root
+        for chord in chords:
+            node = node.children.setdefault(chord, _Node())
+        if node.target is None:
+            self._count += 1
+        node.target = target
+        return None
+
+    def find_conflict(self, sequence: str, ignore: Any = None) -> Any:
+        """Find a binding a sequence would conflict with
+
+        Args:
+            sequence: The hotkey sequence, in any form normalize_sequence() accepts
+            ignore: Target whose bindings do not count, e.g. the sound being rebound
+
+        Returns:
+            The target of a conflicting binding, or None
+        """
+        canonical = normalize_sequence(sequence)
+        if canonical is None:
+            return None
+        return self._find_conflict(canonical.split(", "), ignore)
+
+    def _find_conflict(self, chords: List[str], ignore: Any) -> Any:
+        """Find a binding the sequence of canonical chords would conflict with"""
+        node = self.root
+        for chord in chords:
+            child = node.children.get(chord)
+            if child is None:
+                return None
+            node = child
+            if node.target is not None and node.target != ignore:
+                return node.target
+        # Bindings starting with the whole sequence
+        for _, target in self._iter_bindings(node, []):
+            if target != ignore:
+                return target
+        return None
+
+    def lookup(self, sequence: str) -> Any:
+        """Get the target bound to a sequence, or None"""
+        canonical = normalize_sequence(sequence)
+        if canonical is None:
+            return None
+        node = self.root
+        for chord in canonical.split(", "):
+            child = node.children.get(chord)
+            if child is None:
+                return None
+            node = child
+        return node.target
+
+    def bindings(self) -> List[Tuple[str, Any]]:
+        """Get every (canonical sequence, target) pair"""
+        return list(self._iter_bindings(self.root, []))
+
+    def _iter_bindings(self, node: _Node, chords: List[str]) -> Iterator[Tuple[str, Any]]:
+        """Iterate over the bindings at and below a node"""
+        if node.target is not None:
+            yield ", ".join(chords), node.target
+        for chord, child in node.children.items():
+            yield from self._iter_bindings(child, chords + [chord])
+
+
+class HotkeyMatcher:
+    """Follows key presses through a HotkeyTrie
+
+    Not thread-safe: one matcher belongs to the thread delivering the key
+    events. The trie can be replaced from another thread with set_trie(),
+    which the matcher picks up on the next key.
+    """
+
+    def __init__(self, trie: Optional[HotkeyTrie] = None, timeout: float = SEQUENCE_TIMEOUT):
+        """Initialize the matcher
+
+        Args:
+            trie: The bindings to match, or None for none
+            timeout: Seconds allowed between the chords of a sequence
+        """
+        self.trie = trie or HotkeyTrie()
+        self.timeout = timeout
+        self._node: Optional[_Node] = None  # End of the partial sequence
+        self._node_trie: Optional[HotkeyTrie] = None  # Trie the partial sequence is in
+        self._deadline = 0.0
+
+    def set_trie(self, trie: HotkeyTrie) -> None:
+        """Match another set of bindings, dropping any partial sequence"""
+        self.trie = trie
+
+    def press(self, chord: str, now: Optional[float] = None) -> Any:
+        """Advance by a chord
+
+        A chord that does not continue the partial sequence, or that comes
+        after the timeout, starts over from the first chord of a sequence.
+
+        Args:
+            chord: The canonical chord pressed
+            now: time.monotonic() of the press, or None for now
+
+        Returns:
+            The target of the sequence the chord completes, or None
+        """
+        if now is None:
+            now = time.monotonic()
+        trie = self.trie
+        partial = self._node
+        node: Optional[_Node] = None
+        if partial is not None and self._node_trie is trie and now <= self._deadline:
+            node = partial.children.get(chord)
+        if node is None:
+            node = trie.root.children.get(chord)
+        if node is not None and node.target is None:
+            self._node, self._node_trie = node, trie
+            self._deadline = now + self.timeout
+            return None
+        self._node = self._node_trie = None
+        return node.target if node is not None else None
+
+    def reset(self) -> None:
+        """Drop any partial sequence"""
+        self._node = self._node_trie = None
@@ -0,0 +1,257 @@
+"""Global hotkeys for the soundboard application
+
+Key events arrive on the listener thread of the `keyboard` package, which is
+imported on first use: it hooks the operating system's input as soon as it
+is imported, and needs extra permissions on some platforms. A matched hotkey
+is handed to a dispatch thread of its own, which starts the sound right
+away; the GUI thread only hears about it afterwards, through a queued
+signal, so a busy or stalled GUI never delays a sound.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from managers.hotkey_bindings import MODIFIERS, SEQUENCE_TIMEOUT, HotkeyMatcher, HotkeyTrie, chord_of, normalize_key
+
+# Kinds of hotkey targets, bound as (kind, ID) pairs
+PLAY_SOUND = "sound"
+SWITCH_BANK = "bank"
+
+
+class HotkeyManager(QObject):
+    """Listens for global hotkeys and plays the sounds bound to them
+
+    The keyboard hook only advances a HotkeyMatcher by the chord pressed
+    and queues a completed match, so it never holds up the input of other
+    applications, however many bindings there are. The dispatch thread runs
+    the play callback, then posts hotkey_triggered to the GUI thread.
+
+    Global bindings and bank switches work whatever bank is active, the
+    layout of a bank only while it is. Each bank gets a trie of its own,
+    compiled ahead of time, so switching banks, from the hook itself when
+    a switch hotkey is pressed, is a single assignment: the very next key
+    is matched against the new layout. Tries are swapped in whole, so the
+    threads never see a partial update and need no lock.
+    """
+
+    # Define signals
+    hotkey_triggered = pyqtSignal(str, bool)  # sound_id, whether the play callback handled it
+    bank_triggered = pyqtSignal(str)  # bank_id switched to by its hotkey
+
+    def __init__(self, play_callback: Callable[[str], bool],
+                 bank_callback: Optional[Callable[[str], None]] = None, timeout: float = SEQUENCE_TIMEOUT):
+        """Initialize the hotkey manager
+
+        Args:
+            play_callback: Plays a sound, called on the dispatch thread with
+                its ID; returns False to leave the sound to the GUI thread
+            bank_callback: Prepares a bank switched to by its hotkey, called
+                on the dispatch thread with its ID, or None
+            timeout: Seconds allowed between the chords of a sequence
+        """
+        super().__init__()
+        self.play_callback = play_callback
+        self.bank_callback = bank_callback
+        self._matcher = HotkeyMatcher(timeout=timeout)  # Advanced by the listener thread only
+        self._tries: Dict[Optional[str], HotkeyTrie] = {None: self._matcher.trie}  # bank ID -> layout
+        self._active_bank: Optional[str] = None
+        self._held: Set[str] = set()  # Keys down, seen by the listener thread only
+        self._commands: Deque[Tuple[str, str]] = deque()  # Targets to run; appends and pops are atomic
+        self._wakeup = threading.Event()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._hook = None
+        self._keyboard = None
+
+    def set_bindings(self, bindings: Dict[str, str]) -> HotkeyTrie:
+        """Replace every binding with global bindings only
+
+        Args:
+            bindings: Dictionary of hotkey sequence -> sound ID
+
+        Returns:
+            The trie the bindings were compiled into
+        """
+        return self.set_layouts(bindings)
+
+    def set_layouts(self, bindings: Dict[str, str], bank_layouts: Optional[Dict[str, Dict[str, str]]] = None,
+                    bank_hotkeys: Optional[Dict[str, str]] = None, active_bank: Optional[str] = None) -> HotkeyTrie:
+        """Replace every binding
+
+        Invalid hotkeys, and hotkeys conflicting with one bound before
+        them, are skipped: bank switches come first, then global bindings,
+        then the layouts of the banks.
+
+        Args:
+            bindings: Dictionary of hotkey sequence -> sound ID, for every bank
+            bank_layouts: Dictionary of bank ID -> its own bindings
+            bank_hotkeys: Dictionary of hotkey sequence -> ID of the bank it switches to
+            active_bank: ID of the bank whose layout to use, or None
+
+        Returns:
+            The trie of the active bank
+        """
+        common = HotkeyTrie()
+        self._bind(common, ((hotkey, (SWITCH_BANK, bank_id)) for hotkey, bank_id in (bank_hotkeys or {}).items()))
+        self._bind(common, ((hotkey, (PLAY_SOUND, sound_id)) for hotkey, sound_id in bindings.items()))
+        tries: Dict[Optional[str], HotkeyTrie] = {None: common}
+        for bank_id, layout in (bank_layouts or {}).items():
+            tries[bank_id] = common.copy()
+            self._bind(tries[bank_id], ((hotkey, (PLAY_SOUND, sound_id)) for hotkey, sound_id in layout.items()))
+        self._tries = tries
+        self.switch_bank(active_bank)
+        return self._matcher.trie
+
+    def _bind(self, trie: HotkeyTrie, bindings: Iterable[Tuple[str, Tuple[str, str]]]) -> None:
+        """Add bindings to a trie, reporting the ones that cannot be added"""
+        for hotkey, target in bindings:
+            try:
+                conflict = trie.add(hotkey, target)
+            except ValueError as e:
+                print(e)
+                continue
+            if conflict is not None:
+                print(f"Hotkey {hotkey} of {target[0]} {target[1]} conflicts with {conflict[0]} {conflict[1]}")
+
+    def switch_bank(self, bank_id: Optional[str]) -> bool:
+        """Match the layout of another bank from the next key on
+
+        Args:
+            bank_id: ID of the bank, or None for global bindings only
+
+        Returns:
+            True if switched, False if the bank has no layout
+        """
+        trie = self._tries.get(bank_id)
+        if trie is None:
+            return False
+        self._active_bank = bank_id
+        self._matcher.set_trie(trie)
+        return True
+
+    def active_bank(self) -> Optional[str]:
+        """Get the ID of the bank whose layout is matched, or None"""
+        return self._active_bank
+
+    def find_conflict(self, hotkey: str, ignore: Optional[Tuple[str, str]] = None,
+                      banks: Optional[Iterable[Optional[str]]] = None) -> Optional[Tuple[str, str]]:
+        """Find the binding a hotkey would conflict with
+
+        Args:
+            hotkey: The hotkey sequence
+            ignore: Target whose own bindings do not count, e.g. (PLAY_SOUND, ID of the sound to bind)
+            banks: The layouts to look in, None for the global bindings only;
+                every layout includes the global bindings
+
+        Returns:
+            The conflicting target, (PLAY_SOUND, sound ID) or (SWITCH_BANK,
+            bank ID), or None if the hotkey is free or invalid
+        """
+        for bank_id in banks if banks is not None else [None]:
+            trie = self._tries.get(bank_id)
+            conflict: Optional[Tuple[str, str]] = trie.find_conflict(hotkey, ignore) if trie is not None else None
+            if conflict is not None:
+                return conflict
+        return None
+
+    def bank_ids(self) -> List[Optional[str]]:
+        """Get the IDs of the banks with a layout, None for the global bindings first"""
+        return list(self._tries)
+
+    def is_running(self) -> bool:
+        """Check whether the keyboard is being listened to"""
+        return self._hook is not None
+
+    def start(self) -> bool:
+        """Start listening for hotkeys
+
+        Returns:
+            True if listening, False if the keyboard cannot be hooked here
+        """
+        if self._hook is not None:
+            return True
+        try:
+            import keyboard
+            self._keyboard = keyboard
+            self._hook = keyboard.hook(self._on_key_event)
+        except (ImportError, OSError) as e:
+            # keyboard needs root on Linux, and accessibility access on macOS
+            print(f"Global hotkeys unavailable: {e}")
+            return False
+
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, name="hotkey-dispatch", daemon=True)
+        self._dispatch_thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop listening for hotkeys, letting queued ones play first"""
+        if self._hook is None:
+            return
+        self._keyboard.unhook(self._hook)
+        self._hook = None
+        self._wakeup.set()
+        self._dispatch_thread.join()
+        self._dispatch_thread = None
+        self._held.clear()
+        self._matcher.reset()
+
+    def trigger(self, sound_id: str) -> None:
+        """Queue a sound for the dispatch thread, as if its hotkey was pressed
+
+        Args:
+            sound_id: Unique identifier for the sound
+        """
+        self._queue((PLAY_SOUND, sound_id))
+
+    def _queue(self, target: Tuple[str, str]) -> None:
+        """Hand a target to the dispatch thread"""
+        self._commands.append(target)
+        self._wakeup.set()
+
+    def _on_key_event(self, event: Any) -> None:
+        """Match a key event of the keyboard hook against the bindings"""
+        if not event.name:
+            return
+        key = normalize_key(event.name)
+        if event.event_type == "up":
+            self._held.discard(key)
+            return
+        if key in self._held:
+            # Auto-repeat of a held key
+            return
+        self._held.add(key)
+        if key in MODIFIERS:
+            return
+
+        target = self._matcher.press(chord_of(self._held, key))
+        if target is not None:
+            if target[0] == SWITCH_BANK:
+                # Switched here, so the next key already uses the new layout
+                self.switch_bank(target[1])
+            self._queue(target)
+
+    def _dispatch_loop(self) -> None:
+        """Run queued targets until stopped"""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._commands:
+                kind, target_id = self._commands.popleft()
+                if kind == SWITCH_BANK:
+                    if self.bank_callback is not None:
+                        try:
+                            self.bank_callback(target_id)
+                        except Exception as e:
+                            print(f"Error preparing hotkey bank: {e}")
+                    self.bank_triggered.emit(target_id)
+                    continue
+                try:
+                    handled = self.play_callback(target_id)
+                except Exception as e:
+                    print(f"Error playing hotkey sound: {e}")
+                    handled = True
+                # Queued to the GUI thread, which is told only once the sound started
+                self.hotkey_triggered.emit(target_id, handled)
+            if self._hook is None:
+                return
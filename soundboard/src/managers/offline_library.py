@@ -0,0 +1,84 @@
+"""The sound library without the application, for command-line tools"""
+
+from typing import Any, Dict, List, Optional
+
+from models.sound_model import SoundModel
+
+
+class OfflineLibrary:
+    """Reads and changes the library while no instance of the application runs
+
+    Offers the methods of SoundManager that the library commands of
+    ControlCommands use, straight on the model: no event loop, audio device
+    or hotkeys, and no Qt. Hold the instance lock while using it, so an
+    instance starting meanwhile does not overwrite its changes.
+    """
+
+    def __init__(self, data_file: Optional[str] = None):
+        """Read the library
+
+        Args:
+            data_file: Path to the JSON file of the library, or None for the default one
+        """
+        # Most commands never search, so the search index is only built by the first search
+        self.model = SoundModel(data_file, search=False)
+
+    def get_sound(self, sound_id: str) -> Optional[Dict[str, Any]]:
+        """Get a sound by its ID"""
+        return self.model.get_sound(sound_id)
+
+    def get_all_sounds(self) -> Dict[str, Dict[str, Any]]:
+        """Get all sounds, by ID"""
+        return self.model.get_all_sounds()
+
+    def is_favorite(self, sound_id: str) -> bool:
+        """Check if a sound is a favorite"""
+        return self.model.is_favorite(sound_id)
+
+    def search_sounds(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[str]:
+        """Search sounds by title, category and tags, best match first"""
+        if fuzzy:
+            return self.model.fuzzy_search(query, limit)
+        return self.model.search(query, limit)
+
+    def get_sorted_sound_ids(self, sort_by: str = "recent", category: Optional[int] = None,
+                             favorites_only: bool = False) -> List[str]:
+        """Get the IDs of every sound passing a filter, in sort order"""
+        return self.model.get_sorted_sound_ids(sort_by, category, favorites_only)
+
+    def get_most_played_sound_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most played sounds, most played first"""
+        return self.model.get_most_played_sound_ids(limit)
+
+    def get_facet_counts(self, facet: str) -> Dict[Any, int]:
+        """Count the sounds having each value of a facet"""
+        return self.model.get_facet_counts(facet)
+
+    def get_folders(self, parent_id: Optional[str] = None, recursive: bool = False) -> List[Dict[str, Any]]:
+        """Get the folders under a parent"""
+        return self.model.get_folders(parent_id, recursive)
+
+    def get_banks(self) -> List[Dict[str, Any]]:
+        """Get every sound bank"""
+        return self.model.get_banks()
+
+    def add_sounds(self, sounds: Dict[str, Dict[str, Any]]) -> None:
+        """Add or update many sounds, saving the library once"""
+        with self.model.batch():
+            for sound_id, sound_data in sounds.items():
+                self.model.add_sound(sound_id, sound_data)
+
+    def update_sounds(self, changes: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Change fields of many sounds, saving the library once
+
+        Returns:
+            The IDs of the sounds changed, leaving out the unknown ones
+        """
+        updated = []
+        with self.model.batch():
+            for sound_id, fields in changes.items():
+                sound_data = self.model.get_sound(sound_id)
+                if sound_data is not None:
+                    self.model.add_sound(sound_id, dict(sound_data, **fields))
+                    updated.append(sound_id)
+        return updated
@@ -0,0 +1,405 @@
+"""OSC trigger server, for lighting desks and show control
+
+Listens for Open Sound Control 1.0 packets over UDP:
+
+    /board/play <id>          play a sound
+    /board/stop               stop the sound playing
+    /board/gain <id> <db>     set the gain of a sound, in decibels
+
+Packets are parsed on the receive thread and queued to the sound manager's
+command queue right away. The messages of a bundle whose timetag is in the
+future are held by a scheduler thread until then, and queued together, as
+OSC runs the messages of a bundle atomically. Bundles due too far ahead, or
+past the number of bundles held at once, are dropped.
+"""
+
+import heapq
+import socket
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from managers.sound_manager import SoundManager
+
+DEFAULT_PORT = 9000
+
+# Prefix of the addresses the server answers to
+ADDRESS_PREFIX = "/board"
+
+# Largest datagram read
+MAX_PACKET_SIZE = 65535
+
+# Most levels of bundles nested in a packet
+MAX_BUNDLE_DEPTH = 8
+
+# Timetag meaning "now"
+IMMEDIATELY = 1
+
+# Seconds between 1900, the OSC (NTP) epoch, and 1970, the Unix epoch
+NTP_EPOCH_OFFSET = 2208988800
+
+# Seconds the receive thread waits for a packet before checking whether it should stop
+RECEIVE_TIMEOUT = 0.25
+
+# Most bundles held for later at once, so a controller cannot fill up the memory with them
+MAX_SCHEDULED = 1024
+
+# Seconds ahead a bundle may be due; later timetags are taken for a wrong controller clock
+MAX_SCHEDULE_AHEAD = 24 * 3600.0
+
+# Seconds between two reports of the same kind of error, so a misconfigured controller cannot flood the output
+ERROR_REPORT_INTERVAL = 10.0
+
+
+class OscError(ValueError):
+    """A packet that is not valid OSC"""
+
+
+def _read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a null-terminated string padded to four bytes"""
+    end = data.find(b"\0", offset)
+    if end < 0:
+        raise OscError("Unterminated string")
+    return data[offset:end].decode("utf-8", "replace"), (end + 4) & ~3
+
+
+def _read_blob(data: bytes, offset: int) -> Tuple[bytes, int]:
+    """Read a blob: its size, then its bytes padded to four bytes"""
+    size = struct.unpack_from(">i", data, offset)[0]
+    start = offset + 4
+    if size < 0 or start + size > len(data):
+        raise OscError("Truncated blob")
+    return data[start:start + size], (start + size + 3) & ~3
+
+
+# Type tag -> (struct format, size) of the fixed size arguments
+_FIXED_ARGUMENTS = {"i": (">i", 4), "f": (">f", 4), "h": (">q", 8), "d": (">d", 8), "t": (">Q", 8)}
+_CONSTANT_ARGUMENTS = {"T": True, "F": False, "N": None, "I": float("inf")}
+
+
+def parse_message(data: bytes) -> Tuple[str, List[Any]]:
+    """Parse an OSC message
+
+    Args:
+        data: The message, from its address to its last argument
+
+    Returns:
+        The address and the arguments
+    """
+    address, offset = _read_string(data, 0)
+    if not address.startswith("/"):
+        raise OscError(f"Invalid address: {address}")
+    if offset >= len(data):
+        # Messages of old implementations may have no type tags
+        return address, []
+    tags, offset = _read_string(data, offset)
+    if not tags.startswith(","):
+        raise OscError(f"Invalid type tags: {tags}")
+    arguments: List[Any] = []
+    try:
+        for tag in tags[1:]:
+            if tag in _FIXED_ARGUMENTS:
+                fmt, size = _FIXED_ARGUMENTS[tag]
+                arguments.append(struct.unpack_from(fmt, data, offset)[0])
+                offset += size
+            elif tag == "s" or tag == "S":
+                value, offset = _read_string(data, offset)
+                arguments.append(value)
+            elif tag == "b":
+                blob, offset = _read_blob(data, offset)
+                arguments.append(blob)
+            elif tag in _CONSTANT_ARGUMENTS:
+                arguments.append(_CONSTANT_ARGUMENTS[tag])
+            else:
+                raise OscError(f"Unsupported type tag: {tag}")
+    except struct.error:
+        raise OscError("Truncated arguments")
+    return address, arguments
+
+
+def parse_packet(data: bytes) -> List[Tuple[int, List[Tuple[str, List[Any]]]]]:
+    """Parse an OSC packet, a message or a bundle of packets
+
+    Args:
+        data: The packet
+
+    Returns:
+        The messages grouped by bundle, as (timetag, [(address, arguments)])
+        pairs; a message on its own runs immediately
+    """
+    if not data.startswith(b"#bundle\0"):
+        return [(IMMEDIATELY, [parse_message(data)])]
+    groups: List[Tuple[int, List[Tuple[str, List[Any]]]]] = []
+    # Bundles left to read, with their depth; a bundle's groups come before those of the bundles after it
+    pending = [(data, 1)]
+    while pending:
+        bundle, depth = pending.pop()
+        if depth > MAX_BUNDLE_DEPTH:
+            raise OscError(f"Bundles nested more than {MAX_BUNDLE_DEPTH} deep")
+        if len(bundle) < 16:
+            raise OscError("Truncated bundle")
+        messages: List[Tuple[str, List[Any]]] = []
+        groups.append((struct.unpack_from(">Q", bundle, 8)[0], messages))
+        nested = []
+        offset = 16
+        while offset < len(bundle):
+            if offset + 4 > len(bundle):
+                raise OscError("Truncated bundle element")
+            size = struct.unpack_from(">i", bundle, offset)[0]
+            element = bundle[offset + 4:offset + 4 + size]
+            if size <= 0 or len(element) != size:
+                raise OscError("Truncated bundle element")
+            if element.startswith(b"#bundle\0"):
+                nested.append((element, depth + 1))
+            else:
+                messages.append(parse_message(element))
+            offset += 4 + size
+        pending.extend(reversed(nested))
+    return [group for group in groups if group[1]]
+
+
+def timetag_to_monotonic(timetag: int, now: Optional[float] = None) -> Optional[float]:
+    """Get the time.monotonic() at which a timetag is due
+
+    Args:
+        timetag: NTP time: seconds since 1900 in the high 32 bits, fractions in the low ones
+        now: time.monotonic() of the conversion, or None for now
+
+    Returns:
+        The due time, or None if the timetag means immediately
+    """
+    if timetag == IMMEDIATELY:
+        return None
+    if now is None:
+        now = time.monotonic()
+    unix_time = (timetag >> 32) - NTP_EPOCH_OFFSET + (timetag & 0xFFFFFFFF) / 2 ** 32
+    return now + unix_time - time.time()
+
+
+class OscServer:
+    """Runs OSC messages received over UDP against a sound manager
+
+    Start and stop it from the thread owning the sound manager.
+    """
+
+    def __init__(self, sound_manager: "SoundManager", port: int = DEFAULT_PORT, host: str = "127.0.0.1",
+                 prefix: str = ADDRESS_PREFIX):
+        """Initialize the server
+
+        Args:
+            sound_manager: The sound manager to control
+            port: UDP port to listen on, or 0 for any free port
+            host: Address to listen on; "0.0.0.0" for controllers on other machines
+            prefix: Prefix of the addresses, e.g. "/board" for "/board/play"
+        """
+        self.sound_manager = sound_manager
+        self.port = port
+        self.host = host
+        self._handlers: Dict[str, Callable[[List[Any]], Tuple[Callable[..., Any], tuple]]] = {
+            f"{prefix}/play": self._parse_play,
+            f"{prefix}/stop": self._parse_stop,
+            f"{prefix}/gain": self._parse_gain,
+        }
+        self._socket: Optional[socket.socket] = None
+        self._receive_thread: Optional[threading.Thread] = None
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._running = False
+        self._scheduled: List[Tuple[float, int, list]] = []  # Heap of (due time, sequence, calls)
+        self._sequence = 0  # Keeps bundles due at the same time in arrival order
+        self._schedule_changed = threading.Condition()
+        # Kind of error -> (time.monotonic() of its last report, errors of the kind not reported since)
+        self._reports: Dict[str, Tuple[float, int]] = {}
+
+    def is_running(self) -> bool:
+        """Check whether the server is listening"""
+        return self._running
+
+    def start(self) -> bool:
+        """Start listening
+
+        Returns:
+            True if listening, False if the port cannot be bound
+        """
+        if self._running:
+            return True
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind((self.host, self.port))
+        except OSError as e:
+            print(f"OSC server unavailable: {e}")
+            return False
+        sock.settimeout(RECEIVE_TIMEOUT)
+        self._socket = sock
+        self.port = sock.getsockname()[1]
+        self._running = True
+        self._receive_thread = threading.Thread(target=self._receive_loop, args=(sock,), name="osc-receive",
+                                                daemon=True)
+        self._scheduler_thread = threading.Thread(target=self._schedule_loop, name="osc-scheduler", daemon=True)
+        self._receive_thread.start()
+        self._scheduler_thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop listening, dropping the bundles not due yet"""
+        if not self._running:
+            return
+        self._running = False
+        with self._schedule_changed:
+            self._scheduled.clear()
+            self._schedule_changed.notify()
+        for thread in (self._receive_thread, self._scheduler_thread):
+            if thread is not None:
+                thread.join()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def handle_packet(self, data: bytes, now: Optional[float] = None) -> int:
+        """Queue the messages of a packet, or schedule them if their bundle is due later
+
+        Args:
+            data: The packet
+            now: time.monotonic() of its arrival, or None for now
+
+        Returns:
+            The number of messages queued or scheduled
+        """
+        if now is None:
+            now = time.monotonic()
+        try:
+            groups = parse_packet(data)
+        except OscError as e:
+            self._report("packet", f"Invalid OSC packet: {e}", now)
+            return 0
+        count = 0
+        for timetag, messages in groups:
+            calls = []
+            for address, arguments in messages:
+                handler = self._handlers.get(address)
+                if handler is None:
+                    self._report("address", f"Unknown OSC address: {address}", now)
+                    continue
+                try:
+                    calls.append(handler(arguments))
+                except (ValueError, TypeError, IndexError) as e:
+                    self._report("arguments", f"Invalid arguments for {address}: {arguments} ({e})", now)
+            if not calls:
+                continue
+            due = timetag_to_monotonic(timetag, now)
+            if due is None or due <= now:
+                self._queue(calls)
+            elif not self._schedule(due, calls, now):
+                continue
+            count += len(calls)
+        return count
+
+    def _parse_play(self, arguments: List[Any]) -> Tuple[Callable[..., Any], tuple]:
+        """/play <id>"""
+        sound_id = arguments[0]
+        if not isinstance(sound_id, (str, int)) or isinstance(sound_id, bool):
+            raise ValueError("the sound ID must be a string or an integer")
+        return self.sound_manager.play_sound, (str(sound_id),)
+
+    def _parse_stop(self, arguments: List[Any]) -> Tuple[Callable[..., Any], tuple]:
+        """/stop"""
+        return self.sound_manager.stop_sound, ()
+
+    def _parse_gain(self, arguments: List[Any]) -> Tuple[Callable[..., Any], tuple]:
+        """/gain <id> <db>"""
+        sound_id, gain_db = arguments[0], arguments[1]
+        if (not isinstance(sound_id, (str, int)) or isinstance(sound_id, bool)
+                or not isinstance(gain_db, (int, float)) or isinstance(gain_db, bool)):
+            raise ValueError("expected a sound ID and a gain in decibels")
+        return self.sound_manager.set_gain, (str(sound_id), float(gain_db))
+
+    def _queue(self, calls: List[Tuple[Callable[..., Any], tuple]]) -> None:
+        """Hand the calls of a bundle to the sound manager, as one command"""
+        if len(calls) == 1:
+            function, args = calls[0]
+            self.sound_manager.commands.submit(function, *args)
+        else:
+            self.sound_manager.commands.submit(_run_calls, calls)
+
+    def _schedule(self, due: float, calls: List[Tuple[Callable[..., Any], tuple]], now: float) -> bool:
+        """Hold the calls of a bundle until their time
+
+        Bundles due more than MAX_SCHEDULE_AHEAD from now, or arriving while
+        MAX_SCHEDULED bundles are held, are dropped and reported.
+
+        Args:
+            due: time.monotonic() at which the bundle is due
+            calls: The calls of the bundle
+            now: time.monotonic() of the arrival of the bundle
+
+        Returns:
+            True if the bundle is scheduled, False if it was dropped
+        """
+        if due - now > MAX_SCHEDULE_AHEAD:
+            self._report("ahead", f"OSC bundle due in {due - now:.0f} s dropped, "
+                                  f"bundles are scheduled up to {MAX_SCHEDULE_AHEAD:.0f} s ahead", now)
+            return False
+        with self._schedule_changed:
+            full = len(self._scheduled) >= MAX_SCHEDULED
+            if not full:
+                self._sequence += 1
+                heapq.heappush(self._scheduled, (due, self._sequence, calls))
+                self._schedule_changed.notify()
+        if full:
+            self._report("scheduled", f"OSC bundle dropped, {MAX_SCHEDULED} bundles are already scheduled", now)
+        return not full
+
+    def _report(self, kind: str, message: str, now: float) -> None:
+        """Print an error of a packet, unless one of the same kind was reported less than an interval ago
+
+        Args:
+            kind: Kind of the error, e.g. "address" for unknown addresses
+            message: The error
+            now: time.monotonic() of the error
+        """
+        report = self._reports.get(kind)
+        if report is not None:
+            last, unreported = report
+            if now - last < ERROR_REPORT_INTERVAL:
+                self._reports[kind] = (last, unreported + 1)
+                return
+            if unreported:
+                message += f" ({unreported} more like it in the last {now - last:.0f} s)"
+        print(message)
+        self._reports[kind] = (now, 0)
+
+    def _receive_loop(self, sock: socket.socket) -> None:
+        """Handle packets until stopped"""
+        while self._running:
+            try:
+                data, _ = sock.recvfrom(MAX_PACKET_SIZE)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                self._report("receive", f"OSC receive error: {e}", time.monotonic())
+                continue
+            try:
+                self.handle_packet(data, time.monotonic())
+            except Exception as e:
+                self._report("handling", f"Error handling OSC packet: {e}", time.monotonic())
+
+    def _schedule_loop(self) -> None:
+        """Queue scheduled bundles when they are due, until stopped"""
+        with self._schedule_changed:
+            while self._running:
+                if not self._scheduled:
+                    self._schedule_changed.wait()
+                    continue
+                delay = self._scheduled[0][0] - time.monotonic()
+                if delay > 0:
+                    self._schedule_changed.wait(delay)
+                    continue
+                _, _, calls = heapq.heappop(self._scheduled)
+                self._queue(calls)
+
+
+def _run_calls(calls: List[Tuple[Callable[..., Any], tuple]]) -> None:
+    """Run the calls of a bundle one after the other"""
+    for function, args in calls:
+        function(*args)
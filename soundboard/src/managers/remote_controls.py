@@ -0,0 +1,114 @@
+"""Everything controlling a running instance from outside: other launches, the control API and OSC"""
+
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QTimer
+
+from managers.control_commands import ControlCommands
+from managers.control_server import ControlServer
+from managers.osc_server import OscServer
+from managers.single_instance import InstanceLock, IpcServer
+
+if TYPE_CHECKING:
+    from managers.sound_manager import SoundManager
+
+# Operations of forwarded commands that do not read the library, run while it is still loading
+IMMEDIATE_OPERATIONS = frozenset({"show", "stop", "volume", "status"})
+
+
+class RemoteControls:
+    """The servers of the instance owning the library, started and stopped together
+
+    The instance always answers the launches forwarding their command line
+    to it; the control API and the OSC server only run when given a port.
+    """
+
+    def __init__(self, sound_manager: "SoundManager", lock: InstanceLock, control_port: Optional[int] = None,
+                 osc_port: Optional[int] = None, osc_host: str = "127.0.0.1") -> None:
+        """Initialize the servers
+
+        Args:
+            sound_manager: The sound manager to control
+            lock: The instance lock, held; released by stop()
+            control_port: Port of the control API, or None for none
+            osc_port: UDP port of the OSC server, or None for none
+            osc_host: Address the OSC server listens on
+        """
+        self.sound_manager = sound_manager
+        self.lock = lock
+        # Operations of forwarded command lines; the front end adds its own, like "show"
+        self.operations = ControlCommands(sound_manager)
+        self.ipc_server = IpcServer(self.forward)
+        # Forwarded commands waiting for the library to be loaded, with the futures of their results
+        self._waiting: List[Tuple[List[Any], Future]] = []
+        sound_manager.library_loaded.connect(self._run_waiting)
+        self.control_server = ControlServer(sound_manager, control_port) if control_port is not None else None
+        self.osc_server = OscServer(sound_manager, osc_port, osc_host) if osc_port is not None else None
+
+    def start(self) -> None:
+        """Start the servers, from the thread owning the sound manager"""
+        if self.ipc_server.start():
+            self.lock.advertise(self.ipc_server.port, self.ipc_server.token)
+        if self.control_server is not None:
+            self.control_server.start()
+        if self.osc_server is not None:
+            self.osc_server.start()
+
+    def stop(self) -> None:
+        """Stop the servers and release the instance lock"""
+        self.ipc_server.stop()
+        if self.control_server is not None:
+            self.control_server.stop()
+        if self.osc_server is not None:
+            self.osc_server.stop()
+        self.lock.release()
+
+    def forward(self, commands: List[Any]) -> Future:
+        """Run commands forwarded by another launch, from any thread
+
+        Commands reading the library wait until it is loaded, so a sound is
+        never looked up in the part of the library indexed so far.
+
+        Args:
+            commands: The commands, as run by ControlCommands
+
+        Returns:
+            A future holding the result of each command
+        """
+        future: Future = Future()
+        self.sound_manager.commands.submit(self._run_forwarded, commands, future)
+        return future
+
+    def _run_forwarded(self, commands: List[Any], future: Future) -> None:
+        """Run forwarded commands now, or once the library is loaded if they read it"""
+        reads_library = any(not isinstance(command, dict) or command.get("op") not in IMMEDIATE_OPERATIONS
+                            for command in commands)
+        if reads_library and self.sound_manager.is_loading():
+            self._waiting.append((commands, future))
+        else:
+            future.set_result(self.operations.execute(commands))
+
+    def _run_waiting(self) -> None:
+        """Run the forwarded commands that waited for the library"""
+        waiting, self._waiting = self._waiting, []
+        for commands, future in waiting:
+            future.set_result(self.operations.execute(commands))
+
+    def run_when_loaded(self, commands: List[Dict[str, Any]]) -> None:
+        """Run the commands of the command line once the library is loaded
+
+        Args:
+            commands: The commands, as run by ControlCommands
+        """
+        def run_commands() -> None:
+            for result in self.operations.execute(commands):
+                if not result["ok"]:
+                    print(f"Command failed: {result['error']}")
+
+        if not commands:
+            return
+        if self.sound_manager.is_loading():
+            self.sound_manager.library_loaded.connect(run_commands)
+        else:
+            QTimer.singleShot(0, run_commands)
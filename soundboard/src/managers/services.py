@@ -0,0 +1,44 @@
+"""Application-wide services shared by every window, view and card"""
+
+from typing import Optional
+
+from managers.sound_manager import SoundManager
+
+
+class ServiceContainer:
+    """Holds the single instance of each application-wide service
+
+    Services are created on first use and then shared, so the sound library
+    is read once and every view plays through the same audio player and
+    decode cache, however many views and cards ask for them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty container"""
+        self._sound_manager: Optional[SoundManager] = None
+        # Options of the services, read when they are created
+        self.audio_process = False
+
+    @property
+    def sound_manager(self) -> SoundManager:
+        """The shared sound manager, created on first use"""
+        if self._sound_manager is None:
+            # The library loads from the event loop, so windows show before it is complete
+            self._sound_manager = SoundManager(progressive=True, audio_process=self.audio_process)
+        return self._sound_manager
+
+    def set_sound_manager(self, sound_manager: SoundManager) -> None:
+        """Share an existing sound manager, e.g. one using another data file
+
+        Args:
+            sound_manager: The sound manager every view should use
+        """
+        self._sound_manager = sound_manager
+
+    def reset(self) -> None:
+        """Forget every service, so the next use creates new ones"""
+        self._sound_manager = None
+
+
+# The services of the running application
+services = ServiceContainer()
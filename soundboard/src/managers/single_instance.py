@@ -0,0 +1,262 @@
+"""One running instance per library, and the channel other launches reach it by
+
+The running instance holds an operating system lock on a file next to the
+library, released even if the process dies, and advertises a loopback TCP
+port and a random token in another file. A later launch that finds the
+lock taken sends its commands to that port and exits, without reading the
+library or starting Qt: this module and the client side of it only use the
+standard library, so forwarding takes milliseconds.
+
+The protocol is one JSON line each way per connection:
+
+    -> {"token": "...", "commands": [{"op": "play", "name": "Air Horn"}]}
+    <- {"results": [{"ok": true, "id": "...", "played": true}]}
+"""
+
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+# Directory of the library, holding the lock and endpoint files
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".soundboard")
+
+LOCK_FILE = "instance.lock"
+ENDPOINT_FILE = "instance.json"
+
+# Seconds a launch waits for the running instance to advertise its endpoint, while it starts up
+ENDPOINT_WAIT = 3.0
+
+# Seconds to wait for the running instance to answer
+FORWARD_TIMEOUT = 5.0
+
+# Seconds forwarded commands may wait for the running instance to finish loading its library
+LOAD_TIMEOUT = 120.0
+
+# Largest request accepted, e.g. the paths of a folder of ten thousand sounds
+MAX_REQUEST_SIZE = 64 << 20
+
+
+class InstanceLock:
+    """Exclusive lock of a library directory, held for the life of the running instance"""
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY):
+        """Initialize without taking the lock
+
+        Args:
+            directory: Directory of the library
+        """
+        self.directory = directory
+        self._file: Optional[IO[bytes]] = None
+
+    def acquire(self) -> bool:
+        """Take the lock, without waiting
+
+        Returns:
+            True if this process holds the lock, False if another one does
+        """
+        if self._file is not None:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), "a+b")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def advertise(self, port: int, token: str) -> None:
+        """Publish the endpoint other launches forward their commands to
+
+        Args:
+            port: Loopback TCP port of the IPC server
+            token: Secret other launches must send with their commands
+        """
+        path = os.path.join(self.directory, ENDPOINT_FILE)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        # Only the user may read the token
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "port": port, "token": token}, f)
+        os.replace(temp_path, path)
+
+    def release(self) -> None:
+        """Withdraw the endpoint and release the lock"""
+        if self._file is None:
+            return
+        try:
+            os.remove(os.path.join(self.directory, ENDPOINT_FILE))
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
+
+
+def read_endpoint(directory: str = DEFAULT_DIRECTORY) -> Optional[Tuple[int, str]]:
+    """Get the port and token advertised by the running instance, or None"""
+    try:
+        with open(os.path.join(directory, ENDPOINT_FILE), encoding="utf-8") as f:
+            endpoint = json.load(f)
+        return int(endpoint["port"]), str(endpoint["token"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def send_commands(commands: List[Dict[str, Any]], directory: str = DEFAULT_DIRECTORY,
+                  timeout: float = FORWARD_TIMEOUT) -> Optional[List[Dict[str, Any]]]:
+    """Run commands in the running instance, if there is one
+
+    Args:
+        commands: Commands as run by ControlCommands
+        directory: Directory of the library
+        timeout: Seconds to wait for the answer
+
+    Returns:
+        The result of each command, or None if no instance runs
+
+    Raises:
+        OSError: If an instance runs but cannot be reached
+    """
+    lock = InstanceLock(directory)
+    if lock.acquire():
+        lock.release()
+        return None
+
+    # The instance may be starting up, before it advertised its endpoint
+    deadline = time.monotonic() + ENDPOINT_WAIT
+    while True:
+        endpoint = read_endpoint(directory)
+        if endpoint is not None:
+            try:
+                return _request(endpoint, commands, timeout)
+            except ConnectionRefusedError:
+                # A stale endpoint of an instance that died before another one advertised
+                pass
+        if time.monotonic() > deadline:
+            raise OSError("The running instance does not answer")
+        time.sleep(0.02)
+
+
+def _request(endpoint: Tuple[int, str], commands: List[Dict[str, Any]], timeout: float) -> List[Dict[str, Any]]:
+    """Send commands to an endpoint and read the results"""
+    port, token = endpoint
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as connection:
+        connection.sendall(json.dumps({"token": token, "commands": commands}).encode() + b"\n")
+        # Commands reading the library are answered once the instance has loaded it
+        connection.settimeout(timeout + LOAD_TIMEOUT)
+        response = connection.makefile("rb").readline()
+    try:
+        answer = json.loads(response)
+        if "error" in answer:
+            raise OSError(f"The running instance refused the commands: {answer['error']}")
+        results: List[Dict[str, Any]] = answer["results"]
+        return results
+    except (ValueError, KeyError, TypeError):
+        raise OSError(f"Invalid answer from the running instance: {response[:200]!r}")
+
+
+class IpcServer:
+    """Answers the commands forwarded by other launches
+
+    Connections are handled one at a time on a thread of their own, which
+    hands the commands over to the thread owning the sound manager and waits
+    for their results.
+    """
+
+    def __init__(self, run_commands: Callable[[List[Any]], Any]):
+        """Initialize the server
+
+        Args:
+            run_commands: Called with the commands of a connection, from the
+                thread of the server; returns a concurrent.futures.Future of
+                their results
+        """
+        self.run_commands = run_commands
+        self.port = 0
+        self.token = secrets.token_hex(16)
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Start listening on a free loopback port
+
+        Returns:
+            True if listening, False otherwise
+        """
+        if self._socket is not None:
+            return True
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            sock.listen(16)
+        except OSError as e:
+            print(f"Instance channel unavailable: {e}")
+            return False
+        self._socket = sock
+        self.port = sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, args=(sock,), name="instance-ipc", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop listening"""
+        if self._socket is None:
+            return
+        sock, self._socket = self._socket, None
+        # Wake the blocked accept() with a connection of our own
+        try:
+            socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+        sock.close()
+
+    def _serve(self, sock: socket.socket) -> None:
+        """Answer connections until stopped"""
+        while self._socket is not None:
+            try:
+                connection, _ = sock.accept()
+            except OSError:
+                continue
+            with connection:
+                try:
+                    connection.settimeout(FORWARD_TIMEOUT)
+                    self._answer(connection)
+                except OSError:
+                    pass
+
+    def _answer(self, connection: socket.socket) -> None:
+        """Run the commands of a connection and send their results"""
+        request = connection.makefile("rb").readline(MAX_REQUEST_SIZE)
+        if not request:
+            return
+        try:
+            request = json.loads(request)
+            valid = isinstance(request, dict) and secrets.compare_digest(str(request.get("token")), self.token)
+            commands = request.get("commands") if valid else None
+        except ValueError:
+            commands = None
+        if isinstance(commands, list):
+            # Imported here, as it pulls in logging, which a forwarding launch does without
+            import concurrent.futures
+            future = self.run_commands(commands)
+            try:
+                response = {"results": future.result(LOAD_TIMEOUT)}
+            except concurrent.futures.TimeoutError:
+                response = {"error": "The application is busy"}
+        else:
+            response = {"error": "Invalid request"}
+        connection.sendall(json.dumps(response).encode() + b"\n")
@@ -1,14 +1,30 @@
 """Sound manager for the soundboard application"""
 
+import itertools
 import os
+import time
 import uuid
-from typing import Dict, List, Optional, Any, Callable
-from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtWidgets import QFileDialog
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 # Import the sound model and audio player
+from models.library_files import new_sound_data
 from models.sound_model import SoundModel
 from managers.audio_player import AudioPlayer
+from managers.command_queue import CommandQueue
+from managers.hotkey_bindings import format_hotkey, normalize_sequence
+from managers.hotkey_manager import PLAY_SOUND, SWITCH_BANK, HotkeyManager
+from managers.startup_profile import startup_profile
+
+# Play statistics are written to disk at most this often while sounds are being played
+STATS_SAVE_DELAY_MS = 5000
+
+# Time spent loading the library per event loop iteration, so the window stays responsive
+LOAD_SLICE_MS = 15
+
+# Range of the gain of a sound, in decibels
+MIN_GAIN_DB = -60.0
+MAX_GAIN_DB = 12.0
 
 class SoundManager(QObject):
     """Manager for handling sound operations"""
@@ -20,22 +36,72 @@ class SoundManager(QObject):
     favorite_added = pyqtSignal(str)  # sound_id
     favorite_removed = pyqtSignal(str)  # sound_id
     sound_played = pyqtSignal(str)  # sound_id
+    sound_stopped = pyqtSignal(str)  # sound_id
+    volume_changed = pyqtSignal(float)  # volume, from 0.0 to 1.0
+    folder_added = pyqtSignal(str, dict)  # folder_id, folder_data
+    folder_removed = pyqtSignal(str)  # folder_id
+    folder_updated = pyqtSignal(str, dict)  # folder_id, folder_data
+    folder_counts_changed = pyqtSignal(dict)  # folder_id -> sound count, for changed folders only
+    bank_added = pyqtSignal(str, dict)  # bank_id, bank_data
+    bank_removed = pyqtSignal(str)  # bank_id
+    bank_updated = pyqtSignal(str, dict)  # bank_id, bank_data
+    bank_switched = pyqtSignal(object)  # bank_id, or None for no bank
+    library_loading = pyqtSignal(int, int)  # sounds loaded so far, sounds in the library
+    library_loaded = pyqtSignal()
     
-    def __init__(self, data_file: str = None):
+    def __init__(self, data_file: str = None, progressive: bool = False, audio_process: bool = False):
         """Initialize the sound manager
         
         Args:
             data_file: Path to the JSON file for storing sound data
+            progressive: Load the library from the event loop, a time slice at
+                a time, instead of before returning
+            audio_process: Mix the sounds in a process of their own, so pauses
+                of this one never interrupt them
         """
         super().__init__()
-        self.model = SoundModel(data_file)
-        self.audio_player = AudioPlayer()
+        self.model = SoundModel(data_file, progressive)
+        self._reported_loaded = 0  # Sounds loaded when views were last told about them
+        startup_profile.mark("model load")
+        engine = None
+        if audio_process:
+            # Imports multiprocessing, which only this option needs
+            from managers.audio_process import AudioProcessEngine
+            engine = AudioProcessEngine()
+        self.audio_player = AudioPlayer(engine=engine)
+        startup_profile.mark("audio init")
         self.current_playing: Optional[str] = None
         
+        # Batch the saves of play statistics
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(STATS_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+        
         # Connect audio player signals
         self.audio_player.playback_started.connect(self._on_playback_started)
         self.audio_player.playback_stopped.connect(self._on_playback_stopped)
         self.audio_player.playback_error.connect(self._on_playback_error)
+        
+        # Calls from other threads, e.g. the control server, run on this one
+        self.commands = CommandQueue(self)
+        
+        # The file and gain of each sound a hotkey plays, and those files by bank ID, with the ones
+        # of the sounds' own hotkeys under None; built on this thread and replaced whole, as the
+        # dispatch thread reads them
+        self._hotkey_sounds: Dict[str, Tuple[str, float]] = {}
+        self._hotkey_files: Dict[Optional[str], Dict[str, str]] = {None: {}}
+        self._missing_hotkey_files: frozenset = frozenset()  # Sounds of the prepared bank without their file
+        
+        # Hotkeys play on a thread of their own; listening starts with start_hotkeys()
+        self.hotkeys = HotkeyManager(self._play_from_hotkey, self._prepare_bank)
+        self.hotkeys.hotkey_triggered.connect(self._on_hotkey_triggered)
+        self.hotkeys.bank_triggered.connect(self._on_bank_triggered)
+        
+        if self.model.is_loading():
+            QTimer.singleShot(0, self._load_more)
+        else:
+            self._update_hotkeys()
     
     def add_sound(self, sound_id: str, sound_data: Dict[str, Any]) -> None:
         """Add or update a sound
@@ -44,43 +110,32 @@ class SoundManager(QObject):
             sound_id: Unique identifier for the sound
             sound_data: Dictionary containing sound data
         """
+        old_folder_id = self.model.get_sound_folder(sound_id)
+        bound = self._is_bound(sound_id)
         self.model.add_sound(sound_id, sound_data)
-        self.sound_added.emit(sound_id, sound_data)
+        if bound or self._is_bound(sound_id):
+            self._update_hotkeys()
+        self.sound_added.emit(sound_id, self.model.get_sound(sound_id))
+        folder_id = self.model.get_sound_folder(sound_id)
+        if folder_id != old_folder_id:
+            self._emit_folder_counts(old_folder_id, folder_id)
         
-    def select_and_add_sound_file(self, parent=None) -> Optional[str]:
-        """Open a file dialog to select a sound file and add it to the collection
+    def add_sound_file(self, file_path: str) -> Optional[str]:
+        """Add a sound file to the collection, titled after its name
         
         Args:
-            parent: Parent widget for the file dialog
+            file_path: Path to the sound file
             
         Returns:
-            The sound_id of the added sound, or None if cancelled
+            The sound_id of the added sound, or None if the file does not exist
         """
-        # Open file dialog to select sound file
-        file_path, _ = QFileDialog.getOpenFileName(
-            parent,
-            "Select Sound File",
-            "",
-            "Audio Files (*.mp3 *.wav *.ogg *.flac);;All Files (*)"
-        )
-        
-        if not file_path:
-            return None  # User cancelled
+        if not os.path.isfile(file_path):
+            print(f"Sound file not found: {file_path}")
+            return None
             
         # Generate a unique ID for the sound
         sound_id = str(uuid.uuid4())
-        
-        # Get file information
-        file_name = os.path.basename(file_path)
-        name, _ = os.path.splitext(file_name)
-        
-        # Create sound data
-        sound_data = {
-            "title": name,
-            "category": 1,  # Default category
-            "file_path": file_path,
-            "favorite": False
-        }
+        sound_data = new_sound_data(file_path)
         
         # Try to load the sound to get its duration
         if self.audio_player.load_sound(sound_id, file_path):
@@ -93,6 +148,55 @@ class SoundManager(QObject):
         
         return sound_id
     
+    def add_sounds(self, sounds: Dict[str, Dict[str, Any]]) -> None:
+        """Add or update many sounds, saving the library once
+        
+        Args:
+            sounds: Sound data by sound ID
+        """
+        old_folder_ids = {sound_id: self.model.get_sound_folder(sound_id) for sound_id in sounds}
+        bound = any(self._is_bound(sound_id) for sound_id in sounds)
+        with self.model.batch():
+            for sound_id, sound_data in sounds.items():
+                self.model.add_sound(sound_id, sound_data)
+        if bound or any(self._is_bound(sound_id) for sound_id in sounds):
+            self._update_hotkeys()
+        changed_folder_ids: Set[Optional[str]] = set()
+        for sound_id in sounds:
+            self.sound_added.emit(sound_id, self.model.get_sound(sound_id))
+            folder_id = self.model.get_sound_folder(sound_id)
+            if folder_id != old_folder_ids[sound_id]:
+                changed_folder_ids.update((old_folder_ids[sound_id], folder_id))
+        if changed_folder_ids:
+            self._emit_folder_counts(*changed_folder_ids)
+    
+    def update_sounds(self, changes: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Change fields of many sounds, e.g. measured durations, saving the library once
+        
+        Args:
+            changes: The fields to set by sound ID; other fields are kept
+            
+        Returns:
+            The IDs of the sounds changed, leaving out the unknown ones
+        """
+        updated = {}
+        bound = False
+        with self.model.batch():
+            for sound_id, fields in changes.items():
+                sound_data = self.model.get_sound(sound_id)
+                if sound_data is None:
+                    continue
+                bound = bound or self._is_bound(sound_id)
+                sound_data = dict(sound_data, **fields)
+                self.model.add_sound(sound_id, sound_data)
+                updated[sound_id] = self.model.get_sound(sound_id)
+                bound = bound or self._is_bound(sound_id)
+        if bound:
+            self._update_hotkeys()
+        for sound_id, sound_data in updated.items():
+            self.sound_updated.emit(sound_id, sound_data)
+        return list(updated)
+    
     def remove_sound(self, sound_id: str) -> bool:
         """Remove a sound
         
@@ -102,11 +206,46 @@ class SoundManager(QObject):
         Returns:
             True if the sound was removed, False otherwise
         """
+        folder_id = self.model.get_sound_folder(sound_id)
         if self.model.remove_sound(sound_id):
+            self._update_hotkeys()
             self.sound_removed.emit(sound_id)
+            self._emit_folder_counts(folder_id)
             return True
         return False
     
+    def is_loading(self) -> bool:
+        """Check whether the library is still being loaded"""
+        return self.model.is_loading()
+    
+    def loading_progress(self) -> Tuple[int, int]:
+        """Get the number of sounds loaded so far and the number of sounds read"""
+        return self.model.loading_progress()
+    
+    def _load_more(self) -> None:
+        """Load the library for one time slice, then let the event loop run
+        
+        The first sounds loaded are reported right away, as they make up the
+        first page of the default view. After that, progress is reported
+        each time the number of loaded sounds has doubled. Views lay out all
+        of their rows on every refresh, so the refreshes of the whole load
+        add up to about twice the cost of the last one.
+        """
+        deadline = time.perf_counter() + LOAD_SLICE_MS / 1000
+        loading = True
+        while loading and time.perf_counter() < deadline:
+            loading = self.model.load_more()
+        if not loading:
+            self._update_hotkeys()
+            self.library_loaded.emit()
+            return
+        
+        loaded, total = self.model.loading_progress()
+        if loaded >= max(1, 2 * self._reported_loaded):
+            self._reported_loaded = loaded
+            self.library_loading.emit(loaded, total)
+        QTimer.singleShot(0, self._load_more)
+    
     def get_sound(self, sound_id: str) -> Optional[Dict[str, Any]]:
         """Get a sound by its ID
         
@@ -126,6 +265,241 @@ class SoundManager(QObject):
         """
         return self.model.get_all_sounds()
     
+    def search_sounds(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[str]:
+        """Search sounds by title, category and tags
+        
+        Args:
+            query: Free text query
+            limit: Maximum number of results to return, or None for all
+            fuzzy: Whether to tolerate typos in the query
+            
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        if fuzzy:
+            return self.model.fuzzy_search(query, limit)
+        return self.model.search(query, limit)
+    
+    def sort_sounds(self, sound_ids: List[str], sort_by: str = "recent") -> List[str]:
+        """Sort sounds by a sort key
+        
+        Args:
+            sound_ids: Sound IDs to sort
+            sort_by: Sort key: "recent" (last played), "added", "name", "duration", "category"
+                or "play_count"
+            
+        Returns:
+            List of sound IDs in sort order
+        """
+        return self.model.sort_sounds(sound_ids, sort_by)
+    
+    def get_sorted_sound_ids(self, sort_by: str = "recent", category: Optional[int] = None,
+                             favorites_only: bool = False) -> List[str]:
+        """Get the IDs of every sound passing a filter, in sort order
+        
+        Args:
+            sort_by: Sort key: "recent" (last played), "added", "name", "duration", "category"
+                or "play_count"
+            category: Only include sounds in this category, or None for all
+            favorites_only: Only include favorite sounds
+            
+        Returns:
+            List of sound IDs in sort order
+        """
+        return self.model.get_sorted_sound_ids(sort_by, category, favorites_only)
+    
+    def get_recent_sound_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most recently played sounds
+        
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+            
+        Returns:
+            List of sound IDs, most recently played first
+        """
+        return self.model.get_recent_sound_ids(limit)
+    
+    def get_most_played_sound_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most played sounds
+        
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+            
+        Returns:
+            List of sound IDs, most played first
+        """
+        return self.model.get_most_played_sound_ids(limit)
+    
+    def flush(self) -> None:
+        """Write pending play statistics and gains to disk"""
+        self._save_timer.stop()
+        self.model.flush()
+    
+    def filter_sounds(self, category: Any = None, favorite: Optional[bool] = None,
+                      folder: Any = None, missing_file: Optional[bool] = None,
+                      has_hotkey: Optional[bool] = None) -> List[str]:
+        """Get the sounds matching every given facet filter
+        
+        Args:
+            category: Category, or list of categories to match any of, or None for all
+            favorite: True for favorites only, False for non-favorites, None for all
+            folder: Folder ID, or list of folder IDs to match any of, or None for all
+            missing_file: True/False to keep sounds whose file is missing/present, None for all
+            has_hotkey: True/False to keep sounds with/without a hotkey, None for all
+            
+        Returns:
+            List of matching sound IDs
+        """
+        return self.model.filter_sounds(category, favorite, folder, missing_file, has_hotkey)
+    
+    def get_facet_counts(self, facet: str) -> Dict[Any, int]:
+        """Count the sounds having each value of a facet
+        
+        Args:
+            facet: "category", "favorite", "folder", "missing_file" or "has_hotkey"
+            
+        Returns:
+            Dictionary of facet value -> number of sounds
+        """
+        return self.model.get_facet_counts(facet)
+    
+    def create_folder(self, name: str, parent_id: Optional[str] = None) -> Optional[str]:
+        """Create an empty folder
+        
+        Args:
+            name: Display name of the folder
+            parent_id: ID of the parent folder, or None for a top-level folder
+            
+        Returns:
+            The folder_id of the new folder, or None if the parent does not exist
+        """
+        folder_id = str(uuid.uuid4())
+        if not self.model.add_folder(folder_id, name, parent_id):
+            return None
+        self.folder_added.emit(folder_id, self.model.get_folder(folder_id))
+        return folder_id
+    
+    def rename_folder(self, folder_id: str, name: str) -> bool:
+        """Rename a folder
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            name: New display name
+            
+        Returns:
+            True if the folder was renamed, False otherwise
+        """
+        if self.model.rename_folder(folder_id, name):
+            self.folder_updated.emit(folder_id, self.model.get_folder(folder_id))
+            return True
+        return False
+    
+    def move_folder(self, folder_id: str, parent_id: Optional[str]) -> bool:
+        """Move a folder under another parent
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            parent_id: ID of the new parent folder, or None to make it top-level
+            
+        Returns:
+            True if the folder was moved, False otherwise
+        """
+        folder = self.model.get_folder(folder_id)
+        if folder is None or not self.model.move_folder(folder_id, parent_id):
+            return False
+        self.folder_updated.emit(folder_id, self.model.get_folder(folder_id))
+        self._emit_folder_counts(folder["parent_id"], parent_id)
+        return True
+    
+    def remove_folder(self, folder_id: str) -> bool:
+        """Remove a folder, moving its subfolders and sounds up to its parent
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            
+        Returns:
+            True if the folder was removed, False otherwise
+        """
+        child_ids = [folder["id"] for folder in self.model.get_folders(folder_id)]
+        if not self.model.remove_folder(folder_id):
+            return False
+        self.folder_removed.emit(folder_id)
+        for child_id in child_ids:
+            self.folder_updated.emit(child_id, self.model.get_folder(child_id))
+        return True
+    
+    def move_sound_to_folder(self, sound_id: str, folder_id: Optional[str]) -> bool:
+        """File a sound in a folder
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            folder_id: ID of the folder, or None to take the sound out of its folder
+            
+        Returns:
+            True if the sound was moved, False otherwise
+        """
+        old_folder_id = self.model.get_sound_folder(sound_id)
+        if not self.model.move_sound_to_folder(sound_id, folder_id):
+            return False
+        if folder_id != old_folder_id:
+            self._emit_folder_counts(old_folder_id, folder_id)
+        return True
+    
+    def get_folder(self, folder_id: str) -> Optional[Dict[str, Any]]:
+        """Get a folder by its ID
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            
+        Returns:
+            Folder data dictionary or None if not found
+        """
+        return self.model.get_folder(folder_id)
+    
+    def get_folders(self, parent_id: Optional[str] = None, recursive: bool = False) -> List[Dict[str, Any]]:
+        """Get the subfolders of a folder
+        
+        Args:
+            parent_id: ID of the folder, or None for the top-level folders
+            recursive: Whether to include every folder below, parents before their children
+            
+        Returns:
+            List of folder data dictionaries
+        """
+        return self.model.get_folders(parent_id, recursive)
+    
+    def get_folder_parents(self) -> Dict[str, Optional[str]]:
+        """Get the parent folder ID of every folder
+        
+        Returns:
+            Dictionary of folder ID -> parent folder ID, None for top-level folders
+        """
+        return self.model.get_folder_parents()
+    
+    def get_folder_sound_ids(self, folder_id: str, recursive: bool = True) -> List[str]:
+        """Get the sounds in a folder
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            recursive: Whether to include the sounds in its subfolders
+            
+        Returns:
+            List of sound IDs
+        """
+        return self.model.get_folder_sound_ids(folder_id, recursive)
+    
+    def _emit_folder_counts(self, *folder_ids: Optional[str]) -> None:
+        """Emit the sound counts of some folders and their parents
+        
+        Args:
+            *folder_ids: Folders whose counts may have changed, None entries are skipped
+        """
+        counts: Dict[str, int] = {}
+        for folder_id in set(folder_ids):
+            counts.update(self.model.get_folder_path_counts(folder_id))
+        if counts:
+            self.folder_counts_changed.emit(counts)
+    
     def toggle_favorite(self, sound_id: str) -> bool:
         """Toggle a sound's favorite status
         
@@ -220,18 +594,20 @@ class SoundManager(QObject):
         """
         sound_data = self.model.get_sound(sound_id)
         if sound_data:
-            # Check if the sound has a file path
-            if 'file_path' in sound_data and os.path.exists(sound_data['file_path']):
+            # Check if the sound has a file, which also refreshes its missing_file facet
+            if self.model.check_file(sound_id):
+                gain_db = sound_data.get('gain_db', 0.0)
                 # If the sound is already loaded, play it
-                if self.audio_player.play_sound(sound_id):
+                if self.audio_player.play_sound(sound_id, gain_db):
                     return True
                     
                 # Otherwise, try to load and play it
                 if self.audio_player.load_sound(sound_id, sound_data['file_path']):
-                    return self.audio_player.play_sound(sound_id)
+                    return self.audio_player.play_sound(sound_id, gain_db)
             else:
                 # For sample sounds without real files, just emit the signal
                 self.current_playing = sound_id
+                self._record_play(sound_id)
                 self.sound_played.emit(sound_id)
                 return True
         return False
@@ -240,6 +616,395 @@ class SoundManager(QObject):
         """Stop the currently playing sound"""
         self.audio_player.stop_sound()
         self.current_playing = None
+    
+    def get_volume(self) -> float:
+        """Get the playback volume, from 0.0 to 1.0"""
+        return self.audio_player.volume
+    
+    def set_volume(self, volume: float) -> float:
+        """Set the volume, which applies to the sound playing too
+        
+        Args:
+            volume: Gain from 0.0 (silent) to 1.0 (as recorded)
+            
+        Returns:
+            The volume set, clamped to that range
+        """
+        old_volume = self.audio_player.volume
+        volume = self.audio_player.set_volume(volume)
+        if volume != old_volume:
+            self.volume_changed.emit(volume)
+        return volume
+    
+    def set_gain(self, sound_id: str, gain_db: float) -> Optional[float]:
+        """Set the gain a sound is played with from its next play on
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            gain_db: Gain in decibels, 0.0 to play the sound as recorded
+            
+        Returns:
+            The gain set, clamped to MIN_GAIN_DB..MAX_GAIN_DB, or None if the sound does not exist
+        """
+        gain_db = min(MAX_GAIN_DB, max(MIN_GAIN_DB, float(gain_db)))
+        if not self.model.set_gain(sound_id, gain_db):
+            return None
+        hotkey_sound = self._hotkey_sounds.get(sound_id)
+        if hotkey_sound is not None:
+            hotkey_sounds = dict(self._hotkey_sounds)
+            hotkey_sounds[sound_id] = (hotkey_sound[0], gain_db)
+            self._hotkey_sounds = hotkey_sounds
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+        self.sound_updated.emit(sound_id, self.model.get_sound(sound_id))
+        return gain_db
+    
+    def set_hotkey(self, sound_id: str, hotkey: Optional[str]) -> bool:
+        """Bind a global hotkey to a sound, or unbind it
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            hotkey: Chords separated by ", ", each of them modifiers and a key
+                joined by "+", e.g. "Ctrl+F1" or "Ctrl+K, 3"; or None to unbind
+            
+        Returns:
+            True if the hotkey was changed, False if the sound does not exist, the
+            hotkey is invalid, or it conflicts with the hotkey of another sound
+        """
+        sound_data = self.model.get_sound(sound_id)
+        if sound_data is None:
+            return False
+        sound_data = dict(sound_data)
+        if hotkey:
+            canonical = normalize_sequence(hotkey)
+            if canonical is None:
+                print(f"Invalid hotkey: {hotkey}")
+                return False
+            conflict = self.find_hotkey_conflict(canonical, sound_id)
+            if conflict is not None:
+                print(f"Hotkey {hotkey} conflicts with the hotkey of {conflict}")
+                return False
+            sound_data["hotkey"] = format_hotkey(canonical)
+        else:
+            sound_data.pop("hotkey", None)
+        
+        self.model.add_sound(sound_id, sound_data)
+        self._update_hotkeys()
+        self.sound_updated.emit(sound_id, sound_data)
+        return True
+    
+    def find_hotkey_conflict(self, hotkey: str, sound_id: Optional[str] = None,
+                             bank_id: Optional[str] = None, switch: bool = False) -> Optional[str]:
+        """Find what a hotkey would conflict with
+        
+        Args:
+            hotkey: The hotkey sequence
+            sound_id: The sound to bind, whose own hotkeys do not count, or None
+            bank_id: The bank whose layout the hotkey is for, or None for a hotkey
+                working in every bank
+            switch: Whether the hotkey is to switch to bank_id, so it works in every bank
+            
+        Returns:
+            The title of the conflicting sound or "bank <name>", or None if there is no conflict
+        """
+        ignore: Optional[Tuple[str, str]] = None
+        if switch:
+            if bank_id is not None:
+                ignore = (SWITCH_BANK, bank_id)
+            banks = self.hotkeys.bank_ids()
+        else:
+            if sound_id is not None:
+                ignore = (PLAY_SOUND, sound_id)
+            banks = [bank_id] if bank_id is not None else self.hotkeys.bank_ids()
+        conflict = self.hotkeys.find_conflict(hotkey, ignore, banks)
+        if conflict is None:
+            return None
+        kind, target_id = conflict
+        if kind == SWITCH_BANK:
+            return f"bank {(self.model.get_bank(target_id) or {}).get('name', target_id)}"
+        title: str = (self.model.get_sound(target_id) or {}).get("title", target_id)
+        return title
+    
+    def create_bank(self, name: str) -> str:
+        """Create an empty bank after the others
+        
+        Args:
+            name: Display name of the bank
+            
+        Returns:
+            The bank_id of the new bank
+        """
+        bank_id = str(uuid.uuid4())
+        self.model.add_bank(bank_id, name)
+        self._update_hotkeys()
+        self.bank_added.emit(bank_id, self.model.get_bank(bank_id))
+        return bank_id
+    
+    def rename_bank(self, bank_id: str, name: str) -> bool:
+        """Rename a bank
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            name: New display name
+            
+        Returns:
+            True if the bank was renamed, False otherwise
+        """
+        if self.model.rename_bank(bank_id, name):
+            self.bank_updated.emit(bank_id, self.model.get_bank(bank_id))
+            return True
+        return False
+    
+    def remove_bank(self, bank_id: str) -> bool:
+        """Remove a bank, leaving its sounds in the library
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            
+        Returns:
+            True if the bank was removed, False otherwise
+        """
+        was_active = self.model.get_active_bank_id() == bank_id
+        if not self.model.remove_bank(bank_id):
+            return False
+        self._update_hotkeys()
+        self.bank_removed.emit(bank_id)
+        if was_active:
+            self.bank_switched.emit(None)
+        return True
+    
+    def set_bank_switch_hotkey(self, bank_id: str, hotkey: Optional[str]) -> bool:
+        """Set the hotkey switching to a bank, which works whatever bank is active
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            hotkey: The hotkey sequence, or None to remove it
+            
+        Returns:
+            True if the hotkey was set, False if the bank does not exist, the
+            hotkey is invalid, or it conflicts with another hotkey
+        """
+        if self.model.get_bank(bank_id) is None:
+            return False
+        if hotkey:
+            canonical = normalize_sequence(hotkey)
+            if canonical is None:
+                print(f"Invalid hotkey: {hotkey}")
+                return False
+            conflict = self.find_hotkey_conflict(canonical, bank_id=bank_id, switch=True)
+            if conflict is not None:
+                print(f"Hotkey {hotkey} conflicts with the hotkey of {conflict}")
+                return False
+            hotkey = format_hotkey(canonical)
+        self.model.set_bank_switch_hotkey(bank_id, hotkey)
+        self._update_hotkeys()
+        self.bank_updated.emit(bank_id, self.model.get_bank(bank_id))
+        return True
+    
+    def add_sound_to_bank(self, bank_id: str, sound_id: str, hotkey: Optional[str] = None) -> bool:
+        """Put a sound in a bank, or change its hotkey there
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            sound_id: Unique identifier for the sound
+            hotkey: The hotkey sequence playing the sound while the bank is active, or None
+            
+        Returns:
+            True if the sound was set, False if the sound or bank does not exist,
+            the hotkey is invalid, or it conflicts with another hotkey of the bank
+        """
+        if self.model.get_bank(bank_id) is None or self.model.get_sound(sound_id) is None:
+            return False
+        if hotkey:
+            canonical = normalize_sequence(hotkey)
+            if canonical is None:
+                print(f"Invalid hotkey: {hotkey}")
+                return False
+            conflict = self.find_hotkey_conflict(canonical, sound_id, bank_id)
+            if conflict is not None:
+                print(f"Hotkey {hotkey} conflicts with the hotkey of {conflict}")
+                return False
+            hotkey = format_hotkey(canonical)
+        self.model.set_bank_sound(bank_id, sound_id, hotkey)
+        self._update_hotkeys()
+        self.bank_updated.emit(bank_id, self.model.get_bank(bank_id))
+        return True
+    
+    def remove_sound_from_bank(self, bank_id: str, sound_id: str) -> bool:
+        """Take a sound out of a bank
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            sound_id: Unique identifier for the sound
+            
+        Returns:
+            True if the sound was removed, False if it was not in the bank
+        """
+        if not self.model.remove_bank_sound(bank_id, sound_id):
+            return False
+        self._update_hotkeys()
+        self.bank_updated.emit(bank_id, self.model.get_bank(bank_id))
+        return True
+    
+    def switch_bank(self, bank_id: Optional[str]) -> bool:
+        """Make a bank the active one, so its hotkeys work
+        
+        The layout of every bank is compiled ahead of time, so the new
+        hotkeys work from the next key on, and the sounds of the bank are
+        kept decoded, so they play as fast as any other.
+        
+        Args:
+            bank_id: Unique identifier for the bank, or None for no bank
+            
+        Returns:
+            True if the bank is now active, False if it does not exist
+        """
+        if not self.model.set_active_bank(bank_id):
+            return False
+        self.hotkeys.switch_bank(bank_id)
+        self._prepare_bank(bank_id)
+        self.bank_switched.emit(bank_id)
+        return True
+    
+    def get_bank(self, bank_id: str) -> Optional[Dict[str, Any]]:
+        """Get a bank by its ID
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            
+        Returns:
+            Bank data dictionary or None if not found
+        """
+        return self.model.get_bank(bank_id)
+    
+    def get_banks(self) -> List[Dict[str, Any]]:
+        """Get every bank, in page order
+        
+        Returns:
+            List of bank data dictionaries
+        """
+        return self.model.get_banks()
+    
+    def get_active_bank_id(self) -> Optional[str]:
+        """Get the ID of the active bank, or None"""
+        return self.model.get_active_bank_id()
+    
+    def _prepare_bank(self, bank_id: Optional[str]) -> None:
+        """Keep the sounds of a bank and those with a hotkey decoded, decoding the missing ones in the background
+        
+        Called from the hotkey dispatch thread when a bank is switched to by its hotkey,
+        so it only reads the files noted by _update_hotkeys(), never the model.
+        
+        Args:
+            bank_id: Unique identifier for the bank, or None for no bank
+        """
+        hotkey_files = self._hotkey_files
+        file_paths = dict(hotkey_files[None])
+        if bank_id is not None:
+            file_paths.update(hotkey_files.get(bank_id, {}))
+        # Checked here rather than on each trigger; the hotkeys of missing files are left to play_sound()
+        missing = frozenset(sound_id for sound_id, file_path in file_paths.items() if not os.path.exists(file_path))
+        self._missing_hotkey_files = missing
+        file_paths = {sound_id: file_path for sound_id, file_path in file_paths.items() if sound_id not in missing}
+        self.audio_player.pin(file_paths)
+        self.audio_player.preload(file_paths)
+    
+    def _on_bank_triggered(self, bank_id: str) -> None:
+        """Record a bank switched to by its hotkey, which already switched the layout
+        
+        Args:
+            bank_id: Unique identifier for the bank
+        """
+        if self.model.set_active_bank(bank_id):
+            self.bank_switched.emit(bank_id)
+    
+    def start_hotkeys(self) -> bool:
+        """Start listening for global hotkeys
+        
+        Returns:
+            True if listening, False if the keyboard cannot be hooked here
+        """
+        return self.hotkeys.start()
+    
+    def stop_hotkeys(self) -> None:
+        """Stop listening for global hotkeys"""
+        self.hotkeys.stop()
+    
+    def _update_hotkeys(self) -> None:
+        """Bind the hotkeys of the loaded sounds and of the banks, replacing the previous bindings
+        
+        The sounds the bindings play are then kept decoded, see _prepare_bank().
+        """
+        bindings: Dict[str, str] = {}
+        for sound_id in self.model.filter_sounds(has_hotkey=True):
+            sound = self.model.get_sound(sound_id)
+            if sound is not None:
+                # Of the sounds of a hand-edited library sharing a hotkey, the first one gets it
+                bindings.setdefault(sound["hotkey"], sound_id)
+        banks = self.model.get_banks()
+        hotkey_sounds = {}
+        for sound_id in itertools.chain(bindings.values(), *(bank["sounds"] for bank in banks)):
+            sound_data = self.model.get_sound(sound_id)
+            if sound_data and sound_data.get("file_path"):
+                hotkey_sounds[sound_id] = (sound_data["file_path"], sound_data.get("gain_db", 0.0))
+        hotkey_files = {}
+        for bank_id, sound_ids in itertools.chain([(None, bindings.values())],
+                                                  ((bank["id"], bank["sounds"]) for bank in banks)):
+            hotkey_files[bank_id] = {sound_id: hotkey_sounds[sound_id][0]
+                                     for sound_id in sound_ids if sound_id in hotkey_sounds}
+        self._hotkey_sounds = hotkey_sounds
+        self._hotkey_files = hotkey_files
+        self.hotkeys.set_layouts(
+            bindings,
+            {bank["id"]: {hotkey: sound_id for sound_id, hotkey in bank["sounds"].items() if hotkey} for bank in banks},
+            {bank["hotkey"]: bank["id"] for bank in banks if bank["hotkey"]},
+            self.model.get_active_bank_id()
+        )
+        self._prepare_bank(self.model.get_active_bank_id())
+    
+    def _is_bound(self, sound_id: str) -> bool:
+        """Check whether a sound has a hotkey or is in a bank, so that changing it changes the bindings
+        
+        Args:
+            sound_id: Unique identifier for the sound
+        """
+        sound_data = self.model.get_sound(sound_id)
+        return bool(sound_data and sound_data.get("hotkey")) or self.model.is_in_bank(sound_id)
+    
+    def _play_from_hotkey(self, sound_id: str) -> bool:
+        """Play a sound from the hotkey dispatch thread, without the GUI thread
+        
+        The audio player's signals are queued to the GUI thread, where the
+        play is recorded as usual. The sound is read from the snapshot taken
+        by _update_hotkeys(), never from the model.
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            
+        Returns:
+            True if the sound has a file, which was played or failed to play,
+            False to leave sounds without a file to play_sound()
+        """
+        hotkey_sound = self._hotkey_sounds.get(sound_id)
+        if hotkey_sound is None or sound_id in self._missing_hotkey_files:
+            return False
+        file_path, gain_db = hotkey_sound
+        if not self.audio_player.is_loaded(sound_id):
+            # Decoding would hold up the hotkeys pressed meanwhile
+            self.audio_player.play_when_loaded(sound_id, file_path, gain_db)
+            return True
+        self.audio_player.play_sound(sound_id, gain_db)
+        return True
+    
+    def _on_hotkey_triggered(self, sound_id: str, handled: bool) -> None:
+        """Finish playing a hotkey's sound on the GUI thread
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            handled: Whether the dispatch thread already played it
+        """
+        if not handled:
+            self.play_sound(sound_id)
         
     def _on_playback_started(self, sound_id: str) -> None:
         """Handle when playback starts
@@ -248,7 +1013,17 @@ class SoundManager(QObject):
             sound_id: Unique identifier for the sound
         """
         self.current_playing = sound_id
+        self._record_play(sound_id)
         self.sound_played.emit(sound_id)
+    
+    def _record_play(self, sound_id: str) -> None:
+        """Count a play and schedule saving the statistics
+        
+        Args:
+            sound_id: Unique identifier for the sound
+        """
+        if self.model.record_play(sound_id) is not None and not self._save_timer.isActive():
+            self._save_timer.start()
         
     def _on_playback_stopped(self, sound_id: str) -> None:
         """Handle when playback stops
@@ -257,6 +1032,7 @@ class SoundManager(QObject):
             sound_id: Unique identifier for the sound
         """
         self.current_playing = None
+        self.sound_stopped.emit(sound_id)
         
     def _on_playback_error(self, sound_id: str, error_message: str) -> None:
         """Handle playback errors
@@ -0,0 +1,69 @@
+"""Startup phase timing for the soundboard application"""
+
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+# Phases of a launch, in the order they complete
+STARTUP_PHASES = ("imports", "model load", "audio init", "first paint", "interactive")
+
+
+class StartupProfile:
+    """Records when each phase of the application launch completes
+
+    Marks are cheap and always recorded, so the launch code marks its phases
+    unconditionally; the report is only printed when profiling was asked
+    for with --profile-startup. Times count from the creation of the
+    profile, which happens when this module is first imported.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profile, starting the clock"""
+        self.started_at = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []  # (phase, seconds since start)
+        self.enabled = False
+
+    def mark(self, phase: str) -> None:
+        """Record that a phase completed, unless it already did
+
+        Args:
+            phase: Name of the phase, one of STARTUP_PHASES
+        """
+        if self.elapsed(phase) is None:
+            self.marks.append((phase, time.perf_counter() - self.started_at))
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """Get the seconds from the start to the end of a phase
+
+        Args:
+            phase: Name of the phase
+
+        Returns:
+            Seconds since the start, or None if the phase has not completed
+        """
+        for name, seconds in self.marks:
+            if name == phase:
+                return seconds
+        return None
+
+    def report(self) -> str:
+        """Format the phases with their end time and duration"""
+        lines = []
+        previous = 0.0
+        for phase, seconds in self.marks:
+            lines.append(f"startup {phase:<12} {seconds * 1000:8.1f} ms  (+{(seconds - previous) * 1000:.1f} ms)")
+            previous = seconds
+        return "\n".join(lines)
+
+    def print_report(self, stream: TextIO = sys.stderr) -> None:
+        """Print the report if profiling is enabled
+
+        Args:
+            stream: Where to print the report
+        """
+        if self.enabled:
+            print(self.report(), file=stream, flush=True)
+
+
+# The profile of the running application
+startup_profile = StartupProfile()
@@ -0,0 +1,278 @@
+"""Bitset facet indexes for combining sound library filters"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+# Facets maintained for every sound
+FACETS = ("category", "favorite", "folder", "missing_file", "has_hotkey")
+
+
+def popcount(bits: int) -> int:
+    """Count the set bits of a bitmap
+
+    Args:
+        bits: Bitmap as a Python int
+
+    Returns:
+        Number of set bits
+    """
+    return bin(bits).count("1")
+
+
+class FacetIndex:
+    """Bitmaps of the sounds having each value of each facet
+
+    Every sound is given a bit position. For each facet value, a Python int
+    has the bits of the sounds with that value set, so any combination of
+    filters is a handful of bitwise AND/OR operations and a popcount,
+    however large the library is. Bit positions follow insertion order, so
+    bitmaps list sounds in the order they were added. Positions of removed
+    sounds are not reused; once they are more than half of them, the
+    positions are compacted, keeping the order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty facet index"""
+        self._positions: Dict[str, int] = {}  # sound ID -> bit position
+        self._ids: List[Optional[str]] = []  # bit position -> sound ID, None once removed
+        self._removed = 0  # Positions of removed sounds in _ids
+        self._all = 0
+        self._bitmaps: Dict[str, Dict[Hashable, int]] = {facet: {} for facet in FACETS}
+        self._values: Dict[str, Dict[str, Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, sound_id: str) -> bool:
+        return sound_id in self._positions
+
+    @property
+    def all(self) -> int:
+        """Bitmap of every sound in the index"""
+        return self._all
+
+    def clear(self) -> None:
+        """Remove every sound"""
+        self._positions.clear()
+        self._ids.clear()
+        self._removed = 0
+        self._all = 0
+        self._bitmaps = {facet: {} for facet in FACETS}
+        self._values.clear()
+
+    def add(self, sound_id: str, values: Dict[str, Any]) -> None:
+        """Add a sound, or replace its facet values if it is already present
+
+        Args:
+            sound_id: Unique identifier for the sound
+            values: Dictionary of facet -> value, None or missing facets are left unset
+        """
+        position = self._positions.get(sound_id)
+        if position is None:
+            position = len(self._ids)
+            self._ids.append(sound_id)
+            self._positions[sound_id] = position
+            self._all |= 1 << position
+            self._values[sound_id] = {}
+
+        for facet in FACETS:
+            self.set(sound_id, facet, values.get(facet))
+
+    def remove(self, sound_id: str) -> bool:
+        """Remove a sound from every facet
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            True if the sound was removed, False if it was not present
+        """
+        if sound_id not in self._positions:
+            return False
+        for facet in FACETS:
+            self.set(sound_id, facet, None)
+        position = self._positions.pop(sound_id)
+        del self._values[sound_id]
+        self._ids[position] = None
+        self._all &= ~(1 << position)
+        self._removed += 1
+        if self._removed * 2 > len(self._ids):
+            self._compact()
+        return True
+
+    def set(self, sound_id: str, facet: str, value: Any) -> None:
+        """Move a sound to another value of a facet
+
+        Boolean facets only keep a bitmap for True, False and None both clear it.
+
+        Args:
+            sound_id: Unique identifier for the sound
+            facet: One of FACETS
+            value: New facet value, or None to clear it
+        """
+        position = self._positions.get(sound_id)
+        if position is None:
+            return
+        if value is False:
+            value = None
+
+        values = self._values[sound_id]
+        old = values.get(facet)
+        if old == value:
+            return
+
+        bit = 1 << position
+        bitmaps = self._bitmaps[facet]
+        if old is not None:
+            remaining = bitmaps[old] & ~bit
+            if remaining:
+                bitmaps[old] = remaining
+            else:
+                del bitmaps[old]
+        if value is None:
+            values.pop(facet, None)
+        else:
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+            values[facet] = value
+
+    def bitmap(self, facet: str, value: Any = True) -> int:
+        """Get the bitmap of the sounds having a facet value
+
+        Args:
+            facet: One of FACETS
+            value: Facet value, or an iterable of values to OR together
+
+        Returns:
+            Bitmap as a Python int
+        """
+        bitmaps = self._bitmaps[facet]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            bits = 0
+            for item in value:
+                bits |= bitmaps.get(item, 0)
+            return bits
+        return bitmaps.get(value, 0)
+
+    def query(self, **filters: Any) -> int:
+        """AND together facet filters
+
+        Example: query(category=(1, 2), favorite=True, missing_file=False)
+
+        Args:
+            **filters: facet=value pairs, a None value ignores the facet,
+                False on a boolean facet keeps the sounds without it,
+                and a list or tuple of values matches any of them
+
+        Returns:
+            Bitmap of the matching sounds
+        """
+        bits = self._all
+        for facet, value in filters.items():
+            if value is None:
+                continue
+            if value is False:
+                bits &= ~self.bitmap(facet, True)
+            else:
+                bits &= self.bitmap(facet, value)
+        return bits
+
+    def count(self, bits: int) -> int:
+        """Count the sounds in a bitmap"""
+        return popcount(bits)
+
+    def counts(self, facet: str, within: Optional[int] = None) -> Dict[Hashable, int]:
+        """Count the sounds having each value of a facet
+
+        Args:
+            facet: One of FACETS
+            within: Only count the sounds in this bitmap, or None for all
+
+        Returns:
+            Dictionary of facet value -> number of sounds
+        """
+        if within is None:
+            return {value: popcount(bits) for value, bits in self._bitmaps[facet].items()}
+        return {value: popcount(bits & within) for value, bits in self._bitmaps[facet].items()}
+
+    def ids(self, bits: int) -> List[str]:
+        """Get the sound IDs in a bitmap, in the order they were added
+
+        Args:
+            bits: Bitmap as returned by bitmap() or query()
+
+        Returns:
+            List of sound IDs
+        """
+        if not bits:
+            return []
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        flags = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+        ids = self._ids
+        return [ids[position] for position in np.flatnonzero(flags).tolist()]
+
+    def contains(self, bits: int, sound_id: str) -> bool:
+        """Check whether a sound is in a bitmap"""
+        position = self._positions.get(sound_id)
+        return position is not None and bool(bits >> position & 1)
+
+    def values(self, sound_id: str) -> Dict[str, Hashable]:
+        """Get the facet values of a sound, which must not be modified"""
+        return self._values.get(sound_id, {})
+
+    def rebuild(self, sound_values: Iterable) -> None:
+        """Rebuild the index from (sound_id, facet values) pairs
+
+        Args:
+            sound_values: Iterable of (sound_id, dictionary of facet -> value)
+        """
+        self.clear()
+        self.extend(sound_values)
+
+    def extend(self, sound_values: Iterable) -> None:
+        """Add a batch of sounds, e.g. one chunk of a library being loaded
+
+        Bitmaps are assembled per facet value for the whole batch instead of
+        being re-created for every sound. Sounds already present have their
+        values replaced instead.
+
+        Args:
+            sound_values: Iterable of (sound_id, dictionary of facet -> value)
+        """
+        members: Dict[str, Dict[Hashable, List[int]]] = {facet: {} for facet in FACETS}
+        start = len(self._ids)
+        for sound_id, values in sound_values:
+            if sound_id in self._positions:
+                self.add(sound_id, values)
+                continue
+            position = len(self._ids)
+            self._positions[sound_id] = position
+            self._ids.append(sound_id)
+            kept = {}
+            for facet in FACETS:
+                value = values.get(facet)
+                if value is None or value is False:
+                    continue
+                kept[facet] = value
+                members[facet].setdefault(value, []).append(position)
+            self._values[sound_id] = kept
+
+        self._all |= self._bits_of(range(start, len(self._ids)))
+        for facet, by_value in members.items():
+            bitmaps = self._bitmaps[facet]
+            for value, positions in by_value.items():
+                bitmaps[value] = bitmaps.get(value, 0) | self._bits_of(positions)
+
+    def _compact(self) -> None:
+        """Give the sounds consecutive bit positions again, in the same order"""
+        values = self._values
+        self.rebuild([(sound_id, values[sound_id]) for sound_id in self._ids if sound_id is not None])
+
+    def _bits_of(self, positions: Iterable[int]) -> int:
+        """Build a bitmap from bit positions"""
+        positions = np.fromiter(positions, dtype=np.int64)
+        if not len(positions):
+            return 0
+        flags = np.zeros(int(positions.max()) + 1, dtype=np.uint8)
+        flags[positions] = 1
+        return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
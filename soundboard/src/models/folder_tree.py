@@ -0,0 +1,320 @@
+"""Folder hierarchy of the sound library with materialized sound counts"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class FolderTree:
+    """Folders, their parent pointers and the sounds filed in them
+
+    Every folder keeps its direct members and a materialized count of the
+    sounds in its whole subtree. Filing, moving or removing a sound only
+    walks the ancestors of the folders involved, so counts are updated in
+    O(depth) instead of recounting the library. Each change returns the
+    folders whose recursive count changed, so views can update just those.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty folder tree"""
+        self._folders: Dict[str, Dict[str, Any]] = {}  # folder ID -> {"name", "parent_id"}
+        self._children: Dict[Optional[str], List[str]] = {None: []}  # parent ID -> child IDs
+        self._members: Dict[str, Set[str]] = {}  # folder ID -> sounds filed directly in it
+        self._totals: Dict[str, int] = {}  # folder ID -> sounds in its subtree
+        self._sound_folder: Dict[str, str] = {}  # sound ID -> folder ID
+
+    def __len__(self) -> int:
+        return len(self._folders)
+
+    def __contains__(self, folder_id: Any) -> bool:
+        return folder_id in self._folders
+
+    def clear(self) -> None:
+        """Remove every folder and sound"""
+        self._folders.clear()
+        self._children = {None: []}
+        self._members.clear()
+        self._totals.clear()
+        self._sound_folder.clear()
+
+    def add_folder(self, folder_id: str, name: str, parent_id: Optional[str] = None) -> bool:
+        """Add an empty folder
+
+        Args:
+            folder_id: Unique identifier for the folder
+            name: Display name of the folder
+            parent_id: ID of the parent folder, or None for a top-level folder
+
+        Returns:
+            True if the folder was added, False if the ID is taken or the parent is unknown
+        """
+        if folder_id in self._folders or (parent_id is not None and parent_id not in self._folders):
+            return False
+        self._folders[folder_id] = {"name": name, "parent_id": parent_id}
+        self._children[folder_id] = []
+        self._children[parent_id].append(folder_id)
+        self._members[folder_id] = set()
+        self._totals[folder_id] = 0
+        return True
+
+    def rename_folder(self, folder_id: str, name: str) -> bool:
+        """Rename a folder
+
+        Args:
+            folder_id: Unique identifier for the folder
+            name: New display name
+
+        Returns:
+            True if the folder was renamed, False if it does not exist
+        """
+        folder = self._folders.get(folder_id)
+        if folder is None:
+            return False
+        folder["name"] = name
+        return True
+
+    def move_folder(self, folder_id: str, parent_id: Optional[str]) -> Optional[Dict[str, int]]:
+        """Move a folder, with its subtree, under another parent
+
+        Args:
+            folder_id: Unique identifier for the folder
+            parent_id: ID of the new parent, or None to make it top-level
+
+        Returns:
+            Dictionary of folder ID -> new recursive count for every folder whose count changed,
+            or None if the move is not possible (unknown folder, or a move into its own subtree)
+        """
+        folder = self._folders.get(folder_id)
+        if folder is None:
+            return None
+        if parent_id is not None and (parent_id not in self._folders or folder_id in self.path(parent_id)):
+            return None
+        if folder["parent_id"] == parent_id:
+            return {}
+
+        total = self._totals[folder_id]
+        old_parent = folder["parent_id"]
+        changed = self._add_to_ancestors(old_parent, -total)
+        self._children[old_parent].remove(folder_id)
+        folder["parent_id"] = parent_id
+        self._children[parent_id].append(folder_id)
+        changed.update(self._add_to_ancestors(parent_id, total))
+        return changed
+
+    def remove_folder(self, folder_id: str) -> Optional[List[str]]:
+        """Remove a folder, moving its subfolders and sounds up to its parent
+
+        Everything stays under the same ancestors, so no recursive count changes.
+
+        Args:
+            folder_id: Unique identifier for the folder
+
+        Returns:
+            IDs of the sounds that were refiled, or None if the folder does not exist
+        """
+        folder = self._folders.get(folder_id)
+        if folder is None:
+            return None
+
+        parent_id = folder["parent_id"]
+        for child_id in self._children.pop(folder_id):
+            self._folders[child_id]["parent_id"] = parent_id
+            self._children[parent_id].append(child_id)
+        self._children[parent_id].remove(folder_id)
+
+        sound_ids = list(self._members.pop(folder_id))
+        del self._totals[folder_id]
+        del self._folders[folder_id]
+        for sound_id in sound_ids:
+            if parent_id is None:
+                del self._sound_folder[sound_id]
+            else:
+                self._sound_folder[sound_id] = parent_id
+                self._members[parent_id].add(sound_id)
+        return sound_ids
+
+    def set_sound_folder(self, sound_id: str, folder_id: Optional[str]) -> Dict[str, int]:
+        """File a sound in a folder, or take it out of every folder
+
+        Args:
+            sound_id: Unique identifier for the sound
+            folder_id: ID of the folder, or None (or an unknown ID) for no folder
+
+        Returns:
+            Dictionary of folder ID -> new recursive count for every folder whose count changed
+        """
+        if folder_id not in self._folders:
+            folder_id = None
+        old_id = self._sound_folder.get(sound_id)
+        if old_id == folder_id:
+            return {}
+
+        changed: Dict[str, int] = {}
+        if old_id is not None:
+            self._members[old_id].discard(sound_id)
+            del self._sound_folder[sound_id]
+            changed.update(self._add_to_ancestors(old_id, -1))
+        if folder_id is not None:
+            self._members[folder_id].add(sound_id)
+            self._sound_folder[sound_id] = folder_id
+            changed.update(self._add_to_ancestors(folder_id, 1))
+        return changed
+
+    def remove_sound(self, sound_id: str) -> Dict[str, int]:
+        """Take a sound out of the tree
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            Dictionary of folder ID -> new recursive count for every folder whose count changed
+        """
+        return self.set_sound_folder(sound_id, None)
+
+    def get_folder(self, folder_id: str) -> Optional[Dict[str, Any]]:
+        """Get a folder record
+
+        Args:
+            folder_id: Unique identifier for the folder
+
+        Returns:
+            Dictionary with id, name, parent_id, count (recursive) and direct_count,
+            or None if the folder does not exist
+        """
+        folder = self._folders.get(folder_id)
+        if folder is None:
+            return None
+        return {
+            "id": folder_id,
+            "name": folder["name"],
+            "parent_id": folder["parent_id"],
+            "count": self._totals[folder_id],
+            "direct_count": len(self._members[folder_id]),
+        }
+
+    def children(self, parent_id: Optional[str] = None) -> List[str]:
+        """Get the IDs of the subfolders of a folder, in creation order
+
+        Args:
+            parent_id: ID of the folder, or None for the top-level folders
+        """
+        return list(self._children.get(parent_id, ()))
+
+    def walk(self, folder_id: Optional[str] = None) -> List[Tuple[str, int]]:
+        """List a subtree depth first
+
+        Args:
+            folder_id: Root of the subtree (not included), or None for the whole tree
+
+        Returns:
+            List of (folder ID, depth below the root) pairs, parents before children
+        """
+        walked = []
+        stack = [(child_id, 0) for child_id in reversed(self._children.get(folder_id, ()))]
+        while stack:
+            child_id, depth = stack.pop()
+            walked.append((child_id, depth))
+            stack.extend((grandchild_id, depth + 1) for grandchild_id in reversed(self._children[child_id]))
+        return walked
+
+    def descendants(self, folder_id: str) -> List[str]:
+        """Get a folder and every folder below it"""
+        if folder_id not in self._folders:
+            return []
+        return [folder_id] + [child_id for child_id, _ in self.walk(folder_id)]
+
+    def path(self, folder_id: Optional[str]) -> List[str]:
+        """Get the IDs from the top-level folder down to a folder"""
+        path = []
+        while folder_id is not None and folder_id in self._folders:
+            path.append(folder_id)
+            folder_id = self._folders[folder_id]["parent_id"]
+        path.reverse()
+        return path
+
+    def parents(self) -> Dict[str, Optional[str]]:
+        """Get the parent ID of every folder"""
+        return {folder_id: folder["parent_id"] for folder_id, folder in self._folders.items()}
+
+    def folder_of(self, sound_id: str) -> Optional[str]:
+        """Get the folder a sound is filed in, or None"""
+        return self._sound_folder.get(sound_id)
+
+    def sound_ids(self, folder_id: str) -> Set[str]:
+        """Get the sounds filed directly in a folder, which must not be modified"""
+        return self._members.get(folder_id, set())
+
+    def sound_count(self, folder_id: str, recursive: bool = True) -> int:
+        """Count the sounds in a folder
+
+        Args:
+            folder_id: Unique identifier for the folder
+            recursive: Whether to include the sounds in its subfolders
+        """
+        if folder_id not in self._folders:
+            return 0
+        if recursive:
+            return self._totals[folder_id]
+        return len(self._members[folder_id])
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Get the folder records for saving, parents listed before their children"""
+        return {
+            folder_id: dict(self._folders[folder_id])
+            for folder_id, _ in self.walk()
+        }
+
+    def rebuild(self, folders: Dict[str, Dict[str, Any]], sound_folders: Iterable) -> None:
+        """Rebuild the tree from saved folder records and sound membership
+
+        Folders whose parent is missing, or that form a cycle, become top-level.
+
+        Args:
+            folders: Dictionary of folder ID -> {"name", "parent_id"}
+            sound_folders: Iterable of (sound ID, folder ID or None)
+        """
+        self.clear()
+        parents = {}
+        for folder_id, folder in folders.items():
+            self._folders[folder_id] = {"name": folder.get("name", ""), "parent_id": None}
+            self._children[folder_id] = []
+            self._members[folder_id] = set()
+            self._totals[folder_id] = 0
+            parents[folder_id] = folder.get("parent_id")
+
+        for folder_id, parent_id in parents.items():
+            if parent_id in self._folders and not self._reaches(parent_id, folder_id, parents):
+                self._folders[folder_id]["parent_id"] = parent_id
+            else:
+                parent_id = None
+            self._children[parent_id].append(folder_id)
+
+        for sound_id, folder_id in sound_folders:
+            if folder_id in self._members:
+                self._members[folder_id].add(sound_id)
+                self._sound_folder[sound_id] = folder_id
+
+        # Accumulate the totals bottom-up in a single pass
+        for folder_id, _ in reversed(self.walk()):
+            total = len(self._members[folder_id]) + sum(self._totals[child] for child in self._children[folder_id])
+            self._totals[folder_id] = total
+
+    def _reaches(self, start: str, target: str, parents: Dict[str, Optional[str]]) -> bool:
+        """Check whether following saved parent pointers from start leads to target"""
+        seen = set()
+        folder_id: Optional[str] = start
+        while folder_id is not None and folder_id not in seen:
+            if folder_id == target:
+                return True
+            seen.add(folder_id)
+            folder_id = parents.get(folder_id)
+        return False
+
+    def _add_to_ancestors(self, folder_id: Optional[str], delta: int) -> Dict[str, int]:
+        """Add to the recursive count of a folder and all of its ancestors"""
+        changed: Dict[str, int] = {}
+        if not delta:
+            return changed
+        while folder_id is not None:
+            self._totals[folder_id] += delta
+            changed[folder_id] = self._totals[folder_id]
+            folder_id = self._folders[folder_id]["parent_id"]
+        return changed
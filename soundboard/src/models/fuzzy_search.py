@@ -0,0 +1,332 @@
+"""Typo-tolerant search on top of the soundboard search index"""
+
+from collections import OrderedDict
+from typing import AbstractSet, Dict, List, Optional, Set, Tuple
+
+from models.search_index import (
+    RANK_COUNT, SearchIndex, WORD_PREFIX, WORD_SUBSTRING, normalize_text, tokenize
+)
+
+# Word score of a fuzzy match is WORD_FUZZY + edit distance - 1
+WORD_FUZZY = WORD_SUBSTRING + 1
+
+# Largest edit distance ever accepted, candidates further away are dropped for good
+MAX_DISTANCE = 2
+
+# Number of term states kept for backspacing and retyping
+MEMO_SIZE = 256
+
+# Number of multi-word query candidate sets kept
+QUERY_MEMO_SIZE = 32
+
+# Terms this short match words all over the index and never tolerate typos, so a
+# multi-word query keeps the candidates of the terms before them as they are
+SHORT_TERM = 2
+
+# Narrow candidates with set intersections when the matching postings are at most
+# this many times the candidates, checking each candidate's words is cheaper otherwise
+SET_NARROW_RATIO = 8
+
+# A pair of edit distance rows: (row for the query minus its last character, row for the query)
+Rows = Tuple[Optional[List[int]], List[int]]
+
+
+def allowed_distance(term_length: int) -> int:
+    """Get the number of typos tolerated for a term of the given length
+
+    Args:
+        term_length: Number of characters in the term
+
+    Returns:
+        Maximum edit distance for a fuzzy match
+    """
+    if term_length <= 3:
+        return 0
+    if term_length <= 6:
+        return 1
+    return MAX_DISTANCE
+
+
+class _TermState:
+    """Candidate words for one search term"""
+
+    __slots__ = ("term", "prefix", "substring", "rows")
+
+    def __init__(self, term: str, prefix: Set[str], substring: Set[str], rows: Dict[str, Rows]):
+        self.term = term
+        self.prefix = prefix  # words starting with the term
+        self.substring = substring  # words containing the term elsewhere
+        self.rows = rows  # words still within MAX_DISTANCE of the term -> edit distance rows
+
+    def words(self) -> Set[str]:
+        """Get every word that may still match once the term grows"""
+        if len(self.term) == 1:
+            return set(self.prefix)
+        words = self.prefix | self.substring
+        words.update(self.rows)
+        return words
+
+    def word_scores(self) -> Dict[str, int]:
+        """Score the candidate words, lower is better"""
+        # A single letter somewhere inside a word says nothing, only word starts count
+        if len(self.term) == 1:
+            return dict.fromkeys(self.prefix, WORD_PREFIX)
+        scores = dict.fromkeys(self.substring, WORD_SUBSTRING)
+        scores.update(dict.fromkeys(self.prefix, WORD_PREFIX))
+
+        max_distance = allowed_distance(len(self.term))
+        if max_distance:
+            for word, (_, row) in self.rows.items():
+                if word not in scores:
+                    distance = min(row)
+                    if distance <= max_distance:
+                        scores[word] = WORD_FUZZY + distance - 1
+        return scores
+
+
+class _QueryState:
+    """Candidate sounds for a multi-word query"""
+
+    __slots__ = ("base", "survivors", "scores")
+
+    def __init__(self, base: Dict[str, int], survivors: AbstractSet[str], scores: Dict[str, int]):
+        self.base = base  # sound ID -> score of every term but the last
+        self.survivors = survivors  # sounds that may still match once the last term grows
+        self.scores = scores  # sounds matching every term -> total score
+
+
+class FuzzySearcher:
+    """Fuzzy, ranked search with per-keystroke refinement
+
+    Matches are ranked title prefix > word start > substring > edit distance.
+    Typo tolerance is a prefix edit distance (with transpositions) against
+    words sharing the first letter of the term, so "aplause" finds
+    "Applause" while the user is still typing.
+
+    The candidate words of every term are memoized. When the query grows by
+    a character, only the previous candidates are re-checked, and the edit
+    distance rows are extended by one row instead of being recomputed.
+    Multi-word queries memoize their scored sounds the same way, so typing
+    into the last word only re-checks the sounds that matched before it.
+    """
+
+    def __init__(self, index: SearchIndex):
+        """Initialize the fuzzy searcher
+
+        Args:
+            index: Search index to search in
+        """
+        self.index = index
+        self._memo: "OrderedDict[str, _TermState]" = OrderedDict()
+        # Scored candidates of multi-word queries, keyed by their terms
+        self._query_memo: "OrderedDict[Tuple[str, ...], _QueryState]" = OrderedDict()
+        self._memo_version = index.version
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Search with typo tolerance
+
+        Args:
+            query: Free text query
+            limit: Maximum number of results to return, or None for all
+
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        normalized = normalize_text(query).strip()
+        terms = list(dict.fromkeys(tokenize(normalized)))
+        if not terms:
+            return []
+
+        if self._memo_version != self.index.version:
+            self.clear_cache()
+
+        states = [self._term_state(term) for term in terms]
+        if len(terms) == 1:
+            results = self.index.rank_matches(normalized, [states[0].word_scores()], limit)
+            if query[-1:].isspace():
+                # A second word is coming: score the sounds of the first one now, so its
+                # first letters only narrow them down
+                self._query_state((terms[0],), states)
+            return results
+
+        query_state = self._query_state(tuple(terms), states)
+        return self.index.rank_scored(normalized, query_state.scores, limit)
+
+    def clear_cache(self) -> None:
+        """Drop every memoized term and query"""
+        self._memo.clear()
+        self._query_memo.clear()
+        self._memo_version = self.index.version
+
+    def _query_state(self, terms: Tuple[str, ...], states: List[_TermState]) -> "_QueryState":
+        """Get the scored candidates of a query
+
+        Typing into the last word only re-checks the candidates of the query
+        as it was one keystroke earlier, and starting a new word only
+        re-checks the matches of the words before it.
+        """
+        query_state = self._query_memo.get(terms)
+        if query_state is not None:
+            self._query_memo.move_to_end(terms)
+            return query_state
+
+        if len(terms) == 1:
+            # Only ever the words before a new one, scored once for everything typed after them
+            scores = self._term_scores(states[0].word_scores())
+            query_state = _QueryState({}, set(), scores)
+        else:
+            last = terms[-1]
+            previous = None
+            if len(last) > 1:
+                previous = self._query_memo.get(terms[:-1] + (last[:-1],))
+            if previous is not None:
+                query_state = self._narrow(previous.survivors, previous.base, states[-1])
+            else:
+                base = self._query_state(terms[:-1], states[:-1]).scores
+                query_state = self._narrow(base.keys(), base, states[-1])
+        self._query_memo[terms] = query_state
+        while len(self._query_memo) > QUERY_MEMO_SIZE:
+            self._query_memo.popitem(last=False)
+        return query_state
+
+    def _term_scores(self, word_scores: Dict[str, int]) -> Dict[str, int]:
+        """Score every sound containing one of the words of a term"""
+        scores: Dict[str, int] = {}
+        for word, word_score in word_scores.items():
+            base = word_score * RANK_COUNT
+            postings = self.index.postings(word)
+            if not scores:
+                scores = {sound_id: base + rank for sound_id, rank in postings.items()}
+                continue
+            # Few sounds contain several matching words, only those are compared
+            for sound_id in postings.keys() & scores.keys():
+                score = base + postings[sound_id]
+                if score < scores[sound_id]:
+                    scores[sound_id] = score
+            scores.update({sound_id: base + postings[sound_id] for sound_id in postings.keys() - scores.keys()})
+        return scores
+
+    def _narrow(
+        self, pool: AbstractSet[str], base: Dict[str, int], state: _TermState
+    ) -> "_QueryState":
+        """Keep the sounds of a pool that may match the term, scoring those that already do"""
+        postings = self.index.postings
+        doc_words = self.index.doc_words
+        if len(state.term) <= SHORT_TERM:
+            # Any sound of the pool may still match once the term grows: keep them all
+            # rather than gathering the postings of every word the term might become
+            survivors = pool
+        else:
+            words = state.words()
+            if sum(len(postings(word)) for word in words) <= SET_NARROW_RATIO * len(pool):
+                survivors = set().union(*(postings(word).keys() & pool for word in words))
+            else:
+                survivors = {
+                    sound_id for sound_id in pool
+                    if not words.isdisjoint([word for word, _ in doc_words(sound_id)])
+                }
+
+        offsets = {word: score * RANK_COUNT for word, score in state.word_scores().items()}
+        scores: Dict[str, int] = {}
+        if sum(len(postings(word)) for word in offsets) <= SET_NARROW_RATIO * len(survivors):
+            # Intersect the postings of the matching words with the pool, scoring only the hits
+            for word, offset in offsets.items():
+                ranks = postings(word)
+                hits = ranks.keys() & survivors
+                for sound_id in hits & scores.keys():
+                    score = base[sound_id] + offset + ranks[sound_id]
+                    if score < scores[sound_id]:
+                        scores[sound_id] = score
+                scores.update({
+                    sound_id: base[sound_id] + offset + ranks[sound_id] for sound_id in hits - scores.keys()
+                })
+        else:
+            for sound_id in survivors:
+                matches = [offsets[word] + rank for word, rank in doc_words(sound_id) if word in offsets]
+                if matches:
+                    scores[sound_id] = base[sound_id] + min(matches)
+        return _QueryState(base, survivors, scores)
+
+    def _term_state(self, term: str) -> _TermState:
+        """Get the candidate words of a term, refining the longest memoized prefix"""
+        state = self._memo.get(term)
+        if state is not None:
+            self._memo.move_to_end(term)
+            return state
+
+        # Start from the longest prefix of the term we have already seen
+        length = len(term) - 1
+        while length > 0 and term[:length] not in self._memo:
+            length -= 1
+        if length:
+            state = self._memo[term[:length]]
+        else:
+            state = self._initial_state(term[0])
+            self._remember(state)
+            length = 1
+
+        for end in range(length + 1, len(term) + 1):
+            state = self._refine(state, term[:end])
+            self._remember(state)
+        return state
+
+    def _remember(self, state: _TermState) -> None:
+        """Memoize a term state, evicting the least recently used one"""
+        self._memo[state.term] = state
+        self._memo.move_to_end(state.term)
+        while len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+
+    def _initial_state(self, char: str) -> _TermState:
+        """Build the candidates of a one character term from the index"""
+        containing = self.index.words_with_gram(char)
+        prefix = {word for word in containing if word.startswith(char)}
+        substring = containing - prefix
+        # Fuzzy candidates have to share the first letter, which typos rarely hit
+        rows: Dict[str, Rows] = {word: (None, self._first_row(char, word)) for word in prefix}
+        return _TermState(char, prefix, substring, rows)
+
+    def _refine(self, state: _TermState, term: str) -> _TermState:
+        """Narrow the candidates of a term down to the candidates of term + one character"""
+        prefix = {word for word in state.prefix if word.startswith(term)}
+        substring = {word for word in state.substring if term in word}
+        substring.update(word for word in state.prefix if word not in prefix and term in word)
+
+        rows: Dict[str, Rows] = {}
+        for word, (previous_row, row) in state.rows.items():
+            next_row = self._next_row(term, word, previous_row, row)
+            # Rows never get cheaper, so once two in a row are out of reach the word is done
+            if min(next_row) <= MAX_DISTANCE or min(row) <= MAX_DISTANCE:
+                rows[word] = (row, next_row)
+        return _TermState(term, prefix, substring, rows)
+
+    @staticmethod
+    def _first_row(char: str, word: str) -> List[int]:
+        """Edit distances between a one character term and every prefix of a word"""
+        row = [1]
+        for j, word_char in enumerate(word, 1):
+            row.append(min(row[j - 1] + 1, j + 1, j - 1 + (word_char != char)))
+        return row
+
+    @staticmethod
+    def _next_row(
+        term: str, word: str, previous_row: Optional[List[int]], row: List[int]
+    ) -> List[int]:
+        """Extend the edit distance table by the last character of the term
+
+        Uses the optimal string alignment distance, so a swap of two adjacent
+        characters counts as a single edit.
+        """
+        i = len(term)
+        char = term[-1]
+        before = term[-2] if i > 1 else ""
+        next_row = [i]
+        for j, word_char in enumerate(word, 1):
+            cost = min(row[j] + 1, next_row[j - 1] + 1, row[j - 1] + (word_char != char))
+            if (
+                previous_row is not None and j > 1
+                and word_char == before and word[j - 2] == char
+            ):
+                cost = min(cost, previous_row[j - 2] + 1)
+            next_row.append(cost)
+        return next_row
@@ -0,0 +1,434 @@
+"""Columnar mirror of the sound library for vectorized filtering and sorting"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.search_index import normalize_text
+
+# Sort keys understood by LibraryColumns.order
+SORT_KEYS = ("recent", "added", "name", "duration", "category", "play_count")
+
+# Sort keys whose order changes when a sound is played
+PLAY_SORT_KEYS = ("recent", "play_count")
+
+# Initial number of rows allocated, grown by doubling
+INITIAL_CAPACITY = 256
+
+# Duration of a sound whose length is unknown, sorted after every known duration
+UNKNOWN_DURATION = np.iinfo(np.int64).max
+
+
+def parse_duration_ms(duration: Any) -> int:
+    """Parse a stored duration into milliseconds
+
+    Args:
+        duration: Duration as "m:ss" / "h:mm:ss" text, or a number of seconds
+
+    Returns:
+        Duration in milliseconds, or UNKNOWN_DURATION if it cannot be parsed
+    """
+    if isinstance(duration, bool) or duration is None:
+        return UNKNOWN_DURATION
+    if isinstance(duration, (int, float)):
+        return int(round(duration * 1000))
+    try:
+        seconds = 0.0
+        for part in str(duration).strip().split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return UNKNOWN_DURATION
+    return int(round(seconds * 1000))
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds the way it is stored, as "m:ss" text
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        Formatted duration string
+    """
+    minutes = int(seconds // 60)
+    seconds = int(seconds % 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class LibraryColumns:
+    """Sound attributes stored as NumPy columns, one row per sound
+
+    Rows are appended on add and filled from the last row on remove, so
+    neither rebuilds the columns. Sort orders and filter masks are computed
+    with vectorized NumPy calls and cached until a column they read changes,
+    so re-sorting an unchanged library only permutes row indices.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty columns"""
+        self._rows: Dict[str, int] = {}
+        self._titles: List[str] = []  # collation text of each row
+        self._next_seq = 0
+        self._allocate(INITIAL_CAPACITY)
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._positions: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._masks: Dict[Tuple[Optional[int], Optional[bool]], np.ndarray] = {}
+        self._title_rank: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, sound_id: str) -> bool:
+        return sound_id in self._rows
+
+    def _allocate(self, capacity: int) -> None:
+        """Create empty column arrays with room for `capacity` rows"""
+        self.sound_id = np.empty(capacity, dtype=object)
+        self.seq = np.zeros(capacity, dtype=np.int64)
+        self.duration_ms = np.zeros(capacity, dtype=np.int64)
+        self.category = np.zeros(capacity, dtype=np.int16)
+        self.favorite = np.zeros(capacity, dtype=bool)
+        self.added_at = np.zeros(capacity, dtype=np.float64)
+        self.play_count = np.zeros(capacity, dtype=np.int64)
+        self.last_played_at = np.zeros(capacity, dtype=np.float64)
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        """Get every column array"""
+        return (self.sound_id, self.seq, self.duration_ms, self.category, self.favorite, self.added_at,
+                self.play_count, self.last_played_at)
+
+    def _grow(self) -> None:
+        """Double the capacity of every column"""
+        count = len(self._rows)
+        old = self._columns()
+        self._allocate(max(INITIAL_CAPACITY, 2 * len(self.seq)))
+        for source, target in zip(old, self._columns()):
+            target[:count] = source[:count]
+
+    def clear(self) -> None:
+        """Remove every row"""
+        self._rows = {}
+        self._titles = []
+        self._allocate(INITIAL_CAPACITY)
+        self._invalidate()
+
+    def rebuild(self, sounds: Dict[str, Dict[str, Any]], favorites: Iterable[str] = ()) -> None:
+        """Rebuild the columns from a collection of sounds
+
+        Args:
+            sounds: Dictionary of sound_id -> sound data
+            favorites: IDs of the favorite sounds
+        """
+        self.clear()
+        self.extend(sounds.items(), favorites)
+
+    def extend(self, sounds: Iterable[Tuple[str, Dict[str, Any]]], favorites: Iterable[str] = (),
+               seqs: Optional[Iterable[int]] = None) -> None:
+        """Append a batch of sounds with one vectorized write per column
+
+        Sounds already present are updated in place instead.
+
+        Args:
+            sounds: Iterable of (sound_id, sound data)
+            favorites: IDs of the favorite sounds, those of the batch are flagged
+            seqs: Insertion number of each sound, for sounds loaded out of the
+                order they were added in (see reserve_seq), or None to number
+                them after the sounds already present
+        """
+        favorites = favorites if isinstance(favorites, (set, frozenset, dict)) else set(favorites)
+        sounds = list(sounds)
+        seqs = list(seqs) if seqs is not None else None
+        if any(sound_id in self._rows for sound_id, _ in sounds):
+            new = [i for i, (sound_id, _) in enumerate(sounds) if sound_id not in self._rows]
+            for sound_id, sound_data in sounds:
+                if sound_id in self._rows:
+                    self.add(sound_id, sound_data, sound_id in favorites)
+            sounds = [sounds[i] for i in new]
+            seqs = [seqs[i] for i in new] if seqs is not None else None
+        if not sounds:
+            return
+
+        start = len(self._rows)
+        count = len(sounds)
+        end = start + count
+        while end > len(self.seq):
+            self._grow()
+        for row, (sound_id, _) in enumerate(sounds, start):
+            self._rows[sound_id] = row
+        values = [sound_data for _, sound_data in sounds]
+        self._titles.extend(normalize_text(data.get("title", "")) for data in values)
+
+        self.sound_id[start:end] = [sound_id for sound_id, _ in sounds]
+        if seqs is None:
+            self.seq[start:end] = np.arange(self._next_seq, self._next_seq + count)
+            self._next_seq += count
+        else:
+            self.seq[start:end] = seqs
+            self._next_seq = max(self._next_seq, max(seqs) + 1)
+        self.duration_ms[start:end] = [parse_duration_ms(data.get("duration")) for data in values]
+        self.category[start:end] = [self._category_of(data) for data in values]
+        self.favorite[start:end] = [sound_id in favorites for sound_id, _ in sounds]
+        self.added_at[start:end] = [float(data.get("added_at") or 0) for data in values]
+        self.play_count[start:end] = [int(data.get("play_count") or 0) for data in values]
+        self.last_played_at[start:end] = [float(data.get("last_played_at") or 0) for data in values]
+        self._invalidate()
+
+    def reserve_seq(self, count: int) -> int:
+        """Set aside insertion numbers for sounds that will be appended out of order
+
+        Sounds added meanwhile are numbered after the reserved range, so they
+        still sort as added after the reserved ones.
+
+        Args:
+            count: Number of insertion numbers to reserve
+
+        Returns:
+            The first reserved number, to pass on to extend() with an offset
+        """
+        first = self._next_seq
+        self._next_seq += count
+        return first
+
+    def add(self, sound_id: str, sound_data: Dict[str, Any], favorite: bool = False) -> None:
+        """Add a sound, or update its row if it is already present
+
+        Args:
+            sound_id: Unique identifier for the sound
+            sound_data: Dictionary containing sound data
+            favorite: Whether the sound is a favorite
+        """
+        row = self._rows.get(sound_id)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self.seq):
+                self._grow()
+            self._titles.append("")
+            self._rows[sound_id] = row
+            self.sound_id[row] = sound_id
+            self.seq[row] = self._next_seq
+            self._next_seq += 1
+
+        self._titles[row] = normalize_text(sound_data.get("title", ""))
+        self.duration_ms[row] = parse_duration_ms(sound_data.get("duration"))
+        self.category[row] = self._category_of(sound_data)
+        self.favorite[row] = favorite
+        self.added_at[row] = float(sound_data.get("added_at") or 0)
+        self.play_count[row] = int(sound_data.get("play_count") or 0)
+        self.last_played_at[row] = float(sound_data.get("last_played_at") or 0)
+        self._invalidate()
+
+    def remove(self, sound_id: str) -> bool:
+        """Remove a sound, moving the last row into its place
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            True if the sound was removed, False if it was not present
+        """
+        row = self._rows.pop(sound_id, None)
+        if row is None:
+            return False
+
+        last = len(self._rows)
+        if row != last:
+            moved = self.sound_id[last]
+            self._titles[row] = self._titles[last]
+            self._rows[moved] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self.sound_id[last] = None
+        self._titles.pop()
+        self._invalidate()
+        return True
+
+    def set_favorite(self, sound_id: str, favorite: bool) -> None:
+        """Update the favorite flag of a sound
+
+        Args:
+            sound_id: Unique identifier for the sound
+            favorite: Whether the sound is a favorite
+        """
+        row = self._rows.get(sound_id)
+        if row is not None and self.favorite[row] != favorite:
+            self.favorite[row] = favorite
+            # Only masks read the favorite column
+            self._masks.clear()
+
+    def record_play(self, sound_id: str, play_count: int, played_at: float) -> None:
+        """Update the play statistics of a sound
+
+        Only the orders of PLAY_SORT_KEYS are dropped, the others stay cached.
+
+        Args:
+            sound_id: Unique identifier for the sound
+            play_count: New number of plays
+            played_at: Time of the play, in seconds since the epoch
+        """
+        row = self._rows.get(sound_id)
+        if row is None:
+            return
+        self.play_count[row] = play_count
+        self.last_played_at[row] = played_at
+        for cache in (self._orders, self._positions):
+            for key in [key for key in cache if key[0] in PLAY_SORT_KEYS]:
+                del cache[key]
+
+    def order(self, sort_by: str = "recent", descending: bool = False) -> np.ndarray:
+        """Get the row order of the whole library for a sort key
+
+        Args:
+            sort_by: One of SORT_KEYS
+            descending: Whether to reverse the natural order of the key
+
+        Returns:
+            Array of row indices, which must not be modified
+        """
+        key = (sort_by if sort_by in SORT_KEYS else "recent", descending)
+        order = self._orders.get(key)
+        if order is None:
+            order = self._compute_order(*key)
+            self._orders[key] = order
+        return order
+
+    def sorted_ids(self, sort_by: str = "recent", descending: bool = False,
+                   category: Optional[int] = None, favorite: Optional[bool] = None) -> List[str]:
+        """Get the IDs of the sounds passing a filter, in sort order
+
+        Args:
+            sort_by: One of SORT_KEYS
+            descending: Whether to reverse the natural order of the key
+            category: Only keep sounds in this category, or None for all
+            favorite: Only keep favorites (True) or non-favorites (False), or None for all
+
+        Returns:
+            List of sound IDs
+        """
+        order = self.order(sort_by, descending)
+        if category is not None or favorite is not None:
+            order = order[self.mask(category, favorite)[order]]
+        sound_ids: List[str] = self.sound_id[order].tolist()
+        return sound_ids
+
+    def sort_ids(self, sound_ids: Iterable[str], sort_by: str = "recent",
+                 descending: bool = False) -> List[str]:
+        """Sort a subset of the library
+
+        The subset is ordered by each row's position in the cached library
+        order, so no sort key is recomputed. Unknown IDs keep their relative
+        order after the known ones.
+
+        Args:
+            sound_ids: Sound IDs to sort
+            sort_by: One of SORT_KEYS
+            descending: Whether to reverse the natural order of the key
+
+        Returns:
+            List of sound IDs in sort order
+        """
+        sound_ids = list(sound_ids)
+        rows_of = self._rows
+        rows = np.fromiter((rows_of.get(sound_id, -1) for sound_id in sound_ids), dtype=np.int64,
+                           count=len(sound_ids))
+        known = rows >= 0
+        positions = self._position_of_rows(sort_by, descending)
+        known_rows = rows[known]
+        known_rows = known_rows[np.argsort(positions[known_rows], kind="stable")]
+        ordered: List[str] = self.sound_id[known_rows].tolist()
+        if not known.all():
+            ordered.extend(sound_id for sound_id, row in zip(sound_ids, rows.tolist()) if row < 0)
+        return ordered
+
+    def mask(self, category: Optional[int] = None, favorite: Optional[bool] = None) -> np.ndarray:
+        """Get a boolean row mask for a filter
+
+        Args:
+            category: Only keep sounds in this category, or None for all
+            favorite: Only keep favorites (True) or non-favorites (False), or None for all
+
+        Returns:
+            Boolean array with one entry per row, which must not be modified
+        """
+        key = (category, favorite)
+        mask = self._masks.get(key)
+        if mask is None:
+            count = len(self._rows)
+            mask = np.ones(count, dtype=bool)
+            if category is not None:
+                mask &= self.category[:count] == category
+            if favorite is not None:
+                mask &= self.favorite[:count] == favorite
+            self._masks[key] = mask
+        return mask
+
+    def count(self, category: Optional[int] = None, favorite: Optional[bool] = None) -> int:
+        """Count the sounds passing a filter"""
+        return int(np.count_nonzero(self.mask(category, favorite)))
+
+    def _position_of_rows(self, sort_by: str, descending: bool) -> np.ndarray:
+        """Get the position of every row in the library order for a sort key"""
+        key = (sort_by if sort_by in SORT_KEYS else "recent", descending)
+        positions = self._positions.get(key)
+        if positions is None:
+            order = self.order(*key)
+            positions = np.empty(len(order), dtype=np.int64)
+            positions[order] = np.arange(len(order))
+            self._positions[key] = positions
+        return positions
+
+    def _compute_order(self, sort_by: str, descending: bool) -> np.ndarray:
+        """Sort the rows by a key, ties broken by title and then by insertion order"""
+        count = len(self._rows)
+        seq = self.seq[:count]
+        if sort_by == "recent":
+            # Most recently played first, then the sounds never played newest first
+            keys: Tuple[np.ndarray, ...] = (-seq, -self.added_at[:count], -self.last_played_at[:count])
+        elif sort_by == "added":
+            # Most recently added first, sounds without a date newest first as well
+            keys = (-seq, -self.added_at[:count])
+        else:
+            title_rank = self._title_ranks()
+            if sort_by == "name":
+                primary = title_rank
+            elif sort_by == "duration":
+                primary = self.duration_ms[:count]
+            elif sort_by == "category":
+                primary = self.category[:count]
+            else:
+                # Most played first
+                primary = -self.play_count[:count]
+            keys = (seq, title_rank, primary)
+
+        if descending:
+            # np.lexsort sorts by the last key first
+            keys = keys[:-1] + (-keys[-1],)
+        return np.lexsort(keys)
+
+    def _title_ranks(self) -> np.ndarray:
+        """Get the collation rank of every row's title, computed once per change"""
+        if self._title_rank is None:
+            titles = self._titles
+            order = sorted(range(len(titles)), key=titles.__getitem__)
+            # Equal titles share a rank, so ties fall through to the insertion order
+            ordered = np.array([titles[row] for row in order], dtype=object)
+            distinct = np.ones(len(titles), dtype=np.int64)
+            distinct[1:] = ordered[1:] != ordered[:-1]
+            ranks = np.empty(len(titles), dtype=np.int64)
+            ranks[order] = np.cumsum(distinct)
+            self._title_rank = ranks
+        return self._title_rank
+
+    def _invalidate(self) -> None:
+        """Drop every cached order and mask"""
+        self._orders.clear()
+        self._positions.clear()
+        self._masks.clear()
+        self._title_rank = None
+
+    @staticmethod
+    def _category_of(sound_data: Dict[str, Any]) -> int:
+        """Get the numeric category of a sound, 0 if it has none"""
+        try:
+            return int(sound_data.get("category") or 0)
+        except (TypeError, ValueError):
+            return 0
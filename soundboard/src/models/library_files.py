@@ -0,0 +1,78 @@
+"""Sound files on disk: finding them, describing new ones and measuring them"""
+
+import os
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from models.library_columns import format_duration
+
+# Extensions of the files imported from a folder, as offered by the file dialog
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg", ".flac")
+
+# Level reported for digital silence, instead of minus infinity
+SILENCE_DB = -120.0
+
+
+def find_sound_files(directory: str, recursive: bool = True) -> List[str]:
+    """Find the audio files in a folder
+
+    Args:
+        directory: The folder
+        recursive: Whether to look in its subfolders too
+
+    Returns:
+        Absolute paths of the files, sorted
+    """
+    directory = os.path.abspath(directory)
+    if recursive:
+        walk: Iterator[Tuple[str, List[str]]] = ((root, files) for root, _, files in os.walk(directory))
+    else:
+        walk = iter([(directory, [entry.name for entry in os.scandir(directory) if entry.is_file()])])
+    return sorted(
+        os.path.join(root, name)
+        for root, files in walk
+        for name in files
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+
+
+def new_sound_data(file_path: str) -> Dict[str, Any]:
+    """Describe a sound file being added to the library, titled after its name
+
+    Args:
+        file_path: Path to the sound file
+
+    Returns:
+        The sound data
+    """
+    name, _ = os.path.splitext(os.path.basename(file_path))
+    return {
+        "title": name,
+        "category": 1,  # Default category
+        "file_path": file_path,
+        "favorite": False,
+        "added_at": time.time()
+    }
+
+
+def analyze_file(file_path: str) -> Dict[str, Any]:
+    """Decode a sound file and measure it
+
+    Args:
+        file_path: Path to the sound file
+
+    Returns:
+        The fields of the sound data measured: "duration" as "m:ss" text,
+        and "peak_db" and "rms_db", its peak and average levels in dBFS
+
+    Raises:
+        Exception: If the file cannot be read or decoded
+    """
+    # pydub looks for ffmpeg as soon as it is imported
+    from pydub import AudioSegment
+    audio = AudioSegment.from_file(file_path)
+    return {
+        "duration": format_duration(len(audio) / 1000),
+        "peak_db": round(max(audio.max_dBFS, SILENCE_DB), 1),
+        "rms_db": round(max(audio.dBFS, SILENCE_DB), 1),
+    }
@@ -0,0 +1,92 @@
+"""Incremental reader for the saved sound library"""
+
+import json
+import re
+from typing import Any, Iterator, Optional, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_library_entries(text: str, incremental: bool = True) -> Iterator[Tuple[str, Optional[str], Any]]:
+    """Decode a saved library one sound at a time
+
+    Only the object mapping sound IDs to sound data is taken apart, every
+    other top-level value is decoded whole. A caller can stop after any
+    sound and resume later, so a large library is never parsed in one go.
+
+    Args:
+        text: Contents of the library file, a JSON object
+        incremental: Decode the sounds as they are asked for; if False the
+            whole text is decoded on the first one, which is faster when
+            every sound is wanted right away
+
+    Yields:
+        ("sounds", sound ID, sound data) for each sound in file order, and
+        (key, None, value) for every other top-level key
+
+    Raises:
+        json.JSONDecodeError: If the text is not a JSON object
+    """
+    if not incremental:
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise json.JSONDecodeError("Expecting '{' delimiter", text, 0)
+        for key, value in data.items():
+            if key == "sounds" and isinstance(value, dict):
+                for sound_id, sound_data in value.items():
+                    yield "sounds", sound_id, sound_data
+            else:
+                yield key, None, value
+        return
+
+    position = _expect(text, _skip(text, 0), "{")
+    if text.startswith("}", position):
+        return
+    while True:
+        key, position = _decode(text, position)
+        position = _expect(text, position, ":")
+        if key == "sounds" and text.startswith("{", position):
+            position = _skip(text, position + 1)
+            if text.startswith("}", position):
+                position += 1
+            else:
+                while True:
+                    sound_id, position = _decode(text, position)
+                    position = _expect(text, position, ":")
+                    sound_data, position = _decode(text, position)
+                    yield "sounds", sound_id, sound_data
+                    if text.startswith(",", position):
+                        position = _skip(text, position + 1)
+                        continue
+                    position = _expect(text, position, "}")
+                    break
+        else:
+            value, position = _decode(text, position)
+            yield key, None, value
+        if text.startswith(",", position):
+            position = _skip(text, position + 1)
+            continue
+        position = _expect(text, position, "}")
+        if position != len(text):
+            raise json.JSONDecodeError("Extra data", text, position)
+        return
+
+
+def _skip(text: str, position: int) -> int:
+    """Get the position of the next non-whitespace character"""
+    match = _WHITESPACE.match(text, position)
+    return match.end() if match else position
+
+
+def _expect(text: str, position: int, character: str) -> int:
+    """Check for a delimiter, returning the position of the value after it"""
+    if not text.startswith(character, position):
+        raise json.JSONDecodeError(f"Expecting '{character}' delimiter", text, position)
+    return _skip(text, position + 1)
+
+
+def _decode(text: str, position: int) -> Tuple[Any, int]:
+    """Decode the JSON value at a position, returning it and the position after it"""
+    value, end = _decoder.raw_decode(text, position)
+    return value, _skip(text, end)
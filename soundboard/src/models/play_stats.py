@@ -0,0 +1,239 @@
+"""Recency and frequency index over sound plays"""
+
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class PlayStatsIndex:
+    """Play counts and last play times, ordered for top-k reads
+
+    Sounds are kept in two orders that are maintained on every play
+    instead of being sorted when read:
+
+    - recency: an ordered dict moved to the end on each play, so the k
+      most recently played sounds are its last k entries;
+    - frequency: one bucket per play count, linked from the highest count
+      to the lowest (as in an LFU cache). A play moves the sound to the
+      next bucket up, creating it next to the current one if needed, so
+      the k most played sounds are read by walking buckets from the top.
+
+    Both reads are O(k) and a play is O(1). Sounds with the same play
+    count are listed most recently played first.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index"""
+        self._recency: "OrderedDict[str, float]" = OrderedDict()  # sound ID -> last played at, oldest first
+        self._counts: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}  # play count -> sounds, oldest play first
+        self._lower: Dict[int, Optional[int]] = {}  # play count -> next lower non-empty count
+        self._higher: Dict[int, Optional[int]] = {}  # play count -> next higher non-empty count
+        self._top: Optional[int] = None  # highest play count
+        self._bottom: Optional[int] = None  # lowest play count
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, sound_id: str) -> bool:
+        return sound_id in self._counts
+
+    def clear(self) -> None:
+        """Forget every play"""
+        self._recency.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._lower.clear()
+        self._higher.clear()
+        self._top = None
+        self._bottom = None
+
+    def record(self, sound_id: str, played_at: float) -> int:
+        """Record a play of a sound
+
+        Args:
+            sound_id: Unique identifier for the sound
+            played_at: Time of the play, in seconds since the epoch
+
+        Returns:
+            The new play count of the sound
+        """
+        self._recency[sound_id] = played_at
+        self._recency.move_to_end(sound_id)
+
+        count = self._counts.get(sound_id, 0)
+        if count:
+            self._unlink(sound_id, count, count + 1)
+        else:
+            # No count is lower than one play, so its bucket goes below the lowest one
+            self._link(1, None, self._bottom)
+        self._counts[sound_id] = count + 1
+        self._buckets[count + 1][sound_id] = None
+        return count + 1
+
+    def remove(self, sound_id: str) -> bool:
+        """Forget the plays of a sound
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            True if the sound had been played, False otherwise
+        """
+        count = self._counts.pop(sound_id, None)
+        if count is None:
+            return False
+        del self._recency[sound_id]
+        bucket = self._buckets[count]
+        del bucket[sound_id]
+        if not bucket:
+            self._drop_bucket(count)
+        return True
+
+    def set(self, sound_id: str, count: int, last_played_at: Optional[float]) -> None:
+        """Set the statistics of a sound, e.g. when it is added with saved ones
+
+        The sound is placed among the others by its last play, so only the
+        sounds played after it are moved, and its count bucket is linked in
+        by walking the distinct counts above it.
+
+        Args:
+            sound_id: Unique identifier for the sound
+            count: Its play count, 0 to forget its plays
+            last_played_at: Time of its last play, or None if unknown
+        """
+        self.remove(sound_id)
+        if not count:
+            return
+        played_at = last_played_at or 0.0
+        played_times = self._recency.__getitem__
+        self._insert_by_time(self._recency, sound_id, played_at, played_at, played_times)
+        self._counts[sound_id] = count
+        if count not in self._buckets:
+            higher = None
+            lower = self._top
+            while lower is not None and lower > count:
+                higher = lower
+                lower = self._lower[lower]
+            self._link(count, lower, higher)
+        self._insert_by_time(self._buckets[count], sound_id, None, played_at, played_times)
+
+    def play_count(self, sound_id: str) -> int:
+        """Get the number of times a sound was played"""
+        return self._counts.get(sound_id, 0)
+
+    def last_played_at(self, sound_id: str) -> Optional[float]:
+        """Get the time a sound was last played, or None if it never was"""
+        return self._recency.get(sound_id)
+
+    def recent(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most recently played sounds
+
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+
+        Returns:
+            List of sound IDs, most recently played first
+        """
+        return list(islice(reversed(self._recency), limit))
+
+    def most_played(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most played sounds
+
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+
+        Returns:
+            List of sound IDs, most played first
+        """
+        return list(islice(self._iter_most_played(), limit))
+
+    def rebuild(self, stats: Iterable) -> None:
+        """Rebuild the index from saved statistics
+
+        Args:
+            stats: Iterable of (sound ID, play count, last played at) for the played sounds
+        """
+        self.clear()
+        played = sorted(
+            ((last_played_at or 0.0, sound_id, count) for sound_id, count, last_played_at in stats if count),
+            key=lambda entry: entry[0]
+        )
+        for last_played_at, sound_id, count in played:
+            self._recency[sound_id] = last_played_at
+            self._counts[sound_id] = count
+            self._buckets.setdefault(count, OrderedDict())[sound_id] = None
+
+        previous = None
+        for count in sorted(self._buckets):
+            self._lower[count] = previous
+            self._higher[count] = None
+            if previous is not None:
+                self._higher[previous] = count
+            previous = count
+        self._top = previous
+        self._bottom = min(self._buckets) if self._buckets else None
+
+    @staticmethod
+    def _insert_by_time(ordered: "OrderedDict", key: str, value: Any, played_at: float,
+                        time_of: Callable[[str], float]) -> None:
+        """Insert into an ordered dict kept oldest play first, moving only the entries played later"""
+        if ordered and time_of(next(iter(ordered))) > played_at:
+            ordered[key] = value
+            ordered.move_to_end(key, last=False)
+            return
+        later = []
+        while ordered:
+            last = next(reversed(ordered))
+            if time_of(last) <= played_at:
+                break
+            later.append((last, ordered.pop(last)))
+        ordered[key] = value
+        for last, last_value in reversed(later):
+            ordered[last] = last_value
+
+    def _iter_most_played(self) -> Iterator[str]:
+        """Yield the played sounds, most played first"""
+        count = self._top
+        while count is not None:
+            yield from reversed(self._buckets[count])
+            count = self._lower[count]
+
+    def _unlink(self, sound_id: str, count: int, new_count: int) -> None:
+        """Move a sound from its bucket to the bucket one play count higher"""
+        bucket = self._buckets[count]
+        del bucket[sound_id]
+        if new_count not in self._buckets:
+            self._link(new_count, count, self._higher[count])
+        if not bucket:
+            self._drop_bucket(count)
+
+    def _link(self, count: int, lower: Optional[int], higher: Optional[int]) -> None:
+        """Create the bucket for a play count between two existing buckets"""
+        if count in self._buckets:
+            return
+        self._buckets[count] = OrderedDict()
+        self._lower[count] = lower
+        self._higher[count] = higher
+        if lower is not None:
+            self._higher[lower] = count
+        else:
+            self._bottom = count
+        if higher is not None:
+            self._lower[higher] = count
+        else:
+            self._top = count
+
+    def _drop_bucket(self, count: int) -> None:
+        """Unlink an empty bucket"""
+        lower = self._lower.pop(count)
+        higher = self._higher.pop(count)
+        del self._buckets[count]
+        if lower is not None:
+            self._higher[lower] = higher
+        else:
+            self._bottom = higher
+        if higher is not None:
+            self._lower[higher] = lower
+        else:
+            self._top = lower
@@ -0,0 +1,615 @@
+"""Full-text search index for the soundboard library"""
+
+import heapq
+from itertools import islice
+import re
+from bisect import bisect_left, insort
+import unicodedata
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Names used when a sound's category is stored as a number
+CATEGORY_NAMES = {
+    1: "Effects",
+    2: "Music",
+    3: "Voice",
+    4: "Custom",
+}
+
+# Field ranks, lower ranks score better
+RANK_TITLE_START = 0
+RANK_TITLE = 1
+RANK_TAG = 2
+RANK_CATEGORY = 3
+
+# Number of field ranks, used to fold the match quality and rank into one score
+RANK_COUNT = 4
+
+# Word scores, lower scores are better matches
+WORD_PREFIX = 0
+WORD_SUBSTRING = 1
+
+# Longest n-gram kept in the index; longer terms are looked up by their trigrams
+MAX_GRAM = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: Any) -> str:
+    """Casefold a value and strip its accents
+
+    Args:
+        text: Value to normalize
+
+    Returns:
+        The folded string, e.g. "Café Ambiance" -> "cafe ambiance"
+    """
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into word tokens
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        List of word tokens in order of appearance
+    """
+    return _TOKEN_RE.findall(text)
+
+
+def category_name(category: Any) -> str:
+    """Get the display name of a category
+
+    Args:
+        category: Category number or name
+
+    Returns:
+        The category name
+    """
+    if isinstance(category, int) and category in CATEGORY_NAMES:
+        return CATEGORY_NAMES[category]
+    return str(category) if category is not None else ""
+
+
+class SearchIndex:
+    """N-gram inverted index over sound titles, categories and tags
+
+    Text is folded once when a sound is indexed. Lookups go through the
+    vocabulary of distinct words, so the cost of a query depends on the
+    number of matching sounds rather than the size of the library.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty search index"""
+        # token -> {sound_id: best field rank}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # token -> the sound IDs of each field rank, for set operations on score tiers
+        self._rank_postings: Dict[str, List[Set[str]]] = {}
+        # n-gram -> tokens containing it
+        self._grams: Dict[str, Set[str]] = {}
+        # sound_id -> (normalized title, [(token, rank), ...])
+        self._docs: Dict[str, Tuple[str, List[Tuple[str, int]]]] = {}
+        # token -> [(rank, normalized title, sound_id), ...] kept sorted
+        self._ordered: Dict[str, List[Tuple[int, str, str]]] = {}
+        # tokens whose ordered postings were appended to in bulk, sorted on next use
+        self._unsorted: Set[str] = set()
+        # Incremented on every change so callers can invalidate cached results
+        self.version = 0
+        self._bulk_loading = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, sound_id: str) -> bool:
+        return sound_id in self._docs
+
+    def clear(self) -> None:
+        """Remove every sound from the index"""
+        self._postings.clear()
+        self._rank_postings.clear()
+        self._grams.clear()
+        self._docs.clear()
+        self._ordered.clear()
+        self._unsorted.clear()
+        self.version += 1
+
+    def add(self, sound_id: str, sound_data: Dict[str, Any]) -> None:
+        """Index a sound, replacing any previous entry for it
+
+        Args:
+            sound_id: Unique identifier for the sound
+            sound_data: Dictionary containing sound data
+        """
+        if sound_id in self._docs:
+            self.remove(sound_id)
+
+        title = normalize_text(sound_data.get("title", ""))
+        entries: Dict[str, int] = {}
+
+        for position, token in enumerate(tokenize(title)):
+            rank = RANK_TITLE_START if position == 0 else RANK_TITLE
+            entries[token] = min(rank, entries.get(token, rank))
+        tags = sound_data.get("tags") or []
+        if isinstance(tags, str):
+            # A single tag stored as a string, not a list of them
+            tags = [tags]
+        for tag in tags:
+            for token in tokenize(normalize_text(tag)):
+                entries[token] = min(RANK_TAG, entries.get(token, RANK_TAG))
+        for token in tokenize(normalize_text(category_name(sound_data.get("category")))):
+            entries[token] = min(RANK_CATEGORY, entries.get(token, RANK_CATEGORY))
+
+        for token, rank in entries.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._rank_postings[token] = [set() for _ in range(RANK_COUNT)]
+                self._add_token_grams(token)
+            postings[sound_id] = rank
+            self._rank_postings[token][rank].add(sound_id)
+
+            entry = (rank, title, sound_id)
+            ordered = self._ordered.setdefault(token, [])
+            if self._bulk_loading or token in self._unsorted:
+                ordered.append(entry)
+                self._unsorted.add(token)
+            else:
+                insort(ordered, entry)
+
+        self._docs[sound_id] = (title, list(entries.items()))
+        self.version += 1
+
+    def update(self, sound_id: str, sound_data: Dict[str, Any]) -> None:
+        """Re-index a sound after its data changed
+
+        Args:
+            sound_id: Unique identifier for the sound
+            sound_data: Dictionary containing sound data
+        """
+        self.add(sound_id, sound_data)
+
+    def remove(self, sound_id: str) -> bool:
+        """Remove a sound from the index
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            True if the sound was indexed, False otherwise
+        """
+        doc = self._docs.pop(sound_id, None)
+        if doc is None:
+            return False
+
+        title = doc[0]
+        for token, rank in doc[1]:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(sound_id, None)
+            self._rank_postings[token][rank].discard(sound_id)
+
+            ordered = self._sorted_postings(token)
+            position = bisect_left(ordered, (rank, title, sound_id))
+            if position < len(ordered) and ordered[position][2] == sound_id:
+                del ordered[position]
+
+            if not postings:
+                del self._postings[token]
+                del self._rank_postings[token]
+                del self._ordered[token]
+                self._unsorted.discard(token)
+                self._remove_token_grams(token)
+        self.version += 1
+        return True
+
+    def title_of(self, sound_id: str) -> str:
+        """Get the normalized title of an indexed sound
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            The folded title, or an empty string if the sound is not indexed
+        """
+        doc = self._docs.get(sound_id)
+        return doc[0] if doc else ""
+
+    def matching_tokens(self, term: str) -> Set[str]:
+        """Get the indexed words that contain a term
+
+        Args:
+            term: A single normalized search term
+
+        Returns:
+            Set of indexed words containing the term
+        """
+        if len(term) <= MAX_GRAM:
+            return set(self._grams.get(term, ()))
+
+        gram_sets = []
+        for gram in self._term_grams(term):
+            tokens = self._grams.get(gram)
+            if not tokens:
+                return set()
+            gram_sets.append(tokens)
+        gram_sets.sort(key=len)
+
+        candidates = set(gram_sets[0])
+        for tokens in gram_sets[1:]:
+            candidates &= tokens
+            if not candidates:
+                return candidates
+        return {token for token in candidates if term in token}
+
+    def words_with_gram(self, gram: str) -> Set[str]:
+        """Get the indexed words containing an n-gram of up to MAX_GRAM characters
+
+        Args:
+            gram: A normalized n-gram
+
+        Returns:
+            Set of indexed words, which must not be modified
+        """
+        return self._grams.get(gram, set())
+
+    def postings(self, token: str) -> Dict[str, int]:
+        """Get the sounds containing a word
+
+        Args:
+            token: An indexed word
+
+        Returns:
+            Dictionary of sound_id -> field rank, which must not be modified
+        """
+        return self._postings.get(token, {})
+
+    def word_scores(self, term: str) -> Dict[str, int]:
+        """Score the indexed words that contain a term
+
+        Args:
+            term: A single normalized search term
+
+        Returns:
+            Dictionary of word -> word score, lower is better
+        """
+        return {
+            token: WORD_PREFIX if token.startswith(term) else WORD_SUBSTRING
+            for token in self.matching_tokens(term)
+        }
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Search the index
+
+        Every word of the query has to match. Results are ordered by how well
+        they match (title prefix, then word start, then substring, with title
+        matches ahead of tag and category matches) and then by title.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of results to return, or None for all
+
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        normalized = normalize_text(query).strip()
+        terms = list(dict.fromkeys(tokenize(normalized)))
+        if not terms:
+            return []
+        return self.rank_matches(normalized, [self.word_scores(term) for term in terms], limit)
+
+    def rank_matches(
+        self, normalized_query: str, term_words: List[Dict[str, int]], limit: Optional[int] = None
+    ) -> List[str]:
+        """Rank the sounds matching every term of a query
+
+        A sound scores ``word score * RANK_COUNT + field rank`` for its best
+        word on each term, so the match quality always outweighs the field.
+
+        Args:
+            normalized_query: The folded query text
+            term_words: For each query term, a dictionary of word -> word score
+            limit: Maximum number of results to return, or None for all
+
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        if not term_words or not all(term_words):
+            return []
+
+        if len(term_words) == 1:
+            results = []
+            for _, _, sound_id in self._iter_matches(term_words[0]):
+                results.append(sound_id)
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+        if limit is None:
+            candidates = self.candidates(term_words)
+            return self.rank_candidates(normalized_query, candidates, term_words)
+        return self._rank_top(normalized_query, term_words, limit)
+
+    def _rank_top(self, normalized_query: str, term_words: List[Dict[str, int]], limit: int) -> List[str]:
+        """Rank the best matches of a query, scoring as few candidates as it takes
+
+        Scores are small sums, so the sounds scoring at most some total are
+        gathered tier by tier with set operations on the postings of each
+        field rank, lowest total first. Only the new candidates of a tier
+        are scored, and once `limit` sounds score within the tier, no sound
+        left out can rank ahead of them. Titles starting with the whole query
+        rank ahead whatever their score, so they are looked up first.
+        """
+        docs = self._docs
+        scores: Dict[str, int] = {}
+        for sound_id in self._title_prefix_matches(normalized_query):
+            score = self._score_words(docs[sound_id][1], term_words)
+            if score is not None:
+                scores[sound_id] = score
+        needed = limit - len(scores)
+        if needed > 0:
+            leading = len(scores)
+            worst = sum(max(words.values()) * RANK_COUNT + RANK_COUNT - 1 for words in term_words)
+            # The sounds scoring at most the tier on each term, grown a tier at a time
+            reach: List[Set[str]] = [set() for _ in term_words]
+            for tier in range(worst + 1):
+                for words, sound_ids in zip(term_words, reach):
+                    for token, word_score in words.items():
+                        rank = tier - word_score * RANK_COUNT
+                        if 0 <= rank < RANK_COUNT:
+                            sound_ids |= self._rank_postings[token][rank]
+                # Some of these score more than the tier on the sum of the terms
+                candidates = set.intersection(*sorted(reach, key=len))
+                for sound_id in candidates.difference(scores):
+                    # Candidates match every term, so they always have a score
+                    score = self._score_words(docs[sound_id][1], term_words)
+                    if score is not None:
+                        scores[sound_id] = score
+                if sum(1 for score in scores.values() if score <= tier) - leading >= needed:
+                    break
+        return self.rank_scored(normalized_query, scores, limit)
+
+    def _title_prefix_matches(self, normalized_query: str) -> Iterator[str]:
+        """Yield the sounds whose title starts with the query
+
+        Such a title starts with the first word of the query, so they are a
+        run of that word's title-start postings, which are ordered by title.
+        """
+        tokens = tokenize(normalized_query)
+        if not tokens or tokens[0] not in self._ordered:
+            return
+        ordered = self._sorted_postings(tokens[0])
+        for rank, title, sound_id in islice(ordered, bisect_left(ordered, (RANK_TITLE_START, normalized_query)), None):
+            if rank != RANK_TITLE_START or not title.startswith(normalized_query):
+                return
+            yield sound_id
+
+    def candidates(self, term_words: Sequence[Collection[str]]) -> Set[str]:
+        """Get the sounds containing a word of every term
+
+        Args:
+            term_words: For each query term, the indexed words it matches
+
+        Returns:
+            Set of sound IDs
+        """
+        # Intersect with set operations, smallest term first, before scoring anything
+        ordered = sorted(term_words, key=lambda words: sum(len(self._postings[t]) for t in words))
+        result: Set[str] = set().union(*(self._postings[token] for token in ordered[0]))
+        for words in ordered[1:]:
+            if not result:
+                break
+            result.intersection_update(set().union(*(self._postings[token] for token in words)))
+        return result
+
+    def rank_candidates(
+        self,
+        normalized_query: str,
+        candidates: Iterable[str],
+        term_words: List[Dict[str, int]],
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """Score and order candidate sounds against every term of a query
+
+        Candidates without a scored word for some term are dropped.
+
+        Args:
+            normalized_query: The folded query text
+            candidates: Sound IDs to rank
+            term_words: For each query term, a dictionary of word -> word score
+            limit: Maximum number of results to return, or None for all
+
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        scores: Dict[str, int] = {}
+        docs = self._docs
+        for sound_id in candidates:
+            score = self._score_words(docs[sound_id][1], term_words)
+            if score is not None:
+                scores[sound_id] = score
+        return self.rank_scored(normalized_query, scores, limit)
+
+    @staticmethod
+    def _score_words(doc_tokens: List[Tuple[str, int]], term_words: List[Dict[str, int]]) -> Optional[int]:
+        """Score the words of a sound against query terms
+
+        Returns:
+            The sum of the best score on each term, or None if a term has no match
+        """
+        score = 0
+        for words in term_words:
+            best = None
+            for token, rank in doc_tokens:
+                word_score = words.get(token)
+                if word_score is not None:
+                    token_score = word_score * RANK_COUNT + rank
+                    if best is None or token_score < best:
+                        best = token_score
+            if best is None:
+                return None
+            score += best
+        return score
+
+    def rank_scored(
+        self, normalized_query: str, scores: Dict[str, int], limit: Optional[int] = None
+    ) -> List[str]:
+        """Order scored sounds, titles starting with the whole query first
+
+        Args:
+            normalized_query: The folded query text
+            scores: Dictionary of sound_id -> score, lower is better
+            limit: Maximum number of results to return, or None for all
+
+        Returns:
+            List of sound IDs, best match first
+        """
+        docs = self._docs
+        if limit is not None and limit < len(scores):
+            # Past the best `limit` scores only titles starting with the query can make the cut
+            cutoff = sorted(scores.values())[limit - 1]
+            if len(tokenize(normalized_query)) > 1:
+                # Titles starting with a query of several words start with its first word,
+                # so they are looked up rather than checked one by one
+                leading = set(self._title_prefix_matches(normalized_query)).intersection(scores)
+                ranked = [(0, scores[sound_id], docs[sound_id][0], sound_id) for sound_id in leading]
+                ranked.extend((1, score, docs[sound_id][0], sound_id) for sound_id, score in scores.items()
+                              if score <= cutoff and sound_id not in leading)
+            else:
+                ranked = []
+                for sound_id, score in scores.items():
+                    title = docs[sound_id][0]
+                    if title.startswith(normalized_query):
+                        ranked.append((0, score, title, sound_id))
+                    elif score <= cutoff:
+                        ranked.append((1, score, title, sound_id))
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked = []
+            for sound_id, score in scores.items():
+                title = docs[sound_id][0]
+                flag = 0 if title.startswith(normalized_query) else 1
+                ranked.append((flag, score, title, sound_id))
+            ranked.sort()
+        return [entry[3] for entry in ranked]
+
+    def doc_words(self, sound_id: str) -> List[Tuple[str, int]]:
+        """Get the indexed words of a sound
+
+        Args:
+            sound_id: Unique identifier for the sound
+
+        Returns:
+            List of (word, field rank) pairs, which must not be modified
+        """
+        doc = self._docs.get(sound_id)
+        return doc[1] if doc else []
+
+    def _iter_matches(self, words: Dict[str, int]) -> Iterator[Tuple[int, str, str]]:
+        """Yield (score, title, sound_id) for every sound containing one of the words
+
+        Sounds are yielded best score first, then by title, each sound once.
+        """
+        streams = [
+            self._iter_word_postings(token, word_score * RANK_COUNT)
+            for token, word_score in words.items()
+        ]
+        seen: Set[str] = set()
+        for entry in heapq.merge(*streams):
+            sound_id = entry[2]
+            if sound_id not in seen:
+                seen.add(sound_id)
+                yield entry
+
+    def _iter_word_postings(self, token: str, base: int) -> Iterator[Tuple[int, str, str]]:
+        """Yield the postings of a word in score order"""
+        for rank, title, sound_id in self._sorted_postings(token):
+            yield (base + rank, title, sound_id)
+
+    def _sorted_postings(self, token: str) -> List[Tuple[int, str, str]]:
+        """Get the ordered postings of a word, sorting them first if they were appended to in bulk"""
+        ordered = self._ordered[token]
+        if token in self._unsorted:
+            ordered.sort()
+            self._unsorted.discard(token)
+        return ordered
+
+    def rebuild(self, sounds: Dict[str, Dict[str, Any]]) -> None:
+        """Rebuild the index from a collection of sounds
+
+        Args:
+            sounds: Dictionary of sound_id -> sound data
+        """
+        self.clear()
+        self.add_many(sounds.items())
+        self.sort_pending()
+
+    def add_many(self, sounds: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Index a batch of sounds, e.g. one chunk of a library being loaded
+
+        Postings are appended unsorted instead of being inserted in place,
+        and the postings of each word are sorted once, the next time the
+        word is looked up. Indexing a library chunk by chunk thus never
+        re-sorts the postings of common words between chunks.
+
+        Args:
+            sounds: Iterable of (sound_id, sound data)
+        """
+        self._bulk_loading = True
+        try:
+            for sound_id, sound_data in sounds:
+                self.add(sound_id, sound_data)
+        finally:
+            self._bulk_loading = False
+
+    def is_sorted(self) -> bool:
+        """Check whether no postings are left unsorted by add_many()"""
+        return not self._unsorted
+
+    def sort_pending(self, limit: Optional[int] = None) -> bool:
+        """Sort the postings left unsorted by add_many() ahead of the lookups
+
+        Args:
+            limit: Maximum number of words to sort, or None for all of them
+
+        Returns:
+            True if words are still left unsorted
+        """
+        for token in list(islice(self._unsorted, limit)):
+            self._sorted_postings(token)
+        return bool(self._unsorted)
+
+    def _add_token_grams(self, token: str) -> None:
+        """Register a new word under each of its n-grams"""
+        for gram in self._token_grams(token):
+            tokens = self._grams.get(gram)
+            if tokens is None:
+                self._grams[gram] = {token}
+            else:
+                tokens.add(token)
+
+    def _remove_token_grams(self, token: str) -> None:
+        """Drop a word that no longer appears in any sound"""
+        for gram in self._token_grams(token):
+            tokens = self._grams.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._grams[gram]
+
+    @staticmethod
+    def _token_grams(token: str) -> Iterable[str]:
+        """Get every n-gram of a word up to MAX_GRAM characters"""
+        grams = set()
+        length = len(token)
+        for size in range(1, min(MAX_GRAM, length) + 1):
+            for start in range(length - size + 1):
+                grams.add(token[start:start + size])
+        return grams
+
+    @staticmethod
+    def _term_grams(term: str) -> List[str]:
+        """Get the trigrams of a term longer than MAX_GRAM characters"""
+        return [term[i:i + MAX_GRAM] for i in range(len(term) - MAX_GRAM + 1)]
@@ -0,0 +1,207 @@
+"""Sound banks: named pages of sounds, each with its own hotkey layout"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class SoundBanks:
+    """Banks of sounds, in page order, and the bank in use
+
+    A bank lists some sounds of the library, each with an optional hotkey
+    that only plays it while the bank is active, and may have a hotkey of
+    its own that switches to it from anywhere. A sound can be in any number
+    of banks, with a different hotkey in each.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without banks"""
+        self._banks: Dict[str, Dict[str, Any]] = {}  # bank ID -> {"name", "hotkey", "sounds": {sound ID -> hotkey}}
+        self.active_id: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._banks)
+
+    def __contains__(self, bank_id: Any) -> bool:
+        return bank_id in self._banks
+
+    def clear(self) -> None:
+        """Remove every bank"""
+        self._banks.clear()
+        self.active_id = None
+
+    def add_bank(self, bank_id: str, name: str) -> bool:
+        """Add an empty bank after the others
+
+        Args:
+            bank_id: Unique identifier for the bank
+            name: Display name of the bank
+
+        Returns:
+            True if the bank was added, False if the ID is taken
+        """
+        if bank_id in self._banks:
+            return False
+        self._banks[bank_id] = {"name": name, "hotkey": None, "sounds": {}}
+        return True
+
+    def rename_bank(self, bank_id: str, name: str) -> bool:
+        """Rename a bank
+
+        Returns:
+            True if the bank was renamed, False if it does not exist
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None:
+            return False
+        bank["name"] = name
+        return True
+
+    def remove_bank(self, bank_id: str) -> bool:
+        """Remove a bank, leaving its sounds in the library
+
+        Returns:
+            True if the bank was removed, False if it does not exist
+        """
+        if self._banks.pop(bank_id, None) is None:
+            return False
+        if self.active_id == bank_id:
+            self.active_id = None
+        return True
+
+    def set_switch_hotkey(self, bank_id: str, hotkey: Optional[str]) -> bool:
+        """Set the hotkey switching to a bank
+
+        Args:
+            bank_id: Unique identifier for the bank
+            hotkey: The hotkey, or None to remove it
+
+        Returns:
+            True if the hotkey was set, False if the bank does not exist
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None:
+            return False
+        bank["hotkey"] = hotkey or None
+        return True
+
+    def set_sound(self, bank_id: str, sound_id: str, hotkey: Optional[str] = None) -> bool:
+        """Put a sound in a bank, or change its hotkey there
+
+        Args:
+            bank_id: Unique identifier for the bank
+            sound_id: Unique identifier for the sound
+            hotkey: The hotkey playing the sound while the bank is active, or None
+
+        Returns:
+            True if the sound was set, False if the bank does not exist
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None:
+            return False
+        bank["sounds"][sound_id] = hotkey or None
+        return True
+
+    def remove_sound(self, bank_id: str, sound_id: str) -> bool:
+        """Take a sound out of a bank
+
+        Returns:
+            True if the sound was removed, False if it was not in the bank
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None or sound_id not in bank["sounds"]:
+            return False
+        del bank["sounds"][sound_id]
+        return True
+
+    def forget_sound(self, sound_id: str) -> List[str]:
+        """Take a sound out of every bank, e.g. when it leaves the library
+
+        Returns:
+            The IDs of the banks the sound was in
+        """
+        bank_ids = [bank_id for bank_id, bank in self._banks.items() if sound_id in bank["sounds"]]
+        for bank_id in bank_ids:
+            del self._banks[bank_id]["sounds"][sound_id]
+        return bank_ids
+
+    def set_active(self, bank_id: Optional[str]) -> bool:
+        """Make a bank the active one
+
+        Args:
+            bank_id: Unique identifier for the bank, or None for no bank
+
+        Returns:
+            True if the bank is now active, False if it does not exist
+        """
+        if bank_id is not None and bank_id not in self._banks:
+            return False
+        self.active_id = bank_id
+        return True
+
+    def get_bank(self, bank_id: str) -> Optional[Dict[str, Any]]:
+        """Get a bank by its ID
+
+        Returns:
+            Dictionary with id, name, hotkey and sounds (sound ID -> hotkey in
+            the bank), or None if not found
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None:
+            return None
+        return self._record(bank_id, bank)
+
+    @staticmethod
+    def _record(bank_id: str, bank: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a bank into the record returned by get_bank()"""
+        return {"id": bank_id, "name": bank["name"], "hotkey": bank["hotkey"], "sounds": dict(bank["sounds"])}
+
+    def bank_ids(self) -> List[str]:
+        """Get the IDs of every bank, in page order"""
+        return list(self._banks)
+
+    def sound_ids(self, bank_id: str) -> List[str]:
+        """Get the sounds of a bank, in the order they were added"""
+        bank = self._banks.get(bank_id)
+        return list(bank["sounds"]) if bank is not None else []
+
+    def has_sound(self, sound_id: str) -> bool:
+        """Check whether a sound is in any bank"""
+        return any(sound_id in bank["sounds"] for bank in self._banks.values())
+
+    def layout(self, bank_id: str) -> Dict[str, str]:
+        """Get the hotkeys of a bank
+
+        Returns:
+            Dictionary of hotkey -> sound ID, for the sounds of the bank having one
+        """
+        bank = self._banks.get(bank_id)
+        if bank is None:
+            return {}
+        return {hotkey: sound_id for sound_id, hotkey in bank["sounds"].items() if hotkey}
+
+    def switch_hotkeys(self) -> Dict[str, str]:
+        """Get the hotkeys switching banks, as a dictionary of hotkey -> bank ID"""
+        return {bank["hotkey"]: bank_id for bank_id, bank in self._banks.items() if bank["hotkey"]}
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Get the banks as JSON-serializable records, in page order"""
+        return [self._record(bank_id, bank) for bank_id, bank in self._banks.items()]
+
+    def rebuild(self, banks: Iterable[Dict[str, Any]], active_id: Optional[str], sound_ids: Iterable[str]) -> None:
+        """Replace every bank with the records of a data file
+
+        Args:
+            banks: Records as returned by to_list()
+            active_id: ID of the active bank, or None
+            sound_ids: The sounds of the library; other sounds are left out of the banks
+        """
+        library = set(sound_ids)
+        self.clear()
+        for record in banks:
+            bank_id = record.get("id")
+            if not bank_id or not self.add_bank(bank_id, record.get("name", "Bank")):
+                continue
+            self.set_switch_hotkey(bank_id, record.get("hotkey"))
+            for sound_id, hotkey in (record.get("sounds") or {}).items():
+                if sound_id in library:
+                    self.set_sound(bank_id, sound_id, hotkey)
+        self.set_active(active_id if active_id in self._banks else None)
@@ -2,22 +2,61 @@
 
 import os
 import json
-from typing import Dict, List, Optional, Any
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+
+from models.search_index import SearchIndex
+from models.fuzzy_search import FuzzySearcher
+from models.library_columns import LibraryColumns
+from models.facet_index import FacetIndex
+from models.folder_tree import FolderTree
+from models.sound_banks import SoundBanks
+from models.play_stats import PlayStatsIndex
+from models.library_reader import iter_library_entries
+
+# Sort keys answered from the play statistics index instead of a library sort
+PLAY_STATS_SORTS = ("recent", "play_count")
+
+# Sounds read or indexed by one load_more() call of a progressive load
+LOAD_CHUNK_SIZE = 256
 
 class SoundModel:
     """Model for managing sound data including favorites"""
     
-    def __init__(self, data_file: str = None):
+    def __init__(self, data_file: Optional[str] = None, progressive: bool = False, search: bool = True):
         """Initialize the sound model
         
         Args:
             data_file: Path to the JSON file for storing sound data
+            progressive: Only open the file, leaving the sounds to be read
+                and indexed by calls to load_more(), e.g. from an event loop
+            search: Build the search index while loading; if False, the
+                first search builds it, e.g. for tools that seldom search
         """
         self.sounds: Dict[str, Dict[str, Any]] = {}
         self.favorites: List[str] = []
+        self.search_index = SearchIndex()
+        self.fuzzy_searcher = FuzzySearcher(self.search_index)
+        self._search_deferred = not search  # Sounds are left out of the search index until a search
+        self.columns = LibraryColumns()
+        self.facets = FacetIndex()
+        self.folder_tree = FolderTree()
+        self.banks = SoundBanks()
+        self.play_stats = PlayStatsIndex()
+        self._unsaved_changes = False  # Play statistics, gains and batched changes since the last save
+        self._batch_depth = 0  # Nesting of batch() blocks, which hold back saves
+        self._entries: Optional[Iterator] = None  # Entries of the data file still to be read
+        self._saved_folders: Dict[str, Dict[str, Any]] = {}  # Folder records read from the data file
+        self._saved_banks: List[Dict[str, Any]] = []  # Bank records read from the data file
+        self._saved_active_bank: Optional[str] = None
+        self._load_queue: List[Tuple[str, int]] = []  # (sound ID, insertion number) still to be indexed
+        self._load_position = 0  # Next entry of the load queue
         self.data_file = data_file or os.path.join(os.path.expanduser("~"), ".soundboard", "sounds.json")
         self._ensure_data_dir()
-        self._load_data()
+        self._load_data(progressive)
+        if not progressive:
+            self.finish_loading()
     
     def _ensure_data_dir(self) -> None:
         """Ensure the data directory exists"""
@@ -25,25 +64,162 @@ class SoundModel:
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
     
-    def _load_data(self) -> None:
-        """Load sound data from the JSON file"""
+    def _load_data(self, progressive: bool = False) -> None:
+        """Open the JSON file, to be read a chunk of sounds at a time if progressive"""
+        text = "{}"
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.sounds = data.get('sounds', {})
-                    self.favorites = data.get('favorites', [])
-            except (json.JSONDecodeError, IOError) as e:
+                    text = f.read()
+            except IOError as e:
                 print(f"Error loading sound data: {e}")
+        self._entries = iter_library_entries(text, incremental=progressive)
+    
+    def is_loading(self) -> bool:
+        """Check whether sounds of the data file are still to be read or indexed"""
+        return (self._entries is not None or self._load_position < len(self._load_queue)
+                or not self.search_index.is_sorted())
+    
+    def loading_progress(self) -> Tuple[int, int]:
+        """Get how far loading the library got
+        
+        Returns:
+            The number of sounds indexed, and the number of sounds read so far
+        """
+        return len(self.columns), len(self.sounds)
+    
+    def load_more(self, limit: Optional[int] = LOAD_CHUNK_SIZE) -> bool:
+        """Read or index the next chunk of sounds of the data file
+        
+        The file is read first. The sounds are then indexed in the order of
+        the "recent" sort, most recently played first and then newest first,
+        so the first chunk already holds the first page of the default view.
+        Until a sound is indexed it is left out of searches, sorts and filters.
+        Last, the search postings are sorted, a chunk of words at a time, so
+        the first searches do not have to.
+        
+        Args:
+            limit: Maximum number of sounds to read or index, or of words to
+                sort, or None for all of them
+            
+        Returns:
+            True if sounds are still to be loaded, False once the library is complete
+        """
+        if self._entries is not None:
+            self._read_entries(limit)
+        elif self._load_position < len(self._load_queue):
+            self._index_queued(limit)
+        else:
+            self.search_index.sort_pending(limit)
+        return self.is_loading()
+    
+    def finish_loading(self) -> None:
+        """Read and index the rest of the data file at once"""
+        while self.load_more(None):
+            pass
+    
+    def _finish_reading(self) -> None:
+        """Read the rest of the data file, so a change is not overwritten by what is still unread"""
+        if self._entries is not None:
+            self._read_entries(None)
+    
+    def _read_entries(self, limit: Optional[int]) -> None:
+        """Read up to `limit` sounds from the data file, preparing the indexing once it is all read"""
+        entries = self._entries
+        if entries is None:
+            return
+        read = 0
+        try:
+            while limit is None or read < limit:
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                key, sound_id, value = entry
+                if key == 'sounds':
+                    self.sounds[sound_id] = value
+                    read += 1
+                elif key == 'favorites':
+                    self.favorites = value
+                elif key == 'folders':
+                    self._saved_folders = value
+                elif key == 'banks':
+                    self._saved_banks = value
+                elif key == 'active_bank':
+                    self._saved_active_bank = value
+            else:
+                # Limit reached, the rest is read by the next call
+                return
+        except json.JSONDecodeError as e:
+            print(f"Error loading sound data: {e}")
+            self.sounds = {}
+            self.favorites = []
+            self._saved_folders = {}
+            self._saved_banks = []
+            self._saved_active_bank = None
+        
+        self._entries = None
+        self.folder_tree.rebuild(
+            self._saved_folders,
+            ((sound_id, sound_data.get("folder_id")) for sound_id, sound_data in self.sounds.items())
+        )
+        self._saved_folders = {}
+        for sound_id, sound_data in self.sounds.items():
+            if "folder_id" in sound_data and self.folder_tree.folder_of(sound_id) is None:
+                # Filed in a folder missing from the file, so in none
+                del sound_data["folder_id"]
+        self.banks.rebuild(self._saved_banks, self._saved_active_bank, self.sounds)
+        self._saved_banks = []
+        self._rebuild_play_stats()
+        
+        # Sounds keep their place in the file as insertion number, whatever order they are indexed in
+        first_seq = self.columns.reserve_seq(len(self.sounds))
+        seqs = {sound_id: first_seq + position for position, sound_id in enumerate(self.sounds)}
+        unplayed = sorted(
+            (sound_id for sound_id in self.sounds if sound_id not in self.play_stats),
+            key=lambda sound_id: (float(self.sounds[sound_id].get("added_at") or 0), seqs[sound_id]),
+            reverse=True
+        )
+        self._load_queue = [(sound_id, seqs[sound_id]) for sound_id in self.play_stats.recent() + unplayed]
+        self._load_position = 0
+    
+    def _index_queued(self, limit: Optional[int]) -> None:
+        """Index up to `limit` sounds of the load queue"""
+        end = len(self._load_queue) if limit is None else min(len(self._load_queue), self._load_position + limit)
+        # Sounds removed meanwhile are skipped, sounds changed meanwhile were indexed by the change
+        chunk = [
+            (sound_id, seq) for sound_id, seq in self._load_queue[self._load_position:end]
+            if sound_id in self.sounds and sound_id not in self.columns
+        ]
+        self._load_position = end
+        if end == len(self._load_queue):
+            self._load_queue = []
+            self._load_position = 0
+        
+        sounds = [(sound_id, self.sounds[sound_id]) for sound_id, _ in chunk]
+        favorites = set(self.favorites)
+        if not self._search_deferred:
+            self.search_index.add_many(sounds)
+        self.columns.extend(sounds, favorites, [seq for _, seq in chunk])
+        self.facets.extend(
+            (sound_id, self._facet_values(sound_data, sound_id in favorites)) for sound_id, sound_data in sounds
+        )
     
     def _save_data(self) -> None:
-        """Save sound data to the JSON file"""
+        """Save sound data to the JSON file, or at the end of the batch being run"""
+        if self._batch_depth:
+            self._unsaved_changes = True
+            return
+        self._finish_reading()
         try:
             with open(self.data_file, 'w', encoding='utf-8') as f:
                 json.dump({
                     'sounds': self.sounds,
-                    'favorites': self.favorites
+                    'favorites': self.favorites,
+                    'folders': self.folder_tree.to_dict(),
+                    'banks': self.banks.to_list(),
+                    'active_bank': self.banks.active_id
                 }, f, indent=2)
+            self._unsaved_changes = False
         except IOError as e:
             print(f"Error saving sound data: {e}")
     
@@ -52,9 +228,36 @@ class SoundModel:
         
         Args:
             sound_id: Unique identifier for the sound
-            sound_data: Dictionary containing sound data
+            sound_data: Dictionary containing sound data, filed in the folder given by its folder_id;
+                the model keeps a copy, completed with the statistics of the sound
         """
+        self._finish_reading()
+        sound_data = dict(sound_data)
+        previous = self.sounds.get(sound_id)
+        if previous is not None:
+            # Updates keep the statistics the caller did not pass
+            for key in ("added_at", "play_count", "last_played_at"):
+                if key in previous:
+                    sound_data.setdefault(key, previous[key])
+        sound_data.setdefault("added_at", time.time())
         self.sounds[sound_id] = sound_data
+        play_count = int(sound_data.get("play_count") or 0)
+        last_played_at = sound_data.get("last_played_at")
+        if (play_count != self.play_stats.play_count(sound_id)
+                or (play_count and (last_played_at or 0.0) != self.play_stats.last_played_at(sound_id))):
+            self.play_stats.set(sound_id, play_count, last_played_at)
+        self.folder_tree.set_sound_folder(sound_id, sound_data.get("folder_id"))
+        # An unknown folder files the sound in none, which its data and folder facet must say too
+        folder_id = self.folder_tree.folder_of(sound_id)
+        if folder_id is None:
+            sound_data.pop("folder_id", None)
+        else:
+            sound_data["folder_id"] = folder_id
+        if not self._search_deferred:
+            self.search_index.add(sound_id, sound_data)
+        is_favorite = sound_id in self.favorites
+        self.columns.add(sound_id, sound_data, is_favorite)
+        self.facets.add(sound_id, self._facet_values(sound_data, is_favorite))
         self._save_data()
     
     def remove_sound(self, sound_id: str) -> bool:
@@ -66,8 +269,15 @@ class SoundModel:
         Returns:
             True if the sound was removed, False otherwise
         """
+        self._finish_reading()
         if sound_id in self.sounds:
             del self.sounds[sound_id]
+            self.search_index.remove(sound_id)
+            self.columns.remove(sound_id)
+            self.facets.remove(sound_id)
+            self.folder_tree.remove_sound(sound_id)
+            self.banks.forget_sound(sound_id)
+            self.play_stats.remove(sound_id)
             # Also remove from favorites if present
             if sound_id in self.favorites:
                 self.favorites.remove(sound_id)
@@ -94,6 +304,597 @@ class SoundModel:
         """
         return self.sounds
     
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Search sounds by title, category and tags
+        
+        Args:
+            query: Free text query
+            limit: Maximum number of results to return, or None for all
+            
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        self._build_deferred_search_index()
+        return self.search_index.search(query, limit)
+    
+    def fuzzy_search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Search sounds with typo tolerance
+        
+        Args:
+            query: Free text query
+            limit: Maximum number of results to return, or None for all
+            
+        Returns:
+            List of matching sound IDs, best match first
+        """
+        self._build_deferred_search_index()
+        return self.fuzzy_searcher.search(query, limit)
+    
+    def _build_deferred_search_index(self) -> None:
+        """Index the sounds for searching, if loading left them out"""
+        if not self._search_deferred:
+            return
+        self._search_deferred = False
+        self.search_index.add_many(
+            (sound_id, sound_data) for sound_id, sound_data in self.sounds.items() if sound_id in self.columns
+        )
+    
+    def sort_sounds(self, sound_ids: List[str], sort_by: str = "recent",
+                    descending: bool = False) -> List[str]:
+        """Sort sounds using the cached library orderings
+        
+        Args:
+            sound_ids: Sound IDs to sort
+            sort_by: Sort key: "recent" (last played), "added", "name", "duration",
+                "category" or "play_count"
+            descending: Whether to reverse the natural order of the key
+            
+        Returns:
+            List of sound IDs in sort order
+        """
+        if sort_by in PLAY_STATS_SORTS and not descending:
+            sound_ids = list(sound_ids)
+            wanted = set(sound_ids)
+            unplayed = [sound_id for sound_id in sound_ids if sound_id not in self.play_stats]
+            return self._played_first(sort_by, wanted.__contains__, self.columns.sort_ids(unplayed, "added"))
+        return self.columns.sort_ids(sound_ids, sort_by, descending)
+    
+    def get_sorted_sound_ids(self, sort_by: str = "recent", category: Optional[int] = None,
+                             favorites_only: bool = False) -> List[str]:
+        """Get the IDs of every sound passing a filter, in sort order
+        
+        Args:
+            sort_by: Sort key: "recent" (last played), "added", "name", "duration",
+                "category" or "play_count"
+            category: Only include sounds in this category, or None for all
+            favorites_only: Only include favorite sounds
+            
+        Returns:
+            List of sound IDs in sort order
+        """
+        favorite = True if favorites_only else None
+        if sort_by in PLAY_STATS_SORTS:
+            unplayed = [
+                sound_id for sound_id in self.columns.sorted_ids("added", category=category, favorite=favorite)
+                if sound_id not in self.play_stats
+            ]
+            if category is None and favorite is None:
+                return self._played_first(sort_by, self.sounds.__contains__, unplayed)
+            bits = self.facets.query(category=category, favorite=favorite)
+            return self._played_first(sort_by, lambda sound_id: self.facets.contains(bits, sound_id), unplayed)
+        return self.columns.sorted_ids(sort_by, category=category, favorite=favorite)
+    
+    def _played_first(self, sort_by: str, keep: Callable[[str], bool], unplayed: List[str]) -> List[str]:
+        """Put the played sounds, in play statistics order, before the unplayed ones
+        
+        Args:
+            sort_by: "recent" or "play_count"
+            keep: Predicate selecting the played sounds to include
+            unplayed: Sounds never played, already in order
+            
+        Returns:
+            List of sound IDs
+        """
+        played = self.play_stats.recent() if sort_by == "recent" else self.play_stats.most_played()
+        return [sound_id for sound_id in played if keep(sound_id)] + unplayed
+    
+    def record_play(self, sound_id: str, played_at: Optional[float] = None) -> Optional[int]:
+        """Count a play of a sound
+        
+        The statistics are not saved right away, call flush() to persist them.
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            played_at: Time of the play in seconds since the epoch, now if None
+            
+        Returns:
+            The new play count, or None if the sound does not exist
+        """
+        self._finish_reading()
+        sound_data = self.sounds.get(sound_id)
+        if sound_data is None:
+            return None
+        played_at = time.time() if played_at is None else played_at
+        play_count = self.play_stats.record(sound_id, played_at)
+        sound_data["play_count"] = play_count
+        sound_data["last_played_at"] = played_at
+        self.columns.record_play(sound_id, play_count, played_at)
+        self._unsaved_changes = True
+        return play_count
+    
+    def set_gain(self, sound_id: str, gain_db: float) -> bool:
+        """Set the gain a sound is played with
+        
+        Like play statistics, gains are not saved right away, as faders
+        change them many times a second; call flush() to persist them.
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            gain_db: Gain in decibels, 0.0 to play the sound as recorded
+            
+        Returns:
+            True if the gain was set, False if the sound does not exist
+        """
+        self._finish_reading()
+        sound_data = self.sounds.get(sound_id)
+        if sound_data is None:
+            return False
+        if gain_db:
+            sound_data["gain_db"] = gain_db
+        else:
+            sound_data.pop("gain_db", None)
+        self._unsaved_changes = True
+        return True
+    
+    def get_recent_sound_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most recently played sounds
+        
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+            
+        Returns:
+            List of sound IDs, most recently played first
+        """
+        return self.play_stats.recent(limit)
+    
+    def get_most_played_sound_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get the most played sounds
+        
+        Args:
+            limit: Maximum number of sounds to return, or None for all
+            
+        Returns:
+            List of sound IDs, most played first
+        """
+        return self.play_stats.most_played(limit)
+    
+    def has_unsaved_changes(self) -> bool:
+        """Check whether play statistics or gains changed since the last save"""
+        return self._unsaved_changes
+    
+    def flush(self) -> bool:
+        """Save the data if play statistics or gains changed since the last save
+        
+        Returns:
+            True if the data was written, False if there was nothing to save
+        """
+        if not self._unsaved_changes:
+            return False
+        self._save_data()
+        return True
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Save the changes made in a with block once, at its end
+        
+        Bulk operations, like importing a folder of thousands of files,
+        would otherwise rewrite the data file once per sound. Batches may
+        be nested; the outermost one saves.
+        
+            with model.batch():
+                for sound_id, sound_data in sounds.items():
+                    model.add_sound(sound_id, sound_data)
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+    
+    def _rebuild_play_stats(self) -> None:
+        """Rebuild the play statistics index from the sound data"""
+        self.play_stats.rebuild(
+            (sound_id, int(sound_data.get("play_count") or 0), sound_data.get("last_played_at"))
+            for sound_id, sound_data in self.sounds.items()
+        )
+    
+    def filter_sounds(self, category: Any = None, favorite: Optional[bool] = None,
+                      folder: Any = None, missing_file: Optional[bool] = None,
+                      has_hotkey: Optional[bool] = None) -> List[str]:
+        """Get the sounds matching every given facet filter
+        
+        Args:
+            category: Category, or list of categories to match any of, or None for all
+            favorite: True for favorites only, False for non-favorites, None for all
+            folder: Folder ID, or list of folder IDs to match any of, or None for all
+            missing_file: True/False to keep sounds whose file is missing/present, None for all
+            has_hotkey: True/False to keep sounds with/without a hotkey, None for all
+            
+        Returns:
+            List of matching sound IDs
+        """
+        return self.facets.ids(self.facets.query(
+            category=category, favorite=favorite, folder=folder,
+            missing_file=missing_file, has_hotkey=has_hotkey
+        ))
+    
+    def get_facet_counts(self, facet: str) -> Dict[Any, int]:
+        """Count the sounds having each value of a facet
+        
+        Args:
+            facet: "category", "favorite", "folder", "missing_file" or "has_hotkey"
+            
+        Returns:
+            Dictionary of facet value -> number of sounds
+        """
+        return self.facets.counts(facet)
+    
+    def add_folder(self, folder_id: str, name: str, parent_id: Optional[str] = None) -> bool:
+        """Add an empty folder
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            name: Display name of the folder
+            parent_id: ID of the parent folder, or None for a top-level folder
+            
+        Returns:
+            True if the folder was added, False otherwise
+        """
+        self._finish_reading()
+        if self.folder_tree.add_folder(folder_id, name, parent_id):
+            self._save_data()
+            return True
+        return False
+    
+    def rename_folder(self, folder_id: str, name: str) -> bool:
+        """Rename a folder
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            name: New display name
+            
+        Returns:
+            True if the folder was renamed, False otherwise
+        """
+        self._finish_reading()
+        if self.folder_tree.rename_folder(folder_id, name):
+            self._save_data()
+            return True
+        return False
+    
+    def move_folder(self, folder_id: str, parent_id: Optional[str]) -> bool:
+        """Move a folder, with its subfolders and sounds, under another parent
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            parent_id: ID of the new parent folder, or None to make it top-level
+            
+        Returns:
+            True if the folder was moved, False if it does not exist or would end up inside itself
+        """
+        self._finish_reading()
+        if self.folder_tree.move_folder(folder_id, parent_id) is None:
+            return False
+        self._save_data()
+        return True
+    
+    def remove_folder(self, folder_id: str) -> bool:
+        """Remove a folder, moving its subfolders and sounds up to its parent
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            
+        Returns:
+            True if the folder was removed, False otherwise
+        """
+        self._finish_reading()
+        folder = self.folder_tree.get_folder(folder_id)
+        if folder is None:
+            return False
+        for sound_id in self.folder_tree.remove_folder(folder_id) or []:
+            self._set_sound_folder_id(sound_id, folder["parent_id"])
+        self._save_data()
+        return True
+    
+    def move_sound_to_folder(self, sound_id: str, folder_id: Optional[str]) -> bool:
+        """File a sound in a folder
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            folder_id: ID of the folder, or None to take the sound out of its folder
+            
+        Returns:
+            True if the sound was moved, False if the sound or folder does not exist
+        """
+        self._finish_reading()
+        if sound_id not in self.sounds or (folder_id is not None and folder_id not in self.folder_tree):
+            return False
+        self.folder_tree.set_sound_folder(sound_id, folder_id)
+        self._set_sound_folder_id(sound_id, folder_id)
+        self._save_data()
+        return True
+    
+    def get_folder(self, folder_id: str) -> Optional[Dict[str, Any]]:
+        """Get a folder by its ID
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            
+        Returns:
+            Dictionary with id, name, parent_id, count (sounds in the folder and its
+            subfolders) and direct_count, or None if not found
+        """
+        return self.folder_tree.get_folder(folder_id)
+    
+    def get_folders(self, parent_id: Optional[str] = None, recursive: bool = False) -> List[Dict[str, Any]]:
+        """Get the subfolders of a folder
+        
+        Args:
+            parent_id: ID of the folder, or None for the top-level folders
+            recursive: Whether to include every folder below, parents before their children
+            
+        Returns:
+            List of folder dictionaries as returned by get_folder, with the depth below parent_id
+        """
+        if recursive:
+            walked = self.folder_tree.walk(parent_id)
+        else:
+            walked = [(folder_id, 0) for folder_id in self.folder_tree.children(parent_id)]
+        folders = []
+        for folder_id, depth in walked:
+            folder = self.folder_tree.get_folder(folder_id)
+            if folder is not None:
+                folder["depth"] = depth
+                folders.append(folder)
+        return folders
+    
+    def get_folder_parents(self) -> Dict[str, Optional[str]]:
+        """Get the parent folder ID of every folder
+        
+        Returns:
+            Dictionary of folder ID -> parent folder ID, None for top-level folders
+        """
+        return self.folder_tree.parents()
+    
+    def get_sound_folder(self, sound_id: str) -> Optional[str]:
+        """Get the folder a sound is filed in
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            
+        Returns:
+            Folder ID, or None if the sound is not in a folder
+        """
+        return self.folder_tree.folder_of(sound_id)
+    
+    def get_folder_sound_ids(self, folder_id: str, recursive: bool = True) -> List[str]:
+        """Get the sounds in a folder
+        
+        Args:
+            folder_id: Unique identifier for the folder
+            recursive: Whether to include the sounds in its subfolders
+            
+        Returns:
+            List of sound IDs, in the order they were added
+        """
+        folder_ids = self.folder_tree.descendants(folder_id) if recursive else [folder_id]
+        return self.facets.ids(self.facets.bitmap("folder", folder_ids))
+    
+    def get_folder_path_counts(self, folder_id: Optional[str]) -> Dict[str, int]:
+        """Get the sound count of a folder and of each of its parents
+        
+        Args:
+            folder_id: Unique identifier for the folder, None gives no counts
+            
+        Returns:
+            Dictionary of folder ID -> number of sounds in it and its subfolders
+        """
+        return {path_id: self.folder_tree.sound_count(path_id) for path_id in self.folder_tree.path(folder_id)}
+    
+    def add_bank(self, bank_id: str, name: str) -> bool:
+        """Add an empty bank after the others
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            name: Display name of the bank
+            
+        Returns:
+            True if the bank was added, False otherwise
+        """
+        self._finish_reading()
+        if self.banks.add_bank(bank_id, name):
+            self._save_data()
+            return True
+        return False
+    
+    def rename_bank(self, bank_id: str, name: str) -> bool:
+        """Rename a bank
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            name: New display name
+            
+        Returns:
+            True if the bank was renamed, False otherwise
+        """
+        self._finish_reading()
+        if self.banks.rename_bank(bank_id, name):
+            self._save_data()
+            return True
+        return False
+    
+    def remove_bank(self, bank_id: str) -> bool:
+        """Remove a bank, leaving its sounds in the library
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            
+        Returns:
+            True if the bank was removed, False otherwise
+        """
+        self._finish_reading()
+        if self.banks.remove_bank(bank_id):
+            self._save_data()
+            return True
+        return False
+    
+    def set_bank_switch_hotkey(self, bank_id: str, hotkey: Optional[str]) -> bool:
+        """Set the hotkey switching to a bank
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            hotkey: The hotkey, or None to remove it
+            
+        Returns:
+            True if the hotkey was set, False if the bank does not exist
+        """
+        self._finish_reading()
+        if self.banks.set_switch_hotkey(bank_id, hotkey):
+            self._save_data()
+            return True
+        return False
+    
+    def set_bank_sound(self, bank_id: str, sound_id: str, hotkey: Optional[str] = None) -> bool:
+        """Put a sound in a bank, or change its hotkey there
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            sound_id: Unique identifier for the sound
+            hotkey: The hotkey playing the sound while the bank is active, or None
+            
+        Returns:
+            True if the sound was set, False if the sound or bank does not exist
+        """
+        self._finish_reading()
+        if sound_id in self.sounds and self.banks.set_sound(bank_id, sound_id, hotkey):
+            self._save_data()
+            return True
+        return False
+    
+    def remove_bank_sound(self, bank_id: str, sound_id: str) -> bool:
+        """Take a sound out of a bank
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            sound_id: Unique identifier for the sound
+            
+        Returns:
+            True if the sound was removed, False if it was not in the bank
+        """
+        self._finish_reading()
+        if self.banks.remove_sound(bank_id, sound_id):
+            self._save_data()
+            return True
+        return False
+    
+    def set_active_bank(self, bank_id: Optional[str]) -> bool:
+        """Make a bank the active one
+        
+        Args:
+            bank_id: Unique identifier for the bank, or None for no bank
+            
+        Returns:
+            True if the bank is now active, False if it does not exist
+        """
+        self._finish_reading()
+        if bank_id == self.banks.active_id:
+            return True
+        if self.banks.set_active(bank_id):
+            self._save_data()
+            return True
+        return False
+    
+    def get_active_bank_id(self) -> Optional[str]:
+        """Get the ID of the active bank, or None"""
+        return self.banks.active_id
+    
+    def get_bank(self, bank_id: str) -> Optional[Dict[str, Any]]:
+        """Get a bank by its ID
+        
+        Args:
+            bank_id: Unique identifier for the bank
+            
+        Returns:
+            Dictionary with id, name, hotkey (switching to the bank) and sounds
+            (sound ID -> hotkey in the bank), or None if not found
+        """
+        return self.banks.get_bank(bank_id)
+    
+    def is_in_bank(self, sound_id: str) -> bool:
+        """Check whether a sound is in any bank
+        
+        Args:
+            sound_id: Unique identifier for the sound
+        """
+        return self.banks.has_sound(sound_id)
+    
+    def get_banks(self) -> List[Dict[str, Any]]:
+        """Get every bank, in page order
+        
+        Returns:
+            List of bank data dictionaries, as returned by get_bank()
+        """
+        return self.banks.to_list()
+    
+    def _set_sound_folder_id(self, sound_id: str, folder_id: Optional[str]) -> None:
+        """Store a sound's folder in its data and its folder facet"""
+        sound_data = self.sounds[sound_id]
+        if folder_id is None:
+            sound_data.pop("folder_id", None)
+        else:
+            sound_data["folder_id"] = folder_id
+        self.facets.set(sound_id, "folder", folder_id)
+    
+    @staticmethod
+    def _facet_values(sound_data: Dict[str, Any], is_favorite: bool) -> Dict[str, Any]:
+        """Get the facet values of a sound
+        
+        Args:
+            sound_data: Dictionary containing sound data
+            is_favorite: Whether the sound is a favorite
+            
+        Returns:
+            Dictionary of facet -> value
+        """
+        file_path = sound_data.get("file_path")
+        return {
+            "category": sound_data.get("category"),
+            "favorite": is_favorite,
+            "folder": sound_data.get("folder_id"),
+            "missing_file": not file_path or not os.path.isfile(file_path),
+            "has_hotkey": bool(sound_data.get("hotkey")),
+        }
+    
+    def check_file(self, sound_id: str) -> bool:
+        """Check whether the file of a sound exists, updating its missing_file facet
+
+        The facet is computed when a sound is indexed, so a file deleted or
+        restored since is only noticed when this is called, e.g. on playing.
+        
+        Args:
+            sound_id: Unique identifier for the sound
+            
+        Returns:
+            True if the file of the sound exists, False otherwise
+        """
+        sound_data = self.sounds.get(sound_id)
+        file_path = sound_data.get("file_path") if sound_data else None
+        found = file_path is not None and os.path.isfile(file_path)
+        self.facets.set(sound_id, "missing_file", not found)
+        return found
+    
     def add_to_favorites(self, sound_id: str) -> bool:
         """Add a sound to favorites
         
@@ -103,8 +904,11 @@ class SoundModel:
         Returns:
             True if the sound was added to favorites, False otherwise
         """
+        self._finish_reading()
         if sound_id in self.sounds and sound_id not in self.favorites:
             self.favorites.append(sound_id)
+            self.columns.set_favorite(sound_id, True)
+            self.facets.set(sound_id, "favorite", True)
             self._save_data()
             return True
         return False
@@ -118,8 +922,11 @@ class SoundModel:
         Returns:
             True if the sound was removed from favorites, False otherwise
         """
+        self._finish_reading()
         if sound_id in self.favorites:
             self.favorites.remove(sound_id)
+            self.columns.set_favorite(sound_id, False)
+            self.facets.set(sound_id, "favorite", False)
             self._save_data()
             return True
         return False
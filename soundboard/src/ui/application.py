@@ -0,0 +1,74 @@
+"""Startup of the soundboard window, for the launch that owns the library"""
+
+import argparse
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+from managers.remote_controls import RemoteControls
+from managers.services import services
+from managers.single_instance import InstanceLock
+from managers.startup_profile import startup_profile
+from ui.main_window import MainWindow
+
+startup_profile.mark("imports")
+
+
+class FirstPaintWatcher(QObject):
+    """Marks the first paint of a window, then the first idle event loop"""
+
+    def eventFilter(self, watched: Optional[QObject], event: Optional[QEvent]) -> bool:
+        if watched is not None and event is not None and event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            startup_profile.mark("first paint")
+            # Timers run once the events queued by the first paint are handled
+            QTimer.singleShot(0, self._on_interactive)
+        return False
+
+    def _on_interactive(self) -> None:
+        startup_profile.mark("interactive")
+        startup_profile.print_report()
+
+
+def run(options: argparse.Namespace, qt_args: List[str], lock: InstanceLock, commands: List[Dict[str, Any]]) -> int:
+    """Show the window and run the event loop
+
+    Args:
+        options: The parsed options of the application
+        qt_args: The command line left to Qt
+        lock: The instance lock, held; released on exit
+        commands: Commands of the command line, run once the library is loaded
+
+    Returns:
+        The exit code
+    """
+    app = QApplication(qt_args)
+    services.audio_process = options.audio_process
+    # Reads the library and sets up the audio player, marking both phases
+    sound_manager = services.sound_manager
+    window = MainWindow()
+    watcher = FirstPaintWatcher(window)
+    window.installEventFilter(watcher)
+    window.show()
+    # Hooking the keyboard can wait until the window is up
+    QTimer.singleShot(0, sound_manager.start_hotkeys)
+
+    # Later launches forward their command line here instead of opening a window
+    remote_controls = RemoteControls(sound_manager, lock, options.control_port, options.osc_port, options.osc_host)
+    remote_controls.operations.register("show", lambda command: _show_window(window))
+    QTimer.singleShot(0, remote_controls.start)
+    remote_controls.run_when_loaded(commands)
+    exit_code = app.exec()
+    remote_controls.stop()
+    sound_manager.audio_player.close()
+    return exit_code
+
+
+def _show_window(window: MainWindow) -> Dict[str, Any]:
+    """Bring the window to the front, restoring it if minimized"""
+    if window.isMinimized():
+        window.showNormal()
+    window.show()
+    window.raise_()
+    window.activateWindow()
+    return {}
@@ -0,0 +1,112 @@
+"""
+Layout flowing equally sized cards into as many columns as fit
+"""
+
+from typing import List, Optional
+
+from PyQt6.QtCore import QPoint, QRect, QSize, Qt
+from PyQt6.QtWidgets import QLayout, QLayoutItem, QWidget
+
+
+class CardFlowLayout(QLayout):
+    """
+    Lays out cards left to right, top to bottom, in fixed size cells
+
+    The column count follows the width of the layout. Resizing only moves
+    the cards when the column count changes; cards keep their cells when
+    the width grows or shrinks within the same count. Hidden cards take
+    no cell.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._items: List[QLayoutItem] = []
+        self._columns = 0  # Column count of the current layout, 0 until laid out
+        self._cell = QSize()  # Cell size of the current layout
+        self._origin: Optional[QPoint] = None  # Top left corner of the current layout
+        self._dirty = True  # Items were added, removed, shown, hidden or resized
+
+    def addItem(self, item: Optional[QLayoutItem]) -> None:
+        if item is None:
+            return
+        self._items.append(item)
+        self.invalidate()
+
+    def count(self) -> int:
+        return len(self._items)
+
+    def itemAt(self, index: int) -> Optional[QLayoutItem]:
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+
+    def takeAt(self, index: int) -> Optional[QLayoutItem]:
+        if 0 <= index < len(self._items):
+            item = self._items.pop(index)
+            self.invalidate()
+            return item
+        return None
+
+    def invalidate(self) -> None:
+        self._dirty = True
+        super().invalidate()
+
+    def expandingDirections(self) -> Qt.Orientation:
+        return Qt.Orientation(0)
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        visible = self._visible_items()
+        if not visible:
+            return 0
+        cell = visible[0].sizeHint()
+        columns = self._column_count(width, cell)
+        rows = (len(visible) + columns - 1) // columns
+        margins = self.contentsMargins()
+        return margins.top() + margins.bottom() + rows * cell.height() + (rows - 1) * self.spacing()
+
+    def sizeHint(self) -> QSize:
+        return self.minimumSize()
+
+    def minimumSize(self) -> QSize:
+        visible = self._visible_items()
+        cell = visible[0].sizeHint() if visible else QSize(0, 0)
+        margins = self.contentsMargins()
+        return cell + QSize(margins.left() + margins.right(), margins.top() + margins.bottom())
+
+    def columns(self) -> int:
+        """Get the column count of the current layout"""
+        return self._columns
+
+    def setGeometry(self, rect: QRect) -> None:
+        super().setGeometry(rect)
+        visible = self._visible_items()
+        cell = visible[0].sizeHint() if visible else QSize()
+        columns = self._column_count(rect.width(), cell)
+        if not self._dirty and columns == self._columns and cell == self._cell and rect.topLeft() == self._origin:
+            # Same columns, same cells: every card is already where it belongs
+            return
+
+        self._dirty = False
+        self._columns = columns
+        self._cell = cell
+        self._origin = rect.topLeft()
+        area = rect.marginsRemoved(self.contentsMargins())
+        spacing = self.spacing()
+        for i, item in enumerate(visible):
+            row, column = divmod(i, columns)
+            x = area.x() + column * (cell.width() + spacing)
+            y = area.y() + row * (cell.height() + spacing)
+            item.setGeometry(QRect(x, y, cell.width(), cell.height()))
+
+    def _visible_items(self) -> List[QLayoutItem]:
+        """Get the items of cards that are not hidden, in order"""
+        return [item for item in self._items if not item.isEmpty()]
+
+    def _column_count(self, width: int, cell: QSize) -> int:
+        """Get how many cells fit side by side in a width"""
+        margins = self.contentsMargins()
+        available = width - margins.left() - margins.right()
+        return max(1, (available + self.spacing()) // (cell.width() + self.spacing())) if cell.width() > 0 else 1
@@ -4,7 +4,7 @@ FolderView Implementation for the Soundboard
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QScrollArea, QFrame, QSizePolicy
+    QPushButton, QScrollArea, QFrame, QSizePolicy, QInputDialog
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon, QColor
@@ -18,11 +18,12 @@ class FolderItem(QFrame):
     """
     clicked = pyqtSignal(str)  # Emits folder_id when clicked
     
-    def __init__(self, folder_name, folder_id, sound_count=0, parent=None):
+    def __init__(self, folder_name, folder_id, sound_count=0, depth=0, parent=None):
         super().__init__(parent)
         self.folder_name = folder_name
         self.folder_id = folder_id
         self.sound_count = sound_count
+        self.depth = depth  # Nesting level, subfolders are indented
         self.is_selected = False
         
         self._setup_ui()
@@ -35,7 +36,7 @@ class FolderItem(QFrame):
         
         # Main layout
         layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 5, 10, 5)
+        layout.setContentsMargins(10 + 16 * self.depth, 5, 10, 5)
         layout.setSpacing(10)
         
         # Folder icon
@@ -77,6 +78,11 @@ class FolderItem(QFrame):
         self.sound_count = count
         self.count_label.setText(f"{count}")
     
+    def set_name(self, folder_name):
+        """Update the folder name"""
+        self.folder_name = folder_name
+        self.name_label.setText(folder_name)
+    
     def _update_style(self):
         """Update styling based on selection state"""
         if self.is_selected:
@@ -111,10 +117,20 @@ class FolderView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.folders = {}  # Dictionary to store folder items {folder_id: FolderItem}
+        self.parent_folders = {}  # Maps folder_id to parent_id
         self.current_folder_id = None
+        self.sound_manager = None
         
         self._setup_ui()
-        self._populate_sample_folders()  # Add some sample folders for demonstration
+    
+    def set_sound_manager(self, sound_manager):
+        """Show the folders of a sound manager and follow its changes"""
+        self.sound_manager = sound_manager
+        sound_manager.folder_added.connect(lambda folder_id, folder_data: self._load_folders())
+        sound_manager.folder_removed.connect(self.remove_folder)
+        sound_manager.folder_updated.connect(self._on_folder_updated)
+        sound_manager.folder_counts_changed.connect(self._on_folder_counts_changed)
+        self._load_folders()
     
     def _setup_ui(self):
         # Main layout
@@ -140,6 +156,7 @@ class FolderView(QWidget):
         
         # Add folder button
         self.add_folder_btn = QPushButton("+ New")
+        self.add_folder_btn.clicked.connect(self._on_add_folder_clicked)
         self.add_folder_btn.setStyleSheet(f"""
             QPushButton {{
                 background-color: {COLORS['card_bg']};
@@ -201,27 +218,43 @@ class FolderView(QWidget):
             }}
         """)
     
-    def _populate_sample_folders(self):
-        """Add sample folders for demonstration"""
-        sample_folders = [
-            {"id": "folder1", "name": "Sound Effects", "count": 12},
-            {"id": "folder2", "name": "Music", "count": 8},
-            {"id": "folder3", "name": "Voice Clips", "count": 5},
-            {"id": "folder4", "name": "Memes", "count": 15},
-            {"id": "folder5", "name": "Stream Alerts", "count": 9},
-            {"id": "folder6", "name": "Custom", "count": 3},
-            {"id": "folder7", "name": "Gaming", "count": 7},
-            {"id": "folder8", "name": "Soundscapes", "count": 4},
-            {"id": "folder9", "name": "Animals", "count": 10},
-            {"id": "folder10", "name": "Instruments", "count": 6}
-        ]
+    def _load_folders(self):
+        """Show the whole folder tree, subfolders indented below their parent"""
+        for folder_id in list(self.folders):
+            self.remove_folder(folder_id)
+        
+        selected_id = self.current_folder_id
+        self.parent_folders = self.sound_manager.get_folder_parents()
+        for folder in self.sound_manager.get_folders(recursive=True):
+            self.add_folder(folder["id"], folder["name"], folder["count"], folder["depth"])
         
-        for folder in sample_folders:
-            self.add_folder(folder["id"], folder["name"], folder["count"])
+        if selected_id in self.folders:
+            self.current_folder_id = selected_id
+            self.folders[selected_id].set_selected(True)
+    
+    def _on_folder_updated(self, folder_id, folder_data):
+        """Rename a folder in place, or reload the tree if it moved"""
+        if self.parent_folders.get(folder_id) != folder_data["parent_id"]:
+            self._load_folders()
+        elif folder_id in self.folders:
+            self.folders[folder_id].set_name(folder_data["name"])
+    
+    def _on_folder_counts_changed(self, counts):
+        """Update the badges of the folders whose sound count changed"""
+        for folder_id, count in counts.items():
+            self.update_folder_count(folder_id, count)
+    
+    def _on_add_folder_clicked(self):
+        """Ask for a name and create a folder inside the selected one"""
+        if not self.sound_manager:
+            return
+        name, ok = QInputDialog.getText(self, "New Folder", "Folder name:")
+        if ok and name.strip():
+            self.sound_manager.create_folder(name.strip(), self.current_folder_id)
     
-    def add_folder(self, folder_id, folder_name, sound_count=0):
+    def add_folder(self, folder_id, folder_name, sound_count=0, depth=0):
         """Add a new folder to the view"""
-        folder_item = FolderItem(folder_name, folder_id, sound_count)
+        folder_item = FolderItem(folder_name, folder_id, sound_count, depth)
         folder_item.clicked.connect(self._on_folder_clicked)
         
         self.folders[folder_id] = folder_item
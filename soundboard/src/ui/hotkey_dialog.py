@@ -0,0 +1,235 @@
+"""
+Dialog capturing the global hotkeys of sounds and banks
+"""
+
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from PyQt6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QMessageBox, QPushButton, QVBoxLayout, QWidget
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QKeyEvent, QKeySequence
+
+from managers.hotkey_bindings import SEQUENCE_TIMEOUT
+
+if TYPE_CHECKING:
+    from managers.sound_manager import SoundManager
+
+# Keys that only ever modify another key, so they are never a hotkey on their own
+MODIFIER_KEYS = {
+    Qt.Key.Key_Control: "Ctrl", Qt.Key.Key_Alt: "Alt", Qt.Key.Key_AltGr: "Alt",
+    Qt.Key.Key_Shift: "Shift", Qt.Key.Key_Meta: "Meta",
+    Qt.Key.Key_Super_L: "Meta", Qt.Key.Key_Super_R: "Meta",
+}
+
+# Chords of the longest sequence captured, e.g. "Ctrl+K, 3" has two
+MAX_SEQUENCE_CHORDS = 3
+
+# Modifiers kept in a hotkey, in the order they are written; keypad and group switch flags are dropped
+HOTKEY_MODIFIERS = (
+    (Qt.KeyboardModifier.ControlModifier, "Ctrl"),
+    (Qt.KeyboardModifier.AltModifier, "Alt"),
+    (Qt.KeyboardModifier.ShiftModifier, "Shift"),
+    (Qt.KeyboardModifier.MetaModifier, "Meta"),
+)
+
+
+class HotkeyCaptureDialog(QDialog):
+    """
+    Shows the key combination pressed while it is open
+
+    Every key goes to the dialog, Tab and Enter included, so any of them
+    can be bound. Escape without modifiers cancels the dialog. Keys pressed
+    in quick succession make up a sequence, like "Ctrl+K, 3".
+    """
+
+    def __init__(self, title: str, hotkey: Optional[str] = None, parent: Optional[QWidget] = None,
+                 purpose: Optional[str] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Set Hotkey")
+        self.hotkey = hotkey or None
+        self._last_press: Optional[float] = None  # time.monotonic() of the last chord captured
+        self._setup_ui(purpose or f"play “{title}”")
+
+    def _setup_ui(self, purpose: str) -> None:
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+
+        prompt = QLabel(f"Press the keys to {purpose}, from any application. "
+                        "Press keys in quick succession for a sequence.")
+        prompt.setWordWrap(True)
+        layout.addWidget(prompt)
+
+        self.hotkey_label = QLabel()
+        self.hotkey_label.setObjectName("hotkey_capture")
+        self.hotkey_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.hotkey_label.setMinimumHeight(48)
+        layout.addWidget(self.hotkey_label)
+        self._show_hotkey()
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        clear_button = QPushButton("Clear")
+        buttons.addButton(clear_button, QDialogButtonBox.ButtonRole.ResetRole)
+        clear_button.clicked.connect(self._clear)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        # Buttons must not take the keys being captured
+        for button in buttons.buttons():
+            button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        layout.addWidget(buttons)
+
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setFocus()
+
+    def _show_hotkey(self, pending: Optional[str] = None) -> None:
+        """Show the captured hotkey, or the modifiers held so far"""
+        self.hotkey_label.setText(pending or self.hotkey or "None")
+
+    def _clear(self) -> None:
+        """Forget the captured hotkey"""
+        self.hotkey = None
+        self._last_press = None
+        self._show_hotkey()
+
+    def keyPressEvent(self, event: Optional[QKeyEvent]) -> None:
+        """Capture the pressed key with its modifiers"""
+        if event is None:
+            return
+        modifiers = [name for modifier, name in HOTKEY_MODIFIERS if event.modifiers() & modifier]
+        key = Qt.Key(event.key())
+        if key == Qt.Key.Key_Escape and not modifiers:
+            super().keyPressEvent(event)
+            return
+        if key in MODIFIER_KEYS or key == Qt.Key.Key_unknown:
+            # Show the modifiers held so far, waiting for the key itself; some
+            # platforms leave the modifier being pressed out of the event's modifiers
+            pressed = set(modifiers) | {MODIFIER_KEYS.get(key)}
+            held = [name for modifier, name in HOTKEY_MODIFIERS if name in pressed]
+            self._show_hotkey("+".join(held) + "+…" if held else None)
+            return
+        if key == Qt.Key.Key_Backtab:
+            key = Qt.Key.Key_Tab
+        if key == Qt.Key.Key_Comma:
+            # Commas and plus signs separate the chords and keys of a hotkey
+            key_name = "Comma"
+        elif key == Qt.Key.Key_Plus:
+            key_name = "Plus"
+        else:
+            key_name = QKeySequence(key.value).toString(QKeySequence.SequenceFormat.PortableText)
+        chord = "+".join(modifiers + [key_name])
+
+        now = time.monotonic()
+        chords = self.hotkey.split(", ") if self.hotkey else []
+        if self._last_press is not None and now - self._last_press <= SEQUENCE_TIMEOUT and len(chords) < MAX_SEQUENCE_CHORDS:
+            self.hotkey = ", ".join(chords + [chord])
+        else:
+            self.hotkey = chord
+        self._last_press = now
+        self._show_hotkey()
+
+    def keyReleaseEvent(self, event: Optional[QKeyEvent]) -> None:
+        """Drop the modifiers shown once they are released"""
+        self._show_hotkey()
+
+    def focusNextPrevChild(self, next: bool) -> bool:
+        # Tab is a key to capture, not a focus change
+        return False
+
+    @staticmethod
+    def get_hotkey(parent: Optional[QWidget], title: str, hotkey: Optional[str] = None,
+                   purpose: Optional[str] = None) -> Tuple[Optional[str], bool]:
+        """
+        Ask for the hotkey of a sound
+
+        Args:
+            parent: Parent widget of the dialog
+            title: Title of the sound
+            hotkey: The current hotkey, or None
+            purpose: What the hotkey does, e.g. "switch to bank “Live”", or
+                None to play the sound
+
+        Returns:
+            The new hotkey, or None to remove it, and whether the dialog was accepted
+        """
+        dialog = HotkeyCaptureDialog(title, hotkey, parent, purpose)
+        accepted = dialog.exec() == QDialog.DialogCode.Accepted
+        return dialog.hotkey, accepted
+
+
+def edit_sound_hotkey(parent: QWidget, sound_manager: "SoundManager", sound_id: str) -> bool:
+    """
+    Let the user pick the hotkey of a sound and bind it
+
+    Args:
+        parent: Parent widget of the dialog
+        sound_manager: The sound manager holding the sound
+        sound_id: The sound whose hotkey to change
+
+    Returns:
+        True if the hotkey changed, False if cancelled or taken by another sound
+    """
+    sound_data = sound_manager.get_sound(sound_id)
+    if not sound_data:
+        return False
+    hotkey, ok = HotkeyCaptureDialog.get_hotkey(parent, sound_data.get("title", "Untitled"), sound_data.get("hotkey"))
+    if not ok or hotkey == sound_data.get("hotkey"):
+        return False
+    conflict = sound_manager.find_hotkey_conflict(hotkey, sound_id) if hotkey else None
+    if conflict is not None:
+        QMessageBox.warning(parent, "Set Hotkey", f"{hotkey} clashes with the hotkey of {conflict}.")
+        return False
+    return sound_manager.set_hotkey(sound_id, hotkey)
+
+
+def edit_bank_sound_hotkey(parent: QWidget, sound_manager: "SoundManager", sound_id: str) -> bool:
+    """
+    Put a sound in the active bank, letting the user pick its hotkey there
+
+    Args:
+        parent: Parent widget of the dialog
+        sound_manager: The sound manager holding the sound and the banks
+        sound_id: The sound to put in the bank
+
+    Returns:
+        True if the sound was set, False if cancelled, if no bank is active,
+        or if the hotkey is taken in the bank
+    """
+    bank = sound_manager.get_bank(sound_manager.get_active_bank_id() or "")
+    sound_data = sound_manager.get_sound(sound_id)
+    if not bank or not sound_data:
+        return False
+    title = sound_data.get("title", "Untitled")
+    hotkey, ok = HotkeyCaptureDialog.get_hotkey(
+        parent, title, bank["sounds"].get(sound_id), f"play “{title}” while bank “{bank['name']}” is active"
+    )
+    if not ok:
+        return False
+    conflict = sound_manager.find_hotkey_conflict(hotkey, sound_id, bank["id"]) if hotkey else None
+    if conflict is not None:
+        QMessageBox.warning(parent, "Set Hotkey", f"{hotkey} clashes with the hotkey of {conflict}.")
+        return False
+    return sound_manager.add_sound_to_bank(bank["id"], sound_id, hotkey)
+
+
+def edit_bank_switch_hotkey(parent: QWidget, sound_manager: "SoundManager", bank_id: str) -> bool:
+    """
+    Let the user pick the hotkey switching to a bank
+
+    Args:
+        parent: Parent widget of the dialog
+        sound_manager: The sound manager holding the banks
+        bank_id: The bank whose hotkey to change
+
+    Returns:
+        True if the hotkey changed, False if cancelled or taken
+    """
+    bank = sound_manager.get_bank(bank_id)
+    if not bank:
+        return False
+    hotkey, ok = HotkeyCaptureDialog.get_hotkey(parent, bank["name"], bank["hotkey"], f"switch to bank “{bank['name']}”")
+    if not ok or hotkey == bank["hotkey"]:
+        return False
+    conflict = sound_manager.find_hotkey_conflict(hotkey, bank_id=bank_id, switch=True) if hotkey else None
+    if conflict is not None:
+        QMessageBox.warning(parent, "Set Hotkey", f"{hotkey} clashes with the hotkey of {conflict}.")
+        return False
+    return sound_manager.set_bank_switch_hotkey(bank_id, hotkey)
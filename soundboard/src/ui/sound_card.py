@@ -11,7 +11,8 @@ from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QIcon, QColor, QAction
 
 # Import from other modules
-from soundboard.src.ui.main_window import COLORS
+from soundboard.src.ui.theme import set_state
+from soundboard.src.ui.hotkey_dialog import HotkeyCaptureDialog
 
 class SoundCard(QWidget):
     """
@@ -21,6 +22,7 @@ class SoundCard(QWidget):
     play_clicked = pyqtSignal(str)  # Emits sound_id when play button is clicked
     edit_clicked = pyqtSignal(str)  # Emits sound_id when edit button is clicked
     favorite_toggled = pyqtSignal(str, bool)  # Emits sound_id and favorite state
+    hotkey_changed = pyqtSignal(str, str)  # Emits sound_id and the new hotkey, empty if removed
     
     def __init__(self, title, category, sound_id, duration=0, favorite=False, parent=None):
         super().__init__(parent)
@@ -35,6 +37,7 @@ class SoundCard(QWidget):
         self.hotkey = None
         
         # Card size values (default: medium)
+        self.size = "medium"
         self.card_width = 220
         self.card_height = 140
         self.title_font_size = 15
@@ -54,13 +57,6 @@ class SoundCard(QWidget):
         self.card_frame = QFrame()
         self.card_frame.setObjectName("card_frame")
         self.card_frame.setFixedSize(self.card_width, self.card_height)
-        self.card_frame.setStyleSheet(f"""
-            QFrame#card_frame {{
-                background-color: {COLORS['card_bg']};
-                border-radius: 8px;
-                border: 1px solid {COLORS['divider']};
-            }}
-        """)
         
         # Card layout
         card_layout = QVBoxLayout(self.card_frame)
@@ -73,31 +69,22 @@ class SoundCard(QWidget):
         category_row.setSpacing(6)
         
         self.category_label = QLabel(self.category)
-        self.category_label.setStyleSheet(f"""
-            color: {COLORS['text_secondary']};
-            font-size: {self.category_font_size}px;
-        """)
+        self.category_label.setObjectName("category_label")
+        self.category_label.setProperty("card_size", self.size)
         category_row.addWidget(self.category_label)
         
         category_row.addStretch()
         
         # Favorite indicator
         self.favorite_label = QLabel("⭐" if self.favorite else "")
-        self.favorite_label.setStyleSheet(f"""
-            color: {COLORS['favorite']};
-            font-size: {self.category_font_size}px;
-        """)
+        self.favorite_label.setObjectName("favorite_label")
+        self.favorite_label.setProperty("card_size", self.size)
         category_row.addWidget(self.favorite_label)
         
         # Hotkey label (if set)
         self.hotkey_label = QLabel("")
-        self.hotkey_label.setStyleSheet(f"""
-            color: {COLORS['accent']};
-            font-size: {self.category_font_size}px;
-            padding: 2px 6px;
-            background-color: {COLORS['accent_light']};
-            border-radius: 3px;
-        """)
+        self.hotkey_label.setObjectName("hotkey_label")
+        self.hotkey_label.setProperty("card_size", self.size)
         self.hotkey_label.setVisible(False)
         category_row.addWidget(self.hotkey_label)
         
@@ -106,11 +93,8 @@ class SoundCard(QWidget):
         # Title row
         self.title_label = QLabel(self.title)
         self.title_label.setWordWrap(True)
-        self.title_label.setStyleSheet(f"""
-            color: {COLORS['text_primary']};
-            font-size: {self.title_font_size}px;
-            font-weight: bold;
-        """)
+        self.title_label.setObjectName("title_label")
+        self.title_label.setProperty("card_size", self.size)
         card_layout.addWidget(self.title_label)
         
         # Add stretch to push controls to bottom
@@ -122,17 +106,6 @@ class SoundCard(QWidget):
         self.progress_bar.setValue(0)
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setFixedHeight(4)
-        self.progress_bar.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: {COLORS['progress_bg']};
-                border-radius: 2px;
-                border: none;
-            }}
-            QProgressBar::chunk {{
-                background-color: {COLORS['accent']};
-                border-radius: 2px;
-            }}
-        """)
         self.progress_bar.setVisible(False)
         card_layout.addWidget(self.progress_bar)
         
@@ -144,10 +117,8 @@ class SoundCard(QWidget):
         # Duration label
         duration_text = self._format_duration(self.duration)
         self.duration_label = QLabel(duration_text)
-        self.duration_label.setStyleSheet(f"""
-            color: {COLORS['text_secondary']};
-            font-size: {self.duration_font_size}px;
-        """)
+        self.duration_label.setObjectName("duration_label")
+        self.duration_label.setProperty("card_size", self.size)
         controls_row.addWidget(self.duration_label)
         
         controls_row.addStretch()
@@ -156,21 +127,8 @@ class SoundCard(QWidget):
         self.play_button = QPushButton()
         self.play_button.setFixedSize(self.button_size, self.button_size)
         self.play_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.play_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS['accent']};
-                border-radius: {self.button_size // 2}px;
-                border: none;
-                image: url(soundboard/assets/icons/play.png);
-                image-position: center;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['accent_hover']};
-            }}
-            QPushButton:pressed {{
-                background-color: {COLORS['accent_pressed']};
-            }}
-        """)
+        self.play_button.setObjectName("play_button")
+        self.play_button.setProperty("card_size", self.size)
         self.play_button.clicked.connect(self._on_play_clicked)
         controls_row.addWidget(self.play_button)
         
@@ -178,19 +136,7 @@ class SoundCard(QWidget):
         self.menu_button = QPushButton("⋮")
         self.menu_button.setFixedSize(24, 24)
         self.menu_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.menu_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {COLORS['text_secondary']};
-                border-radius: 12px;
-                border: none;
-                font-size: 16px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['button_hover']};
-            }}
-        """)
+        self.menu_button.setObjectName("menu_button")
         self.menu_button.clicked.connect(self._show_context_menu)
         controls_row.addWidget(self.menu_button)
         
@@ -259,11 +205,13 @@ class SoundCard(QWidget):
         """Handle hotkey toggle"""
         if self.hotkey:
             # Remove hotkey
-            self.set_hotkey(None)
+            hotkey = None
         else:
-            # In a real implementation, this would show a dialog to set hotkey
-            # For now, just set a dummy hotkey
-            self.set_hotkey("F1")
+            hotkey, ok = HotkeyCaptureDialog.get_hotkey(self, self.title)
+            if not ok or not hotkey:
+                return
+        self.set_hotkey(hotkey)
+        self.hotkey_changed.emit(self.sound_id, hotkey or "")
     
     def set_playing(self, is_playing):
         """Set the playing state of the card"""
@@ -272,52 +220,9 @@ class SoundCard(QWidget):
         # Show/hide progress bar
         self.progress_bar.setVisible(is_playing)
         
-        # Update play button style to show playing state
-        if is_playing:
-            self.card_frame.setStyleSheet(f"""
-                QFrame#card_frame {{
-                    background-color: {COLORS['card_bg']};
-                    border-radius: 8px;
-                    border: 2px solid {COLORS['accent']};
-                }}
-            """)
-            
-            self.play_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['accent_pressed']};
-                    border-radius: {self.button_size // 2}px;
-                    border: none;
-                    image: url(soundboard/assets/icons/pause.png);
-                    image-position: center;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLORS['accent_hover']};
-                }}
-            """)
-        else:
-            self.card_frame.setStyleSheet(f"""
-                QFrame#card_frame {{
-                    background-color: {COLORS['card_bg']};
-                    border-radius: 8px;
-                    border: 1px solid {COLORS['divider']};
-                }}
-            """)
-            
-            self.play_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['accent']};
-                    border-radius: {self.button_size // 2}px;
-                    border: none;
-                    image: url(soundboard/assets/icons/play.png);
-                    image-position: center;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLORS['accent_hover']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {COLORS['accent_pressed']};
-                }}
-            """)
+        # Restyle the card and play button through the theme stylesheet
+        set_state(self.card_frame, "playing", is_playing)
+        set_state(self.play_button, "playing", is_playing)
     
     def update_progress(self, progress):
         """Update the progress bar value (0-100)"""
@@ -334,8 +239,40 @@ class SoundCard(QWidget):
             self.hotkey_label.setText("")
             self.hotkey_label.setVisible(False)
     
+    def bind(self, sound_id, title, category, duration=0, favorite=False, hotkey=None):
+        """
+        Show another sound on this card, reusing its widgets
+        
+        Only the labels whose text changed are touched, so rebinding a
+        recycled card costs far less than building a new one.
+        """
+        if sound_id != self.sound_id:
+            # The playing state belonged to the previous sound
+            if self.is_playing:
+                self.set_playing(False)
+            self.update_progress(0)
+            self.sound_id = sound_id
+        
+        if title != self.title:
+            self.title = title
+            self.title_label.setText(title)
+        if category != self.category:
+            self.category = category
+            self.category_label.setText(category)
+        if duration != self.duration:
+            self.duration = duration
+            self.duration_label.setText(self._format_duration(duration))
+        if favorite != self.favorite:
+            self.favorite = favorite
+            self.favorite_label.setText("⭐" if favorite else "")
+        if hotkey != self.hotkey:
+            self.set_hotkey(hotkey)
+    
     def set_size(self, size):
         """Set the card size (small, medium, large)"""
+        if size == self.size:
+            return
+        
         if size == "small":
             self.card_width = 160
             self.card_height = 110
@@ -358,41 +295,13 @@ class SoundCard(QWidget):
             self.duration_font_size = 12
             self.button_size = 40
         
-        # Update UI with new sizes
+        # Update UI with new sizes; fonts and the play button radius follow the size property
+        self.size = size
         self.card_frame.setFixedSize(self.card_width, self.card_height)
-        self.title_label.setStyleSheet(f"""
-            color: {COLORS['text_primary']};
-            font-size: {self.title_font_size}px;
-            font-weight: bold;
-        """)
-        self.category_label.setStyleSheet(f"""
-            color: {COLORS['text_secondary']};
-            font-size: {self.category_font_size}px;
-        """)
-        self.favorite_label.setStyleSheet(f"""
-            color: {COLORS['favorite']};
-            font-size: {self.category_font_size}px;
-        """)
-        self.hotkey_label.setStyleSheet(f"""
-            color: {COLORS['accent']};
-            font-size: {self.category_font_size}px;
-            padding: 2px 6px;
-            background-color: {COLORS['accent_light']};
-            border-radius: 3px;
-        """)
-        self.duration_label.setStyleSheet(f"""
-            color: {COLORS['text_secondary']};
-            font-size: {self.duration_font_size}px;
-        """)
+        for widget in (self.title_label, self.category_label, self.favorite_label,
+                       self.hotkey_label, self.duration_label, self.play_button):
+            set_state(widget, "card_size", size)
         self.play_button.setFixedSize(self.button_size, self.button_size)
-        
-        # Update play button border radius
-        play_btn_style = self.play_button.styleSheet()
-        play_btn_style = play_btn_style.replace(
-            f"border-radius: {self.button_size // 2 - 2}px;", 
-            f"border-radius: {self.button_size // 2}px;"
-        )
-        self.play_button.setStyleSheet(play_btn_style)
     
     def _format_duration(self, seconds):
         """Format seconds into mm:ss format"""
@@ -404,30 +313,6 @@ class SoundCard(QWidget):
         else:
             return f"{seconds}s"
     
-    def enterEvent(self, event):
-        """Handle mouse enter event for hover effect"""
-        if not self.is_playing:
-            self.card_frame.setStyleSheet(f"""
-                QFrame#card_frame {{
-                    background-color: {COLORS['card_hover']};
-                    border-radius: 8px;
-                    border: 1px solid {COLORS['divider']};
-                }}
-            """)
-        super().enterEvent(event)
-    
-    def leaveEvent(self, event):
-        """Handle mouse leave event to remove hover effect"""
-        if not self.is_playing:
-            self.card_frame.setStyleSheet(f"""
-                QFrame#card_frame {{
-                    background-color: {COLORS['card_bg']};
-                    border-radius: 8px;
-                    border: 1px solid {COLORS['divider']};
-                }}
-            """)
-        super().leaveEvent(event)
-    
     def contextMenuEvent(self, event):
         """Show context menu on right-click"""
         self._show_context_menu()
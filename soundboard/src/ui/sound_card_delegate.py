@@ -0,0 +1,229 @@
+"""
+Item delegate painting sound cards and list rows
+"""
+
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import QModelIndex, QObject, QPoint, QPointF, QRect, QRectF, QSize, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QLinearGradient, QPainter, QPainterPath, QPen
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from ui.sound_list_model import CategoryRole, DurationRole, FavoriteRole, HotkeyRole
+
+# Card sizes of the grid, by size setting
+CARD_SIZES: Dict[str, Tuple[int, int]] = {
+    "small": (160, 140),
+    "medium": (200, 180),
+    "large": (240, 220)
+}
+
+# Space around each card of the grid
+CARD_SPACING = 16
+
+# Height of a row in list mode, including the space between rows
+ROW_HEIGHT = 68
+
+
+class SoundCardDelegate(QStyledItemDelegate):
+    """
+    Paints a sound as a card (grid) or a row (list) without any widgets
+
+    The clickable parts (play, favorite star, menu) are plain rectangles
+    computed by part_rects(), which both painting and hit_test() use.
+    """
+
+    def __init__(self, colors: Dict[str, str], grid: bool = True, show_favorite: bool = True,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.colors = colors
+        self.grid = grid
+        self.show_favorite = show_favorite
+        self.card_size = CARD_SIZES["medium"]
+
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.small_font = QFont()
+        self.small_font.setPixelSize(12)
+        self.icon_font = QFont()
+        self.icon_font.setPixelSize(16)
+        self.icon_font.setBold(True)
+
+    def set_card_size(self, size: str) -> None:
+        """Set the card size of the grid: "small", "medium" or "large" """
+        self.card_size = CARD_SIZES.get(size, self.card_size)
+
+    def item_size(self) -> QSize:
+        """Get the size of every item, spacing included"""
+        width, height = self.card_size
+        if self.grid:
+            return QSize(width + CARD_SPACING, height + CARD_SPACING)
+        return QSize(width, ROW_HEIGHT)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return self.item_size()
+
+    def part_rects(self, rect: QRect) -> Dict[str, QRect]:
+        """Get the rectangles of the parts of a card or row
+
+        Args:
+            rect: Rectangle of the whole item
+
+        Returns:
+            Dictionary of part name -> QRect
+        """
+        if self.grid:
+            left, top, right, bottom = rect.left() + 12, rect.top() + 12, rect.right() - 12, rect.bottom() - 12
+            menu = QRect(right - 23, top, 24, 24)
+            play = QRect(left, bottom - 31, 72, 32)
+            favorite = QRect(right - 23, bottom - 27, 24, 24)
+            return {
+                "category": QRect(left, top + 2, 4, 20),
+                "title": QRect(left + 10, top, menu.left() - left - 14, 24),
+                "menu": menu,
+                "waveform": QRect(left, top + 32, right - left + 1, max(0, play.top() - top - 40)),
+                "play": play,
+                "favorite": favorite,
+                "hotkey": QRect(favorite.left() - 52 if self.show_favorite else right - 43, bottom - 27, 44, 24),
+            }
+
+        left, right, middle = rect.left() + 16, rect.right() - 16, rect.center().y()
+        menu = QRect(right - 29, middle - 15, 30, 30)
+        play = QRect(menu.left() - 38, middle - 15, 30, 30)
+        favorite = QRect(play.left() - 32, middle - 12, 24, 24)
+        duration_right = favorite.left() - 8 if self.show_favorite else play.left() - 8
+        return {
+            "category": QRect(left, middle - 10, 4, 20),
+            "icon": QRect(left + 10, middle - 12, 24, 24),
+            "title": QRect(left + 44, middle - 12, duration_right - 60 - left - 44, 24),
+            "duration": QRect(duration_right - 52, middle - 12, 52, 24),
+            "favorite": favorite,
+            "play": play,
+            "menu": menu,
+        }
+
+    def hit_test(self, rect: QRect, pos: QPoint) -> str:
+        """Get the action under a point of an item
+
+        Args:
+            rect: Rectangle of the item
+            pos: Point in the same coordinates
+
+        Returns:
+            "menu", "favorite" or "play" (clicking anywhere else plays the sound too)
+        """
+        parts = self.part_rects(self._item_rect(rect))
+        if parts["menu"].contains(pos):
+            return "menu"
+        if self.show_favorite and parts["favorite"].contains(pos):
+            return "favorite"
+        return "play"
+
+    def paint(self, painter: Optional[QPainter], option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if painter is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        colors = self.colors
+        rect = self._item_rect(option.rect)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        parts = self.part_rects(rect)
+
+        # Background
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(rect), 8 if self.grid else 6, 8 if self.grid else 6)
+        if self.grid:
+            gradient = QLinearGradient(QPointF(rect.topLeft()), QPointF(rect.bottomLeft()))
+            gradient.setColorAt(0, QColor(colors['card_hover' if hovered else 'card_gradient_start']))
+            gradient.setColorAt(1, QColor(colors['bg_elevated' if hovered else 'card_gradient_end']))
+            painter.fillPath(path, gradient)
+        else:
+            painter.fillPath(path, QColor(colors['card_hover' if hovered else 'bg_elevated']))
+        painter.setPen(QPen(QColor(colors['accent' if hovered else 'divider']), 1))
+        painter.drawPath(path)
+
+        # Category indicator
+        category_color = QColor(colors.get(f"category_{index.data(CategoryRole)}", colors['accent']))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(category_color)
+        painter.drawRoundedRect(QRectF(parts["category"]), 2, 2)
+
+        # Title
+        title = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(colors['text_primary']))
+        elided = QFontMetrics(self.title_font).elidedText(title, Qt.TextElideMode.ElideRight, parts["title"].width())
+        painter.drawText(parts["title"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, elided)
+
+        if self.grid:
+            self._paint_card_parts(painter, parts, index)
+        else:
+            self._paint_row_parts(painter, parts, index, category_color)
+
+        # Favorite star and menu dots
+        if self.show_favorite:
+            is_favorite = bool(index.data(FavoriteRole))
+            painter.setFont(self.icon_font)
+            painter.setPen(QColor(colors['favorite_color' if is_favorite else 'text_secondary']))
+            painter.drawText(parts["favorite"], Qt.AlignmentFlag.AlignCenter, "★" if is_favorite else "☆")
+        painter.setFont(self.icon_font)
+        painter.setPen(QColor(colors['text_secondary']))
+        painter.drawText(parts["menu"], Qt.AlignmentFlag.AlignCenter, "⋮")
+        painter.restore()
+
+    def _item_rect(self, rect: QRect) -> QRect:
+        """Get the painted rectangle of an item, inside the spacing around it"""
+        if self.grid:
+            margin = CARD_SPACING // 2
+            return rect.adjusted(margin, margin, -margin, -margin)
+        return rect.adjusted(0, 4, 0, -4)
+
+    def _paint_card_parts(self, painter: QPainter, parts: Dict[str, QRect], index: QModelIndex) -> None:
+        """Paint the waveform placeholder, play button and hotkey of a card"""
+        colors = self.colors
+        waveform = QRectF(parts["waveform"])
+        gradient = QLinearGradient(waveform.topLeft(), waveform.topRight())
+        gradient.setColorAt(0, QColor(colors['bg_secondary']))
+        gradient.setColorAt(1, QColor(colors['bg_elevated']))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(gradient)
+        painter.drawRoundedRect(waveform, 4, 4)
+
+        play = QRectF(parts["play"])
+        gradient = QLinearGradient(play.topLeft(), play.bottomLeft())
+        gradient.setColorAt(0, QColor(colors['accent_gradient_start']))
+        gradient.setColorAt(1, QColor(colors['accent_gradient_end']))
+        painter.setBrush(gradient)
+        painter.drawRoundedRect(play, 16, 16)
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(colors['text_on_accent']))
+        painter.drawText(parts["play"], Qt.AlignmentFlag.AlignCenter, "▶ Play")
+
+        hotkey = index.data(HotkeyRole)
+        if hotkey:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(colors['bg_secondary']))
+            painter.drawRoundedRect(QRectF(parts["hotkey"]), 4, 4)
+            painter.setPen(QColor(colors['text_secondary']))
+            metrics = QFontMetrics(self.small_font)
+            text = metrics.elidedText(str(hotkey), Qt.TextElideMode.ElideRight, parts["hotkey"].width() - 8)
+            painter.drawText(parts["hotkey"], Qt.AlignmentFlag.AlignCenter, text)
+
+    def _paint_row_parts(self, painter: QPainter, parts: Dict[str, QRect], index: QModelIndex,
+                         category_color: QColor) -> None:
+        """Paint the icon, duration and play button of a list row"""
+        colors = self.colors
+        painter.setFont(self.icon_font)
+        painter.setPen(category_color)
+        painter.drawText(parts["icon"], Qt.AlignmentFlag.AlignCenter, "🔊")
+
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(colors['text_secondary']))
+        painter.drawText(parts["duration"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight,
+                         str(index.data(DurationRole)))
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(colors['accent']))
+        painter.drawEllipse(QRectF(parts["play"]))
+        painter.setPen(QColor(colors['text_on_accent']))
+        painter.drawText(parts["play"], Qt.AlignmentFlag.AlignCenter, "▶")
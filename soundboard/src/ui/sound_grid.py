@@ -4,7 +4,7 @@ SoundGrid Component for displaying sound cards in a grid layout
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QFrame, QScrollArea, QGridLayout,
+    QPushButton, QFrame, QScrollArea,
     QLineEdit, QComboBox, QSizePolicy
 )
 from PyQt6.QtCore import Qt, pyqtSignal
@@ -12,7 +12,10 @@ from PyQt6.QtGui import QIcon
 
 # Import from other modules
 from soundboard.src.ui.sound_card import SoundCard
+from soundboard.src.ui.card_flow_layout import CardFlowLayout
 from soundboard.src.ui.main_window import COLORS
+from soundboard.src.models.search_index import SearchIndex
+from soundboard.src.models.facet_index import FacetIndex
 
 class SoundGrid(QWidget):
     """
@@ -27,12 +30,15 @@ class SoundGrid(QWidget):
         super().__init__(parent)
         
         # Properties
-        self.sounds = {}  # Dictionary of sound_id -> SoundCard
+        self.sounds = {}  # Dictionary of sound_id -> sound record (title, category, duration, ...)
+        self.cards = []  # Pool of SoundCards in grid order, rebound to whichever sounds are shown
         self.current_folder_id = None
         self.filter_text = ""
         self.sort_option = "name"  # Options: name, date, duration
         self.size_option = "medium"  # Options: small, medium, large
         self.favorite_filter = False
+        self.search_index = SearchIndex()  # Title/category index for the search box
+        self.facets = FacetIndex()  # Favorite/folder bitmaps for the filters
         
         # UI setup
         self._setup_ui()
@@ -176,10 +182,9 @@ class SoundGrid(QWidget):
         
         # Container widget for grid
         self.grid_container = QWidget()
-        self.grid_container.setStyleSheet(f"background-color: transparent;")
         
-        # Grid layout for sound cards
-        self.grid_layout = QGridLayout(self.grid_container)
+        # Flow layout for sound cards, reflowing only when the column count changes
+        self.grid_layout = CardFlowLayout(self.grid_container)
         self.grid_layout.setContentsMargins(0, 0, 12, 0)  # Right margin for scrollbar
         self.grid_layout.setSpacing(16)
         
@@ -197,53 +202,36 @@ class SoundGrid(QWidget):
         self.empty_label.setVisible(False)
         self.main_layout.addWidget(self.empty_label)
     
-    def add_sound(self, title, category, sound_id, duration=0, favorite=False):
+    def add_sound(self, title, category, sound_id, duration=0, favorite=False, folder_id=None, hotkey=None):
         """
-        Add a sound card to the grid
+        Add a sound to the grid, or update it if it is already there
         """
-        if sound_id in self.sounds:
-            # If sound already exists, update it
-            self.sounds[sound_id].title = title
-            self.sounds[sound_id].category = category
-            self.sounds[sound_id].duration = duration
-            self.sounds[sound_id].favorite = favorite
-            return
-        
-        # Create sound card
-        sound_card = SoundCard(
-            title=title,
-            category=category,
-            sound_id=sound_id,
-            duration=duration,
-            favorite=favorite
-        )
-        
-        # Set card size based on current setting
-        sound_card.set_size(self.size_option)
-        
-        # Connect signals
-        sound_card.play_clicked.connect(lambda sid: self.sound_played.emit(sid))
-        sound_card.edit_clicked.connect(lambda sid: self.sound_edited.emit(sid))
-        sound_card.favorite_toggled.connect(lambda sid, state: self.sound_favorited.emit(sid, state))
-        
-        # Add to dictionary
-        self.sounds[sound_id] = sound_card
+        facet_values = {"category": category, "favorite": favorite, "folder": folder_id}
+        self.sounds[sound_id] = {
+            "title": title,
+            "category": category,
+            "duration": duration,
+            "favorite": favorite,
+            "hotkey": hotkey
+        }
+        if sound_id in self.search_index:
+            self.search_index.update(sound_id, {"title": title, "category": category})
+        else:
+            self.search_index.add(sound_id, {"title": title, "category": category})
+        self.facets.add(sound_id, facet_values)
         
         # Update grid layout
         self._apply_filters()
     
     def remove_sound(self, sound_id):
         """
-        Remove a sound card from the grid
+        Remove a sound from the grid, its card goes back to the pool
         """
         if sound_id in self.sounds:
-            # Remove from UI
-            sound_card = self.sounds[sound_id]
-            self.grid_layout.removeWidget(sound_card)
-            sound_card.deleteLater()
-            
             # Remove from dictionary
             del self.sounds[sound_id]
+            self.search_index.remove(sound_id)
+            self.facets.remove(sound_id)
             
             # Update grid layout
             self._apply_filters()
@@ -272,6 +260,26 @@ class SoundGrid(QWidget):
         self.filter_text = self.search_box.text().lower()
         self._apply_filters()
     
+    def _on_favorite_toggled(self, sound_id, favorite):
+        """
+        Keep the favorite bitmap in sync with a card's star
+        """
+        self.sounds[sound_id]["favorite"] = favorite
+        self.facets.set(sound_id, "favorite", favorite)
+        self.sound_favorited.emit(sound_id, favorite)
+        if self.favorite_filter:
+            self._apply_filters()
+        else:
+            self._update_facet_counts()
+    
+    def _update_facet_counts(self):
+        """
+        Show how many favorites the current folder holds
+        """
+        in_folder = self.facets.query(folder=self.current_folder_id)
+        favorites = self.facets.count(in_folder & self.facets.bitmap("favorite"))
+        self.favorites_btn.setText(f"⭐ Favorites ({favorites})")
+    
     def _on_favorite_filter_toggled(self, checked):
         """
         Handle favorites filter toggle
@@ -298,7 +306,7 @@ class SoundGrid(QWidget):
             self.size_option = size_options[index]
             
             # Update all cards with new size
-            for sound_card in self.sounds.values():
+            for sound_card in self.cards:
                 sound_card.set_size(self.size_option)
             
             # Refresh layout
@@ -308,66 +316,75 @@ class SoundGrid(QWidget):
         """
         Apply current filters, sorting, and update the grid layout
         """
-        # First, remove all widgets from grid
-        for i in reversed(range(self.grid_layout.count())): 
-            self.grid_layout.itemAt(i).widget().setParent(None)
+        # Combine the folder and favorites filters on the facet bitmaps
+        visible = self.facets.query(
+            favorite=True if self.favorite_filter else None,
+            folder=self.current_folder_id
+        )
+        self._update_facet_counts()
         
-        # Filter sounds
-        filtered_sounds = []
-        for sound_id, card in self.sounds.items():
-            # Check folder filter (if applicable)
-            # This would need to be integrated with the actual folder system
-            
-            # Check text filter
-            title_match = self.filter_text == "" or self.filter_text in card.title.lower()
-            category_match = self.filter_text == "" or self.filter_text in card.category.lower()
-            
-            # Check favorites filter
-            favorite_match = not self.favorite_filter or card.favorite
-            
-            if (title_match or category_match) and favorite_match:
-                filtered_sounds.append(card)
+        # Look up the text filter in the search index instead of scanning every title
+        if self.filter_text.strip():
+            matches = self.search_index.search(self.filter_text)
+            visible_ids = [sound_id for sound_id in matches if self.facets.contains(visible, sound_id)]
+        else:
+            visible_ids = self.facets.ids(visible)
         
         # Sort sounds
         if self.sort_option == "name":
-            filtered_sounds.sort(key=lambda card: card.title.lower())
+            visible_ids.sort(key=lambda sound_id: self.sounds[sound_id]["title"].lower())
         elif self.sort_option == "duration":
-            filtered_sounds.sort(key=lambda card: card.duration)
+            visible_ids.sort(key=lambda sound_id: self.sounds[sound_id]["duration"])
         elif self.sort_option == "date":
-            # In a real implementation, each card would have a creation date
+            # In a real implementation, each sound would have a creation date
             # For now, just maintain the existing order
             pass
         
         # Show empty state if no sounds
-        if not filtered_sounds:
-            self.empty_label.setVisible(True)
-            return
-        else:
-            self.empty_label.setVisible(False)
-        
-        # Calculate columns based on container width and card size
-        container_width = self.grid_container.width()
-        card_width = filtered_sounds[0].card_width if filtered_sounds else 220  # Default medium
-        spacing = self.grid_layout.spacing()
-        
-        # Calculate max columns that fit in the container
-        max_columns = max(1, container_width // (card_width + spacing))
+        self.empty_label.setVisible(not visible_ids)
         
-        # Add cards to grid
-        for i, card in enumerate(filtered_sounds):
-            row = i // max_columns
-            col = i % max_columns
-            self.grid_layout.addWidget(card, row, col)
+        self._show_sounds(visible_ids)
+    
+    def _show_sounds(self, sound_ids):
+        """
+        Rebind the pooled cards to the given sounds, in grid order
         
-        # Update grid container
-        self.grid_container.updateGeometry()
+        Cards are only created when the pool is smaller than the number of
+        sounds shown. Cards left over are hidden and kept for the next
+        refresh, so sorting and filtering neither build nor delete widgets.
+        """
+        # Lay the cards out once at the end, not once per card shown or hidden
+        self.grid_layout.setEnabled(False)
+        for i, sound_id in enumerate(sound_ids):
+            if i == len(self.cards):
+                self.cards.append(self._create_card())
+            record = self.sounds[sound_id]
+            card = self.cards[i]
+            card.bind(sound_id, record["title"], record["category"], record["duration"],
+                      record["favorite"], record["hotkey"])
+            card.setVisible(True)
+        for card in self.cards[len(sound_ids):]:
+            card.setVisible(False)
+        self.grid_layout.setEnabled(True)
+        self.grid_layout.activate()
     
-    def resizeEvent(self, event):
+    def _create_card(self):
         """
-        Handle resize events to adjust the grid layout
+        Create a card for the pool, not yet bound to a sound
         """
-        super().resizeEvent(event)
-        self._apply_filters()
+        sound_card = SoundCard(title="", category="", sound_id="", parent=self.grid_container)
+        
+        # Set card size based on current setting
+        sound_card.set_size(self.size_option)
+        
+        # Connect signals, the card reports whichever sound it is bound to
+        sound_card.play_clicked.connect(lambda sid: self.sound_played.emit(sid))
+        sound_card.edit_clicked.connect(lambda sid: self.sound_edited.emit(sid))
+        sound_card.favorite_toggled.connect(self._on_favorite_toggled)
+        
+        # Cards stay in the layout for good, hidden ones take no cell
+        self.grid_layout.addWidget(sound_card)
+        return sound_card
     
     def populate_sample_sounds(self):
         """
@@ -0,0 +1,327 @@
+"""
+Qt item model exposing a list of library sounds to item views
+"""
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, QTimer
+
+if TYPE_CHECKING:
+    from managers.sound_manager import SoundManager
+
+# Item data roles, for the delegates painting the sounds
+SoundIdRole = Qt.ItemDataRole.UserRole + 1
+CategoryRole = Qt.ItemDataRole.UserRole + 2
+FavoriteRole = Qt.ItemDataRole.UserRole + 3
+DurationRole = Qt.ItemDataRole.UserRole + 4
+HotkeyRole = Qt.ItemDataRole.UserRole + 5
+PlayCountRole = Qt.ItemDataRole.UserRole + 6
+
+# Reorders needing more single-row moves than this are applied as one layout change
+MAX_ROW_MOVES = 64
+
+# Rows listed at once when an empty model is filled, enough to fill a screen
+FIRST_PAGE_ROWS = 256
+
+
+class SoundListModel(QAbstractListModel):
+    """
+    List model over sound IDs of the library
+
+    Rows only hold sound IDs. Titles, categories and favorite flags are
+    looked up in the sound manager when a delegate paints a row, so only
+    the visible rows ever cost anything and a sound edited in the library
+    needs nothing more than a dataChanged for its row.
+    """
+
+    def __init__(self, sound_manager: Optional["SoundManager"] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.sound_manager = sound_manager
+        self._sound_ids: List[str] = []
+        self._rows: Dict[str, int] = {}  # sound ID -> row, rebuilt lazily
+        self._rows_valid = True
+        self._pending_ids: List[str] = []  # Rows still to be appended by populate()
+        self._chunk_rows = FIRST_PAGE_ROWS
+
+    def set_sound_manager(self, sound_manager: Optional["SoundManager"]) -> None:
+        """Set the sound manager the sound data is read from"""
+        self.beginResetModel()
+        self.sound_manager = sound_manager
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._sound_ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._sound_ids):
+            return None
+
+        sound_id = self._sound_ids[index.row()]
+        if role == SoundIdRole:
+            return sound_id
+        if self.sound_manager is None:
+            return None
+
+        sound_data = self.sound_manager.get_sound(sound_id) or {}
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return sound_data.get("title", "Untitled")
+        if role == CategoryRole:
+            return sound_data.get("category", 1)
+        if role == FavoriteRole:
+            return self.sound_manager.is_favorite(sound_id)
+        if role == DurationRole:
+            return sound_data.get("duration", "0:00")
+        if role == HotkeyRole:
+            return sound_data.get("hotkey", "")
+        if role == PlayCountRole:
+            return sound_data.get("play_count", 0)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def set_sound_ids(self, sound_ids: Iterable[str]) -> None:
+        """Replace every row, e.g. when showing a different folder"""
+        self._pending_ids = []
+        self.beginResetModel()
+        self._sound_ids = list(sound_ids)
+        self._rows_valid = False
+        self.endResetModel()
+
+    def populate(self, sound_ids: Iterable[str]) -> None:
+        """Replace every row, listing the first screenful now and the rest later
+
+        Views lay out every row of their model, so a large list is appended
+        from the event loop in chunks doubling in size: the first page
+        paints right away whatever the library size, and the whole list
+        takes only a handful of layout passes.
+
+        Args:
+            sound_ids: The sound IDs to list, in row order
+        """
+        sound_ids = list(sound_ids)
+        self.set_sound_ids(sound_ids[:FIRST_PAGE_ROWS])
+        self._pending_ids = sound_ids[FIRST_PAGE_ROWS:]
+        self._chunk_rows = FIRST_PAGE_ROWS
+        if self._pending_ids:
+            QTimer.singleShot(0, self._append_pending)
+
+    def is_populating(self) -> bool:
+        """Check whether rows of a populate() are still to be appended"""
+        return bool(self._pending_ids)
+
+    def _append_pending(self) -> None:
+        """Append the next chunk of rows of a populate()"""
+        if not self._pending_ids:
+            # Replaced or updated in the meantime
+            return
+
+        self._chunk_rows *= 2
+        chunk = self._pending_ids[:self._chunk_rows]
+        self._pending_ids = self._pending_ids[self._chunk_rows:]
+        row = len(self._sound_ids)
+        self.beginInsertRows(QModelIndex(), row, row + len(chunk) - 1)
+        self._sound_ids.extend(chunk)
+        self._rows_valid = False
+        self.endInsertRows()
+        if self._pending_ids:
+            QTimer.singleShot(0, self._append_pending)
+
+    def update_sound_ids(self, sound_ids: Iterable[str]) -> None:
+        """Change the rows to a new list of sound IDs with as few row changes as possible
+
+        Rows missing from the new list are removed and new ones inserted in
+        contiguous runs, and rows that changed places are moved, so views
+        keep their scroll position and only repaint what changed. A reorder
+        moving most rows, such as a new sort, is applied as a single
+        layout change instead.
+
+        An empty model is filled with populate() instead. While a populate()
+        is under way, the listed rows are updated and the rest of the new
+        list is appended in chunks in place of the old one.
+
+        Args:
+            sound_ids: The sound IDs to list, in row order
+        """
+        new_ids = list(sound_ids)
+        if not self._sound_ids:
+            self.populate(new_ids)
+            return
+        if self._pending_ids:
+            listed = len(self._sound_ids)
+            self._pending_ids = new_ids[listed:]
+            new_ids = new_ids[:listed]
+        new_set = set(new_ids)
+
+        # Remove from the bottom up so the rows above keep their numbers
+        row = len(self._sound_ids) - 1
+        while row >= 0:
+            if self._sound_ids[row] in new_set:
+                row -= 1
+                continue
+            last = row
+            while row > 0 and self._sound_ids[row - 1] not in new_set:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row, last)
+            del self._sound_ids[row:last + 1]
+            self._rows_valid = False
+            self.endRemoveRows()
+            row -= 1
+
+        old_set = set(self._sound_ids)
+        kept_ids = [sound_id for sound_id in new_ids if sound_id in old_set]
+        if kept_ids != self._sound_ids:
+            self._reorder(kept_ids)
+
+        # Insert the new sounds in runs, top down, now that the kept rows are in order
+        row = 0
+        while row < len(new_ids):
+            if new_ids[row] in old_set:
+                row += 1
+                continue
+            last = row
+            while last + 1 < len(new_ids) and new_ids[last + 1] not in old_set:
+                last += 1
+            self.beginInsertRows(QModelIndex(), row, last)
+            self._sound_ids[row:row] = new_ids[row:last + 1]
+            self._rows_valid = False
+            self.endInsertRows()
+            row = last + 1
+
+    def sound_ids(self) -> List[str]:
+        """Get the sound IDs in row order"""
+        return list(self._sound_ids)
+
+    def sound_id(self, row: int) -> Optional[str]:
+        """Get the sound ID of a row, or None if out of range"""
+        if 0 <= row < len(self._sound_ids):
+            return self._sound_ids[row]
+        return None
+
+    def row_of(self, sound_id: str) -> int:
+        """Get the row of a sound, or -1 if it is not listed"""
+        if not self._rows_valid:
+            self._rows = {sound_id: row for row, sound_id in enumerate(self._sound_ids)}
+            self._rows_valid = True
+        return self._rows.get(sound_id, -1)
+
+    def refresh_sound(self, sound_id: str) -> bool:
+        """Repaint the row of a sound whose data changed
+
+        Returns:
+            True if the sound is listed, False otherwise
+        """
+        row = self.row_of(sound_id)
+        if row < 0:
+            return False
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def resort_sound(self, sound_id: str, sort: Callable[[List[str]], List[str]]) -> bool:
+        """Repaint the row of a sound whose data changed, moving just that row if it left the order
+
+        Only an edit of the sort key can put a row out of order with its
+        neighbours. Every other row still is in order then, so the new row
+        of the sound is found by bisection, sorting pairs of sounds.
+
+        Args:
+            sound_id: The sound whose data changed
+            sort: Puts sound IDs in the order of the rows
+
+        Returns:
+            True if the sound is listed, False otherwise
+        """
+        row = self.row_of(sound_id)
+        if row < 0:
+            return False
+        neighbours = self._sound_ids[max(0, row - 1):row + 2]
+        if sort(neighbours) == neighbours:
+            return self.refresh_sound(sound_id)
+
+        # Bisect the other rows, numbered as if the row of the sound was taken out
+        low, high = 0, len(self._sound_ids) - 1
+        while low < high:
+            middle = (low + high) // 2
+            other = self._sound_ids[middle if middle < row else middle + 1]
+            if sort([other, sound_id])[0] == sound_id:
+                high = middle
+            else:
+                low = middle + 1
+        if low != row:
+            # Qt takes the destination as the row to move before, in the old numbering
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), low + 1 if low > row else low)
+            del self._sound_ids[row]
+            self._sound_ids.insert(low, sound_id)
+            self._rows_valid = False
+            self.endMoveRows()
+        return self.refresh_sound(sound_id)
+
+    def _reorder(self, sound_ids: List[str]) -> None:
+        """Put the rows in a new order, given the same sound IDs
+
+        The longest run of rows already in the right relative order stays
+        put and every other row is moved next to the row that precedes it
+        in the new order, which is the fewest possible single-row moves.
+        """
+        positions = {sound_id: row for row, sound_id in enumerate(self._sound_ids)}
+        staying = _increasing_run([positions[sound_id] for sound_id in sound_ids])
+        if len(sound_ids) - len(staying) > MAX_ROW_MOVES:
+            self._relayout(sound_ids)
+            return
+
+        staying_ids = {self._sound_ids[row] for row in staying}
+        previous = None
+        for sound_id in sound_ids:
+            if sound_id not in staying_ids:
+                source = self._sound_ids.index(sound_id)
+                target = self._sound_ids.index(previous) + 1 if previous is not None else 0
+                if target > source:
+                    target -= 1
+                if target != source:
+                    # Qt takes the destination as the row to move before, in the old numbering
+                    destination = target + 1 if target > source else target
+                    self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination)
+                    del self._sound_ids[source]
+                    self._sound_ids.insert(target, sound_id)
+                    self.endMoveRows()
+            previous = sound_id
+        self._rows_valid = False
+
+    def _relayout(self, sound_ids: List[str]) -> None:
+        """Put the rows in a new order as a single layout change"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_ids = [self._sound_ids[index.row()] for index in old_indexes]
+        self._sound_ids = sound_ids
+        self._rows_valid = False
+        self.changePersistentIndexList(old_indexes, [self.index(self.row_of(sound_id)) for sound_id in old_ids])
+        self.layoutChanged.emit()
+
+
+def _increasing_run(values: List[int]) -> Set[int]:
+    """Get the values of a longest strictly increasing subsequence"""
+    tails: List[int] = []  # tails[k] = index of the smallest tail of an increasing run of length k + 1
+    tail_values: List[int] = []
+    previous: List[Optional[int]] = [None] * len(values)
+    for i, value in enumerate(values):
+        k = bisect_left(tail_values, value)
+        previous[i] = tails[k - 1] if k else None
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[k] = i
+            tail_values[k] = value
+
+    run = set()
+    last = tails[-1] if tails else None
+    while last is not None:
+        run.add(values[last])
+        last = previous[last]
+    return run
@@ -0,0 +1,653 @@
+"""
+Application theme: color palettes and the stylesheet generated from them
+"""
+
+from string import Template
+from typing import Any, Dict
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Dark palette, the default
+DARK_COLORS = {
+    'bg_primary': '#121212',
+    'bg_secondary': '#181818',
+    'bg_elevated': '#282828',
+    'accent': '#1DB954',  # Vibrant green
+    'accent_gradient_start': '#1DB954',
+    'accent_gradient_end': '#169C46',
+    'accent_pressed': '#168D40',
+    'text_primary': '#FFFFFF',
+    'text_secondary': '#B3B3B3',
+    'text_on_accent': '#FFFFFF',
+    'card_bg': '#222222',
+    'card_hover': '#2A2A2A',
+    'divider': '#282828',
+    'shadow': '#0A0A0A',
+    'category_1': '#E13300',  # Orange for effects
+    'category_2': '#1E3799',  # Blue for music
+    'category_3': '#8E44AD',  # Purple for voice
+    'category_4': '#27AE60',   # Green for custom
+    'slider_bg': '#404040',
+    'slider_handle': '#1DB954',
+    'panel_bg': '#202020',
+    'sidebar_bg': '#181818',
+    'search_bg': '#2A2A2A',
+    'search_border': '#404040',
+    'toggle_active': '#1DB954',
+    'toggle_inactive': '#404040',
+    'card_gradient_start': '#2A2A2A',
+    'card_gradient_end': '#1A1A1A',
+    'card_active_glow': '#1DB954',
+    'progress_bg': '#404040',
+    'folder_bg': '#2D2D2D',
+    'folder_hover': '#353535',
+    'folder_active': '#3A3A3A',
+    'folder_selected': '#2A4A3C',
+    'folder_icon': '#FFC107',  # Amber color for folder icon
+    'add_folder_bg': '#383838',
+    'resize_small': '#404040',
+    'resize_medium': '#505050',
+    'resize_large': '#606060',
+    'button_hover': '#353535',  # Add button hover color
+    'accent_light': '#2A4A3C',  # Add accent light color for hover effects
+    'accent_hover': '#1ED760',  # Add accent hover color
+    'scrollbar_bg': '#1A1A1A',  # Add scrollbar background color
+    'scrollbar_handle': '#404040',  # Add scrollbar handle color
+    'scroll_handle': '#404040',
+    'count_badge_bg': '#383838',  # Add count badge background color
+    'favorite': '#FFD700',
+    'favorite_color': '#FFD700',  # Gold color for favorites
+    'favorite_hover': '#FFC107',  # Lighter gold for hover
+    'delete_color': '#E53935',  # Red color for delete button
+    'accent_color': '#1DB954',  # Add accent color for folder icon
+}
+
+# Light palette, with the same keys
+LIGHT_COLORS = dict(
+    DARK_COLORS,
+    bg_primary='#F5F5F5',
+    bg_secondary='#FFFFFF',
+    bg_elevated='#FFFFFF',
+    text_primary='#121212',
+    text_secondary='#5F6368',
+    card_bg='#FFFFFF',
+    card_hover='#EDEDED',
+    divider='#DDDDDD',
+    shadow='#C8C8C8',
+    slider_bg='#D0D0D0',
+    panel_bg='#FAFAFA',
+    sidebar_bg='#FFFFFF',
+    search_bg='#FFFFFF',
+    search_border='#CCCCCC',
+    toggle_inactive='#CCCCCC',
+    card_gradient_start='#FFFFFF',
+    card_gradient_end='#F0F0F0',
+    progress_bg='#DDDDDD',
+    folder_bg='#FFFFFF',
+    folder_hover='#F0F0F0',
+    folder_active='#E8E8E8',
+    folder_selected='#D7F5E1',
+    folder_icon='#FFA000',
+    add_folder_bg='#EEEEEE',
+    resize_small='#D6D6D6',
+    resize_medium='#C4C4C4',
+    resize_large='#B2B2B2',
+    button_hover='#E6E6E6',
+    accent_light='#D7F5E1',
+    scrollbar_bg='#EEEEEE',
+    scrollbar_handle='#C0C0C0',
+    scroll_handle='#C0C0C0',
+    count_badge_bg='#E6E6E6',
+)
+
+THEMES = {
+    "dark": DARK_COLORS,
+    "light": LIGHT_COLORS
+}
+
+# Colors of the current theme. Widgets painting themselves read from this
+# dictionary, which apply_theme() updates in place.
+COLORS = dict(DARK_COLORS)
+
+# Stylesheet of the whole application. Widget states are dynamic properties
+# (see set_state), so no widget needs a stylesheet of its own.
+_STYLESHEET = Template("""
+QMainWindow {
+    background-color: $bg_primary;
+}
+QMenu {
+    background-color: $bg_elevated;
+    border: 1px solid $divider;
+    border-radius: 4px;
+    padding: 4px;
+}
+QMenu::item {
+    padding: 6px 16px;
+    color: $text_primary;
+}
+QMenu::item:selected {
+    background-color: $card_hover;
+    color: $accent;
+}
+QScrollArea, SoundListView {
+    border: none;
+    background: transparent;
+}
+QScrollArea > QWidget > QWidget {
+    background: transparent;
+}
+QScrollBar:vertical {
+    width: 8px;
+    background: transparent;
+}
+QScrollBar::handle:vertical {
+    background: $scrollbar_handle;
+    border-radius: 4px;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+
+/* Header, status bar and side panel */
+QFrame#app_header {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 $bg_secondary,
+        stop:1 $bg_primary);
+    border-bottom: 1px solid $divider;
+}
+QLabel#app_icon {
+    font-size: 24px;
+}
+QLabel#app_title {
+    color: $text_primary;
+    font-size: 24px;
+    font-weight: bold;
+}
+QStackedWidget#content_stack {
+    background-color: $bg_primary;
+}
+QStatusBar {
+    background-color: $bg_secondary;
+    color: $text_secondary;
+}
+QStatusBar QLabel {
+    color: $text_secondary;
+}
+ControlPanel {
+    background-color: $panel_bg;
+    border-left: 1px solid $divider;
+}
+QLabel#panel_header {
+    color: $text_primary;
+    font-size: 18px;
+    font-weight: bold;
+    padding-bottom: 8px;
+    border-bottom: 1px solid $divider;
+}
+QLabel#panel_label {
+    color: $text_primary;
+    font-size: 14px;
+}
+QLabel#panel_value {
+    color: $text_secondary;
+}
+
+/* Inputs */
+SearchBar {
+    background-color: $search_bg;
+    border: 1px solid $search_border;
+    border-radius: 20px;
+    padding: 8px 16px;
+    color: $text_primary;
+    font-size: 13px;
+}
+SearchBar:focus {
+    border: 1px solid $accent;
+}
+ModernButton {
+    background-color: $bg_elevated;
+    color: $text_primary;
+    border: none;
+    border-radius: 4px;
+    padding: 8px 16px;
+    font-size: 13px;
+}
+ModernButton:hover {
+    background-color: $card_hover;
+}
+ModernButton:checked {
+    background-color: $accent;
+    color: $text_on_accent;
+}
+ModernButton[primary="true"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 $accent_gradient_start,
+        stop:1 $accent_gradient_end);
+    color: $text_on_accent;
+    border-radius: 20px;
+    padding: 8px 24px;
+    font-weight: bold;
+}
+ModernButton[primary="true"]:hover {
+    background: $accent;
+}
+ModernSlider {
+    height: 24px;
+}
+ModernSlider::groove:horizontal {
+    height: 4px;
+    background: $slider_bg;
+    border-radius: 2px;
+}
+ModernSlider::handle:horizontal {
+    background: $slider_handle;
+    width: 16px;
+    height: 16px;
+    margin: -6px 0;
+    border-radius: 8px;
+}
+ModernSlider::sub-page:horizontal {
+    background: $accent;
+    border-radius: 2px;
+}
+ModernComboBox {
+    background-color: $bg_elevated;
+    border: 1px solid $divider;
+    border-radius: 4px;
+    padding: 8px 16px;
+    color: $text_primary;
+    font-size: 13px;
+}
+ModernComboBox:hover {
+    border: 1px solid $accent;
+}
+ModernComboBox::drop-down, ViewControls QComboBox::drop-down {
+    border: none;
+    width: 20px;
+}
+ModernComboBox::down-arrow {
+    image: none;
+    border: none;
+}
+ModernComboBox QAbstractItemView {
+    background-color: $bg_elevated;
+    border: 1px solid $divider;
+    selection-background-color: $accent;
+    selection-color: $text_on_accent;
+}
+ModernToggle {
+    color: $text_primary;
+    font-size: 13px;
+    spacing: 8px;
+}
+ModernToggle::indicator {
+    width: 40px;
+    height: 20px;
+    border-radius: 10px;
+    background-color: $toggle_inactive;
+}
+ModernToggle::indicator:checked {
+    background-color: $toggle_active;
+}
+
+/* View controls */
+QLabel#control_label {
+    color: $text_secondary;
+}
+QPushButton#grid_toggle, QPushButton#list_toggle {
+    background-color: $bg_secondary;
+    color: $text_secondary;
+    border: 1px solid $divider;
+    padding: 4px 12px;
+}
+QPushButton#grid_toggle {
+    border-top-left-radius: 4px;
+    border-bottom-left-radius: 4px;
+}
+QPushButton#list_toggle {
+    border-top-right-radius: 4px;
+    border-bottom-right-radius: 4px;
+}
+QPushButton#grid_toggle:hover, QPushButton#list_toggle:hover {
+    background-color: $card_hover;
+}
+QPushButton#grid_toggle:checked, QPushButton#list_toggle:checked {
+    background-color: $accent;
+    color: $text_on_accent;
+    border: 1px solid $accent;
+}
+ViewControls QComboBox {
+    background-color: $bg_secondary;
+    color: $text_primary;
+    border: 1px solid $divider;
+    border-radius: 4px;
+    padding: 4px 8px;
+    min-width: 100px;
+}
+ViewControls QComboBox QAbstractItemView {
+    background-color: $bg_secondary;
+    color: $text_primary;
+    border: 1px solid $divider;
+    selection-background-color: $accent;
+}
+SizeButton {
+    border-radius: 4px;
+    border: 1px solid $divider;
+}
+SizeButton[size_name="small"] {
+    background-color: $resize_small;
+}
+SizeButton[size_name="medium"] {
+    background-color: $resize_medium;
+}
+SizeButton[size_name="large"] {
+    background-color: $resize_large;
+}
+SizeButton:hover {
+    background-color: $card_hover;
+    border: 1px solid $accent;
+}
+SizeButton[active="true"] {
+    border: 2px solid $accent;
+}
+
+/* Views */
+SoundGridView, FavouritesView, FolderView, FolderContentView {
+    background-color: $bg_primary;
+    border: none;
+}
+SoundGridView QLabel, SoundGridView QPushButton,
+FavouritesView QLabel, FavouritesView QPushButton,
+FolderView QLabel, FolderView QPushButton {
+    border: none;
+}
+QLabel#view_title {
+    color: $text_primary;
+    font-size: 24px;
+    font-weight: bold;
+}
+FolderContentView QLabel#view_title {
+    margin-left: 10px;
+}
+QLabel#recent_label {
+    color: $text_secondary;
+    font-size: 13px;
+}
+QPushButton#menu_button {
+    background-color: transparent;
+    color: $text_secondary;
+    border-radius: 12px;
+    border: none;
+    font-size: 16px;
+    font-weight: bold;
+}
+QPushButton#menu_button:hover {
+    background-color: $card_hover;
+}
+
+/* Sound cards */
+SoundCard {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 $card_gradient_start,
+        stop:1 $card_gradient_end);
+    border-radius: 8px;
+    border: 1px solid $divider;
+}
+SoundCard:hover {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 $card_hover,
+        stop:1 $bg_elevated);
+    border: 1px solid $accent;
+}
+SoundCard[active="true"], SoundCard[playing="true"] {
+    border: 2px solid $card_active_glow;
+}
+QFrame#category_indicator {
+    border-radius: 2px;
+    background-color: $accent;
+}
+QFrame#category_indicator[category="1"] {
+    background-color: $category_1;
+}
+QFrame#category_indicator[category="2"] {
+    background-color: $category_2;
+}
+QFrame#category_indicator[category="3"] {
+    background-color: $category_3;
+}
+QFrame#category_indicator[category="4"] {
+    background-color: $category_4;
+}
+QLabel#card_title {
+    color: $text_primary;
+    font-size: 14px;
+    font-weight: bold;
+    margin-left: 4px;
+}
+QFrame#card_waveform {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 $bg_secondary,
+        stop:1 $bg_elevated);
+    border-radius: 4px;
+}
+ModernButton#card_play_button {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 $accent_gradient_start,
+        stop:1 $accent_gradient_end);
+    color: $text_on_accent;
+    border: none;
+    border-radius: 16px;
+    font-size: 12px;
+    font-weight: bold;
+    padding: 4px 12px;
+}
+ModernButton#card_play_button:hover {
+    background: $accent;
+}
+QPushButton#favorite_button {
+    background-color: transparent;
+    color: $text_secondary;
+    border: none;
+    font-size: 16px;
+}
+QPushButton#favorite_button:hover {
+    color: $favorite_color;
+}
+QPushButton#favorite_button[favorite="true"] {
+    color: $favorite_color;
+}
+QPushButton#favorite_button[favorite="true"]:hover {
+    color: $favorite_hover;
+}
+QLabel#card_hotkey {
+    color: $text_secondary;
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 $bg_secondary,
+        stop:1 $bg_elevated);
+    padding: 4px 8px;
+    border-radius: 4px;
+    font-size: 12px;
+}
+
+/* Sound tiles of the sound grid */
+QFrame#card_frame {
+    background-color: $card_bg;
+    border-radius: 8px;
+    border: 1px solid $divider;
+}
+QFrame#card_frame:hover {
+    background-color: $card_hover;
+}
+QFrame#card_frame[playing="true"] {
+    background-color: $card_bg;
+    border: 2px solid $accent;
+}
+QFrame#card_frame QLabel#category_label, QFrame#card_frame QLabel#duration_label {
+    color: $text_secondary;
+}
+QFrame#card_frame QLabel#favorite_label {
+    color: $favorite;
+}
+QFrame#card_frame QLabel#hotkey_label {
+    color: $accent;
+    padding: 2px 6px;
+    background-color: $accent_light;
+    border-radius: 3px;
+}
+QFrame#card_frame QLabel#title_label {
+    color: $text_primary;
+    font-weight: bold;
+}
+QFrame#card_frame QLabel[card_size="small"] {
+    font-size: 11px;
+}
+QFrame#card_frame QLabel[card_size="medium"] {
+    font-size: 12px;
+}
+QFrame#card_frame QLabel[card_size="large"] {
+    font-size: 13px;
+}
+QFrame#card_frame QLabel#duration_label[card_size="small"] {
+    font-size: 10px;
+}
+QFrame#card_frame QLabel#duration_label[card_size="medium"] {
+    font-size: 11px;
+}
+QFrame#card_frame QLabel#duration_label[card_size="large"] {
+    font-size: 12px;
+}
+QFrame#card_frame QLabel#title_label[card_size="small"] {
+    font-size: 13px;
+}
+QFrame#card_frame QLabel#title_label[card_size="medium"] {
+    font-size: 15px;
+}
+QFrame#card_frame QLabel#title_label[card_size="large"] {
+    font-size: 16px;
+}
+QFrame#card_frame QProgressBar {
+    background-color: $progress_bg;
+    border-radius: 2px;
+    border: none;
+}
+QFrame#card_frame QProgressBar::chunk {
+    background-color: $accent;
+    border-radius: 2px;
+}
+QFrame#card_frame QPushButton#play_button {
+    background-color: $accent;
+    border: none;
+    image: url(soundboard/assets/icons/play.png);
+    image-position: center;
+}
+QFrame#card_frame QPushButton#play_button:hover {
+    background-color: $accent_hover;
+}
+QFrame#card_frame QPushButton#play_button:pressed {
+    background-color: $accent_pressed;
+}
+QFrame#card_frame QPushButton#play_button[playing="true"] {
+    background-color: $accent_pressed;
+    image: url(soundboard/assets/icons/pause.png);
+}
+QFrame#card_frame QPushButton#play_button[card_size="small"] {
+    border-radius: 16px;
+}
+QFrame#card_frame QPushButton#play_button[card_size="medium"] {
+    border-radius: 18px;
+}
+QFrame#card_frame QPushButton#play_button[card_size="large"] {
+    border-radius: 20px;
+}
+
+/* Folders */
+QFrame#folder_item, QFrame#folder_card {
+    background-color: $folder_bg;
+    border-radius: 8px;
+    border: 1px solid $divider;
+}
+QFrame#folder_item:hover, QFrame#folder_card:hover {
+    background-color: $folder_hover;
+    border: 1px solid $accent;
+}
+QLabel#folder_icon {
+    font-size: 28px;
+    color: $folder_icon;
+}
+QLabel#folder_name {
+    color: $text_primary;
+    font-size: 16px;
+    font-weight: bold;
+}
+QLabel#folder_count {
+    color: $text_secondary;
+    font-size: 13px;
+}
+QFrame#folder_item QLabel#folder_icon {
+    font-size: 20px;
+}
+QFrame#folder_item QLabel#folder_name {
+    font-size: 14px;
+    margin-left: 8px;
+}
+QFrame#folder_item QLabel#folder_count {
+    font-size: 12px;
+    margin-right: 12px;
+}
+""")
+
+_current_theme = "dark"
+_stylesheets: Dict[str, str] = {}  # theme name -> generated stylesheet
+
+
+def stylesheet(theme: str) -> str:
+    """Get the application stylesheet of a theme, generated once per theme"""
+    if theme not in _stylesheets:
+        _stylesheets[theme] = _STYLESHEET.substitute(THEMES[theme])
+    return _stylesheets[theme]
+
+
+def current_theme() -> str:
+    """Get the name of the current theme"""
+    return _current_theme
+
+
+def apply_theme(theme: str) -> bool:
+    """Switch the application to a theme
+
+    Args:
+        theme: "dark" or "light"
+
+    Returns:
+        True if the theme was applied, False if it is unknown
+    """
+    global _current_theme
+    if theme not in THEMES:
+        print(f"Unknown theme: {theme}")
+        return False
+
+    _current_theme = theme
+    COLORS.clear()
+    COLORS.update(THEMES[theme])
+    app = QApplication.instance()
+    if isinstance(app, QApplication):
+        app.setStyleSheet(stylesheet(theme))
+    return True
+
+
+def set_state(widget: QWidget, name: str, value: Any) -> None:
+    """Set a dynamic property the stylesheet selects on, restyling the widget if it changed
+
+    Args:
+        widget: The widget
+        name: Property name, e.g. "playing", "favorite", "active" or "card_size"
+        value: New value; booleans are matched as "true"/"false" by the stylesheet
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    if style is None:
+        return
+    style.unpolish(widget)
+    style.polish(widget)
@@ -0,0 +1,16 @@
+"""Shared fixtures of the tests, which import the application modules from src/ the way main.py does"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QCoreApplication:
+    """The Qt application of the test session, for signals, timers and command queues"""
+    return QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
@@ -0,0 +1,75 @@
+"""SlotRing: commands pushed by several producers and drained by the mixer"""
+
+import threading
+import time
+
+import numpy as np
+
+from managers.audio_engine import SET_VOLUME, STOP, AudioEngine, SlotRing
+
+
+def drain(ring):
+    """Consume the published slots, the way the callback does"""
+    commands = []
+    while ring.read < ring.written:
+        slot = ring.read % ring.capacity
+        commands.append((ring.codes[slot], ring.voices[slot], ring.values[slot], ring.tags[slot]))
+        ring.read += 1
+    return commands
+
+
+def test_full_ring_refuses_until_drained_and_wraps_around():
+    ring = SlotRing(4)
+    samples = [np.zeros(2, dtype=np.float32) for _ in range(5)]
+    for i in range(4):
+        assert ring.push(STOP, voice=i, samples=samples[i])
+    assert not ring.push(STOP, voice=4)
+    assert ring.pending() == 4
+
+    assert [command[1] for command in drain(ring)] == [0, 1, 2, 3]
+    # The slots come around again, and the samples of the consumed ones are let go of by the next push
+    assert ring.push(STOP, voice=4, samples=samples[4])
+    assert ring.samples[0] is samples[4]
+    assert ring.samples[1] is None and ring.samples[3] is None
+    for voice in (5, 6, 7):
+        assert ring.push(STOP, voice=voice)
+    assert not ring.push(STOP, voice=8)
+    assert [command[1] for command in drain(ring)] == [4, 5, 6, 7]
+    assert ring.written == 8 and ring.pending() == 0
+
+
+def test_producers_keep_their_order_through_a_small_ring():
+    engine = AudioEngine()
+    engine.commands = SlotRing(8)
+    producers, count = 4, 500
+    received = []
+    done = threading.Event()
+
+    def consume():
+        while not done.is_set() or engine.commands.pending():
+            received.extend(drain(engine.commands))
+            time.sleep(0)
+
+    def produce(producer):
+        for i in range(count):
+            # A full ring refuses the command; the producer sends it again
+            while not engine.set_volume(producer * count + i):
+                time.sleep(0)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    threads = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    consumer.join()
+
+    assert all(code == SET_VOLUME for code, _, _, _ in received)
+    values = [int(value) for _, _, value, _ in received]
+    assert len(values) == producers * count
+    for producer in range(producers):
+        sent = [value for value in values if value // count == producer]
+        assert sent == list(range(producer * count, (producer + 1) * count))
+    assert engine.commands.written == producers * count
@@ -0,0 +1,40 @@
+"""Results of control commands"""
+
+from managers.control_commands import ControlCommands
+from managers.offline_library import OfflineLibrary
+from managers.sound_manager import SoundManager
+from models.sound_model import SoundModel
+
+
+def test_play_that_cannot_decode_fails(qapp, tmp_path):
+    sound_file = tmp_path / "horn.wav"
+    sound_file.write_bytes(b"not audio")
+    sound_manager = SoundManager(str(tmp_path / "sounds.json"))
+    sound_manager.model.add_sound("horn", {"title": "Air Horn", "file_path": str(sound_file)})
+
+    [result] = ControlCommands(sound_manager).execute([{"op": "play", "name": "Air Horn"}])
+    assert result == {"ok": False, "error": "Could not play Air Horn"}
+
+
+def test_play_without_file_succeeds(qapp, tmp_path):
+    sound_manager = SoundManager(str(tmp_path / "sounds.json"))
+    sound_manager.model.add_sound("horn", {"title": "Air Horn"})
+
+    [result] = ControlCommands(sound_manager).execute([{"op": "play", "id": "horn"}])
+    assert result == {"ok": True, "id": "horn", "played": True}
+
+
+def test_offline_library_builds_the_search_index_on_the_first_search(tmp_path):
+    data_file = str(tmp_path / "sounds.json")
+    model = SoundModel(data_file)
+    model.add_sound("horn", {"title": "Air Horn"})
+    model.add_sound("drum", {"title": "Drum Roll"})
+
+    library = OfflineLibrary(data_file)
+    assert len(library.model.search_index) == 0
+    library.add_sounds({"bell": {"title": "Boxing Bell"}})
+    library.model.remove_sound("drum")
+    assert ControlCommands(library).execute([{"op": "search", "query": "horn"}])[0]["sounds"][0]["id"] == "horn"
+    assert len(library.model.search_index) == 2 and "drum" not in library.model.search_index
+    library.add_sounds({"gong": {"title": "Gong"}})
+    assert library.search_sounds("gong") == ["gong"]
@@ -0,0 +1,80 @@
+"""Parsing of control API requests and WebSocket frames"""
+
+import asyncio
+import os
+import struct
+
+import pytest
+
+from managers.control_server import MAX_HEADER_LINES, FrameReader, HttpError, _read_request
+
+
+def stream(data: bytes) -> asyncio.StreamReader:
+    """A stream holding data, then closed"""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def client_frame(opcode: int, payload: bytes, final: bool = True) -> bytes:
+    """Encode a masked client frame"""
+    mask = os.urandom(4)
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return struct.pack("!BB", (0x80 if final else 0) | opcode, 0x80 | len(payload)) + mask + masked
+
+
+def read_frames(data: bytes, count: int):
+    """Read frames from a stream"""
+    async def read():
+        frames = FrameReader(stream(data))
+        return [await frames.read() for _ in range(count)]
+    return asyncio.run(read())
+
+
+def read_request(data: bytes):
+    """Read a request from a stream"""
+    async def read():
+        return await _read_request(stream(data))
+    return asyncio.run(read())
+
+
+def test_fragments_survive_a_ping_between_them():
+    data = (client_frame(0x1, b'{"op": ', final=False) + client_frame(0x9, b"hi")
+            + client_frame(0x0, b'"stop"}'))
+    assert read_frames(data, 2) == [(0x9, b"hi"), (0x1, b'{"op": "stop"}')]
+
+
+def test_messages_after_a_fragmented_one_start_afresh():
+    data = client_frame(0x1, b"a", final=False) + client_frame(0x0, b"b") + client_frame(0x1, b"c")
+    assert read_frames(data, 2) == [(0x1, b"ab"), (0x1, b"c")]
+
+
+def test_continuation_without_a_message_is_a_protocol_error():
+    with pytest.raises(HttpError) as error:
+        read_frames(client_frame(0x0, b"orphan"), 1)
+    assert error.value.status == 400
+
+
+def test_fragmented_control_frame_is_a_protocol_error():
+    with pytest.raises(HttpError) as error:
+        read_frames(client_frame(0x9, b"hi", final=False), 1)
+    assert error.value.status == 400
+
+
+def test_request_with_body():
+    request = read_request(b"POST /stop?x=1 HTTP/1.1\r\nHost: localhost\r\nContent-Length: 2\r\n\r\n{}")
+    assert request == ("POST", "/stop", {"x": "1"}, {"host": "localhost", "content-length": "2"}, b"{}")
+
+
+def test_too_many_header_lines_answers_431():
+    headers = b"".join(b"X-Header-%d: x\r\n" % i for i in range(MAX_HEADER_LINES + 1))
+    with pytest.raises(HttpError) as error:
+        read_request(b"GET /status HTTP/1.1\r\n" + headers + b"\r\n")
+    assert error.value.status == 431
+
+
+def test_negative_content_length_answers_400():
+    with pytest.raises(HttpError) as error:
+        read_request(b"POST /stop HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+    assert error.value.status == 400
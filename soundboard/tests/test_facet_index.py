@@ -0,0 +1,45 @@
+"""FacetIndex: bitmaps of facet values, and compaction of removed positions"""
+
+from models.facet_index import FacetIndex
+from models.sound_model import SoundModel
+
+
+def test_removed_positions_are_compacted_keeping_the_order():
+    index = FacetIndex()
+    index.extend((f"s{i}", {"category": i % 3, "favorite": i % 2 == 0}) for i in range(100))
+    for i in range(0, 100, 4):
+        index.remove(f"s{i}")
+    assert len(index._ids) == 100
+
+    for i in range(1, 100, 4):
+        index.remove(f"s{i}")
+    assert len(index._ids) == 100
+
+    index.remove("s2")
+    # More than half of the positions were freed: the bitmaps were rebuilt without them
+    assert len(index._ids) == len(index) == 49
+    kept = [i for i in range(3, 100) if i % 4 > 1]
+    assert index.ids(index.all) == [f"s{i}" for i in kept]
+    assert index.ids(index.query(category=1)) == [f"s{i}" for i in kept if i % 3 == 1]
+    assert index.ids(index.query(favorite=True)) == [f"s{i}" for i in kept if i % 2 == 0]
+    assert index.counts("category") == {value: sum(i % 3 == value for i in kept) for value in range(3)}
+
+    index.add("new", {"category": 1})
+    assert index.ids(index.all)[-1] == "new"
+
+
+def test_playing_refreshes_the_missing_file_facet(tmp_path):
+    sound_file = tmp_path / "kick.wav"
+    sound_file.write_bytes(b"")
+    model = SoundModel(str(tmp_path / "sounds.json"))
+    model.add_sound("kick", {"title": "Kick", "file_path": str(sound_file)})
+    assert model.filter_sounds(missing_file=True) == []
+
+    sound_file.unlink()
+    assert model.filter_sounds(missing_file=True) == []
+    assert not model.check_file("kick")
+    assert model.filter_sounds(missing_file=True) == ["kick"]
+
+    sound_file.write_bytes(b"")
+    assert model.check_file("kick")
+    assert model.filter_sounds(missing_file=True) == []
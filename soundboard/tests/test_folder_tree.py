@@ -0,0 +1,131 @@
+"""FolderTree: materialized sound counts through changes to folders and sounds"""
+
+import random
+
+from models.folder_tree import FolderTree
+
+
+def naive_counts(parents, sound_folders):
+    """The recursive sound count of every folder, by walking up from each sound"""
+    counts = dict.fromkeys(parents, 0)
+    for folder_id in sound_folders.values():
+        while folder_id is not None:
+            counts[folder_id] += 1
+            folder_id = parents[folder_id]
+    return counts
+
+
+def assert_counts(tree, parents, sound_folders):
+    """Check every count of the tree against the naive model"""
+    counts = naive_counts(parents, sound_folders)
+    assert tree.parents() == parents
+    for folder_id, count in counts.items():
+        assert tree.sound_count(folder_id) == count
+        direct = {sound_id for sound_id, filed_in in sound_folders.items() if filed_in == folder_id}
+        assert tree.sound_ids(folder_id) == direct
+    return counts
+
+
+def test_counts_include_subfolders():
+    tree = FolderTree()
+    tree.add_folder("sfx", "Effects")
+    tree.add_folder("horns", "Horns", "sfx")
+    assert tree.set_sound_folder("a", "horns") == {"horns": 1, "sfx": 1}
+    assert tree.set_sound_folder("b", "sfx") == {"sfx": 2}
+    assert tree.get_folder("sfx") == {"id": "sfx", "name": "Effects", "parent_id": None,
+                                      "count": 2, "direct_count": 1}
+    assert tree.path("horns") == ["sfx", "horns"]
+
+
+def test_move_into_own_subtree_is_refused():
+    tree = FolderTree()
+    tree.add_folder("a", "A")
+    tree.add_folder("b", "B", "a")
+    assert tree.move_folder("a", "b") is None
+    assert tree.move_folder("a", "a") is None
+    assert tree.parents() == {"a": None, "b": "a"}
+
+
+def test_remove_folder_refiles_its_sounds_and_subfolders_in_its_parent():
+    tree = FolderTree()
+    tree.add_folder("a", "A")
+    tree.add_folder("b", "B", "a")
+    tree.add_folder("c", "C", "b")
+    tree.set_sound_folder("s1", "b")
+    tree.set_sound_folder("s2", "c")
+    assert tree.remove_folder("b") == ["s1"]
+    assert tree.parents() == {"a": None, "c": "a"}
+    assert tree.folder_of("s1") == "a"
+    assert tree.sound_count("a") == 2
+    assert tree.remove_folder("a") is not None
+    assert tree.folder_of("s1") is None
+    assert tree.sound_count("c") == 1
+
+
+def test_counts_agree_with_a_naive_model_through_random_changes():
+    rng = random.Random(30)
+    tree = FolderTree()
+    parents = {}
+    sound_folders = {}
+    counts = {}
+    next_folder = 0
+    for _ in range(2000):
+        operation = rng.random()
+        folder_ids = list(parents)
+        if operation < 0.15 or not folder_ids:
+            folder_id = f"f{next_folder}"
+            next_folder += 1
+            parent_id = rng.choice(folder_ids + [None])
+            assert tree.add_folder(folder_id, folder_id, parent_id)
+            parents[folder_id] = parent_id
+            changed = {}
+        elif operation < 0.3:
+            folder_id = rng.choice(folder_ids)
+            parent_id = rng.choice(folder_ids + [None])
+            changed = tree.move_folder(folder_id, parent_id)
+            ancestor = parent_id
+            while ancestor is not None and ancestor != folder_id:
+                ancestor = parents[ancestor]
+            if ancestor == folder_id:
+                assert changed is None
+                changed = {}
+            else:
+                parents[folder_id] = parent_id
+        elif operation < 0.38:
+            folder_id = rng.choice(folder_ids)
+            parent_id = parents.pop(folder_id)
+            refiled = tree.remove_folder(folder_id)
+            assert sorted(refiled) == sorted(s for s, f in sound_folders.items() if f == folder_id)
+            for child_id, child_parent in parents.items():
+                if child_parent == folder_id:
+                    parents[child_id] = parent_id
+            for sound_id in refiled:
+                if parent_id is None:
+                    del sound_folders[sound_id]
+                else:
+                    sound_folders[sound_id] = parent_id
+            del counts[folder_id]
+            changed = {}
+        else:
+            sound_id = f"s{rng.randrange(150)}"
+            folder_id = rng.choice(folder_ids + [None, "unknown"])
+            if rng.random() < 0.2:
+                changed = tree.remove_sound(sound_id)
+                sound_folders.pop(sound_id, None)
+            else:
+                changed = tree.set_sound_folder(sound_id, folder_id)
+                if folder_id in parents:
+                    sound_folders[sound_id] = folder_id
+                else:
+                    sound_folders.pop(sound_id, None)
+
+        new_counts = assert_counts(tree, parents, sound_folders)
+        # Every count that moved is reported, with its new value
+        for folder_id, count in changed.items():
+            assert new_counts[folder_id] == count
+        assert {folder_id for folder_id, count in new_counts.items() if counts.get(folder_id, 0) != count} <= set(changed)
+        counts = new_counts
+
+    rebuilt = FolderTree()
+    rebuilt.rebuild(tree.to_dict(), sound_folders.items())
+    assert_counts(rebuilt, parents, sound_folders)
@@ -0,0 +1,95 @@
+"""FuzzySearcher: typo tolerance, and memoized searches agreeing with cold ones"""
+
+import random
+
+from models.fuzzy_search import FuzzySearcher
+from models.search_index import SearchIndex
+
+WORDS = ["applause", "airhorn", "air", "horn", "doorbell", "door", "drumroll", "drum", "thunder",
+         "rain", "laugh", "laughter", "crickets", "bell", "boo", "sad", "trombone", "whoosh"]
+
+
+def random_sound(rng):
+    """Sound data of a few random words"""
+    return {"title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))),
+            "tags": [rng.choice(WORDS)] if rng.random() < 0.3 else []}
+
+
+def typo(rng, word):
+    """A word with one character dropped, doubled or swapped with the next"""
+    position = rng.randrange(1, len(word) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[:position] + word[position + 1:]
+    if kind == 1:
+        return word[:position] + word[position] + word[position:]
+    return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+
+def keystrokes(query):
+    """The queries typed on the way to a query, with a backspace or two along the way"""
+    typed = [query[:end] for end in range(1, len(query) + 1)]
+    if len(query) > 3:
+        typed += [query[:-1], query[:-2], query[:-1], query]
+    return typed
+
+
+def cold_search(index, query, limit=None):
+    """Search with a searcher that has memoized nothing"""
+    return FuzzySearcher(index).search(query, limit)
+
+
+def test_typos_find_the_word():
+    index = SearchIndex()
+    index.add("applause", {"title": "Applause"})
+    index.add("drumroll", {"title": "Drum Roll"})
+    searcher = FuzzySearcher(index)
+    assert searcher.search("aplause") == ["applause"]
+    assert searcher.search("applasue") == ["applause"]
+    assert searcher.search("drum rol") == ["drumroll"]
+    assert searcher.search("xyz") == []
+
+
+def test_exact_matches_rank_ahead_of_typos():
+    index = SearchIndex()
+    index.add("laugh", {"title": "Laugh"})
+    index.add("laughter", {"title": "Laughter"})
+    index.add("lough", {"title": "Lough"})
+    assert FuzzySearcher(index).search("laugh") == ["laugh", "laughter", "lough"]
+
+
+def test_memoized_search_agrees_with_cold_search_while_typing():
+    rng = random.Random(27)
+    index = SearchIndex()
+    for i in range(300):
+        index.add(f"s{i}", random_sound(rng))
+    searcher = FuzzySearcher(index)
+    queries = [rng.choice(WORDS) for _ in range(15)]
+    queries += [typo(rng, rng.choice(WORDS)) for _ in range(15)]
+    queries += [f"{rng.choice(WORDS)} {typo(rng, rng.choice(WORDS))}" for _ in range(15)]
+    queries += [f"{rng.choice(WORDS)[:2]} {rng.choice(WORDS)}" for _ in range(10)]
+    for query in queries:
+        for typed in keystrokes(query):
+            assert searcher.search(typed) == cold_search(index, typed), typed
+            assert searcher.search(typed, limit=10) == cold_search(index, typed, limit=10), typed
+            assert searcher.search(typed, limit=10) == cold_search(index, typed)[:10], typed
+
+
+def test_memoized_search_sees_index_changes():
+    rng = random.Random(270)
+    index = SearchIndex()
+    for i in range(100):
+        index.add(f"s{i}", random_sound(rng))
+    searcher = FuzzySearcher(index)
+    for round_number in range(30):
+        query = rng.choice([rng.choice(WORDS), typo(rng, rng.choice(WORDS)),
+                            f"{rng.choice(WORDS)} {rng.choice(WORDS)[:3]}"])
+        for typed in keystrokes(query):
+            searcher.search(typed)
+        sound_id = f"s{rng.randrange(120)}"
+        if round_number % 3 == 0:
+            index.remove(sound_id)
+        else:
+            index.add(sound_id, random_sound(rng))
+        for typed in keystrokes(query):
+            assert searcher.search(typed) == cold_search(index, typed), typed
@@ -0,0 +1,86 @@
+"""Hotkey names, and the trie and matcher of chords and sequences"""
+
+import pytest
+
+from managers.hotkey_bindings import (
+    HotkeyMatcher, HotkeyTrie, format_hotkey, normalize_hotkey, normalize_sequence
+)
+
+
+def test_names_are_normalized():
+    assert normalize_hotkey("Shift+Ctrl+F1") == "ctrl+shift+f1"
+    assert normalize_hotkey("Left Control+Return") == "ctrl+enter"
+    assert normalize_hotkey("ctrl+alt") is None
+    assert normalize_hotkey("a+b") is None
+    assert normalize_sequence("Control+k,3") == "ctrl+k, 3"
+    assert normalize_sequence("ctrl+k, a+b") is None
+    assert format_hotkey("ctrl+k, page up") == "Ctrl+K, Page Up"
+
+
+def test_conflicts_with_same_and_prefix_sequences():
+    trie = HotkeyTrie()
+    assert trie.add("Ctrl+K, 1", "one") is None
+    assert trie.add("ctrl+k, 2", "two") is None
+    assert trie.add("F5", "five") is None
+    assert trie.add("Ctrl+K", "k") == "one"
+    assert trie.add("ctrl+k, 1, 2", "deeper") == "one"
+    assert trie.add("ctrl+k, 1", "again") == "one"
+    assert trie.find_conflict("ctrl+k, 1", ignore="one") is None
+    assert trie.lookup("Control+K, 2") == "two"
+    assert trie.lookup("ctrl+k") is None
+    assert sorted(trie.bindings()) == [("ctrl+k, 1", "one"), ("ctrl+k, 2", "two"), ("f5", "five")]
+    assert len(trie) == 3
+    with pytest.raises(ValueError):
+        trie.add("ctrl+", "invalid")
+
+
+def test_copy_is_independent():
+    trie = HotkeyTrie()
+    trie.add("f1", "one")
+    copy = trie.copy()
+    copy.add("f2", "two")
+    assert trie.lookup("f2") is None
+    assert copy.lookup("f1") == "one" and len(copy) == 2
+
+
+def test_matcher_follows_sequences_within_the_timeout():
+    trie = HotkeyTrie()
+    trie.add("ctrl+k, 1", "one")
+    trie.add("ctrl+k, ctrl+k, 2", "two")
+    trie.add("f5", "five")
+    matcher = HotkeyMatcher(trie, timeout=1.0)
+    assert matcher.press("f5", now=0.0) == "five"
+    assert matcher.press("ctrl+k", now=1.0) is None
+    assert matcher.press("1", now=1.5) == "one"
+    # A sequence completes once, the next chord starts over
+    assert matcher.press("1", now=1.6) is None
+    assert matcher.press("ctrl+k", now=2.0) is None
+    assert matcher.press("ctrl+k", now=2.5) is None
+    assert matcher.press("2", now=3.0) == "two"
+
+
+def test_matcher_starts_over_after_the_timeout_or_a_wrong_chord():
+    trie = HotkeyTrie()
+    trie.add("ctrl+k, 1", "one")
+    trie.add("1", "plain")
+    matcher = HotkeyMatcher(trie, timeout=1.0)
+    assert matcher.press("ctrl+k", now=0.0) is None
+    assert matcher.press("1", now=1.5) == "plain"
+    assert matcher.press("ctrl+k", now=2.0) is None
+    # A chord that does not continue the sequence is matched as the start of one
+    assert matcher.press("x", now=2.1) is None
+    assert matcher.press("1", now=2.2) == "plain"
+    assert matcher.press("ctrl+k", now=3.0) is None
+    matcher.reset()
+    assert matcher.press("1", now=3.1) == "plain"
+
+
+def test_new_trie_drops_the_partial_sequence():
+    trie = HotkeyTrie()
+    trie.add("ctrl+k, 1", "one")
+    matcher = HotkeyMatcher(trie)
+    assert matcher.press("ctrl+k", now=0.0) is None
+    matcher.set_trie(trie.copy())
+    assert matcher.press("1", now=0.1) is None
+    assert matcher.press("ctrl+k", now=0.2) is None
+    assert matcher.press("1", now=0.3) == "one"
@@ -0,0 +1,78 @@
+"""LibraryColumns: cached sort orders of the library"""
+
+import random
+
+from models.library_columns import LibraryColumns, UNKNOWN_DURATION, parse_duration_ms
+
+
+def columns_of(sounds, favorites=()):
+    columns = LibraryColumns()
+    for sound_id, sound_data in sounds.items():
+        columns.add(sound_id, sound_data, sound_id in favorites)
+    return columns
+
+
+def test_durations_sort_by_length_not_text():
+    assert parse_duration_ms("0:30") == 30000
+    assert parse_duration_ms("10:00") == 600000
+    assert parse_duration_ms("1:02:03") == 3723000
+    assert parse_duration_ms("soon") == parse_duration_ms(None) == UNKNOWN_DURATION
+
+    columns = columns_of({
+        "long": {"title": "Long", "duration": "10:00"},
+        "short": {"title": "Short", "duration": "0:30"},
+        "unknown": {"title": "Unknown"},
+        "medium": {"title": "Medium", "duration": "9:59"},
+        "seconds": {"title": "Seconds", "duration": 45},
+    })
+    assert columns.sorted_ids("duration") == ["short", "seconds", "medium", "long", "unknown"]
+    assert columns.sorted_ids("duration", descending=True) == ["unknown", "long", "medium", "seconds", "short"]
+
+
+def test_ties_fall_back_to_title_then_insertion_order():
+    columns = columns_of({
+        "b2": {"title": "Bell", "duration": "0:05"},
+        "a": {"title": "Air Horn", "duration": "0:05"},
+        "b1": {"title": "bell", "duration": "0:05"},
+        "c": {"title": "Clap", "duration": "0:01"},
+    })
+    assert columns.sorted_ids("duration") == ["c", "a", "b2", "b1"]
+    assert columns.sorted_ids("name") == ["a", "b2", "b1", "c"]
+    # Newest first when nothing was ever played
+    assert columns.sorted_ids("recent") == ["c", "b1", "a", "b2"]
+
+
+def test_orders_follow_changes_and_plays():
+    rng = random.Random(28)
+    sounds = {
+        f"s{i}": {"title": f"Sound {rng.randint(0, 30)}", "category": rng.randint(1, 4),
+                  "duration": f"{rng.randint(0, 12)}:{rng.randint(0, 59):02d}", "added_at": rng.randint(0, 5)}
+        for i in range(200)
+    }
+    columns = columns_of(sounds)
+    for i in range(0, 200, 7):
+        columns.remove(f"s{i}")
+        del sounds[f"s{i}"]
+    for sound_id in rng.sample(sorted(sounds), 40):
+        sounds[sound_id]["title"] = f"Renamed {rng.randint(0, 30)}"
+        columns.add(sound_id, sounds[sound_id])
+    plays = {}
+    for when, sound_id in enumerate(rng.choices(sorted(sounds), k=60), 1):
+        plays[sound_id] = (plays.get(sound_id, (0, 0))[0] + 1, when)
+        columns.record_play(sound_id, *plays[sound_id])
+
+    # Insertion order, which updates keep
+    seq = {sound_id: int(sound_id[1:]) for sound_id in sounds}
+
+    def title(sound_id):
+        return sounds[sound_id]["title"].lower()
+
+    assert columns.sorted_ids("name") == sorted(sounds, key=lambda s: (title(s), seq[s]))
+    assert columns.sorted_ids("duration") == sorted(
+        sounds, key=lambda s: (parse_duration_ms(sounds[s]["duration"]), title(s), seq[s]))
+    assert columns.sorted_ids("play_count") == sorted(
+        sounds, key=lambda s: (-plays.get(s, (0, 0))[0], title(s), seq[s]))
+    assert columns.sorted_ids("recent") == sorted(
+        sounds, key=lambda s: (-plays.get(s, (0, 0))[1], -sounds[s]["added_at"], -seq[s]))
+    subset = rng.sample(sorted(sounds), 25)
+    assert columns.sort_ids(subset, "duration") == [s for s in columns.sorted_ids("duration") if s in subset]
@@ -0,0 +1,120 @@
+"""OSC packets: parsing, and the handling of invalid ones"""
+
+import struct
+import time
+
+import pytest
+
+from managers.osc_server import (
+    ERROR_REPORT_INTERVAL, IMMEDIATELY, MAX_BUNDLE_DEPTH, MAX_SCHEDULE_AHEAD, MAX_SCHEDULED, NTP_EPOCH_OFFSET,
+    OscError, OscServer, parse_message, parse_packet
+)
+from managers.sound_manager import SoundManager
+
+
+def osc_string(value: str) -> bytes:
+    data = value.encode() + b"\0"
+    return data + b"\0" * (-len(data) % 4)
+
+
+def osc_message(address: str, tags: str = ",", data: bytes = b"") -> bytes:
+    return osc_string(address) + osc_string(tags) + data
+
+
+def osc_bundle(timetag: int, *elements: bytes) -> bytes:
+    return b"#bundle\0" + struct.pack(">Q", timetag) + b"".join(
+        struct.pack(">i", len(element)) + element for element in elements)
+
+
+def test_arguments_are_parsed():
+    data = (struct.pack(">i", -3) + struct.pack(">f", 0.5) + osc_string("kick")
+            + struct.pack(">i", 3) + b"abc\0" + struct.pack(">q", 2 ** 40))
+    assert parse_message(osc_message("/sound/play", ",ifsbhTN", data)) == (
+        "/sound/play", [-3, 0.5, "kick", b"abc", 2 ** 40, True, None])
+    # Messages of old implementations may have no type tags
+    assert parse_message(osc_string("/stop")) == ("/stop", [])
+
+
+@pytest.mark.parametrize("data, error", [
+    (b"/stop", "Unterminated string"),
+    (osc_string("stop"), "Invalid address"),
+    (osc_string("/stop") + osc_string("if"), "Invalid type tags"),
+    (osc_message("/stop", ",s", b"kick"), "Unterminated string"),
+    (osc_message("/stop", ",b", struct.pack(">i", 8) + b"abc\0"), "Truncated blob"),
+    (osc_message("/stop", ",b", b"\0\0"), "Truncated arguments"),
+    (osc_message("/stop", ",if", struct.pack(">i", 1)), "Truncated arguments"),
+    (osc_message("/stop", ",x"), "Unsupported type tag"),
+])
+def test_invalid_messages_are_rejected(data, error):
+    with pytest.raises(OscError, match=error):
+        parse_message(data)
+
+
+def test_bundles_are_grouped_in_order():
+    play, stop = osc_message("/play", ",i", struct.pack(">i", 1)), osc_message("/stop")
+    packet = osc_bundle(5, play, osc_bundle(6, stop, osc_bundle(7, play)), osc_bundle(8), osc_bundle(9, stop), stop)
+    assert parse_packet(packet) == [
+        (5, [("/play", [1]), ("/stop", [])]),
+        (6, [("/stop", [])]),
+        (7, [("/play", [1])]),
+        (9, [("/stop", [])]),
+    ]
+    assert parse_packet(stop) == [(IMMEDIATELY, [("/stop", [])])]
+
+
+@pytest.mark.parametrize("data", [
+    b"#bundle\0\0\0",
+    osc_bundle(1, osc_message("/stop"))[:-2],
+    osc_bundle(1, osc_message("/stop")) + b"\0\0",
+    osc_bundle(1) + struct.pack(">i", 0),
+    osc_bundle(1) + struct.pack(">i", -4) + b"\0" * 4,
+    osc_bundle(1, osc_bundle(2)[:12]),
+])
+def test_truncated_bundles_are_rejected(data):
+    with pytest.raises(OscError, match="Truncated bundle"):
+        parse_packet(data)
+
+
+def test_bundles_nested_too_deep_are_rejected():
+    packet = osc_message("/stop")
+    for depth in range(MAX_BUNDLE_DEPTH):
+        packet = osc_bundle(depth, packet)
+    assert len(parse_packet(packet)) == 1
+    with pytest.raises(OscError, match="nested"):
+        parse_packet(osc_bundle(0, packet))
+
+
+def test_errors_of_a_kind_are_reported_once_per_interval(qapp, tmp_path, capsys):
+    server = OscServer(SoundManager(str(tmp_path / "sounds.json")), port=0)
+    for i in range(50):
+        server.handle_packet(b"not osc", now=100.0 + i * 0.01)
+        server.handle_packet(b"/other/play\0,\0\0\0", now=100.0 + i * 0.01)
+    assert capsys.readouterr().out.splitlines() == [
+        "Invalid OSC packet: Unterminated string",
+        "Unknown OSC address: /other/play",
+    ]
+
+    server.handle_packet(b"not osc", now=100.0 + ERROR_REPORT_INTERVAL)
+    assert capsys.readouterr().out.splitlines() == [
+        "Invalid OSC packet: Unterminated string (49 more like it in the last 10 s)",
+    ]
+
+
+def timetag_in(seconds: float) -> int:
+    return int((time.time() + seconds + NTP_EPOCH_OFFSET) * 2 ** 32)
+
+
+def test_bundles_too_far_ahead_or_too_many_are_dropped(qapp, tmp_path, capsys):
+    server = OscServer(SoundManager(str(tmp_path / "sounds.json")), port=0)
+    now = time.monotonic()
+    assert server.handle_packet(osc_bundle(timetag_in(2 * MAX_SCHEDULE_AHEAD), osc_message("/board/stop")), now) == 0
+    assert capsys.readouterr().out.startswith("OSC bundle due in ")
+
+    for _ in range(MAX_SCHEDULED):
+        assert server.handle_packet(osc_bundle(timetag_in(60), osc_message("/board/stop")), now) == 1
+    assert server.handle_packet(osc_bundle(timetag_in(60), osc_message("/board/stop")), now) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        f"OSC bundle dropped, {MAX_SCHEDULED} bundles are already scheduled",
+    ]
+    # Bundles due now still run
+    assert server.handle_packet(osc_bundle(IMMEDIATELY, osc_message("/board/stop")), now) == 1
@@ -0,0 +1,73 @@
+"""PlayStatsIndex: recency and frequency orders kept through plays and changes"""
+
+import random
+
+from models.play_stats import PlayStatsIndex
+
+
+def naive_orders(stats):
+    """The recent and most played orders of {sound ID: (count, last played at)}, by sorting"""
+    recent = sorted(stats, key=lambda sound_id: stats[sound_id][1], reverse=True)
+    most_played = sorted(stats, key=lambda sound_id: stats[sound_id], reverse=True)
+    return recent, most_played
+
+
+def test_most_played_breaks_ties_by_last_play():
+    index = PlayStatsIndex()
+    for sound_id, played_at in (("a", 1), ("b", 2), ("a", 3), ("c", 4), ("b", 5)):
+        index.record(sound_id, played_at)
+    assert index.recent() == ["b", "c", "a"]
+    assert index.most_played() == ["b", "a", "c"]
+    assert index.most_played(limit=1) == ["b"]
+    assert index.play_count("a") == 2
+    assert index.last_played_at("c") == 4
+
+
+def test_remove_and_set():
+    index = PlayStatsIndex()
+    index.record("a", 1)
+    index.record("b", 2)
+    assert index.remove("b")
+    assert not index.remove("b")
+    index.set("c", 5, 0.5)
+    index.set("a", 0, None)
+    assert index.recent() == ["c"]
+    assert index.most_played() == ["c"]
+    assert "a" not in index
+
+
+def test_orders_agree_with_sorting_through_random_changes():
+    rng = random.Random(31)
+    index = PlayStatsIndex()
+    stats = {}
+    clock = 1000.0
+    for step in range(3000):
+        sound_id = f"s{rng.randrange(80)}"
+        operation = rng.random()
+        if operation < 0.7:
+            clock += rng.uniform(0.01, 1.0)
+            count, _ = stats.get(sound_id, (0, None))
+            assert index.record(sound_id, clock) == count + 1
+            stats[sound_id] = (count + 1, clock)
+        elif operation < 0.8:
+            assert index.remove(sound_id) == (sound_id in stats)
+            stats.pop(sound_id, None)
+        else:
+            # Saved statistics, played some time before now
+            count, played_at = rng.randrange(0, 12), clock - rng.uniform(0.001, 500.0)
+            index.set(sound_id, count, played_at)
+            if count:
+                stats[sound_id] = (count, played_at)
+            else:
+                stats.pop(sound_id, None)
+        if step % 50 == 0:
+            recent, most_played = naive_orders(stats)
+            assert index.recent() == recent
+            assert index.most_played() == most_played
+            assert index.recent(limit=10) == recent[:10]
+            assert index.most_played(limit=10) == most_played[:10]
+
+    rebuilt = PlayStatsIndex()
+    rebuilt.rebuild((sound_id, count, played_at) for sound_id, (count, played_at) in stats.items())
+    assert (rebuilt.recent(), rebuilt.most_played()) == naive_orders(stats)
+    assert len(rebuilt) == len(index) == len(stats)
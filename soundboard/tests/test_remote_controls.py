@@ -0,0 +1,54 @@
+"""Commands forwarded by other launches while the library loads"""
+
+import json
+import time
+
+from managers.remote_controls import RemoteControls
+from managers.single_instance import InstanceLock
+from managers.sound_manager import SoundManager
+
+SOUNDS = 3000
+
+
+def loading_manager(tmp_path) -> SoundManager:
+    """A sound manager that has only opened a library of sounds without files"""
+    data_file = tmp_path / "sounds.json"
+    sounds = {f"sound_{i}": {"title": f"Sound {i}", "category": "Effects"} for i in range(SOUNDS)}
+    data_file.write_text(json.dumps({"sounds": sounds, "favorites": []}), encoding="utf-8")
+    return SoundManager(str(data_file), progressive=True)
+
+
+def wait_for(qapp, future, timeout: float = 30.0):
+    """Run the event loop until a future is done, and get its result"""
+    deadline = time.monotonic() + timeout
+    while not future.done() and time.monotonic() < deadline:
+        qapp.processEvents()
+    return future.result(0)
+
+
+def test_forward_mid_load_waits_for_library(qapp, tmp_path):
+    sound_manager = loading_manager(tmp_path)
+    remote_controls = RemoteControls(sound_manager, InstanceLock(str(tmp_path)))
+
+    future = remote_controls.forward([{"op": "gain", "name": "Sound 0", "db": -3}])
+    qapp.processEvents()
+    assert sound_manager.is_loading()
+    assert not future.done()
+
+    [result] = wait_for(qapp, future)
+    assert not sound_manager.is_loading()
+    assert result == {"ok": True, "id": "sound_0", "gain_db": -3.0}
+    sound_manager.flush()
+
+
+def test_forward_mid_load_answers_status_at_once(qapp, tmp_path):
+    sound_manager = loading_manager(tmp_path)
+    remote_controls = RemoteControls(sound_manager, InstanceLock(str(tmp_path)))
+
+    future = remote_controls.forward([{"op": "status"}])
+    qapp.processEvents()
+    assert future.done()
+    [result] = future.result(0)
+    assert result["ok"] and result["loading"]
+    while sound_manager.is_loading():
+        qapp.processEvents()
@@ -0,0 +1,115 @@
+"""SearchIndex: indexing of titles, tags and categories, and ranked lookups"""
+
+import random
+
+from models.search_index import SearchIndex, category_name, normalize_text, tokenize
+
+WORDS = ["air", "horn", "airhorn", "bell", "door", "doorbell", "café", "applause", "boo", "rain"]
+
+
+def naive_search(sounds, query):
+    """The sounds with a word containing each term of a query, by brute force"""
+    terms = tokenize(normalize_text(query))
+    matches = set()
+    for sound_id, sound_data in sounds.items():
+        words = tokenize(normalize_text(sound_data.get("title", "")))
+        for tag in sound_data.get("tags") or []:
+            words += tokenize(normalize_text(tag))
+        words += tokenize(normalize_text(category_name(sound_data.get("category"))))
+        if terms and all(any(term in word for word in words) for term in terms):
+            matches.add(sound_id)
+    return matches
+
+
+def random_sound(rng):
+    """Sound data of a few random words"""
+    return {
+        "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))),
+        "tags": [rng.choice(WORDS) for _ in range(rng.randint(0, 2))],
+        "category": rng.choice([1, 2, 3, 4, "Crowd", None]),
+    }
+
+
+def test_accents_and_case_are_folded():
+    assert normalize_text("Café Ambiance") == "cafe ambiance"
+    assert normalize_text("ÉCOLE") == "ecole"
+    index = SearchIndex()
+    index.add("cafe", {"title": "Café Ambiance"})
+    assert index.search("cafe") == ["cafe"]
+    assert index.search("CAFÉ amb") == ["cafe"]
+    assert index.title_of("cafe") == "cafe ambiance"
+
+
+def test_tag_stored_as_a_string_is_one_tag():
+    index = SearchIndex()
+    index.add("bell", {"title": "Ding", "tags": "bell"})
+    assert index.search("bell") == ["bell"]
+    assert index.doc_words("bell") == [("ding", 0), ("bell", 2)]
+
+
+def test_update_replaces_the_words_of_a_sound():
+    index = SearchIndex()
+    index.add("a", {"title": "Air Horn", "tags": ["loud"]})
+    index.update("a", {"title": "Door Bell"})
+    assert index.search("horn") == []
+    assert index.search("loud") == []
+    assert index.search("bell") == ["a"]
+    assert len(index) == 1
+
+
+def test_remove_drops_the_sound_and_its_words():
+    index = SearchIndex()
+    index.add("a", {"title": "Air Horn"})
+    index.add("b", {"title": "Air Raid"})
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert "a" not in index
+    assert index.search("air") == ["b"]
+    assert index.matching_tokens("horn") == set()
+    assert index.words_with_gram("hor") == set()
+
+
+def test_title_prefix_ranks_ahead_of_title_words_tags_and_categories():
+    index = SearchIndex()
+    index.add("category", {"title": "Zap", "category": "Bells"})
+    index.add("tag", {"title": "Zip", "tags": ["bell"]})
+    index.add("word", {"title": "Door Bell"})
+    index.add("prefix", {"title": "Bell Tower"})
+    index.add("substring", {"title": "Doorbell"})
+    assert index.search("bell") == ["prefix", "word", "tag", "category", "substring"]
+    assert index.search("bell", limit=2) == ["prefix", "word"]
+
+
+def test_matches_agree_with_brute_force_through_changes():
+    rng = random.Random(26)
+    index = SearchIndex()
+    sounds = {}
+    for step in range(600):
+        sound_id = f"s{rng.randrange(60)}"
+        if sound_id in sounds and rng.random() < 0.3:
+            del sounds[sound_id]
+            index.remove(sound_id)
+        else:
+            sounds[sound_id] = random_sound(rng)
+            index.add(sound_id, sounds[sound_id])
+        if step % 20 == 0:
+            for query in ("a", "air", "bell door", "or", "cafe", "rn ho", "effects", "zzz"):
+                results = index.search(query)
+                assert set(results) == naive_search(sounds, query), query
+                assert len(results) == len(set(results))
+                assert index.search(query, limit=5) == results[:5], query
+    assert len(index) == len(sounds)
+
+
+def test_bulk_loaded_index_matches_one_built_sound_by_sound():
+    rng = random.Random(260)
+    sounds = {f"s{i}": random_sound(rng) for i in range(200)}
+    bulk, single = SearchIndex(), SearchIndex()
+    bulk.add_many(sounds.items())
+    assert not bulk.is_sorted()
+    while bulk.sort_pending(limit=3):
+        pass
+    for sound_id, sound_data in sounds.items():
+        single.add(sound_id, sound_data)
+    for query in ("air", "bell", "o", "horn air", "music"):
+        assert bulk.search(query) == single.search(query)
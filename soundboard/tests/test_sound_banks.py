@@ -0,0 +1,61 @@
+"""SoundBanks: banks added and removed, and sounds leaving the library"""
+
+from models.sound_banks import SoundBanks
+from models.sound_model import SoundModel
+
+
+def test_banks_are_added_and_removed_in_page_order():
+    banks = SoundBanks()
+    assert banks.add_bank("live", "Live")
+    assert banks.add_bank("jingles", "Jingles")
+    assert not banks.add_bank("live", "Taken")
+    assert banks.bank_ids() == ["live", "jingles"]
+    assert banks.get_bank("live") == {"id": "live", "name": "Live", "hotkey": None, "sounds": {}}
+
+    assert banks.set_active("live")
+    assert not banks.set_active("missing")
+    assert banks.remove_bank("live")
+    assert not banks.remove_bank("live")
+    # Removing the active bank leaves none active
+    assert banks.active_id is None
+    assert banks.bank_ids() == ["jingles"] and "live" not in banks
+    assert banks.get_bank("live") is None
+    assert not banks.set_sound("live", "horn")
+
+
+def test_forget_sound_takes_it_out_of_every_bank():
+    banks = SoundBanks()
+    banks.add_bank("live", "Live")
+    banks.add_bank("jingles", "Jingles")
+    banks.add_bank("empty", "Empty")
+    banks.set_sound("live", "horn", "Ctrl+1")
+    banks.set_sound("live", "drum", "Ctrl+2")
+    banks.set_sound("jingles", "horn", "F1")
+
+    assert banks.forget_sound("horn") == ["live", "jingles"]
+    assert banks.forget_sound("horn") == []
+    assert not banks.has_sound("horn")
+    assert banks.layout("live") == {"Ctrl+2": "drum"}
+    assert banks.layout("jingles") == {}
+    # The records handed out are copies
+    banks.get_bank("live")["sounds"]["bell"] = None
+    assert banks.sound_ids("live") == ["drum"]
+
+
+def test_banks_survive_a_reload_without_the_removed_sounds(tmp_path):
+    data_file = str(tmp_path / "sounds.json")
+    model = SoundModel(data_file)
+    model.add_sound("horn", {"title": "Air Horn"})
+    model.add_sound("drum", {"title": "Drum Roll"})
+    model.add_bank("live", "Live")
+    model.set_bank_switch_hotkey("live", "Ctrl+F1")
+    model.set_bank_sound("live", "horn", "Ctrl+1")
+    model.set_bank_sound("live", "drum", "Ctrl+2")
+    model.set_active_bank("live")
+    model.remove_sound("horn")
+
+    reloaded = SoundModel(data_file)
+    assert reloaded.get_active_bank_id() == "live"
+    assert reloaded.get_bank("live") == {
+        "id": "live", "name": "Live", "hotkey": "Ctrl+F1", "sounds": {"drum": "Ctrl+2"}
+    }
@@ -0,0 +1,144 @@
+"""SoundListModel: row-level diffs applied by update_sound_ids()"""
+
+import random
+
+import pytest
+from PyQt6.QtCore import QPersistentModelIndex, qInstallMessageHandler
+from PyQt6.QtTest import QAbstractItemModelTester
+
+from ui.sound_list_model import FIRST_PAGE_ROWS, MAX_ROW_MOVES, SoundListModel
+
+
+class Mirror:
+    """A list kept up to date from the row signals of a model alone"""
+
+    def __init__(self, model: SoundListModel):
+        self.model = model
+        self.rows = model.sound_ids()
+        self.layout_changes = 0
+        model.rowsInserted.connect(self._inserted)
+        model.rowsRemoved.connect(self._removed)
+        model.rowsMoved.connect(self._moved)
+        model.layoutChanged.connect(self._relaid_out)
+        model.modelReset.connect(self._reset)
+
+    def _inserted(self, parent, first, last):
+        self.rows[first:first] = self.model.sound_ids()[first:last + 1]
+
+    def _removed(self, parent, first, last):
+        del self.rows[first:last + 1]
+
+    def _moved(self, parent, start, end, destination, row):
+        moved = self.rows[start:end + 1]
+        del self.rows[start:end + 1]
+        if row > start:
+            row -= len(moved)
+        self.rows[row:row] = moved
+
+    def _relaid_out(self):
+        self.layout_changes += 1
+        self.rows = self.model.sound_ids()
+
+    def _reset(self):
+        self.rows = self.model.sound_ids()
+
+
+@pytest.fixture
+def model_warnings(qapp):
+    """Warnings of Qt, among them those of QAbstractItemModelTester"""
+    warnings = []
+    previous = qInstallMessageHandler(lambda mode, context, message: warnings.append(message))
+    yield warnings
+    qInstallMessageHandler(previous)
+
+
+def checked_model(sound_ids):
+    """A model listing sounds, with a tester and a mirror watching it"""
+    model = SoundListModel()
+    model.set_sound_ids(sound_ids)
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    return model, tester, Mirror(model)
+
+
+def test_small_changes_are_row_moves_inserts_and_removes(model_warnings):
+    model, tester, mirror = checked_model(["a", "b", "c", "d", "e"])
+    kept = QPersistentModelIndex(model.index(3))
+    model.update_sound_ids(["d", "a", "x", "c", "e", "y"])
+    assert model.sound_ids() == mirror.rows == ["d", "a", "x", "c", "e", "y"]
+    assert mirror.layout_changes == 0
+    assert kept.row() == 0
+    assert model.row_of("x") == 2 and model.row_of("b") == -1
+    assert model_warnings == []
+
+
+def test_large_reorder_is_one_layout_change(model_warnings):
+    sound_ids = [f"s{i}" for i in range(4 * MAX_ROW_MOVES)]
+    model, tester, mirror = checked_model(sound_ids)
+    kept = QPersistentModelIndex(model.index(10))
+    model.update_sound_ids(list(reversed(sound_ids)))
+    assert model.sound_ids() == mirror.rows == list(reversed(sound_ids))
+    assert mirror.layout_changes == 1
+    assert model.sound_id(kept.row()) == "s10"
+    assert model_warnings == []
+
+
+def test_random_updates_reach_the_new_list(model_warnings):
+    rng = random.Random(33)
+    pool = [f"s{i}" for i in range(60)]
+    model, tester, mirror = checked_model(rng.sample(pool, 30))
+    for _ in range(300):
+        new_ids = rng.sample(pool, rng.randint(1, 50))
+        if rng.random() < 0.5:
+            # Mostly the same rows, a few changed
+            new_ids = model.sound_ids()
+            for _ in range(rng.randint(1, 4)):
+                new_ids.insert(rng.randrange(len(new_ids) + 1), new_ids.pop(rng.randrange(len(new_ids))))
+            new_ids = [sound_id for sound_id in new_ids if rng.random() > 0.05]
+            new_ids += [sound_id for sound_id in rng.sample(pool, 3) if sound_id not in new_ids]
+            if not new_ids:
+                new_ids = [pool[0]]
+        model.update_sound_ids(new_ids)
+        assert model.sound_ids() == mirror.rows == new_ids
+        assert all(model.row_of(sound_id) == row for row, sound_id in enumerate(new_ids))
+    assert model_warnings == []
+
+
+def test_update_while_populating_replaces_the_pending_rows(qapp, model_warnings):
+    model = SoundListModel()
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    first = [f"a{i}" for i in range(5 * FIRST_PAGE_ROWS)]
+    model.update_sound_ids(first)
+    assert model.is_populating() and model.rowCount() == FIRST_PAGE_ROWS
+    mirror = Mirror(model)
+
+    second = first[1:] + [f"b{i}" for i in range(3 * FIRST_PAGE_ROWS)]
+    model.update_sound_ids(second)
+    while model.is_populating():
+        qapp.processEvents()
+    assert model.sound_ids() == mirror.rows == second
+    assert model_warnings == []
+
+
+def test_resort_sound_moves_only_a_row_out_of_order(model_warnings):
+    keys = {f"s{i}": i * 10 for i in range(20)}
+    model, tester, mirror = checked_model(sorted(keys, key=keys.get))
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append(model.sound_id(first.row())))
+    moves = []
+    model.rowsMoved.connect(lambda *args: moves.append(args))
+
+    def sort(sound_ids):
+        return sorted(sound_ids, key=keys.get)
+
+    # An edit keeping the order repaints the row and moves nothing
+    keys["s5"] = 51
+    assert model.resort_sound("s5", sort)
+    assert changed == ["s5"] and moves == []
+
+    for sound_id, key in [("s5", 155), ("s15", -1), ("s0", 1000), ("s19", 95)]:
+        keys[sound_id] = key
+        assert model.resort_sound(sound_id, sort)
+        assert model.sound_ids() == mirror.rows == sort(keys)
+    assert len(moves) == 4
+    assert not model.resort_sound("missing", sort)
+    assert model_warnings == []